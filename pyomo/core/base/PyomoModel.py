@@ -51,7 +51,7 @@ from pyomo.core.base.plugin import TransformationFactory
 from pyomo.core.base.label import CNameLabeler, CuidLabeler
 import pyomo.opt
 from pyomo.opt.base import ProblemFormat, guess_format
-from pyomo.opt.results import SolverResults, Solution, SolutionStatus, UndefinedData
+from pyomo.opt.results import SolverResults, Solution, SolutionStatus, UndefinedData, CompactMap
 
 from six import itervalues, iteritems, StringIO
 from six.moves import xrange
@@ -103,6 +103,38 @@ class PyomoConfig(Container):
             d[item[-1]] = PyomoConfig._option[item]
 
 
+#
+# (entry name, symbol prefix, entry key, solution attribute) for the
+# values that a results reader can store as an array in a solution
+# (see ResultsReader_sol), in the order of the indexed symbols with
+# that prefix.
+#
+_solution_arrays = (('variable', 'v', 'Value', '_variable_values'),
+                    ('constraint', 'c', 'Dual', '_constraint_duals'))
+
+def _as_list(values):
+    """
+    Return the values in an array (or list) as a list of Python
+    numbers.
+    """
+    tolist = getattr(values, 'tolist', None)
+    if tolist is None:
+        return values
+    return tolist()
+
+def _expand_solution_arrays(solution):
+    """
+    Move the values stored as arrays in a solution into its entries.
+    """
+    for name, prefix, key, attr in _solution_arrays:
+        values = solution.__dict__.pop(attr, None)
+        if values is None:
+            continue
+        entries = getattr(solution, name)
+        for i, val in enumerate(_as_list(values)):
+            entries.setdefault(prefix+str(i), {})[key] = val
+
+
 class ModelSolution(object):
 
     def __init__(self):
@@ -116,6 +148,29 @@ class ModelSolution(object):
         #
         for name in ['objective', 'variable', 'constraint', 'problem']:
             self._entry[name] = {}
+        #
+        # entry_arrays[name]: list of (list of objects, values, key)
+        #
+        # The values of a solution that was stored as arrays (see
+        # ModelSolutions.add_solution). These are the entry[name] values
+        # for key, which are not stored in entry.
+        #
+        self._entry_arrays = {}
+
+    def _expand_entry_arrays(self):
+        """
+        Move the values in entry_arrays into the entries.
+        """
+        for name, arrays in iteritems(self._entry_arrays):
+            entry = self._entry[name]
+            for objs, values, key in arrays:
+                for obj, val in zip(objs, _as_list(values)):
+                    id_ = id(obj)
+                    if id_ in entry:
+                        entry[id_][1][key] = val
+                    else:
+                        entry[id_] = (weakref_ref(obj), {key: val})
+        self._entry_arrays = {}
 
     def __getattr__(self, name):
         if name[0] == '_':
@@ -148,6 +203,7 @@ class ModelSolutions(object):
         state['_instance'] = self._instance()
         solutions = []
         for soln in self.solutions:
+            soln._expand_entry_arrays()
             soln_ = {}
             soln_['metadata'] = soln._metadata
             tmp = {}
@@ -275,6 +331,7 @@ class ModelSolutions(object):
         results._smap_id = None
 
         for soln_ in self.solutions:
+            soln_._expand_entry_arrays()
             soln = Solution()
             soln._cuid = cuid
             for key, val in iteritems(soln_._metadata):
@@ -335,6 +392,7 @@ class ModelSolutions(object):
             soln._metadata['gap'] = solution.gap
 
         if smap_id is None:
+            _expand_solution_arrays(solution)
             #
             # Cache symbol names, which might be re-used in subsequent
             # calls to add_solution()
@@ -388,25 +446,66 @@ class ModelSolutions(object):
             # Map solution
             #
             smap = self.symbol_map[smap_id]
+            #
+            # Values read as arrays are stored as arrays if the symbol
+            # map has the objects of the corresponding indexed symbols
+            #
+            for name, prefix, key, attr in _solution_arrays:
+                values = solution.__dict__.get(attr, None)
+                if values is None:
+                    continue
+                objs = smap.getIndexedObjects(prefix)
+                if (objs is None) or (len(objs) != len(values)):
+                    _expand_solution_arrays(solution)
+                    soln._entry_arrays = {}
+                    break
+                soln._entry_arrays[name] = [(objs, values, key)]
+            # Note: getObject does not require the symbol map to
+            # generate the labels of indexed symbols
+            smap_getObject = smap.getObject
             for name in ['problem', 'objective', 'variable', 'constraint']:
                 tmp = soln._entry[name]
-                for symb, val in iteritems(getattr(solution, name)):
-                    if symb in smap.bySymbol:
-                        obj = smap.bySymbol[symb]
-                    elif symb in smap.aliases:
-                        obj = smap.aliases[symb]
-                    elif ignore_missing_symbols:
-                        continue
-                    else:                                   #pragma:nocover
+                data = getattr(solution, name)
+                if (type(data) is CompactMap) and data.is_compact():
+                    #
+                    # Map the names of each column of a compact
+                    # solution and store it as an array
+                    #
+                    arrays = soln._entry_arrays.setdefault(name, [])
+                    for key in data.attributes():
+                        symbs, values = data.column(key)
+                        objs = [smap_getObject(symb) for symb in symbs]
+                        missing = [i for i, obj in enumerate(objs)
+                                   if obj is SymbolMap.UnknownSymbol]
+                        if missing:
+                            if not ignore_missing_symbols:
+                                raise RuntimeError(         #pragma:nocover
+                                    "ERROR: Symbol %s is missing from "
+                                    "model %s when loading with a "
+                                    "symbol map!"
+                                    % (symbs[missing[0]], instance.name))
+                            missing = set(missing)
+                            values = [val for i, val
+                                      in enumerate(_as_list(values))
+                                      if i not in missing]
+                            objs = [obj for i, obj in enumerate(objs)
+                                    if i not in missing]
+                        arrays.append((objs, values, key))
+                    continue
+                for symb, val in iteritems(data):
+                    obj = smap_getObject(symb)
+                    if obj is SymbolMap.UnknownSymbol:
+                        if ignore_missing_symbols:
+                            continue
                         #
                         # This should never happen ...
                         #
-                        raise RuntimeError(
+                        raise RuntimeError(                 #pragma:nocover
                             "ERROR: Symbol %s is missing from "
                             "model %s when loading with a symbol map!"
                             % (symb, instance.name))
 
-                    tmp[id(obj())] = (obj, val)
+                    tmp[id(obj)] = (weakref_ref(obj), val)
             #
             # Wrap up
             #
@@ -417,14 +516,24 @@ class ModelSolutions(object):
         # Collect fixed variables
         #
         tmp = soln._entry['variable']
+        if (default_variable_value is not None) and \
+           (smap_id is not None):
+            smap_byObject = smap.byObject
+            # the variables with a value in entry_arrays
+            has_value = set(id(vdata)
+                            for objs, values, key
+                            in soln._entry_arrays.get('variable', ())
+                            if key == 'Value'
+                            for vdata in objs)
         for vdata in instance.component_data_objects(Var):
             id_ = id(vdata)
             if vdata.fixed:
                 tmp[id_] = (weakref_ref(vdata), {'Value':value(vdata)})
             elif (default_variable_value is not None) and \
                  (smap_id is not None) and \
-                 (id_ in smap.byObject) and \
-                 (id_ not in tmp):
+                 (id_ in smap_byObject) and \
+                 (id_ not in tmp) and \
+                 (id_ not in has_value):
                 tmp[id_] = (weakref_ref(vdata), {'Value':default_variable_value})
 
         self.solutions.append(soln)
@@ -492,12 +601,10 @@ class ModelSolutions(object):
         #
         # Load variable data (suffixes and values)
         #
-        for id_, (vdata, entry) in iteritems(soln._entry['variable']):
-            vdata = vdata()
-            val = entry['Value']
+        def load_value(vdata, val):
             if vdata.fixed is True:
                 if ignore_fixed_vars:
-                    continue
+                    return False
                 if not allow_consistent_values_for_fixed_vars:
                     msg = "Variable '%s' in model '%s' is currently fixed - new" \
                           ' value is not expected in solution'
@@ -515,6 +622,29 @@ class ModelSolutions(object):
 
             vdata.value = val
             vdata.stale = False
+            return True
+
+        arrays = soln._entry_arrays.get('variable', ())
+        for objs, values, key in arrays:
+            if key == 'Value':
+                for vdata, val in zip(objs, _as_list(values)):
+                    load_value(vdata, val)
+        for objs, values, _attr_key in arrays:
+            attr_key = _attr_key[0].lower() + _attr_key[1:]
+            if attr_key == 'value':
+                continue
+            elif attr_key in valid_import_suffixes:
+                suffix = valid_import_suffixes[attr_key]
+                for vdata, attr_value in zip(objs, _as_list(values)):
+                    if vdata.fixed and ignore_fixed_vars:
+                        continue
+                    suffix[vdata] = attr_value
+        for id_, (vdata, entry) in iteritems(soln._entry['variable']):
+            vdata = vdata()
+            # the value is not in the entry if it was read as an array
+            if ('Value' in entry) and \
+               (not load_value(vdata, entry['Value'])):
+                continue
 
             for _attr_key, attr_value in iteritems(entry):
                 attr_key = _attr_key[0].lower() + _attr_key[1:]
@@ -525,6 +655,12 @@ class ModelSolutions(object):
         #
         # Load constraint data (suffixes)
         #
+        for objs, values, _attr_key in soln._entry_arrays.get('constraint', ()):
+            attr_key = _attr_key[0].lower() + _attr_key[1:]
+            if attr_key in valid_import_suffixes:
+                suffix = valid_import_suffixes[attr_key]
+                for cdata, attr_value in zip(objs, _as_list(values)):
+                    suffix[cdata] = attr_value
         for id_, (cdata, entry) in iteritems(soln._entry['constraint']):
             cdata = cdata()
             for _attr_key, attr_value in iteritems(entry):
@@ -454,6 +454,11 @@ class _BlockData(ActiveComponentData):
             del ans['_canonical_repn']
         if '_ampl_repn' in ans:
             del ans['_ampl_repn']
+        # The LP/MPS writer row caches (see pyomo.repn.plugins.row_cache)
+        if '_cpxlp_row_cache' in ans:
+            del ans['_cpxlp_row_cache']
+        if '_mps_row_cache' in ans:
+            del ans['_mps_row_cache']
         return ans
 
     def __setstate__(self, state):
@@ -18,7 +18,51 @@ import pyomo.util
 from pyomo.core.base.plugin import register_component
 from pyomo.core.base.misc import tabular_writer
 
-from six import iteritems, string_types
+from six import iteritems, string_types, integer_types, text_type
+
+#
+# Types whose instances are immutable and are returned unchanged by
+# copy.deepcopy(). The values of these types in the state of a
+# component are copied directly, which avoids the overhead of a
+# deepcopy() call (and its memo bookkeeping) for the many scalar
+# attributes of the component data in a model.
+#
+_atomic_types = set([type(None), bool, float, complex, str, text_type, type])
+_atomic_types.update(integer_types)
+
+def _deepcopy_state(state, memo):
+    """
+    Return a copy of a __getstate__() dictionary in which all values
+    have been deepcopied using the memo.
+    """
+    ans = {}
+    for key, val in iteritems(state):
+        if val.__class__ in _atomic_types:
+            ans[key] = val
+        elif val.__class__ is list and id(val) not in memo:
+            # lists (e.g., expression arguments) are copied here
+            # rather than by deepcopy() to skip the dispatch for their
+            # scalar items
+            ans[key] = memo[id(val)] = _list = []
+            for item in val:
+                _list.append( item if item.__class__ in _atomic_types
+                              else deepcopy(item, memo) )
+        elif val.__class__ is dict and id(val) not in memo:
+            # dictionaries (e.g., the _data of indexed components) are
+            # copied here as well; tuples of scalars (indices) are
+            # immutable and shared with the original
+            ans[key] = memo[id(val)] = _dict = {}
+            for k, v in iteritems(val):
+                if k.__class__ not in _atomic_types and \
+                   not (k.__class__ is tuple and
+                        all(i.__class__ in _atomic_types for i in k)):
+                    k = deepcopy(k, memo)
+                if v.__class__ not in _atomic_types:
+                    v = deepcopy(v, memo)
+                _dict[k] = v
+        else:
+            ans[key] = deepcopy(val, memo)
+    return ans
 
 def _cname_index_generator(idx):
     """
@@ -172,6 +216,20 @@ class Component(object):
                 # of setting self.__dict__[key] = val.
                 object.__setattr__(self, key, val)
 
+    def __deepcopy__(self, memo):
+        # Note: this is equivalent to the generic deepcopy() of an
+        # object with __getstate__/__setstate__ (the copy is entered
+        # into the memo before its state is copied), but it skips the
+        # __reduce_ex__ protocol and copies the index -> data
+        # dictionaries of indexed components directly.  Components
+        # that are also component data (e.g., SimpleSet) are copied
+        # by ComponentData.__deepcopy__, which checks the block scope.
+        if isinstance(self, ComponentData):
+            return ComponentData.__deepcopy__(self, memo)
+        ans = memo[id(self)] = self.__class__.__new__(self.__class__)
+        ans.__setstate__(_deepcopy_state(self.__getstate__(), memo))
+        return ans
+
     def type(self):
         """Return the class type for this component"""
         return self._type
@@ -494,7 +552,7 @@ class ComponentData(object):
         # update the _parent refs appropriately, and since this is a
         # slot-ized class, we cannot overwrite the __deepcopy__
         # attribute to prevent infinite recursion.
-        ans.__setstate__(deepcopy(self.__getstate__(), memo))
+        ans.__setstate__(_deepcopy_state(self.__getstate__(), memo))
         return ans
 
     def parent_component(self):
@@ -27,6 +27,7 @@ from pyomo.core.base import numvalue
 
 _common_module_members = [
     'identify_variables',
+    'identify_mutable_parameters',
     'clone_expression',
     'generate_expression',
     'generate_intrinsic_function_expression',
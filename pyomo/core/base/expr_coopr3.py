@@ -39,11 +39,12 @@ except:
 
 #from pyomo.util.plugin import *
 
-from pyomo.core.base.component import Component
+from pyomo.core.base.component import Component, _deepcopy_state
 #from pyomo.core.base.plugin import *
 from pyomo.core.base.numvalue import *
 from pyomo.core.base.numvalue import ZeroConstant, native_numeric_types
 from pyomo.core.base.var import _VarData
+from pyomo.core.base.param import _ParamData
 
 import pyomo.core.base.expr_common
 from pyomo.core.base.expr_common import \
@@ -109,6 +110,43 @@ def identify_variables(expr, include_fixed=True):
             yield expr
 
 
+def identify_mutable_parameters(expr, allow_duplicates=False):
+    if allow_duplicates:
+        for param in _identify_mutable_parameters(expr):
+            yield param
+    else:
+        _seen = set()
+        for param in _identify_mutable_parameters(expr):
+            if id(param) in _seen:
+                continue
+            _seen.add(id(param))
+            yield param
+
+def _identify_mutable_parameters(expr):
+    if type(expr) in native_numeric_types:
+        pass
+    elif expr.is_expression():
+        if type(expr) is _ProductExpression:
+            for arg in expr._numerator:
+                for param in _identify_mutable_parameters(arg):
+                    yield param
+            for arg in expr._denominator:
+                for param in _identify_mutable_parameters(arg):
+                    yield param
+        elif type(expr) is _ExternalFunctionExpression:
+            for arg in expr._args:
+                if isinstance(arg, basestring):
+                    continue
+                for param in _identify_mutable_parameters(arg):
+                    yield param
+        else:
+            for arg in expr._args:
+                for param in _identify_mutable_parameters(arg):
+                    yield param
+    elif isinstance(expr, _ParamData) and (not expr.is_constant()):
+        yield expr
+
+
 class _ExpressionBase(NumericValue):
     """An object that defines a mathematical expression that can be evaluated"""
 
@@ -125,6 +163,15 @@ class _ExpressionBase(NumericValue):
             result[i] = getattr(self, i)
         return result
 
+    def __deepcopy__(self, memo):
+        # Expressions are deepcopied when blocks are cloned.  This is
+        # equivalent to the generic deepcopy() of an object with
+        # __getstate__/__setstate__, but it skips the __reduce_ex__
+        # protocol and the deepcopy of the scalar attributes.
+        ans = memo[id(self)] = self.__class__.__new__(self.__class__)
+        ans.__setstate__(_deepcopy_state(self.__getstate__(), memo))
+        return ans
+
     def to_string(self, ostream=None, verbose=None, precedence=0):
         """Print this expression"""
         if ostream is None:
@@ -32,7 +32,7 @@ except:
 
 #from pyomo.core.plugin import *
 
-from pyomo.core.base.component import Component
+from pyomo.core.base.component import Component, _deepcopy_state
 #from pyomo.core.base.plugin import *
 from pyomo.core.base.numvalue import *
 from pyomo.core.base.numvalue import native_numeric_types
@@ -122,6 +122,42 @@ def identify_variables(expr, include_fixed=True, allow_duplicates=False):
                     yield _sub
 
 
+def _mutable_parameter_args(expr):
+    # The coefficients and constant of a linear expression are not
+    # stored in its argument list
+    if expr.__class__ is _LinearExpression:
+        return [expr._const] + [expr._coef[id(v)] for v in expr._args]
+    return expr._args
+
+def identify_mutable_parameters(expr, allow_duplicates=False):
+    if not allow_duplicates:
+        _seen = set()
+    expr = as_numeric(expr)
+    if expr.is_expression():
+        _args = _mutable_parameter_args(expr)
+        _stack = [ (_args, 0, len(_args)) ]
+    else:
+        _stack = [ ([expr], 0, 1) ]
+    while _stack:
+        _argList, _idx, _len = _stack.pop()
+        while _idx < _len:
+            _sub = _argList[_idx]
+            _idx += 1
+            if type(_sub) in native_numeric_types:
+                pass
+            elif _sub.is_expression():
+                _stack.append(( _argList, _idx, _len ))
+                _argList = _mutable_parameter_args(_sub)
+                _idx = 0
+                _len = len(_argList)
+            elif isinstance(_sub, _ParamData) and (not _sub.is_constant()):
+                if not allow_duplicates:
+                    if id(_sub) in _seen:
+                        continue
+                    _seen.add(id(_sub))
+                yield _sub
+
+
 
 class _ExpressionBase(NumericValue):
     """An object that defines a mathematical expression that can be evaluated"""
@@ -146,6 +182,15 @@ class _ExpressionBase(NumericValue):
            state[i] = getattr(self,i)
         return state
 
+    def __deepcopy__(self, memo):
+        # Expressions are deepcopied when blocks are cloned.  This is
+        # equivalent to the generic deepcopy() of an object with
+        # __getstate__/__setstate__, but it skips the __reduce_ex__
+        # protocol and the deepcopy of the scalar attributes.
+        ans = memo[id(self)] = self.__class__.__new__(self.__class__)
+        ans.__setstate__(_deepcopy_state(self.__getstate__(), memo))
+        return ans
+
     def __nonzero__(self):
         return bool(self())
 
@@ -21,6 +21,11 @@ logger = logging.getLogger('pyomo.core')
 
 UnindexedComponent_set = set([None])
 
+# The iteration over a sparse component with an ordered index sorts
+# the keys of the component data (instead of testing each element of
+# the index) if the index is this many times larger than the data.
+_SPARSE_SORT_RATIO = 16
+
 
 def normalize_index(index):
     """
@@ -163,7 +168,8 @@ class IndexedComponent(Component):
             # user iterates over the set when the _data dict is empty.
             #
             return self._data.__iter__()
-        elif len(self._data) == len(self._index):
+        _len_index = len(self._index)
+        if len(self._data) == _len_index:
             #
             # If the data is dense then return the index iterator.
             #
@@ -199,6 +205,19 @@ You can silence this warning by one of three ways:
                 return self._data.__iter__()
             else:
                 #
+                # If the data is much smaller than the index, then sort
+                # the keys by their position in the index set (for the
+                # ordered sets that can compute it).
+                #
+                if len(self._data) * _SPARSE_SORT_RATIO < _len_index:
+                    _key = getattr(self._index, '_position_key', None)
+                    _key = _key() if _key is not None else None
+                    if _key is not None:
+                        try:
+                            return iter(sorted(self._data, key=_key))
+                        except (KeyError, IndexError, TypeError):
+                            pass
+                #
                 # Test each element of a sparse data with an ordered
                 # index set in order.  This is potentially *slow*: if
                 # the component is in fact very sparse, we could be
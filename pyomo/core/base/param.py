@@ -14,7 +14,8 @@ import types
 import logging
 from weakref import ref as weakref_ref
 
-from pyomo.core.base.component import ComponentData, register_component
+from pyomo.core.base.component import (ComponentData, register_component,
+                                       _cname_index_generator)
 from pyomo.core.base.indexed_component import IndexedComponent, normalize_index, UnindexedComponent_set
 from pyomo.core.base.misc import apply_indexed_rule, apply_parameterized_indexed_rule
 from pyomo.core.base.numvalue import NumericValue, native_types, value
@@ -95,6 +96,134 @@ class _ParamData(ComponentData, NumericValue):
 
     __bool__ = __nonzero__
 
+class _ParamProxyData(_ParamData):
+    """
+    This class defines the data for a mutable parameter of a Param
+    declared with compact=True.
+
+    The value of the parameter is stored on the owning Param (see
+    _ParamValueStore), and this object only records its index.  These
+    objects are created when the parameter data is accessed, so two
+    accesses to the same index may return different objects.
+
+    Constructor Arguments:
+        owner       The Param object that owns this data.
+        index       The index of this parameter.
+    """
+
+    __slots__ = ('_index',)
+
+    def __init__(self, owner, index):
+        #
+        # The following is equivalent to calling
+        # the base ComponentData constructor.
+        #
+        self._component = weakref_ref(owner)
+        self._index = index
+
+    def __getstate__(self):
+        """
+        This method must be defined because this class uses slots.
+        The value is stored on the owning Param, so it is not part of
+        the state.
+        """
+        state = ComponentData.__getstate__(self)
+        for i in _ParamProxyData.__slots__:
+            state[i] = getattr(self, i)
+        return state
+
+    @property
+    def value(self):
+        """Return the value of this parameter."""
+        return self._component()._data._values[self._index]
+    @value.setter
+    def value(self, val):
+        """Set the value of this parameter."""
+        self._component()._data._values[self._index] = val
+
+    def index(self):
+        """Returns the index of this parameter."""
+        return self._index
+
+    def cname(self, fully_qualified=False, name_buffer=None):
+        """Return a string with the component name and index"""
+        # Note: the name is not stored in the name buffer, as this
+        # object may not outlive the buffer (and its id may be reused)
+        return self._component().cname(fully_qualified, name_buffer) \
+            + _cname_index_generator(self._index)
+
+class _ParamValueStore(object):
+    """
+    The dictionary of the data of a Param declared with compact=True
+    (Param._data).  The values of the parameters are stored in a
+    dictionary, as for immutable parameters, and _ParamProxyData
+    objects are created when the data is accessed.  A _ParamData
+    object that is assigned to an index is replaced by its value.
+    """
+
+    __slots__ = ('_component', '_values')
+
+    def __init__(self, owner):
+        self._component = weakref_ref(owner)
+        self._values = {}
+
+    def __getstate__(self):
+        return {'_component': self._component(), '_values': self._values}
+
+    def __setstate__(self, state):
+        self._component = weakref_ref(state['_component'])
+        self._values = state['_values']
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, idx):
+        return idx in self._values
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __getitem__(self, idx):
+        if idx not in self._values:
+            raise KeyError(idx)
+        return _ParamProxyData(self._component(), idx)
+
+    def __setitem__(self, idx, val):
+        if isinstance(val, _ParamData):
+            val = val.value
+        self._values[idx] = val
+
+    def __delitem__(self, idx):
+        del self._values[idx]
+
+    def clear(self):
+        self._values.clear()
+
+    def get(self, idx, default=None):
+        if idx not in self._values:
+            return default
+        return _ParamProxyData(self._component(), idx)
+
+    def iterkeys(self):
+        return iter(self._values)
+
+    def itervalues(self):
+        owner = self._component()
+        return (_ParamProxyData(owner, idx) for idx in self._values)
+
+    def iteritems(self):
+        owner = self._component()
+        return ((idx, _ParamProxyData(owner, idx)) for idx in self._values)
+
+    def keys(self):
+        return list(self._values)
+
+    def values(self):
+        return list(self.itervalues())
+
+    def items(self):
+        return list(self.iteritems())
+
 class Param(IndexedComponent):
     """
     A parameter value, which may be defined over an index.
@@ -114,6 +243,18 @@ class Param(IndexedComponent):
                      values for this parameter
        initialize  A dictionary or rule for setting up this parameter 
                      with existing model data
+       dense       An option to specify that an indexed parameter is
+                     initialized densely (the default).  If False, a
+                     scalar or rule initializer is applied to each index
+                     when the parameter value is first accessed, and
+                     iteration only covers the values that were
+                     accessed (as with sparse indexed variables).
+       compact     An option for mutable indexed parameters to store
+                     the values on the component, as for immutable
+                     parameters, rather than in a data object per
+                     index.  The data objects (see _ParamProxyData)
+                     are created when they are accessed, so they are
+                     not unique: m.p[1] is m.p[1] is False.
     """
 
     DefaultMutable = False
@@ -135,6 +276,11 @@ class Param(IndexedComponent):
         self._mutable       = kwd.pop('mutable', Param.DefaultMutable )
         self._default_val   = kwd.pop('default', None )
         self._dense_initialize = kwd.pop('initialize_as_dense', False)
+        self._dense         = kwd.pop('dense', True )
+        compact             = kwd.pop('compact', False )
+        # The initializer applied to each index when a sparse
+        # (dense=False) indexed parameter value is first accessed
+        self._lazy_init     = None
         #
         if 'repn' in kwd:
             logger.error(
@@ -145,23 +291,37 @@ class Param(IndexedComponent):
         #
         kwd.setdefault('ctype', Param)
         IndexedComponent.__init__(self, *args, **kwd)
+        #
+        # Compact storage of mutable parameter values (see
+        # _ParamValueStore)
+        #
+        if compact:
+            if not self.is_indexed():
+                raise ValueError(
+                    "The compact option is only supported for indexed "
+                    "parameters (declaring Param '%s')" % (self.name,))
+            if self._mutable:
+                self._data = _ParamValueStore(self)
 
     def __len__(self):
         """
         Return the number of component data objects stored by this
-        component.  If a default value is specified, then the 
-        length equals the number of items in the component index.
+        component.  If a default value is specified, then the length
+        equals the number of items in the component index (unless the
+        parameter is sparse, in which case only the values that were
+        accessed are counted).
         """
-        if self._default_val is None:
+        if self._default_val is None or self._lazy_init is not None:
             return len(self._data)
         return len(self._index)
 
     def __contains__(self, ndx):
         """
         Return true if the index is in the dictionary.  If the default value
-        is specified, then all members of the component index are valid.
+        (or the initializer of a sparse parameter) is specified, then all
+        members of the component index are valid.
         """
-        if self._default_val is None:
+        if self._default_val is None and self._lazy_init is None:
             return ndx in self._data
         return ndx in self._index
 
@@ -169,7 +329,14 @@ class Param(IndexedComponent):
         """
         Iterate over the keys in the dictionary.  If the default value is
         specified, then iterate over all keys in the component index.
+        The iteration over a sparse parameter only covers the values
+        that were accessed, so that it does not initialize the
+        remaining values.
         """
+        if self._lazy_init is not None:
+            if not self._data:
+                return iter(())
+            return IndexedComponent.__iter__(self)
         if self._default_val is None:
             return self._data.__iter__()
         return self._index.__iter__()
@@ -353,6 +520,12 @@ class Param(IndexedComponent):
             raise ValueError(
                 "Error retrieving Param value (%s): This parameter has "
                 "not been constructed" % ( idx_str,) )                
+        if self._lazy_init is not None:
+            #
+            # Initialize the value of a sparse parameter
+            #
+            self._lazy_setitem(idx)
+            return self._data[idx]
         if val is None:
             if self.is_indexed():
                 idx_str = '%s[%s]' % (self.cname(True), idx,)
@@ -555,6 +728,15 @@ this parameter dynamically, please declare the parameter as mutable
         # We have a valid index, so do the actual set operation.
         self._raw_setitem(ndx_, val)
 
+    def _lazy_setitem(self, idx):
+        """
+        Apply the initializer of a sparse parameter to an index.
+        """
+        val = self._lazy_init
+        if type(val) is types.FunctionType:
+            val = apply_indexed_rule(self, val, self.parent_block(), idx)
+        self._raw_setitem(idx, val)
+
     def _initialize_from(self, _init):
         """
         Initialize data from a rule or data
@@ -783,10 +965,25 @@ This has resulted in the conversion of the source to dense form.
                 "Default value (%s) is not valid for Param domain %s" %
                 ( str(val), self.domain.name ) )
         #
-        # Step #1: initialize data from rule value
+        # Step #1: initialize data from rule value.  The scalar and
+        # function initializers of sparse indexed parameters are
+        # applied when the values are first accessed (the values that
+        # already exist are reinitialized by reconstruct()).
         #
+        self._lazy_init = None
         if self._rule is not None:
-            self._initialize_from(self._rule)
+            _init = self._rule
+            if not self._dense and self.is_indexed() and \
+               ( type(_init) in native_types or \
+                 type(_init) is types.FunctionType or \
+                 isinstance(_init, NumericValue) ):
+                if isinstance(_init, NumericValue):
+                    _init = _init()
+                self._lazy_init = _init
+                for idx in list(self._data):
+                    self._lazy_setitem(idx)
+            else:
+                self._initialize_from(_init)
         #
         # Step #2: allow any user-specified (external) data to override
         # the initialization
@@ -895,6 +1092,13 @@ this parameter dynamically, please declare the parameter as mutable
 
 class IndexedParam(Param):
 
+    def clear(self):
+        """Clear the data in this component"""
+        if self._data.__class__ is _ParamValueStore:
+            self._data.clear()
+        else:
+            Param.clear(self)
+
     def __call__(self, exception=True):
         """Compute the value of the parameter"""
         if exception:
@@ -72,6 +72,7 @@ class RangeSet(OrderedSimpleSet):
         if self._constructed:
             return
         self._constructed=True
+        self._version += 1
         #
         # We call value() here for cases like Expressions, mutable
         # Params and the like
@@ -182,6 +183,15 @@ class RangeSet(OrderedSimpleSet):
         else:
             raise IndexError("Valid index values for sets are 1 .. len(set) or -1 .. -len(set)")
 
+    def _position_key(self):
+        """
+        Return a function that maps the elements of this set to keys
+        that sort them in the set order.
+        """
+        if self._step_val > 0:
+            return lambda x: x
+        return lambda x: -x
+
     def _set_contains(self, element):
         """
         Test if the specified element in this set.
@@ -0,0 +1,629 @@
+#  _________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright (c) 2014 Sandia Corporation.
+#  Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+#  the U.S. Government retains certain rights in this software.
+#  This software is distributed under the BSD License.
+#  _________________________________________________________________________
+#
+# A compact binary serialization of Pyomo models.
+#
+# A model is written as a versioned stream with three parts:
+#
+#   - a header with a magic string, the format version and the byte
+#     order of the arrays that follow,
+#
+#   - a pickle of the model "skeleton": the blocks, sets and components
+#     of the model, where the _data dictionaries of the indexed
+#     components whose data objects only store slots (e.g., Var, Param,
+#     Constraint, Objective and Expression) are replaced by persistent
+#     ids,
+#
+#   - the data of these components: the index and each slot of the
+#     data objects are written as typed arrays (or as indices into a
+#     table of objects that is pickled with the skeleton), and the
+#     expressions (and any other value that is not a native scalar)
+#     are written as a single postfix stream of opcodes, integers and
+#     floats.
+#
+# Every part of the stream is prefixed with its length, so models can
+# be written to and read from any file-like object (e.g., the file
+# returned by socket.makefile()) without seeking.
+#
+
+__all__ = ['dump_model', 'load_model', 'dumps_model', 'loads_model']
+
+import array
+import gc
+import struct
+import sys
+from io import BytesIO
+from itertools import repeat
+from weakref import ref as weakref_ref
+
+from six import iteritems, PY3
+from six.moves import cPickle as pickle, xrange, zip
+
+from pyomo.core.base.component import ComponentData
+from pyomo.core.base.indexed_component import IndexedComponent
+from pyomo.core.base.numvalue import NumericValue, native_numeric_types
+from pyomo.core.base import expr_coopr3, expr_pyomo4
+
+#: The magic string at the beginning of a serialized model
+MAGIC = b'PYOMOBIN'
+#: The version of the serialization format
+FORMAT_VERSION = 1
+
+_header = struct.Struct('<8sHc')
+_length = struct.Struct('<Q')
+_byteorder = b'<' if sys.byteorder == 'little' else b'>'
+
+# The array typecode of 32-bit integers
+_int_code = 'i' if array.array('i').itemsize == 4 else 'l'
+_int_min = -2**31
+_int_max = 2**31 - 1
+
+_expression_types = (expr_coopr3._ExpressionBase,
+                     expr_pyomo4._ExpressionBase)
+_none_type = type(None)
+_float_types = set([float])
+
+#
+# Column kinds
+#
+_NONE = 0       # all values are None
+_BOOL = 1       # bools (a byte array)
+_INT = 2        # 32-bit integers
+_FLOAT = 3      # floats
+_OPTFLOAT = 4   # floats or None (the floats and the positions of None)
+_STRING = 5     # strings (their lengths and the encoded strings)
+_OBJECT = 6     # indices into the table of pickled objects
+_STREAM = 7     # values written in the postfix stream
+_TUPLE = 8      # tuples of the same length (a column per position)
+
+#
+# Postfix stream opcodes
+#
+_OP_NONE = 0
+_OP_TRUE = 1
+_OP_FALSE = 2
+_OP_INT = 3     # int: the value
+_OP_FLOAT = 4   # float: the value
+_OP_OBJECT = 5  # int: the index in the table of pickled objects
+_OP_DATA = 6    # int, int: the component and position of a data object
+_OP_MEMO = 7    # int: the index of an expression node already read
+_OP_LIST = 8    # int: the number of items
+_OP_TUPLE = 9   # int: the number of items
+_OP_NODE = 10   # int: the index of the class and state keys of the node
+_OP_FLOATS = 11 # int: the length of a list of floats
+
+if PY3:
+    def _tobytes(arr):
+        return arr.tobytes()
+    def _frombytes(arr, buf):
+        arr.frombytes(buf)
+    def _encode_strings(values):
+        return [v.encode('utf-8') for v in values]
+    def _decode_string(buf):
+        return buf.decode('utf-8')
+else:
+    def _tobytes(arr):
+        return arr.tostring()
+    def _frombytes(arr, buf):
+        arr.fromstring(buf)
+    def _encode_strings(values):
+        return values
+    def _decode_string(buf):
+        return buf
+
+
+def _detached_data_class(component):
+    """
+    Return the class of the data objects of an indexed component whose
+    _data dictionary can be written as columns, None if the dictionary
+    stores raw values (e.g., immutable Params), or False if the
+    dictionary must be pickled with the skeleton.
+    """
+    if not isinstance(component, IndexedComponent) or \
+       not component.is_indexed() or \
+       type(component._data) is not dict or \
+       not component._data:
+        return False
+    types = set(map(type, component._data.values()))
+    if len(types) != 1:
+        return False
+    cls = types.pop()
+    if not issubclass(cls, ComponentData):
+        return None
+    # The data objects must only store slots, and the state of the
+    # objects must be restored by ComponentData.__setstate__()
+    if hasattr(next(iter(component._data.values())), '__dict__'):
+        return False
+    for base in cls.__mro__:
+        if base is ComponentData:
+            break
+        if '__setstate__' in base.__dict__:
+            return False
+    return cls
+
+def _node_setters(cls, keys):
+    """
+    Return the slot setters of the state keys of an expression class
+    whose state is restored by NumericValue.__setstate__() (which sets
+    each attribute), or None.
+    """
+    for base in cls.__mro__:
+        if base is NumericValue:
+            break
+        if '__setstate__' in base.__dict__:
+            return None
+    try:
+        return tuple(_slot_setter(cls, key) for key in keys)
+    except AttributeError:
+        return None
+
+def _slot_setter(cls, name):
+    for base in cls.__mro__:
+        if name in base.__dict__:
+            return base.__dict__[name].__set__
+    raise AttributeError("'%s' object has no slot '%s'"
+                         % (cls.__name__, name))
+
+
+class _Writer(object):
+    """
+    The encoder of the component data of a model.  The arrays are
+    collected in memory, as the table of objects they refer to is
+    pickled with the model skeleton (before the arrays).
+    """
+
+    def __init__(self):
+        self.blocks = []
+        self.objects = []
+        self.object_ids = {}
+        self.schemas = []
+        self.schema_ids = {}
+        # The (component, position) of the detached data objects
+        self.data_ids = {}
+        # The postfix stream
+        self.ops = array.array('B')
+        self.ints = array.array(_int_code)
+        self.floats = array.array('d')
+        self.memo = {}
+
+    def object_index(self, obj):
+        idx = self.object_ids.get(id(obj))
+        if idx is None:
+            idx = self.object_ids[id(obj)] = len(self.objects)
+            self.objects.append(obj)
+        return idx
+
+    def write_column(self, values):
+        blocks = self.blocks
+        types = set(map(type, values))
+        if types == set([tuple]):
+            lengths = set(map(len, values))
+            if len(lengths) == 1 and 0 < min(lengths) < 256:
+                blocks.append(array.array('B', (_TUPLE, lengths.pop())))
+                for column in zip(*values):
+                    self.write_column(column)
+                return
+        kind = self._column_kind(values, types)
+        blocks.append(array.array('B', (kind,)))
+        if kind == _BOOL:
+            blocks.append(array.array('B', values))
+        elif kind == _INT:
+            blocks.append(array.array(_int_code, values))
+        elif kind == _FLOAT:
+            blocks.append(array.array('d', values))
+        elif kind == _OPTFLOAT:
+            blocks.append(array.array(
+                'd', (0.0 if v is None else v for v in values)))
+            blocks.append(array.array(
+                _int_code, (i for i, v in enumerate(values) if v is None)))
+        elif kind == _STRING:
+            encoded = _encode_strings(values)
+            blocks.append(array.array(_int_code, map(len, encoded)))
+            blocks.append(b''.join(encoded))
+        elif kind == _OBJECT:
+            blocks.append(array.array(_int_code,
+                                      map(self.object_index, values)))
+        elif kind == _STREAM:
+            write_value = self.write_value
+            for v in values:
+                write_value(v)
+
+    def _column_kind(self, values, types):
+        if len(types) == 1:
+            t = next(iter(types))
+            if t is bool:
+                return _BOOL
+            elif t is int:
+                if min(values) >= _int_min and max(values) <= _int_max:
+                    return _INT
+                return _STREAM
+            elif t is float:
+                return _FLOAT
+            elif t is str:
+                return _STRING
+            elif t is _none_type:
+                return _NONE
+        if types == set([float, _none_type]):
+            return _OPTFLOAT
+        for t in types:
+            if t not in native_numeric_types and t is not _none_type:
+                break
+        else:
+            return _STREAM
+        for v in values:
+            if isinstance(v, (list, tuple, ComponentData) + _expression_types):
+                return _STREAM
+        return _OBJECT
+
+    def write_value(self, v):
+        """Write a value to the postfix stream"""
+        ops = self.ops
+        t = type(v)
+        if t is float:
+            ops.append(_OP_FLOAT)
+            self.floats.append(v)
+        elif v is None:
+            ops.append(_OP_NONE)
+        elif t is bool:
+            ops.append(_OP_TRUE if v else _OP_FALSE)
+        elif t is int and _int_min <= v <= _int_max:
+            ops.append(_OP_INT)
+            self.ints.append(v)
+        elif id(v) in self.data_ids:
+            ops.append(_OP_DATA)
+            self.ints.extend(self.data_ids[id(v)])
+        elif isinstance(v, _expression_types):
+            idx = self.memo.get(id(v))
+            if idx is not None:
+                ops.append(_OP_MEMO)
+                self.ints.append(idx)
+                return
+            state = v.__getstate__()
+            keys = tuple(state)
+            for key in keys:
+                self.write_value(state[key])
+            schema = (v.__class__, keys)
+            idx = self.schema_ids.get(schema)
+            if idx is None:
+                idx = self.schema_ids[schema] = len(self.schemas)
+                self.schemas.append(schema)
+            ops.append(_OP_NODE)
+            self.ints.append(idx)
+            self.memo[id(v)] = len(self.memo)
+        elif t is list and v and set(map(type, v)) == _float_types:
+            ops.append(_OP_FLOATS)
+            self.ints.append(len(v))
+            self.floats.extend(v)
+        elif t is list or t is tuple:
+            for item in v:
+                self.write_value(item)
+            ops.append(_OP_LIST if t is list else _OP_TUPLE)
+            self.ints.append(len(v))
+        else:
+            ops.append(_OP_OBJECT)
+            self.ints.append(self.object_index(v))
+
+
+def dump_model(model, stream):
+    """
+    Write a model (or any block) to a binary file-like object.
+    """
+    writer = _Writer()
+    detached = []
+    detached_dicts = {}
+    for component in model.component_objects(descend_into=True):
+        cls = _detached_data_class(component)
+        if cls is False:
+            continue
+        j = len(detached)
+        detached_dicts[id(component._data)] = j
+        if cls is None:
+            slots = None
+        else:
+            slots = tuple(
+                key for key in
+                next(iter(component._data.values())).__getstate__()
+                if key != '_component')
+            writer.data_ids.update(
+                (id(obj), (j, i))
+                for i, obj in enumerate(component._data.values()))
+        detached.append((component, cls, slots))
+
+    for component, cls, slots in detached:
+        writer.blocks.append(array.array(_int_code, (len(component._data),)))
+        writer.write_column(list(component._data.keys()))
+        values = list(component._data.values())
+        if slots is None:
+            writer.write_column(values)
+        else:
+            for slot in slots:
+                writer.write_column([getattr(obj, slot) for obj in values])
+
+    def persistent_id(obj):
+        if type(obj) is dict:
+            j = detached_dicts.get(id(obj))
+            if j is not None:
+                return ('D', j)
+        elif id(obj) in writer.data_ids:
+            return ('d',) + writer.data_ids[id(obj)] + (obj.__class__,)
+        return None
+
+    buf = BytesIO()
+    pickler = pickle.Pickler(buf, pickle.HIGHEST_PROTOCOL)
+    pickler.persistent_id = persistent_id
+    pickler.dump((model, detached, writer.objects, writer.schemas))
+
+    stream.write(_header.pack(MAGIC, FORMAT_VERSION, _byteorder))
+    _write_block(stream, buf.getvalue())
+    del buf
+    for item in writer.blocks:
+        _write_block(stream, item)
+    for item in (writer.ops, writer.ints, writer.floats):
+        _write_block(stream, item)
+
+def dumps_model(model):
+    """
+    Return the serialization of a model (or any block) as bytes.
+    """
+    buf = BytesIO()
+    dump_model(model, buf)
+    return buf.getvalue()
+
+def _write_block(stream, item):
+    if isinstance(item, array.array):
+        item = _tobytes(item)
+    stream.write(_length.pack(len(item)))
+    stream.write(item)
+
+
+class _PendingColumn(object):
+    """A column whose values are read from the postfix stream"""
+
+    __slots__ = ('n', 'values')
+
+    def __init__(self, n):
+        self.n = n
+        self.values = None
+
+
+class _Reader(object):
+    """
+    The decoder of the component data of a model.
+    """
+
+    def __init__(self, stream, swap):
+        self.stream = stream
+        self.swap = swap
+        self.pending = []
+
+    def read_block(self):
+        n = _length.unpack(_read(self.stream, _length.size))[0]
+        return _read(self.stream, n)
+
+    def read_array(self, typecode):
+        arr = array.array(typecode)
+        _frombytes(arr, self.read_block())
+        if self.swap:
+            arr.byteswap()
+        return arr
+
+    def read_column(self, n, objects):
+        """
+        Return the values of a column, a _PendingColumn, or (for a column
+        of tuples) a tuple of the columns of the tuple positions.
+        """
+        kind = self.read_array('B')
+        if kind[0] == _TUPLE:
+            return tuple(self.read_column(n, objects)
+                         for i in xrange(kind[1]))
+        kind = kind[0]
+        if kind == _FLOAT:
+            return self.read_array('d').tolist()
+        elif kind == _BOOL:
+            return list(map(bool, self.read_array('B')))
+        elif kind == _INT:
+            return self.read_array(_int_code).tolist()
+        elif kind == _OPTFLOAT:
+            values = self.read_array('d').tolist()
+            for i in self.read_array(_int_code):
+                values[i] = None
+            return values
+        elif kind == _STRING:
+            lengths = self.read_array(_int_code)
+            buf = self.read_block()
+            values = []
+            start = 0
+            for size in lengths:
+                values.append(_decode_string(buf[start:start+size]))
+                start += size
+            return values
+        elif kind == _OBJECT:
+            return list(map(objects.__getitem__,
+                            self.read_array(_int_code)))
+        elif kind == _STREAM:
+            column = _PendingColumn(n)
+            self.pending.append(column)
+            return column
+        else:
+            return [None] * n
+
+    def read_stream(self, datas, objects, schemas):
+        """
+        Read the postfix stream, and assign its values to the pending
+        columns.
+        """
+        ops = self.read_array('B')
+        ints = iter(self.read_array(_int_code).tolist())
+        floats = self.read_array('d').tolist()
+        fpos = 0
+        nodes = [(cls, keys, len(keys), _node_setters(cls, keys))
+                 for cls, keys in schemas]
+        stack = []
+        push = stack.append
+        memo = []
+        for op in ops:
+            if op == _OP_DATA:
+                j = next(ints)
+                push(datas[j][next(ints)])
+            elif op == _OP_FLOAT:
+                push(floats[fpos])
+                fpos += 1
+            elif op == _OP_NODE:
+                cls, keys, n, setters = nodes[next(ints)]
+                obj = cls.__new__(cls)
+                if setters is not None:
+                    if n:
+                        for setter, v in zip(setters, stack[-n:]):
+                            setter(obj, v)
+                        del stack[-n:]
+                elif n:
+                    obj.__setstate__(dict(zip(keys, stack[-n:])))
+                    del stack[-n:]
+                else:
+                    obj.__setstate__({})
+                memo.append(obj)
+                push(obj)
+            elif op == _OP_FLOATS:
+                n = next(ints)
+                push(floats[fpos:fpos+n])
+                fpos += n
+            elif op == _OP_INT:
+                push(next(ints))
+            elif op == _OP_OBJECT:
+                push(objects[next(ints)])
+            elif op == _OP_LIST or op == _OP_TUPLE:
+                n = next(ints)
+                items = stack[len(stack)-n:]
+                del stack[len(stack)-n:]
+                push(items if op == _OP_LIST else tuple(items))
+            elif op == _OP_MEMO:
+                push(memo[next(ints)])
+            elif op == _OP_NONE:
+                push(None)
+            elif op == _OP_TRUE:
+                push(True)
+            elif op == _OP_FALSE:
+                push(False)
+            else:
+                raise ValueError("Invalid opcode in serialized model "
+                                 "stream: %s" % (op,))
+        start = 0
+        for column in self.pending:
+            column.values = stack[start:start+column.n]
+            start += column.n
+        if start != len(stack):
+            raise ValueError("Inconsistent serialized model stream")
+
+
+def _read(stream, n):
+    buf = stream.read(n)
+    if len(buf) != n:
+        raise ValueError("Unexpected end of serialized model stream")
+    return buf
+
+def _resolve(column):
+    if type(column) is tuple:
+        return list(zip(*[_resolve(c) for c in column]))
+    elif type(column) is _PendingColumn:
+        return column.values
+    return column
+
+def load_model(stream):
+    """
+    Read a model written by dump_model() from a binary file-like
+    object.
+    """
+    # The cyclic garbage collector is disabled while the model is
+    # loaded, as the allocations of the data objects of a large model
+    # would otherwise trigger repeated (and useless) collections.
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _load_model(stream)
+    finally:
+        if enabled:
+            gc.enable()
+
+def _load_model(stream):
+    magic, version, byteorder = _header.unpack(_read(stream, _header.size))
+    if magic != MAGIC:
+        raise ValueError("The stream does not contain a serialized "
+                         "Pyomo model")
+    if version != FORMAT_VERSION:
+        raise ValueError("Unsupported serialized model format version "
+                         "%s (expected %s)" % (version, FORMAT_VERSION))
+    reader = _Reader(stream, byteorder != _byteorder)
+
+    dicts = {}
+    shells = {}
+    def persistent_load(pid):
+        if pid[0] == 'D':
+            return dicts.setdefault(pid[1], {})
+        # A data object referenced by the skeleton: its slots are
+        # assigned with the slots of the other data objects
+        key = pid[1:3]
+        obj = shells.get(key)
+        if obj is None:
+            obj = shells[key] = pid[3].__new__(pid[3])
+        return obj
+
+    unpickler = pickle.Unpickler(BytesIO(reader.read_block()))
+    unpickler.persistent_load = persistent_load
+    model, detached, objects, schemas = unpickler.load()
+    del unpickler
+    component_shells = {}
+    for (j, i), obj in iteritems(shells):
+        component_shells.setdefault(j, []).append((i, obj))
+
+    # Create the data objects, and assign the slots stored in typed
+    # arrays (the other slots are assigned after the postfix stream
+    # is read, as it refers to the data objects)
+    datas = []
+    columns = []
+    for j, (component, cls, slots) in enumerate(detached):
+        n = reader.read_array(_int_code)[0]
+        keys = reader.read_column(n, objects)
+        if cls is None:
+            datas.append(None)
+            columns.append((keys, reader.read_column(n, objects)))
+            continue
+        new = cls.__new__
+        objs = [new(cls) for i in xrange(n)]
+        for i, obj in component_shells.get(j, ()):
+            objs[i] = obj
+        _set = _slot_setter(cls, '_component')
+        list(map(_set, objs, repeat(weakref_ref(component), n)))
+        slot_columns = []
+        for slot in slots:
+            column = reader.read_column(n, objects)
+            if type(column) is _PendingColumn:
+                slot_columns.append((slot, column))
+            else:
+                list(map(_slot_setter(cls, slot), objs, column))
+        datas.append(objs)
+        columns.append((keys, slot_columns))
+
+    reader.read_stream(datas, objects, schemas)
+
+    for j, (component, cls, slots) in enumerate(detached):
+        keys, values = columns[j]
+        objs = datas[j]
+        if objs is None:
+            objs = _resolve(values)
+        else:
+            for slot, column in values:
+                list(map(_slot_setter(cls, slot), objs, column.values))
+        dicts.setdefault(j, {}).update(zip(_resolve(keys), objs))
+    return model
+
+def loads_model(data):
+    """
+    Return the model serialized in a bytes object by dumps_model().
+    """
+    return load_model(BytesIO(data))
@@ -18,6 +18,7 @@ import sys
 import types
 import copy
 import itertools
+from bisect import bisect_left, bisect_right
 from weakref import ref as weakref_ref
 
 from pyutilib.misc import flatten_tuple as pyutilib_misc_flatten_tuple
@@ -105,11 +106,248 @@ def simple_set_rule( fn ):
     return wrapper_function
 
 
+class _SortedList(object):
+    """
+    A list of values that is kept sorted by a key function.
+
+    The values are stored in a list of blocks, and the lengths of the
+    blocks are summed by a Fenwick (binary indexed) tree.  This allows
+    values to be added, removed, located and indexed by position in
+    O(log n) time (plus the time to shift the values of one block).
+    Values with equal keys are kept in the order they were added.
+    """
+
+    __slots__ = ('_key', '_blocks', '_keys', '_maxes', '_tree', '_len')
+
+    # The number of values in a block.  A block is split when it holds
+    # twice this number of values.
+    _load = 512
+
+    def __init__(self, values=(), key=None):
+        self._key = key
+        self._reset(sorted(values, key=key))
+
+    def __getstate__(self):
+        """
+        This method must be defined because this class uses slots.
+        """
+        return (self._key, list(self))
+
+    def __setstate__(self, state):
+        self._key = state[0]
+        self._reset(state[1])
+
+    def _reset(self, values):
+        """
+        Rebuild the blocks from a sorted list of values.
+        """
+        load = self._load
+        self._blocks = [values[i:i+load] for i in xrange(0,len(values),load)]
+        if self._key is None:
+            # The values are their own keys
+            self._keys = self._blocks
+        else:
+            key = self._key
+            self._keys = [[key(val) for val in block] for block in self._blocks]
+        self._maxes = [keys[-1] for keys in self._keys]
+        self._len = len(values)
+        self._build_tree()
+
+    def _build_tree(self):
+        """
+        Rebuild the Fenwick tree of the block lengths.
+        """
+        tree = [len(block) for block in self._blocks]
+        n = len(tree)
+        for i in xrange(n):
+            j = i | (i+1)
+            if j < n:
+                tree[j] += tree[i]
+        self._tree = tree
+
+    def _update_tree(self, b, delta):
+        """
+        Add delta to the length of block b in the Fenwick tree.
+        """
+        tree = self._tree
+        n = len(tree)
+        while b < n:
+            tree[b] += delta
+            b |= b+1
+
+    def _position(self, b, i):
+        """
+        Return the position of the i-th value of block b.
+        """
+        tree = self._tree
+        while b:
+            i += tree[b-1]
+            b &= b-1
+        return i
+
+    def _locate(self, pos):
+        """
+        Return the block, and the index in that block, of the value at
+        a (valid, non-negative) position.
+        """
+        tree = self._tree
+        n = len(tree)
+        b = 0
+        bit = 1 << (n.bit_length()-1)
+        while bit:
+            j = b + bit
+            if j <= n and tree[j-1] <= pos:
+                pos -= tree[j-1]
+                b = j
+            bit >>= 1
+        return b, pos
+
+    def _find(self, val, key):
+        """
+        Return the block, and the index in that block, of a value (or
+        None if the value is not in the list).
+        """
+        blocks = self._blocks
+        keys = self._keys
+        n = len(blocks)
+        b = bisect_left(self._maxes, key)
+        if b == n:
+            return None
+        i = bisect_left(keys[b], key)
+        while b < n:
+            block = blocks[b]
+            block_keys = keys[b]
+            while i < len(block):
+                if block_keys[i] != key:
+                    return None
+                if block[i] == val:
+                    return b, i
+                i += 1
+            b += 1
+            i = 0
+        return None
+
+    def add(self, val):
+        """
+        Add a value, and return its key.
+        """
+        key = val if self._key is None else self._key(val)
+        if not self._len:
+            self._reset([val])
+            return key
+        maxes = self._maxes
+        b = bisect_right(maxes, key)
+        if b == len(maxes):
+            b -= 1
+        block_keys = self._keys[b]
+        i = bisect_right(block_keys, key)
+        self._blocks[b].insert(i, val)
+        if self._key is not None:
+            block_keys.insert(i, key)
+        maxes[b] = block_keys[-1]
+        self._len += 1
+        if len(block_keys) > 2*self._load:
+            #
+            # Split the block
+            #
+            load = self._load
+            for lists in ((self._blocks,) if self._key is None
+                          else (self._blocks, self._keys)):
+                tmp = lists[b]
+                lists[b:b+1] = [tmp[:load], tmp[load:]]
+            maxes[b:b+1] = [self._keys[b][-1], self._keys[b+1][-1]]
+            self._build_tree()
+        else:
+            self._update_tree(b, 1)
+        return key
+
+    def remove(self, val):
+        """
+        Remove a value.  A ValueError is raised if the value is not
+        in the list.
+        """
+        loc = self._find(val, val if self._key is None else self._key(val))
+        if loc is None:
+            raise ValueError("%s is not in the list" % (val,))
+        b, i = loc
+        del self._blocks[b][i]
+        if self._key is not None:
+            del self._keys[b][i]
+        self._len -= 1
+        if self._keys[b]:
+            self._maxes[b] = self._keys[b][-1]
+            self._update_tree(b, -1)
+        else:
+            del self._blocks[b]
+            if self._key is not None:
+                del self._keys[b]
+            del self._maxes[b]
+            self._build_tree()
+
+    def index(self, val):
+        """
+        Return the (0-based) position of a value.  A ValueError is
+        raised if the value is not in the list.
+        """
+        loc = self._find(val, val if self._key is None else self._key(val))
+        if loc is None:
+            raise ValueError("%s is not in the list" % (val,))
+        return self._position(*loc)
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        return itertools.chain.from_iterable(self._blocks)
+
+    def __reversed__(self):
+        for block in reversed(self._blocks):
+            for val in reversed(block):
+                yield val
+
+    def __contains__(self, val):
+        return self._find(
+            val, val if self._key is None else self._key(val)) is not None
+
+    def __getitem__(self, idx):
+        if type(idx) is slice:
+            return list(self)[idx]
+        if idx < 0:
+            idx += self._len
+        if idx < 0 or idx >= self._len:
+            raise IndexError("list index out of range")
+        b, i = self._locate(idx)
+        return self._blocks[b][i]
+
+    def __eq__(self, other):
+        if isinstance(other, (list, _SortedList)):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        ans = self.__eq__(other)
+        if ans is NotImplemented:
+            return ans
+        return not ans
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self))
+
+
 # A trivial class that we can use to test if an object is a "legitimate"
 # set (either SimpleSet, or a member of an IndexedSet)
 class _SetDataBase(ComponentData):
     __slots__ = tuple()
 
+    def _set_version(self):
+        """
+        Return a value that changes whenever the elements of this set
+        change, or None if the changes cannot be tracked.
+        """
+        return self._version
+
 
 class _SetData(_SetDataBase):
     """
@@ -122,9 +360,10 @@ class _SetData(_SetDataBase):
     Public Class Attributes:
         value       The set values
         _bounds     The tuple of bound values
+        _version    A counter of the changes to the set values
     """
 
-    __slots__ = ('value', '_bounds')
+    __slots__ = ('value', '_bounds', '_version')
 
     def __init__(self, owner, bounds):
         #
@@ -133,6 +372,7 @@ class _SetData(_SetDataBase):
         #
         self._component = weakref_ref(owner)
         #
+        self._version = 0
         self._clear()
         self._bounds = bounds
 
@@ -181,6 +421,7 @@ class _SetData(_SetDataBase):
         Reset the set data
         """
         self.value = set()
+        self._version += 1
 
     def _add(self, val, verify=True):
         """
@@ -191,6 +432,7 @@ class _SetData(_SetDataBase):
         if verify:
             self._component()._verify(val)
         self.value.add(val)
+        self._version += 1
 
     def _discard(self, val):
         """
@@ -198,6 +440,7 @@ class _SetData(_SetDataBase):
         if the element does not already exist.
         """
         self.value.discard(val)
+        self._version += 1
 
     def __len__(self):
         """
@@ -227,10 +470,16 @@ class _OrderedSetData(_SetDataBase):
         bounds      A tuple of bounds for set values: (lower, upper)
     
     Public Class Attributes:
-        value       The set values
+        value       The set values.  The values of a sorted set are
+                        stored in a _SortedList, which keeps them in
+                        order as they are added.
         _bounds     The tuple of bound values
-        order_dict  A dictionary that maps from element value to element id.
-                        Indices in this dictionary start with 1 (not 0).
+        order_dict  A dictionary that maps from element value to a key
+                        that sorts the elements in the set order: the
+                        element id for an insertion-ordered set, and
+                        the sort key for a sorted set.  The element ids
+                        start with 0 (not 1).
+        _version    A counter of the changes to the set values
 
     The ordering supported in this class depends on the 'ordered' attribute
     of the owning component:
@@ -243,7 +492,7 @@ class _OrderedSetData(_SetDataBase):
                                 if the discard method is used.
     """
 
-    __slots__ = ('value', 'order_dict', '_bounds', '_is_sorted')
+    __slots__ = ('value', 'order_dict', '_bounds', '_is_sorted', '_version')
 
     def __init__(self, owner, bounds):
         #
@@ -257,6 +506,7 @@ class _OrderedSetData(_SetDataBase):
             self._is_sorted = 0 
         else:
             self._is_sorted = 1
+        self._version = 0
         self._clear()
 
     def __getstate__(self):
@@ -289,25 +539,43 @@ class _OrderedSetData(_SetDataBase):
         """
         return set(self.value)
 
+    def _sort_key(self):
+        """
+        Return the key function that sorts the set (None for the
+        Python ordering of the set values).
+        """
+        _sorter = self.parent_component().ordered
+        return None if _sorter is Set.SortedOrder else _sorter
+
     def _sort(self):
         """
         Sort the set using the 'ordered' attribute of the owning
-        component.  This recreates the order_dict dictionary, which indicates
-        that the set is sorted.
+        component.  This recreates the order_dict dictionary, and the
+        set is sorted from then on.
+
+        Note that the values of a sorted set are kept in order as
+        they are added, so this is only needed to (re)sort a set after
+        its 'ordered' attribute is changed.
         """
-        _sorter = self.parent_component().ordered
-        self.value = sorted(self.value, key=None if _sorter is Set.SortedOrder else _sorter)
-        self.order_dict = dict((j,i) for i,j in enumerate(self.value))
+        _key = self._sort_key()
+        self.value = _SortedList(self.value, key=_key)
+        if _key is None:
+            self.order_dict = dict((j,j) for j in self.value)
+        else:
+            self.order_dict = dict((j,_key(j)) for j in self.value)
         self._is_sorted = 1
+        self._version += 1
 
     def _clear(self):
         """
         Reset the set data
         """
-        self.value = []
-        self.order_dict = {}
         if self._is_sorted:
-            self._is_sorted = 1
+            self.value = _SortedList(key=self._sort_key())
+        else:
+            self.value = []
+        self.order_dict = {}
+        self._version += 1
 
     def _add(self, val, verify=True):
         """
@@ -317,10 +585,12 @@ class _OrderedSetData(_SetDataBase):
         """
         if verify:
             self._component()._verify(val)
-        self.order_dict[val] = len(self.value)
-        self.value.append(val)
         if self._is_sorted:
-            self._is_sorted = 2
+            self.order_dict[val] = self.value.add(val)
+        else:
+            self.order_dict[val] = len(self.value)
+            self.value.append(val)
+        self._version += 1
 
     def _discard(self, val):
         """
@@ -331,6 +601,10 @@ class _OrderedSetData(_SetDataBase):
             _id = self.order_dict.pop(val)
         except KeyError:
             return
+        self._version += 1
+        if self._is_sorted:
+            self.value.remove(val)
+            return
         del self.value[_id]
         #
         # Update the order_dict: this assumes the user-specified sorter
@@ -349,8 +623,6 @@ class _OrderedSetData(_SetDataBase):
         """
         Return an iterator for the set.
         """
-        if self._is_sorted == 2:
-            self._sort()
         return self.value.__iter__()
 
     def __contains__(self, val):
@@ -363,16 +635,12 @@ class _OrderedSetData(_SetDataBase):
         """
         Return the first element of the set.
         """
-        if self._is_sorted == 2:
-            self._sort()
         return self[1]
 
     def last(self):
         """
         Return the last element of the set.
         """
-        if self._is_sorted == 2:
-            self._sort()
         return self[len(self)]
 
     def __getitem__(self, idx):
@@ -382,8 +650,6 @@ class _OrderedSetData(_SetDataBase):
         The public Set API is 1-based, even though the
         internal order_dict is (pythonically) 0-based.
         """
-        if self._is_sorted == 2:
-            self._sort()
         if idx >= 1:
             if idx > len(self):
                 raise IndexError("Cannot index a RangeSet past the last element")
@@ -401,13 +667,21 @@ class _OrderedSetData(_SetDataBase):
         Return the position index of the input value.  The 
         position indices start at 1.
         """
-        if self._is_sorted == 2:
-            self._sort()
         try:
-            return self.order_dict[match_element] + 1
+            _id = self.order_dict[match_element]
+            if self._is_sorted:
+                _id = self.value.index(match_element)
+            return _id + 1
         except IndexError:
             raise IndexError("Unknown input element="+str(match_element)+" provided as input to ord() method for set="+self.cname(True))
 
+    def _position_key(self):
+        """
+        Return a function that maps the elements of this set to keys
+        that sort them in the set order.
+        """
+        return self.order_dict.__getitem__
+
     def next(self, match_element, k=1):
         """
         Return the next element in the set.  The default behavior is to
@@ -1318,6 +1592,13 @@ class SetOf(SimpleSet):
         the data associated with a concrete set.
         """ 
         return element in self._elements
+
+    def _set_version(self):
+        """
+        The elements are external data, so changes to them cannot be
+        tracked.
+        """
+        return None
         
     def data(self):
         """
@@ -1365,13 +1646,59 @@ class _SetOperator(SimpleSet):
         # deal with multiple indexing arguments.
         #
         self._implicit_subsets = [self._setA, self._setB]
+        #
+        # The elements of the set, and the version of the operand sets
+        # they were computed from.  The elements are cached by len(),
+        # and by a membership test if the operand sets did not change
+        # since the last test (so that sets that are tested while they
+        # are built do not recompute them each time).
+        #
+        self._members = None
+        self._members_version = None
+        self._tested_version = None
+
+    def __getstate__(self):
+        """
+        The cached elements are not pickled (or copied).
+        """
+        state = super(_SetOperator, self).__getstate__()
+        state['_members'] = None
+        state['_members_version'] = None
+        state['_tested_version'] = None
+        return state
 
     def construct(self, values=None):
         """ Disabled construction method """
         pass
 
+    def _set_version(self):
+        """
+        Return the versions of the operand sets, or None if the changes
+        to one of them cannot be tracked.
+        """
+        versionA = self._setA._set_version()
+        if versionA is None:
+            return None
+        versionB = self._setB._set_version()
+        if versionB is None:
+            return None
+        return (versionA, versionB)
+
+    def _cached_members(self, version):
+        """
+        Return a frozenset of the elements of this set, which is
+        recomputed when the version of the operand sets changes.
+        """
+        if self._members_version != version:
+            self._members = frozenset(self)
+            self._members_version = version
+        return self._members
+
     def __len__(self):
         """The number of items in the set."""
+        version = self._set_version()
+        if version is not None:
+            return len(self._cached_members(version))
         ctr = 0
         for i in self:
             ctr += 1
@@ -1382,6 +1709,18 @@ class _SetOperator(SimpleSet):
         raise IOError("Undefined set iterator")
 
     def _set_contains(self, element):
+        version = self._set_version()
+        if version is not None:
+            if self._members_version == version or \
+                   self._tested_version == version:
+                return element in self._cached_members(version)
+            self._tested_version = version
+        return self._operator_contains(element)
+
+    def _operator_contains(self, element):
+        """
+        Test if an element is in this set, using the operand sets.
+        """
         raise IOError("Undefined set operation")
         
     def data(self):
@@ -1401,7 +1740,7 @@ class _SetUnion(_SetOperator):
             if not elt in self._setA:
                 yield elt
 
-    def _set_contains(self, elt):
+    def _operator_contains(self, elt):
         return elt in self._setA or elt in self._setB
     
 
@@ -1415,7 +1754,7 @@ class _SetIntersection(_SetOperator):
             if elt in self._setB:
                 yield elt
 
-    def _set_contains(self, elt):
+    def _operator_contains(self, elt):
         return elt in self._setA and elt in self._setB
     
 
@@ -1429,7 +1768,7 @@ class _SetDifference(_SetOperator):
             if not elt in self._setB:
                 yield elt
 
-    def _set_contains(self, elt):
+    def _operator_contains(self, elt):
         return elt in self._setA and not elt in self._setB
     
 
@@ -1446,7 +1785,7 @@ class _SetSymmetricDifference(_SetOperator):
             if not elt in self._setA:
                 yield elt
 
-    def _set_contains(self, elt):
+    def _operator_contains(self, elt):
         return (elt in self._setA) ^ (elt in self._setB)
     
 
@@ -1489,11 +1828,45 @@ class _SetProduct(_SetOperator):
             for i in itertools.product(*self.set_tuple):
                 yield pyutilib_misc_flatten_tuple(i)
 
+    def _set_version(self):
+        """
+        Return the versions of the sets in the product, or None if the
+        changes to one of them cannot be tracked.
+        """
+        ans = []
+        for _set in self.set_tuple:
+            version = _set._set_version()
+            if version is None:
+                return None
+            ans.append(version)
+        return tuple(ans)
+
     def _set_contains(self, element):
         # Do we really need to check if element is a tuple???
         # if type(element) is not tuple:
         #    return False
         try:
+            if self._flat:
+                #
+                # Fast path for products of sets of dimension 1
+                #
+                if len(element) != len(self.set_tuple):
+                    return False
+                for subset, val in zip(self.set_tuple, element):
+                    if not subset._set_contains(val):
+                        return False
+                return True
+            if self._slices is not None:
+                #
+                # Fast path for products of fixed-dimension sets
+                #
+                if len(element) != self.dimen:
+                    return False
+                for subset, i, j in self._slices:
+                    if not subset._set_contains(
+                            element[i] if j is None else element[i:j]):
+                        return False
+                return True
             ctr = 0
             for subset in self.set_tuple:
                 d = subset.dimen
@@ -1501,10 +1874,20 @@ class _SetProduct(_SetOperator):
                     if not subset._set_contains(element[ctr]):
                         return False
                 elif d is None:
-                    for dlen in range(len(element), ctr, -1):
-                        if subset._set_contains(element[ctr:dlen]):
+                    if self._unknown_dimen == 1:
+                        #
+                        # The dimension of the only subset of unknown
+                        # dimension is fixed by the element length
+                        #
+                        dlen = len(element) - self._known_dimen + ctr
+                        if dlen > ctr and \
+                               subset._set_contains(element[ctr:dlen]):
                             d = dlen - ctr
-                            break
+                    else:
+                        for dlen in range(len(element), ctr, -1):
+                            if subset._set_contains(element[ctr:dlen]):
+                                d = dlen - ctr
+                                break
                     if d is None:
                         if subset._set_contains(element[ctr]):
                             d = 1
@@ -1527,14 +1910,30 @@ class _SetProduct(_SetOperator):
         return ans
 
     def _compute_dimen(self):
+        #
+        # Also compute the data used by _set_contains(): the slices of
+        # the elements that are tested for membership in each subset
+        # (if the dimensions of all subsets are known), the number of
+        # subsets of unknown dimension, and the sum of the known
+        # dimensions.
+        #
         ans=0
+        slices = []
+        self._unknown_dimen = 0
         for _set in self.set_tuple:
             if _set.dimen is None:
-                self.dimen=None
-                return
+                self._unknown_dimen += 1
+                slices = None
             else:
+                if slices is not None:
+                    slices.append((_set, ans,
+                                   None if _set.dimen == 1
+                                   else ans+_set.dimen))
                 ans += _set.dimen
-        self.dimen = ans
+        self._known_dimen = ans
+        self._slices = slices
+        self._flat = self.is_flat_product()
+        self.dimen = None if self._unknown_dimen else ans
 
     def is_flat_product(self):
         """
@@ -1548,6 +1947,31 @@ class _SetProduct(_SetOperator):
                 return False
         return True
 
+    def _position_key(self):
+        """
+        Return a function that maps the elements of this set to keys
+        that sort them in the set order, or None if one of the sets in
+        the product cannot provide one.
+        """
+        keys = []
+        for _set in self.set_tuple:
+            _key = getattr(_set, '_position_key', None)
+            _key = _key() if _key is not None else None
+            if _key is None or _set.dimen is None:
+                return None
+            keys.append((_key, _set.dimen))
+        if self.is_flat_product():
+            keys = [_key for _key, d in keys]
+            return lambda x: tuple(_key(v) for _key, v in zip(keys, x))
+        def _product_key(x):
+            ans = []
+            ctr = 0
+            for _key, d in keys:
+                ans.append(_key(x[ctr] if d == 1 else x[ctr:ctr+d]))
+                ctr += d
+            return tuple(ans)
+        return _product_key
+
     def _verify(self, element):
         """
         If this set is virtual, then an additional check is made
@@ -1635,7 +2059,7 @@ class IndexedSet(Set):
         # Create a _SetData object if one doesn't already exist
         #
         if key in self._data:
-            self._data[key].value.clear()
+            self._data[key]._clear()
         else:
             self._data[key] = self._SetData(self, self._bounds)
         #
@@ -10,7 +10,7 @@
 __all__ = ['SymbolMap', 'symbol_map_from_instance']
 
 from weakref import ref as weakref_ref
-from six import iteritems, iterkeys
+from six import iteritems, iterkeys, string_types
 from pyomo.core.base.label import TextLabeler
 
 
@@ -61,6 +61,11 @@ def symbol_map_from_instance(instance):
     #
     return symbol_map
 
+# A weakref whose object no longer exists (for the symbols removed
+# from the indexed symbols of a symbol map)
+def _dead_ref():
+    return None
+
 #
 # A symbol map is a mechanism for tracking assigned labels (e.g., for
 # use when writing problem files for input to an optimizer) for objects
@@ -69,6 +74,14 @@ def symbol_map_from_instance(instance):
 # A symbol map should never be pickled.  This class is constructed
 # by solvers and writers, and it owned by models.
 #
+# Writers that label objects with a prefix and a dense integer id
+# (e.g., v0, v1, ... in NL files) can add them with
+# addIndexedSymbols. Those symbols are stored as one list of object
+# weakrefs per prefix: getObject() maps a symbol back to its object by parsing
+# the integer id, and the symbol strings (and the byObject and
+# bySymbol entries) are only generated if byObject or bySymbol is
+# accessed.
+#
 class SymbolMap(object):
 
     class UnknownSymbol:
@@ -80,9 +93,78 @@ class SymbolMap(object):
         # bySymbol:  string -> object weakref
         # alias:     string -> object weakref
         #
-        self.byObject = {}
-        self.bySymbol = {}
+        self._byObject = {}
+        self._bySymbol = {}
         self.aliases = {}
+        #
+        # indexed:   prefix -> list of object weakrefs (the symbol of
+        #            the i-th object is prefix+str(i))
+        #
+        self._indexed = {}
+        # the prefixes whose symbols are not in byObject and bySymbol
+        self._unexpanded = []
+
+    @property
+    def byObject(self):
+        if self._unexpanded:
+            self._expand_indexed_symbols()
+        return self._byObject
+    @byObject.setter
+    def byObject(self, val):
+        self._byObject = val
+
+    @property
+    def bySymbol(self):
+        if self._unexpanded:
+            self._expand_indexed_symbols()
+        return self._bySymbol
+    @bySymbol.setter
+    def bySymbol(self, val):
+        self._bySymbol = val
+
+    def _expand_indexed_symbols(self):
+        """
+        Generate the byObject and bySymbol entries for the symbols
+        added with addIndexedSymbols.
+        """
+        for prefix in self._unexpanded:
+            refs = self._indexed[prefix]
+            symbols = [prefix + str(i) for i in range(len(refs))]
+            self._byObject.update(
+                (id(ref_()), symb_) for ref_, symb_ in zip(refs, symbols)
+                if ref_() is not None)
+            self._bySymbol.update(zip(symbols, refs))
+        self._unexpanded = []
+
+    def _getIndexedPosition(self, symbol):
+        """
+        Return the tuple (refs, index) for a symbol added with
+        addIndexedSymbols, where refs[index] is the weakref to its
+        object, or None if there is no such symbol.
+        """
+        if not isinstance(symbol, string_types):
+            return None
+        for prefix, refs in iteritems(self._indexed):
+            if not symbol.startswith(prefix):
+                continue
+            index = symbol[len(prefix):]
+            # only the canonical form of the integer (e.g., not v01)
+            if index.isdigit() and (index[0] != '0' or index == '0'):
+                index = int(index)
+                if index < len(refs):
+                    return refs, index
+        return None
+
+    def _getIndexedObject(self, symbol):
+        """
+        Return the object added with addIndexedSymbols for a symbol,
+        or None if there is no such object.
+        """
+        position = self._getIndexedPosition(symbol)
+        if position is None:
+            return None
+        refs, index = position
+        return refs[index]()
 
     def __getstate__(self):
         raise RuntimeError("ERROR: The SymbolMap class should never be pickled.")
@@ -104,6 +186,35 @@ class SymbolMap(object):
         self.byObject.update((id(obj_), symb_) for obj_,symb_ in tuples)
         self.bySymbol.update((symb_, weakref_ref(obj_)) for obj_,symb_ in tuples)
 
+    def addIndexedSymbols(self, prefix, objs):
+        """
+        Add the symbols prefix+str(i) for the objects in a sequence
+        (i is the position of the object in the sequence).
+
+        This method assumes that symbol names will not conflict, and
+        that it is called at most once for a prefix. The symbol strings
+        are not generated until they are needed (see the comment above
+        this class).
+        """
+        if prefix in self._indexed:
+            raise RuntimeError(
+                "Indexed symbols with prefix '%s' were already added "
+                "to the symbol map" % (prefix,))
+        self._indexed[prefix] = [weakref_ref(obj) for obj in objs]
+        self._unexpanded.append(prefix)
+
+    def getIndexedObjects(self, prefix):
+        """
+        Return the list of objects added with addIndexedSymbols for a
+        prefix (the object with symbol prefix+str(i) is at position
+        i, or None if it no longer exists), or None if no indexed
+        symbols were added for the prefix.
+        """
+        refs = self._indexed.get(prefix, None)
+        if refs is None:
+            return None
+        return [ref() for ref in refs]
+
     def createSymbol(self, obj, labeler, *args):
         """
         Create a symbol for an object with a given labeler.  No
@@ -157,6 +268,24 @@ class SymbolMap(object):
         self.byObject[obj_id] = symb
         return symb
 
+    def removeSymbol(self, obj):
+        """
+        Remove the symbol of an object, and return it (or None if the
+        object is not in the symbol map).  The aliases of the object
+        are not removed.
+        """
+        symb = self.byObject.pop(id(obj), None)
+        if symb is None:
+            return None
+        self._bySymbol.pop(symb, None)
+        if self._indexed:
+            position = self._getIndexedPosition(symb)
+            if position is not None:
+                refs, index = position
+                if refs[index]() is obj:
+                    refs[index] = _dead_ref
+        return symb
+
     def alias(self, obj, name):
         """
         Create an alias for an object.  An aliases are symbols that
@@ -185,9 +314,13 @@ class SymbolMap(object):
         """
         Return the object corresponding to a symbol
         """
-        if symbol in self.bySymbol:
-            return self.bySymbol[symbol]()
-        elif symbol in self.aliases:
+        if symbol in self._bySymbol:
+            return self._bySymbol[symbol]()
+        if self._indexed:
+            obj = self._getIndexedObject(symbol)
+            if obj is not None:
+                return obj
+        if symbol in self.aliases:
             return self.aliases[symbol]()
         else:
             return SymbolMap.UnknownSymbol
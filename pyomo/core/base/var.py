@@ -10,9 +10,11 @@
 __all__ = ['Var', '_VarData', 'VarList']
 
 import logging
+import array
 from weakref import ref as weakref_ref
 
-from pyomo.core.base.numvalue import NumericValue, value, is_fixed
+from pyomo.core.base.numvalue import (NumericValue, value, is_fixed,
+                                      native_numeric_types)
 from pyomo.core.base.set_types import BooleanSet, IntegerSet, RealSet, Reals
 from pyomo.core.base.component import ComponentData, register_component
 from pyomo.core.base.indexed_component import IndexedComponent, UnindexedComponent_set, normalize_index
@@ -21,9 +23,18 @@ from pyomo.core.base.sets import Set
 from pyomo.core.base.util import is_functor
 
 from six import iteritems, itervalues
+from six.moves import xrange
+
+try:
+    import numpy
+    numpy_available = True
+except ImportError:
+    numpy_available = False
 
 logger = logging.getLogger('pyomo.core')
 
+_nan = float('nan')
+
 class _VarData(ComponentData, NumericValue):
     """
     This class defines the data for a single variable.
@@ -411,6 +422,189 @@ class _GeneralVarData(_VarData):
 
     free = unfix
 
+class _ColumnarVarData(_VarData):
+    """
+    This class defines the data for a single variable of a Var
+    declared with columnar=True.
+
+    The value, bounds, domain and the fixed and stale flags of the
+    variable are stored in arrays on the owning Var (see
+    Var._add_columns), and this object only records its position in
+    those arrays. Values and numeric bounds are stored as floats, with
+    nan for None. Bounds that are not numbers (e.g., mutable
+    parameters) are stored in a dictionary on the owning Var.
+
+    Constructor Arguments:
+        position    The position of this variable in the arrays.
+        component   The Var object that owns this data.
+    """
+
+    __slots__ = ('_position',)
+
+    def __init__(self, position, component=None):
+        #
+        # These lines represent in-lining of the
+        # following constructors:
+        #   - _VarData
+        #   - ComponentData
+        #   - NumericValue
+        self._component = weakref_ref(component) if (component is not None) \
+                          else None
+        self._position = position
+
+    def __getstate__(self):
+        state = super(_ColumnarVarData, self).__getstate__()
+        for i in _ColumnarVarData.__slots__:
+            state[i] = getattr(self, i)
+        return state
+
+    @property
+    def value(self):
+        """Return the value for this variable."""
+        val = self._component()._col_value[self._position]
+        if val != val:
+            return None
+        return val
+    @value.setter
+    def value(self, val):
+        """Set the value for this variable."""
+        self._component()._col_value[self._position] = \
+            _nan if val is None else val
+
+    @property
+    def domain(self):
+        """Return the domain for this variable."""
+        return self._component()._col_domain[self._position]
+    @domain.setter
+    def domain(self, domain):
+        """Set the domain for this variable."""
+        if hasattr(domain, 'bounds'):
+            self._component()._col_domain[self._position] = domain
+        else:
+            raise ValueError(
+                "%s is not a valid domain. Variable domains must be an "
+                "instance of one of %s an object that declares a method "
+                "for bounds (like a Pyomo Set). Examples: NonNegativeReals, "
+                "Integers, Binary" % (domain, (RealSet, IntegerSet, BooleanSet)))
+
+    @property
+    def fixed(self):
+        """Return the fixed indicator for this variable."""
+        return bool(self._component()._col_fixed[self._position])
+    @fixed.setter
+    def fixed(self, val):
+        """Set the fixed indicator for this variable."""
+        self._component()._col_fixed[self._position] = bool(val)
+
+    @property
+    def stale(self):
+        """Return the stale indicator for this variable."""
+        return bool(self._component()._col_stale[self._position])
+    @stale.setter
+    def stale(self, val):
+        """Set the stale indicator for this variable."""
+        self._component()._col_stale[self._position] = bool(val)
+
+    def _get_bound(self, column, exprs):
+        bound = column[self._position]
+        if bound != bound:
+            if not exprs:
+                return None
+            bound = exprs.get(self._position)
+            if bound is None:
+                return None
+            return value(bound)
+        return bound
+
+    def _set_bound(self, column, exprs, val):
+        if val is None:
+            column[self._position] = _nan
+        elif val.__class__ in native_numeric_types:
+            column[self._position] = val
+        else:
+            column[self._position] = _nan
+            exprs[self._position] = val
+            return
+        if exprs:
+            exprs.pop(self._position, None)
+
+    @property
+    def lb(self):
+        """Return the lower bound for this variable."""
+        comp = self._component()
+        dlb, _ = comp._col_domain[self._position].bounds()
+        lb = self._get_bound(comp._col_lb, comp._col_lb_exprs)
+        if lb is None:
+            return dlb
+        elif dlb is None:
+            return lb
+        return max(lb, dlb)
+    @lb.setter
+    def lb(self, val):
+        raise AttributeError("Assignment not allowed. Use the setlb method")
+
+    @property
+    def ub(self):
+        """Return the upper bound for this variable."""
+        comp = self._component()
+        _, dub = comp._col_domain[self._position].bounds()
+        ub = self._get_bound(comp._col_ub, comp._col_ub_exprs)
+        if ub is None:
+            return dub
+        elif dub is None:
+            return ub
+        return min(ub, dub)
+    @ub.setter
+    def ub(self, val):
+        raise AttributeError("Assignment not allowed. Use the setub method")
+
+    def setlb(self, val):
+        """
+        Set the lower bound for this variable after validating that
+        the value is fixed (or None).
+        """
+        # Note: is_fixed(None) returns True
+        if is_fixed(val):
+            comp = self._component()
+            self._set_bound(comp._col_lb, comp._col_lb_exprs, val)
+        else:
+            raise ValueError(
+                "Non-fixed input of type '%s' supplied as variable lower "
+                "bound - legal types must be fixed expressions or variables."
+                % (type(val),))
+
+    def setub(self, val):
+        """
+        Set the upper bound for this variable after validating that
+        the value is fixed (or None).
+        """
+        # Note: is_fixed(None) returns True
+        if is_fixed(val):
+            comp = self._component()
+            self._set_bound(comp._col_ub, comp._col_ub_exprs, val)
+        else:
+            raise ValueError(
+                "Non-fixed input of type '%s' supplied as variable upper "
+                "bound - legal types are fixed expressions or variables."
+                % (type(val),))
+
+    def fix(self, *val):
+        """
+        Set the fixed indicator to True. Value argument is optional,
+        indicating the variable should be fixed at its current value.
+        """
+        if len(val) == 1:
+            self.value = val[0]
+        elif len(val) > 1:
+            raise TypeError("fix expected at most 1 arguments, got %d" % (len(val)))
+        self._component()._col_fixed[self._position] = True
+
+    def unfix(self):
+        """Sets the fixed indicator to False."""
+        self._component()._col_fixed[self._position] = False
+
+    free = unfix
+
 class Var(IndexedComponent):
     """
     A numeric variable, which may be defined over an index.
@@ -424,6 +618,15 @@ class Var(IndexedComponent):
                         existing model data
         rule        A function for declaring variables.
         dense       An option to specify that the variables are declared densely.
+                        If False, the variable data objects are created
+                        (and initialized) when they are first accessed.
+        columnar    An option to store the values, bounds, domains and
+                        fixed/stale flags of an indexed variable in
+                        arrays on the component (see _ColumnarVarData).
+                        This reduces the memory used per index and
+                        allows the bulk methods (get_values(as_array=True),
+                        set_values, set_bounds, fix_all, unfix_all) to
+                        operate on whole arrays.
     """
 
     def __new__(cls, *args, **kwds):
@@ -444,6 +647,7 @@ class Var(IndexedComponent):
         domain = kwd.pop('domain', domain )
         bounds = kwd.pop('bounds', None )
         self._dense = kwd.pop('dense', True )
+        columnar = kwd.pop('columnar', False )
 
         #
         # Initialize the base class
@@ -451,6 +655,26 @@ class Var(IndexedComponent):
         kwd.setdefault('ctype', Var)
         IndexedComponent.__init__(self, *args, **kwd)
         #
+        # Columnar storage (see _ColumnarVarData)
+        #
+        self._columnar = bool(columnar)
+        if self._columnar:
+            if not self.is_indexed():
+                raise ValueError(
+                    "The columnar option is only supported for indexed "
+                    "variables (declaring Var '%s')" % (self.cname(True),))
+            self._col_value = array.array('d')
+            self._col_lb = array.array('d')
+            self._col_ub = array.array('d')
+            self._col_fixed = array.array('B')
+            self._col_stale = array.array('B')
+            self._col_domain = []
+            self._col_lb_exprs = {}
+            self._col_ub_exprs = {}
+            # (number of data objects, number of columns, positions)
+            # for the order of keys(), see _column_positions
+            self._col_order = None
+        #
         # Determine if the domain argument is a functor or other object
         #
         self._domain_init_value = None
@@ -485,13 +709,36 @@ class Var(IndexedComponent):
         """
         Set the 'stale' attribute of every variable data object to True.
         """
+        if self._columnar:
+            n = len(self._col_stale)
+            self._col_stale[:] = array.array('B', [1]) * n
+            return
         for var_data in itervalues(self._data):
             var_data.stale = True
 
-    def get_values(self, include_fixed_values=True):
+    def get_values(self, include_fixed_values=True, as_array=False):
         """
         Return a dictionary of index-value pairs.
+
+        If as_array is True, the values are returned as an array of
+        floats in the order of keys(), with nan for variables that do
+        not have a value. This is a NumPy array if NumPy is available
+        and an array.array otherwise.
         """
+        if as_array:
+            if not include_fixed_values:
+                raise ValueError(
+                    "The include_fixed_values option can not be False "
+                    "when the values of Var '%s' are returned as an array"
+                    % (self.cname(True),))
+            if self._columnar:
+                return self._gather_column(self._col_value)
+            vals = array.array('d', (_nan if vardata.value is None
+                                     else vardata.value
+                                     for vardata in itervalues(self)))
+            if numpy_available:
+                return numpy.frombuffer(vals, dtype=numpy.float64).copy()
+            return vals
         if include_fixed_values:
             return dict((idx, vardata.value)
                             for idx, vardata in iteritems(self._data))
@@ -503,11 +750,188 @@ class Var(IndexedComponent):
         """
         Set the values of a dictionary.
 
+        The new values can also be given as a sequence (e.g., a list
+        or NumPy array) with one value for each variable in the order
+        of keys(), where nan or None indicates that the variable has
+        no value. The values are stored as floats.
+
         The default behavior is to validate the values in the
         dictionary.
         """
-        for index, new_value in iteritems(new_values):
-            self[index].set_value(new_value, valid)
+        if hasattr(new_values, 'keys'):
+            for index, new_value in iteritems(new_values):
+                self[index].set_value(new_value, valid)
+            return
+        if not valid:
+            for vardata, val in zip(itervalues(self), new_values):
+                if val is not None and val == val:
+                    vardata._valid_value(val)
+        new_values = self._as_float_array(new_values, "values")
+        if self._columnar:
+            self._scatter_column(self._col_value, new_values)
+            self._scatter_column(self._col_stale, None, 0)
+            return
+        for vardata, val in zip(itervalues(self), new_values):
+            vardata.value = None if val != val else float(val)
+            vardata.stale = False
+
+    def set_bounds(self, lb=None, ub=None):
+        """
+        Set the bounds of all variables.
+
+        The lower and upper bounds are given as sequences (e.g., a list
+        or NumPy array) with one value for each variable in the order
+        of keys(), where nan or None indicates that the variable is not
+        bounded. If lb or ub is None, those bounds are not changed.
+        """
+        for bounds, column, exprs, setter in (
+                (lb, '_col_lb', '_col_lb_exprs', 'setlb'),
+                (ub, '_col_ub', '_col_ub_exprs', 'setub')):
+            if bounds is None:
+                continue
+            bounds = self._as_float_array(bounds, "bounds")
+            if self._columnar:
+                self._scatter_column(getattr(self, column), bounds)
+                getattr(self, exprs).clear()
+                continue
+            for vardata, val in zip(itervalues(self), bounds):
+                getattr(vardata, setter)(None if val != val else float(val))
+
+    def fix_all(self, mask=None):
+        """
+        Fix the variables selected by mask (a sequence of booleans in
+        the order of keys()), or all variables if mask is None. The
+        values of the variables are not changed.
+        """
+        self._set_fixed(mask, True)
+
+    def unfix_all(self, mask=None):
+        """
+        Free the variables selected by mask (a sequence of booleans in
+        the order of keys()), or all variables if mask is None.
+        """
+        self._set_fixed(mask, False)
+
+    def _set_fixed(self, mask, fixed):
+        if mask is not None:
+            if len(mask) != len(self):
+                raise ValueError(
+                    "The mask for Var '%s' has %d entries (expected %d)"
+                    % (self.cname(True), len(mask), len(self)))
+        if self._columnar:
+            self._scatter_column(self._col_fixed, None, fixed, mask)
+            return
+        if mask is None:
+            for vardata in itervalues(self):
+                vardata.fixed = fixed
+        else:
+            for vardata, selected in zip(itervalues(self), mask):
+                if selected:
+                    vardata.fixed = fixed
+
+    def _as_float_array(self, vals, name):
+        """
+        Convert a sequence with one entry per variable into a NumPy
+        array (or a list if NumPy is not available) of floats, with
+        nan for None.
+        """
+        if len(vals) != len(self):
+            raise ValueError(
+                "The %s for Var '%s' have %d entries (expected %d)"
+                % (name, self.cname(True), len(vals), len(self)))
+        if numpy_available:
+            return numpy.array(vals, dtype=numpy.float64)
+        return [_nan if val is None else float(val) for val in vals]
+
+    def _column_positions(self):
+        """
+        Return the positions in the columnar arrays of the variables in
+        the order of keys(), or None if that is the order of the arrays.
+        """
+        ndata = len(self._data)
+        ncols = len(self._col_value)
+        if self._col_order is None or \
+           self._col_order[0] != ndata or \
+           self._col_order[1] != ncols:
+            positions = [vardata._position for vardata in itervalues(self)]
+            if ndata == ncols and \
+               all(i == position for i, position in enumerate(positions)):
+                positions = None
+            self._col_order = (ndata, ncols, positions)
+        return self._col_order[2]
+
+    def _gather_column(self, column):
+        """
+        Return a copy of a columnar array in the order of keys().
+        """
+        positions = self._column_positions()
+        if numpy_available:
+            vals = numpy.frombuffer(column, dtype=numpy.float64)
+            if positions is None:
+                return vals.copy()
+            return vals[positions]
+        if positions is None:
+            return array.array('d', column)
+        return array.array('d', (column[i] for i in positions))
+
+    def _scatter_column(self, column, vals, scalar=None, mask=None):
+        """
+        Assign vals (in the order of keys()) to a columnar array, or
+        assign scalar to the entries selected by mask.
+        """
+        positions = self._column_positions()
+        if numpy_available:
+            dtype = numpy.float64 if column.typecode == 'd' \
+                    else numpy.uint8
+            view = numpy.frombuffer(column, dtype=dtype)
+            if positions is None:
+                positions = slice(None)
+            else:
+                positions = numpy.array(positions, dtype=numpy.intp)
+            if vals is not None:
+                view[positions] = vals
+            elif mask is None:
+                view[positions] = scalar
+            else:
+                mask = numpy.array(mask, dtype=bool)
+                if positions.__class__ is slice:
+                    view[mask] = scalar
+                else:
+                    view[positions[mask]] = scalar
+            return
+        if positions is None:
+            positions = xrange(len(column))
+        if vals is not None:
+            for i, val in zip(positions, vals):
+                column[i] = val
+        elif mask is None:
+            for i in positions:
+                column[i] = scalar
+        else:
+            for i, selected in zip(positions, mask):
+                if selected:
+                    column[i] = scalar
+
+    def _add_columns(self, indices):
+        """
+        Create the data objects for a columnar variable and append
+        their (default) entries to the columnar arrays.
+        """
+        self_weakref = weakref_ref(self)
+        _data = self._data
+        start = position = len(self._col_value)
+        for ndx in indices:
+            cdata = _ColumnarVarData(position, component=None)
+            cdata._component = self_weakref
+            _data[ndx] = cdata
+            position += 1
+        n = position - start
+        self._col_value.extend(array.array('d', [_nan]) * n)
+        self._col_lb.extend(array.array('d', [_nan]) * n)
+        self._col_ub.extend(array.array('d', [_nan]) * n)
+        self._col_fixed.extend(array.array('B', [0]) * n)
+        self._col_stale.extend(array.array('B', [1]) * n)
+        self._col_domain.extend([Reals] * n)
 
     def __setitem__(self, ndx, val):
         """
@@ -559,6 +983,10 @@ class Var(IndexedComponent):
         if not self.is_indexed():
             self._data[None] = self
             self._initialize_members([None])
+        elif self._columnar:
+            if self._dense:
+                self._add_columns(self._index)
+                self._initialize_members(self._index)
         elif self._dense:
             # This loop is optimized for speed with pypy.
             # Calling dict.update((...) for ...) is roughly
@@ -582,7 +1010,11 @@ class Var(IndexedComponent):
     #
     def _default(self, idx):
         """Returns the default component data value."""
-        vardata = self._data[idx] = _GeneralVarData(Reals, component=self)
+        if self._columnar:
+            self._add_columns([idx])
+            vardata = self._data[idx]
+        else:
+            vardata = self._data[idx] = _GeneralVarData(Reals, component=self)
         self._initialize_members([idx])
         return vardata
 
@@ -906,9 +1338,7 @@ class VarList(IndexedVar):
         """Add a variable to this list."""
         self._nvars += 1
         self._index.add(self._nvars)
-        vardata = self._data[self._nvars] = _GeneralVarData(Reals, component=self)
-        self._initialize_members([self._nvars])
-        return vardata
+        return self._default(self._nvars)
 
 register_component(Var, "Decision variables.")
 register_component(VarList, "List of decision variables.")
@@ -14,14 +14,19 @@ from pyomo.core.base import IPyomoPresolveAction
 
 
 @pyomo.util.pyomo_api(namespace='pyomo.model')
-def simple_preprocessor(data, model=None):
+def simple_preprocessor(data, model=None, processes=None):
     """
     This plugin simply applies preprocess actions in a fixed order.
 
     Required:
         model:      A concrete model instance.
+
+    Optional:
+        processes:  The number of worker processes that compute the
+                    canonical representations of the constraints.
     """
-    pyomo.util.PyomoAPIFactory('pyomo.repn.compute_canonical_repn')(data, model=model)
+    pyomo.util.PyomoAPIFactory('pyomo.repn.compute_canonical_repn')(
+        data, model=model, processes=processes)
     #
     # Process the presolver actions
     #
@@ -26,6 +26,19 @@ class TestComponent(unittest.TestCase):
         except DeveloperError:
             pass
 
+    def test_data_slots(self):
+        # there is one data object per index, so these should not
+        # carry a __dict__
+        model = ConcreteModel()
+        model.x = Var([1,2])
+        model.p = Param([1,2], initialize=1, mutable=True)
+        model.c = Constraint([1,2], rule=lambda m, i: m.x[i] >= m.p[i])
+        model.o = Objective([1,2], rule=lambda m, i: m.x[i])
+        model.e = Expression([1,2], rule=lambda m, i: m.x[i])
+        for obj in (model.x[1], model.p[1], model.c[1],
+                    model.o[1], model.e[1]):
+            self.assertFalse(hasattr(obj, '__dict__'))
+
 
 class TestComponentUID(unittest.TestCase):
 
@@ -2983,5 +2983,24 @@ class ExpressionUtilities(unittest.TestCase):
         self.assertEqual( list(EXPR.identify_variables(m.a**m.a + m.a, allow_duplicates=True)), 
                           [ m.a, m.a, m.a,  ] )
 
+    def test_identify_mutable_parameters(self):
+        m = ConcreteModel()
+        m.I = RangeSet(2)
+        m.a = Param(initialize=1)
+        m.b = Param(m.I, initialize=1, mutable=True)
+        m.c = Param(initialize=1, mutable=True)
+        m.x = Var()
+        self.assertEqual( list(EXPR.identify_mutable_parameters(5)), [] )
+        self.assertEqual( list(EXPR.identify_mutable_parameters(m.a)), [] )
+        self.assertEqual( list(EXPR.identify_mutable_parameters(m.x)), [] )
+        self.assertEqual( list(EXPR.identify_mutable_parameters(m.b[1])),
+                          [ m.b[1] ] )
+        self.assertEqual( list(EXPR.identify_mutable_parameters(
+            m.a*m.x + m.b[1]*m.x**m.c)), [ m.b[1], m.c ] )
+        self.assertEqual( list(EXPR.identify_mutable_parameters(
+            m.c*m.x + m.c)), [ m.c ] )
+        self.assertEqual( list(EXPR.identify_mutable_parameters(
+            m.c*m.x + m.c, allow_duplicates=True)), [ m.c, m.c ] )
+
 if __name__ == "__main__":
     unittest.main()
@@ -23,6 +23,7 @@ import pyomo.opt
 from pyomo.opt import SolutionStatus
 from pyomo.opt.parallel.local import SolverManager_Serial
 from pyomo.environ import *
+from pyomo.core.base import expr as EXPR
 
 solver = pyomo.opt.load_solvers('glpk')
 
@@ -127,6 +128,47 @@ class Test(unittest.TestCase):
             self.assertEqual(id(y.vv.parent_block()), id(y))
             self.assertEqual(id(y.p.parent_block()), id(y))
 
+    def test_clone_expressions(self):
+        m = ConcreteModel()
+        m.I = Set(initialize=[(1,'a'), (2,'b')])
+        m.p = Param(m.I, initialize={(1,'a'): 1, (2,'b'): 2}, mutable=True)
+        m.x = Var(m.I, bounds=(0, 10), initialize=1)
+        m.y = Var(initialize=1)
+        m.c = Constraint(m.I, rule=lambda m, i, j:
+                         m.p[i,j]*m.x[i,j] + 2*m.y <= 5)
+        m.b = Block()
+        m.b.z = Var()
+        m.b.c = Constraint(expr=m.b.z + m.y >= 1)
+
+        n = m.clone()
+        for i in m.I:
+            self.assertIsNot(n.x[i], m.x[i])
+            self.assertIs(n.x[i].parent_component(), n.x)
+            self.assertEqual(n.x[i].value, 1)
+            self.assertEqual(n.x[i].ub, 10)
+            self.assertIsNot(n.c[i].body, m.c[i].body)
+            self.assertEqual(
+                sorted(id(v) for v in EXPR.identify_variables(n.c[i].body)),
+                sorted([id(n.x[i]), id(n.y)]))
+            self.assertEqual(
+                list(EXPR.identify_mutable_parameters(n.c[i].body)),
+                [ n.p[i] ])
+        # the index tuples are shared with the original model
+        for i, j in zip(sorted(m.x._data), sorted(n.x._data)):
+            self.assertIs(i, j)
+        n.x[1,'a'].value = 5
+        n.p[1,'a'] = 3
+        self.assertEqual(m.x[1,'a'].value, 1)
+        self.assertEqual(value(m.p[1,'a']), 1)
+        self.assertEqual(value(n.c[1,'a'].body), 17)
+
+        # components outside of a cloned block are not copied
+        b = m.b.clone()
+        self.assertIsNot(b.z, m.b.z)
+        self.assertEqual(
+            sorted(id(v) for v in EXPR.identify_variables(b.c.body)),
+            sorted([id(b.z), id(m.y)]))
+
     def test_clear_attribute(self):
         # Test coverage of the _clear_attribute method
         model = ConcreteModel()
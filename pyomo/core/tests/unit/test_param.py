@@ -211,8 +211,12 @@ class ParamTester(object):
         self.assertEqual( value(self.instance.A[idx]),
                           self.instance.A._default_val )
         if self.instance.A._mutable:
-            self.assertEqual( type(self.instance.A[idx]),
-                              pyomo.core.base.param._ParamData )
+            if type(self.instance.A._data) is dict:
+                self.assertEqual( type(self.instance.A[idx]),
+                                  pyomo.core.base.param._ParamData )
+            else:
+                self.assertEqual( type(self.instance.A[idx]),
+                                  pyomo.core.base.param._ParamProxyData )
         else:
             self.assertEqual(type(self.instance.A[idx]),
                              type(value(self.instance.A._default_val)))
@@ -223,8 +227,12 @@ class ParamTester(object):
                 self.fail("Expected setitem[%s] to fail for immutable Params"
                           % (idx,))
             self.assertEqual( self.instance.A[idx], 4.3)
-            self.assertEqual( type(self.instance.A[idx]),
-                              pyomo.core.base.param._ParamData )
+            if type(self.instance.A._data) is dict:
+                self.assertEqual( type(self.instance.A[idx]),
+                                  pyomo.core.base.param._ParamData )
+            else:
+                self.assertEqual( type(self.instance.A[idx]),
+                                  pyomo.core.base.param._ParamProxyData )
         except TypeError:
             # immutable Params should raise a TypeError exception
             if self.instance.A._mutable:
@@ -524,6 +532,29 @@ class ArrayParam_mutable_dense_intDefault_ruleInit\
         self.data = self.sparse_data
 
 
+class ArrayParam_mutable_compact_sparse_noDefault\
+          (ArrayParam_mutable_sparse_noDefault):
+
+    def setUp(self, **kwds):
+        ArrayParam_mutable_sparse_noDefault.setUp(self, compact=True, **kwds)
+
+
+class ArrayParam_mutable_compact_sparse_floatDefault\
+          (ArrayParam_mutable_sparse_floatDefault):
+
+    def setUp(self, **kwds):
+        ArrayParam_mutable_sparse_floatDefault.setUp(
+            self, compact=True, **kwds)
+
+
+class ArrayParam_mutable_compact_dense_intDefault_dictInit\
+          (ArrayParam_mutable_dense_intDefault_dictInit):
+
+    def setUp(self, **kwds):
+        ArrayParam_mutable_dense_intDefault_dictInit.setUp(
+            self, compact=True, **kwds)
+
+
 class ArrayParam_immutable_sparse_noDefault\
           (ParamTester, unittest.TestCase):
 
@@ -1710,5 +1741,179 @@ class MiscIndexedParamBehaviorTests(unittest.TestCase):
 assignTestsIndexedParamTests(MiscIndexedParamBehaviorTests,instrinsic_test_list)
 
 
+def _lazy_rule(model, i):
+    _lazy_rule.calls.append(i)
+    return 10*i
+_lazy_rule.calls = []
+
+class TestSparseParam(unittest.TestCase):
+
+    def setUp(self):
+        _lazy_rule.calls = []
+
+    def test_rule_immutable(self):
+        model = ConcreteModel()
+        model.A = Set(initialize=[1,2,3,4])
+        model.p = Param(model.A, initialize=_lazy_rule, dense=False)
+        # no values are created during construction
+        self.assertEqual(_lazy_rule.calls, [])
+        self.assertEqual(list(model.p.sparse_keys()), [])
+        # but all indices are valid
+        self.assertEqual(len(model.p), 0)
+        self.assertTrue(3 in model.p)
+        self.assertFalse(5 in model.p)
+        self.assertEqual(model.p[3], 30)
+        self.assertEqual(model.p[3], 30)
+        self.assertEqual(_lazy_rule.calls, [3])
+        self.assertEqual(list(model.p.sparse_keys()), [3])
+        # the iteration only covers the values that were accessed
+        self.assertEqual(len(model.p), 1)
+        self.assertEqual(list(model.p.values()), [30])
+        self.assertEqual(model.p[1], 10)
+        self.assertEqual(list(model.p.keys()), [1, 3])
+        self.assertEqual(_lazy_rule.calls, [3,1])
+        self.assertRaises(KeyError, model.p.__getitem__, 5)
+
+    def test_iteration(self):
+        # iterating over a sparse parameter does not initialize the
+        # values that were not accessed
+        model = ConcreteModel()
+        model.A = RangeSet(100)
+        model.p = Param(model.A, initialize=_lazy_rule, dense=False)
+        model.q = Param(model.A, initialize=_lazy_rule, dense=False,
+                        mutable=True, default=0)
+        model.p[50]
+        model.q[7]
+        for param in (model.p, model.q):
+            self.assertEqual(len(param._data), 1)
+            list(param.values())
+            list(param.iteritems())
+            list(model.component_data_objects(Param))
+            output = StringIO()
+            param.pprint(ostream=output)
+            param.display(ostream=output)
+            self.assertEqual(len(param._data), 1)
+            self.assertEqual(len(param), 1)
+        self.assertEqual(list(model.p.items()), [(50, 500)])
+        self.assertEqual(_lazy_rule.calls, [50, 7])
+
+    def test_rule_mutable(self):
+        model = ConcreteModel()
+        model.A = Set(initialize=[1,2,3,4])
+        model.p = Param(model.A, initialize=_lazy_rule, dense=False,
+                        mutable=True)
+        model.x = Var(model.A, initialize=1)
+        model.c = Constraint(expr=model.p[2]*model.x[2] >= 1)
+        self.assertEqual(list(model.p.sparse_keys()), [2])
+        self.assertEqual(value(model.c.body), 20)
+        model.p[2] = 5
+        model.p[4] = 7
+        self.assertEqual(value(model.p[2]), 5)
+        self.assertEqual(value(model.p[4]), 7)
+        self.assertEqual(_lazy_rule.calls, [2])
+        # reconstruct() reapplies the rule to the existing values
+        model.p.reconstruct()
+        self.assertEqual(sorted(model.p.sparse_keys()), [2,4])
+        self.assertEqual(value(model.p[2]), 20)
+        self.assertEqual(value(model.p[4]), 40)
+        self.assertEqual(value(model.p[1]), 10)
+
+    def test_scalar(self):
+        model = ConcreteModel()
+        model.A = Set(initialize=[1,2,3])
+        model.p = Param(model.A, initialize=1.5, dense=False)
+        model.q = Param(model.A, initialize=model.p[1], dense=False,
+                        mutable=True)
+        self.assertEqual(list(model.p.sparse_keys()), [1])
+        self.assertEqual(list(model.q.sparse_keys()), [])
+        self.assertEqual(list(model.p.values()), [1.5])
+        self.assertEqual([value(model.q[i]) for i in model.A],
+                         [1.5, 1.5, 1.5])
+
+    def test_dict(self):
+        # dictionary initializers are applied during construction
+        model = ConcreteModel()
+        model.A = Set(initialize=[1,2,3])
+        model.p = Param(model.A, initialize={1:1, 3:3}, dense=False)
+        self.assertEqual(sorted(model.p.sparse_keys()), [1,3])
+        self.assertEqual(len(model.p), 2)
+        self.assertFalse(2 in model.p)
+
+    def test_abstract(self):
+        model = AbstractModel()
+        model.A = Set(initialize=[1,2,3])
+        model.p = Param(model.A, initialize=_lazy_rule, dense=False)
+        instance = model.create_instance()
+        self.assertEqual(_lazy_rule.calls, [])
+        self.assertEqual(instance.p[2], 20)
+        self.assertEqual(_lazy_rule.calls, [2])
+
+
+class TestCompactParam(unittest.TestCase):
+
+    def _model(self):
+        model = ConcreteModel()
+        model.A = Set(initialize=[1,2,3])
+        model.p = Param(model.A, initialize=lambda m, i: 1.5*i,
+                        mutable=True, compact=True)
+        model.x = Var(model.A, initialize=1)
+        model.c = Constraint(model.A,
+                             rule=lambda m, i: m.p[i]*m.x[i] >= m.p[i])
+        return model
+
+    def test_storage(self):
+        model = self._model()
+        # the values are stored on the component
+        self.assertEqual(model.p._data._values, {1:1.5, 2:3.0, 3:4.5})
+        data = model.p[2]
+        self.assertTrue(isinstance(data, pyomo.core.base.param._ParamData))
+        self.assertFalse(hasattr(data, '__dict__'))
+        self.assertEqual(data.index(), 2)
+        self.assertEqual(data.cname(True), 'p[2]')
+        self.assertTrue(data.parent_component() is model.p)
+        self.assertEqual(sorted(model.p.keys()), [1,2,3])
+        self.assertEqual(sorted(value(v) for v in model.p.values()),
+                         [1.5, 3.0, 4.5])
+        self.assertEqual(model.p.extract_values(), {1:1.5, 2:3.0, 3:4.5})
+        output = StringIO()
+        model.p.pprint(ostream=output)
+        self.assertTrue('2 :   3.0' in output.getvalue())
+
+    def test_mutable(self):
+        model = self._model()
+        self.assertEqual(value(model.c[2].body), 3.0)
+        model.p[2] = 5
+        self.assertEqual(value(model.c[2].body), 5)
+        self.assertEqual(value(model.c[2].lower), 5)
+        model.p[2].value = 6
+        self.assertEqual(value(model.p[2]), 6)
+        self.assertEqual(model.p._data._values[2], 6)
+        model.p.store_values(2)
+        self.assertEqual(model.p.extract_values(), {1:2, 2:2, 3:2})
+        self.assertEqual(value(model.c[3].body), 2)
+
+    def test_default(self):
+        model = ConcreteModel()
+        model.A = Set(initialize=[1,2,3])
+        model.p = Param(model.A, initialize={1:1}, default=7,
+                        mutable=True, compact=True)
+        self.assertEqual(value(model.p[3]), 7)
+        model.p[3] = 8
+        self.assertEqual(model.p._data._values, {1:1, 3:8})
+        model.p.clear()
+        self.assertEqual(len(model.p._data), 0)
+
+    def test_clone(self):
+        model = self._model()
+        inst = model.clone()
+        inst.p[2] = 5
+        self.assertEqual(value(inst.c[2].body), 5)
+        self.assertEqual(value(model.c[2].body), 3.0)
+
+    def test_scalar(self):
+        model = ConcreteModel()
+        self.assertRaises(ValueError, Param, compact=True)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -13,6 +13,8 @@
 import pickle
 import os
 import sys
+from io import BytesIO
+from six import StringIO
 from os.path import abspath, dirname
 currdir = dirname(abspath(__file__))+os.sep
 
@@ -337,5 +339,86 @@ class Test(unittest.TestCase):
         
 
 
+def serialize_constraint_rule(model, i):
+    return model.p[i]*model.x[i,'a'] + model.e[i] + model.z <= model.q[i,'a']
+def serialize_expression_rule(model, i):
+    return model.x[i,'b']**2
+def serialize_block_rule(block, i):
+    block.v = Var([1,2], initialize=i)
+    block.c = Constraint(expr=block.v[1] + block.v[2] >= i)
+
+class TestSerialize(unittest.TestCase):
+
+    def create_model(self):
+        model = ConcreteModel()
+        model.I = Set(initialize=[1,2,3])
+        model.J = Set(initialize=['a','b'])
+        model.p = Param(model.I, initialize={1:1.5, 2:2, 3:3}, mutable=True)
+        model.q = Param(model.I, model.J, initialize=10)
+        model.x = Var(model.I, model.J, bounds=(0, model.p[1]), initialize=1.0)
+        model.y = Var([3,4], within=Binary)
+        model.y[3].fix(1)
+        model.z = Var()
+        model.w = Var(range(4), columnar=True, bounds=(1,4))
+        model.w[2].value = 3
+        model.e = Expression(model.I, rule=serialize_expression_rule)
+        model.c = Constraint(model.I, rule=serialize_constraint_rule)
+        model.cl = ConstraintList()
+        model.cl.add(model.z >= -1)
+        model.cl.add((0, model.y[3] + model.y[4], 2))
+        model.o = Objective(expr=summation(model.y) + model.z)
+        model.b = Block([1,2], rule=serialize_block_rule)
+        model.dual = Suffix()
+        model.dual[model.c[1]] = 5
+        return model
+
+    def output(self, model):
+        OUTPUT = StringIO()
+        model.pprint(ostream=OUTPUT)
+        return OUTPUT.getvalue()
+
+    def test_serialize(self):
+        model = self.create_model()
+        tmodel = loads_model(dumps_model(model))
+        self.assertEqual(self.output(model), self.output(tmodel))
+        self.assertIs(tmodel.x[1,'a'].parent_component(), tmodel.x)
+        self.assertIs(tmodel.w[2].parent_component(), tmodel.w)
+        self.assertEqual(tmodel.w[2].value, 3)
+        self.assertIs(tmodel.b[2].v[1].parent_block(), tmodel.b[2])
+        self.assertEqual(tmodel.dual[tmodel.c[1]], 5)
+        self.assertTrue(tmodel.y[3].fixed)
+        # the expressions and bounds refer to the new components
+        self.assertIs(tmodel.x[1,'a']._ub, tmodel.p[1])
+        tmodel.x[1,'b'] = 2
+        self.assertEqual(tmodel.e[1](), 4)
+        tmodel.z = 0
+        tmodel.p[1] = 2
+        self.assertEqual(tmodel.x[1,'a'].ub, 2)
+        self.assertEqual(tmodel.c[1].body(), 6)
+        self.assertEqual(model.x[1,'a'].ub, 1.5)
+
+    def test_serialize_stream(self):
+        model = self.create_model()
+        model2 = ConcreteModel()
+        model2.x = Var([1,2])
+        model2.c = Constraint(expr=model2.x[1] + model2.x[2] >= 1)
+        OUTPUT = BytesIO()
+        dump_model(model, OUTPUT)
+        dump_model(model2, OUTPUT)
+        OUTPUT.seek(0)
+        tmodel = load_model(OUTPUT)
+        tmodel2 = load_model(OUTPUT)
+        self.assertEqual(OUTPUT.read(), b'')
+        self.assertEqual(self.output(model), self.output(tmodel))
+        self.assertEqual(self.output(model2), self.output(tmodel2))
+
+    def test_serialize_invalid(self):
+        data = dumps_model(ConcreteModel())
+        self.assertRaises(ValueError, loads_model, b'PYOMOXXX' + data[8:])
+        self.assertRaises(ValueError, loads_model,
+                          data[:8] + b'\xff\xff' + data[10:])
+        self.assertRaises(ValueError, loads_model, data[:-1])
+
+
 if __name__ == "__main__":
     unittest.main()
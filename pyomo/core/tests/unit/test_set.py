@@ -27,6 +27,7 @@
 
 import itertools
 import os
+import random
 from os.path import abspath, dirname
 currdir = dirname(abspath(__file__))+os.sep
 
@@ -35,8 +36,11 @@ import pyutilib.th as unittest
 
 import pyomo.core.base
 from pyomo.core.base.set_types import _AnySet
+from pyomo.core.base.sets import _SortedList
 from pyomo.environ import *
 
+from six.moves import cPickle as pickle
+
 _has_numpy = False
 try:
     import numpy
@@ -357,6 +361,100 @@ class SimpleSetAordered(SimpleSetA):
         self.assertRaises( IndexError, self.instance.A.__getitem__, -5)
 
 
+class _SmallBlockSortedList(_SortedList):
+    __slots__ = ()
+    _load = 3
+
+def _reverse_order(val):
+    return -val
+
+def _tens_order(val):
+    return val // 10
+
+class TestSortedSet(unittest.TestCase):
+
+    def test_sorted_list(self):
+        rnd = random.Random(1000)
+        values = _SmallBlockSortedList()
+        ref = []
+        for i in range(300):
+            val = rnd.randint(0, 1000)
+            if val in ref:
+                self.assertTrue(val in values)
+                values.remove(val)
+                ref.remove(val)
+            else:
+                self.assertFalse(val in values)
+                values.add(val)
+                ref.append(val)
+                ref.sort()
+            self.assertEqual(len(values), len(ref))
+        self.assertEqual(list(values), ref)
+        self.assertEqual(values, ref)
+        self.assertEqual(list(reversed(values)), ref[::-1])
+        self.assertEqual([values[i] for i in range(len(ref))], ref)
+        self.assertEqual(values[-1], ref[-1])
+        self.assertEqual(values[2:5], ref[2:5])
+        self.assertEqual([values.index(val) for val in ref],
+                         list(range(len(ref))))
+        self.assertRaises(IndexError, values.__getitem__, len(ref))
+        self.assertRaises(ValueError, values.index, -1)
+        self.assertRaises(ValueError, values.remove, -1)
+        for val in list(ref):
+            values.remove(val)
+        self.assertEqual(len(values), 0)
+        self.assertEqual(list(values), [])
+
+    def test_sorted_list_key(self):
+        values = _SmallBlockSortedList(key=_tens_order)
+        for val in [15, 3, 11, 42, 17, 1, 44, 13, 12]:
+            values.add(val)
+        # values with equal keys keep the order they were added in
+        self.assertEqual(list(values), [3, 1, 15, 11, 17, 13, 12, 42, 44])
+        self.assertEqual(values.index(17), 4)
+        self.assertTrue(13 in values)
+        self.assertFalse(14 in values)
+        values.remove(11)
+        self.assertEqual(list(values), [3, 1, 15, 17, 13, 12, 42, 44])
+        tmp = pickle.loads(pickle.dumps(values))
+        self.assertEqual(list(tmp), list(values))
+
+    def test_incremental_add(self):
+        model = ConcreteModel()
+        model.T = Set(ordered=Set.SortedOrder)
+        for i in range(100, 0, -1):
+            model.T.add(i / 10.0)
+            self.assertEqual(model.T.first(), i / 10.0)
+            self.assertEqual(model.T.ord(i / 10.0), 1)
+            if i < 100:
+                self.assertEqual(model.T.next(i / 10.0), (i+1) / 10.0)
+                self.assertEqual(model.T.prev((i+1) / 10.0), i / 10.0)
+        self.assertEqual(list(model.T), [i / 10.0 for i in range(1, 101)])
+        self.assertEqual(model.T.ord(5.0), 50)
+        self.assertEqual(model.T[50], 5.0)
+        self.assertEqual(model.T.last(), 10.0)
+        model.T.discard(5.0)
+        self.assertFalse(5.0 in model.T)
+        self.assertEqual(model.T.ord(5.1), 50)
+        self.assertEqual(model.T.next(4.9), 5.1)
+        self.assertEqual(len(model.T), 99)
+
+    def test_sorter(self):
+        model = ConcreteModel()
+        model.A = Set(initialize=[3, 1, 2], ordered=_reverse_order)
+        self.assertEqual(list(model.A), [3, 2, 1])
+        model.A.add(5)
+        model.A.add(0)
+        self.assertEqual(list(model.A), [5, 3, 2, 1, 0])
+        self.assertEqual(model.A.ord(2), 3)
+        self.assertEqual(model.A.prev(1), 2)
+        clone = model.clone()
+        self.assertEqual(list(clone.A), [5, 3, 2, 1, 0])
+        clone.A.add(4)
+        self.assertEqual(list(clone.A), [5, 4, 3, 2, 1, 0])
+        self.assertEqual(list(model.A), [5, 3, 2, 1, 0])
+
+
 class TestRangeSet(SimpleSetA):
 
     def setUp(self):
@@ -3016,5 +3114,110 @@ class NestedSetOperations(unittest.TestCase):
         self.assertEqual(sorted(inst.product3),
                          sorted(prod3))
 
+class TestSetOperatorCache(unittest.TestCase):
+
+    def test_operators(self):
+        model = ConcreteModel()
+        model.A = Set(initialize=[1,2,3])
+        model.B = Set(initialize=[3,4], ordered=True)
+        model.C = Set(initialize=[4,5])
+        model.U = (model.A | model.B) - model.C
+        model.I = model.A & model.B
+        model.X = model.A ^ model.B
+        self.assertEqual(len(model.U), 3)
+        self.assertEqual(len(model.I), 1)
+        self.assertEqual(len(model.X), 3)
+        for i in range(2):
+            self.assertTrue(3 in model.U)
+            self.assertFalse(4 in model.U)
+            self.assertTrue(4 in model.X)
+            self.assertFalse(3 in model.X)
+        # the cached elements are updated when the operands change
+        model.B.add(6)
+        self.assertEqual(len(model.U), 4)
+        self.assertTrue(6 in model.U)
+        self.assertTrue(6 in model.X)
+        model.C.add(6)
+        self.assertFalse(6 in model.U)
+        self.assertEqual(len(model.U), 3)
+        model.A.discard(3)
+        self.assertFalse(3 in model.I)
+        self.assertTrue(3 in model.X)
+        self.assertEqual(len(model.I), 0)
+        self.assertEqual(sorted(model.U), [1,2,3])
+        model.B.clear()
+        self.assertEqual(sorted(model.U), [1,2])
+        self.assertEqual(len(model.U), 2)
+        self.assertFalse(3 in model.U)
+        self.assertFalse(3 in model.U)
+
+    def test_incremental_membership(self):
+        model = ConcreteModel()
+        model.A = Set(initialize=[1])
+        model.B = Set()
+        model.U = model.A | model.B
+        for i in range(2, 20):
+            self.assertFalse(i in model.U)
+            model.B.add(i)
+            self.assertTrue(i in model.U)
+        self.assertEqual(len(model.U), 19)
+
+    def test_setof(self):
+        # changes to external data can not be tracked
+        model = ConcreteModel()
+        model.A = Set(initialize=[1,2])
+        data = [2,3]
+        model.U = model.A | data
+        self.assertEqual(len(model.U), 3)
+        data.append(4)
+        self.assertEqual(len(model.U), 4)
+        self.assertTrue(4 in model.U)
+        self.assertTrue(4 in model.U)
+
+    def test_clone(self):
+        model = ConcreteModel()
+        model.A = Set(initialize=[1,2])
+        model.B = Set(initialize=[3])
+        model.x = Var(model.A | model.B)
+        self.assertEqual(len(model.x), 3)
+        self.assertTrue(3 in model.x_index)
+        self.assertTrue(3 in model.x_index)
+        clone = model.clone()
+        clone.B.add(4)
+        self.assertEqual(len(clone.x_index), 4)
+        self.assertTrue(4 in clone.x_index)
+        self.assertEqual(len(model.x_index), 3)
+        self.assertFalse(4 in model.x_index)
+
+    def test_product(self):
+        model = ConcreteModel()
+        model.A = Set(initialize=[1,2])
+        model.B = Set(initialize=[(1,2),(3,4)], dimen=2)
+        model.C = Set(initialize=[1,(2,3)], dimen=None)
+        model.D = Set(initialize=['a'])
+        model.P = model.A * model.D
+        model.Q = model.A * model.B * model.D
+        model.R = model.A * model.C * model.D
+        self.assertTrue((1,'a') in model.P)
+        self.assertFalse((1,'b') in model.P)
+        self.assertFalse((1,'a',1) in model.P)
+        self.assertFalse(1 in model.P)
+        self.assertTrue((1,3,4,'a') in model.Q)
+        self.assertFalse((1,3,2,'a') in model.Q)
+        self.assertFalse((1,3,4) in model.Q)
+        self.assertFalse((1,3,4,'a','a') in model.Q)
+        self.assertTrue((1,1,'a') in model.R)
+        self.assertTrue((2,2,3,'a') in model.R)
+        self.assertFalse((2,2,'a') in model.R)
+        self.assertFalse((2,2,3) in model.R)
+        # products of set operations
+        model.E = Set(initialize=[3])
+        model.S = (model.A | model.E) * model.D
+        self.assertTrue((3,'a') in model.S)
+        self.assertTrue((3,'a') in model.S)
+        model.E.add(4)
+        self.assertTrue((4,'a') in model.S)
+        self.assertTrue((4,'a') in model.S)
+
 if __name__ == "__main__":
     unittest.main()
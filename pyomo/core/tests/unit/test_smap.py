@@ -12,6 +12,8 @@
 
 from six import StringIO
 import os
+import gc
+import weakref
 import pyutilib.th as unittest
 from pyomo.environ import *
 
@@ -120,6 +122,71 @@ class Test(unittest.TestCase):
         self.assertEqual( id(smap.getObject('x')), id(self.instance.x) )
         self.assertEqual( id(smap.getObject('X')), id(self.instance.x) )
         self.assertEqual( id(smap.getObject('y')), id(SymbolMap.UnknownSymbol) )
+    def test_indexed(self):
+        smap = SymbolMap()
+        smap.addSymbol(self.instance.x, 'x')
+        objs = list(self.instance.y.values())
+        smap.addIndexedSymbols('v', objs)
+        smap.addIndexedSymbols('c', [self.instance.c1])
+        self.assertRaises(RuntimeError, smap.addIndexedSymbols, 'v', objs)
+        smap.alias(self.instance.c1, 'v10')
+        self.assertEqual( id(smap.getObject('v0')), id(objs[0]) )
+        self.assertEqual( id(smap.getObject('v2')), id(objs[2]) )
+        self.assertEqual( id(smap.getObject('c0')), id(self.instance.c1) )
+        self.assertEqual( id(smap.getObject('x')), id(self.instance.x) )
+        self.assertEqual( id(smap.getObject('v10')), id(self.instance.c1) )
+        for symb in ('v3', 'v01', 'v', 'v-1', 'w0', 0):
+            self.assertEqual( id(smap.getObject(symb)),
+                              id(SymbolMap.UnknownSymbol) )
+        # the labels have not been generated
+        self.assertEqual( set(smap._bySymbol.keys()), set(['x']) )
+        self.assertEqual( set(smap.bySymbol.keys()),
+                          set(['x','v0','v1','v2','c0']) )
+        self.assertEqual( smap.byObject[id(objs[1])], 'v1' )
+        self.assertEqual( smap.getSymbol(self.instance.c1), 'c0' )
+        self.assertEqual( id(smap.getObject('v1')), id(objs[1]) )
+
+    def test_removeSymbol(self):
+        smap = SymbolMap()
+        smap.addSymbol(self.instance.x, 'x')
+        smap.addSymbol(self.instance.c1, 'c1')
+        self.assertEqual( smap.removeSymbol(self.instance.x), 'x' )
+        self.assertEqual( smap.removeSymbol(self.instance.x), None )
+        self.assertEqual( smap.byObject, {id(self.instance.c1): 'c1'} )
+        self.assertEqual( set(smap.bySymbol.keys()), set(['c1']) )
+        self.assertEqual( id(smap.getObject('x')),
+                          id(SymbolMap.UnknownSymbol) )
+        self.assertEqual( id(smap.getObject('c1')), id(self.instance.c1) )
+
+    def test_removeSymbol_indexed(self):
+        smap = SymbolMap()
+        objs = list(self.instance.y.values())
+        smap.addIndexedSymbols('v', objs)
+        self.assertEqual( smap.removeSymbol(objs[1]), 'v1' )
+        self.assertEqual( id(smap.getObject('v1')),
+                          id(SymbolMap.UnknownSymbol) )
+        self.assertEqual( id(smap.getObject('v2')), id(objs[2]) )
+        self.assertEqual( set(smap.bySymbol.keys()), set(['v0','v2']) )
+        self.assertEqual( smap.getSymbol(objs[0]), 'v0' )
+
+    def test_indexed_weakref(self):
+        # the symbol map does not keep the indexed objects alive
+        smap = SymbolMap()
+        model = ConcreteModel()
+        model.v = Var([1,2])
+        objs = list(model.v.values())
+        smap.addIndexedSymbols('v', objs)
+        self.assertEqual( list(map(id, smap.getIndexedObjects('v'))),
+                          list(map(id, objs)) )
+        refs = list(map(weakref.ref, objs))
+        del model, objs
+        gc.collect()
+        self.assertEqual( [ref() for ref in refs], [None, None] )
+        self.assertEqual( list(map(id, smap.getIndexedObjects('v'))),
+                          [id(None), id(None)] )
+        self.assertEqual( id(smap.getObject('v0')),
+                          id(SymbolMap.UnknownSymbol) )
+        self.assertEqual( smap.byObject, {} )
 
 if __name__ == "__main__":
     unittest.main()
@@ -22,6 +22,14 @@ import pyutilib.th as unittest
 from pyomo.core.base import IntegerSet
 from pyomo.environ import *
 
+try:
+    import numpy
+    numpy_available=True
+except ImportError:
+    numpy_available=False
+
+nan = float('nan')
+
 class PyomoModel(unittest.TestCase):
 
     def setUp(self):
@@ -502,6 +510,21 @@ class TestArrayVar(TestSimpleVar):
         self.assertEqual(len(self.instance.y),2)
         self.assertEqual(len(self.instance.z),2)
 
+    def test_sparse_order(self):
+        """Test the iteration order of a sparse variable"""
+        model = ConcreteModel()
+        model.I = RangeSet(100)
+        model.J = Set(initialize=[5,3,1], ordered=True)
+        model.x = Var(model.I, model.J, dense=False)
+        model.y = Var(RangeSet(0, 98, 2), dense=False)
+        for idx in [(7,1), (3,3), (70,5), (7,5), (3,1)]:
+            model.x[idx].value = 1
+        for idx in [96, 4, 40]:
+            model.y[idx].value = 1
+        self.assertEqual(list(model.x.keys()),
+                         [(3,3), (3,1), (7,5), (7,1), (70,5)])
+        self.assertEqual(list(model.y.keys()), [4, 40, 96])
+
     def test_value(self):
         """Check the value of the variable"""
         self.model.x = Var(self.model.A,initialize=3.3)
@@ -1194,5 +1217,163 @@ class MiscVarTests(unittest.TestCase):
         self.assertTrue( newIdx in model.x )
 
 
+class TestColumnarVar(unittest.TestCase):
+
+    def _model(self, columnar=True):
+        model = ConcreteModel()
+        model.s = Set(initialize=[3,1,2], ordered=True)
+        model.p = Param(initialize=4, mutable=True)
+        model.x = Var(model.s, bounds=(0,10), initialize={1:1.0, 2:2.0},
+                      columnar=columnar)
+        model.y = Var(model.s, within=Binary, dense=False,
+                      columnar=columnar)
+        return model
+
+    def _values(self, vals):
+        return [None if v != v else v for v in vals]
+
+    def test_scalar(self):
+        self.assertRaises(ValueError, Var, columnar=True)
+
+    def test_data(self):
+        model = self._model()
+        self.assertEqual(len(model.x), 3)
+        self.assertEqual(value(model.x[1]), 1)
+        self.assertEqual(model.x[3].value, None)
+        self.assertEqual(model.x[3].bounds, (0,10))
+        self.assertTrue(model.x[3].stale)
+        self.assertFalse(model.x[3].fixed)
+        self.assertFalse(hasattr(model.x[3], '__dict__'))
+        model.x[3] = 5
+        self.assertEqual(model.x[3].value, 5)
+        self.assertFalse(model.x[3].stale)
+        self.assertRaises(ValueError, model.x[3].set_value, 'a')
+        model.x[3].fix()
+        self.assertTrue(model.x[3].fixed)
+        self.assertTrue(model.x[3].fixed is True)
+        model.x[3].unfix()
+        self.assertFalse(model.x[3].fixed)
+        model.x[2].fix(7)
+        self.assertEqual((model.x[2].value, model.x[2].fixed), (7, True))
+        model.x[2].setlb(None)
+        model.x[2].setub(model.p)
+        self.assertEqual(model.x[2].bounds, (None, 4))
+        model.p = 3
+        self.assertEqual(model.x[2].ub, 3)
+        model.x[2].setub(2)
+        self.assertEqual(model.x[2].ub, 2)
+        self.assertRaises(ValueError, model.x[2].setlb, model.x[1])
+        model.x[1].domain = NonNegativeIntegers
+        self.assertTrue(model.x[1].is_integer())
+        self.assertFalse(model.x[2].is_integer())
+        self.assertRaises(ValueError, setattr, model.x[1], 'domain', 1)
+
+    def test_sparse(self):
+        model = self._model()
+        self.assertEqual(len(model.y), 0)
+        model.y[2] = 1
+        self.assertEqual(len(model.y), 1)
+        self.assertEqual(model.y[2].value, 1)
+        self.assertEqual(model.y[2].bounds, (0,1))
+        self.assertEqual(model.y[1].value, None)
+        self.assertEqual(list(model.y.keys()), [1,2])
+        self.assertEqual(self._values(model.y.get_values(as_array=True)),
+                         [None, 1])
+        model.y.set_values([0, 1])
+        self.assertEqual((model.y[1].value, model.y[2].value), (0, 1))
+        model.l = VarList(columnar=True)
+        model.l.add()
+        model.l.add().setlb(2)
+        self.assertEqual([v.lb for v in model.l.values()], [None, 2])
+
+    def test_bulk(self):
+        for columnar in (True, False):
+            model = self._model(columnar)
+            self.assertEqual(list(model.x.keys()), [3,1,2])
+            self.assertEqual(self._values(model.x.get_values(as_array=True)),
+                             [None, 1, 2])
+            self.assertRaises(ValueError, model.x.get_values,
+                              include_fixed_values=False, as_array=True)
+            model.x.flag_as_stale()
+            model.x.set_values([4, None, 6])
+            self.assertEqual([model.x[i].value for i in model.s],
+                             [4, None, 6])
+            self.assertEqual([model.x[i].stale for i in model.s],
+                             [False]*3)
+            self.assertEqual(model.x.get_values(), {1:None, 2:6, 3:4})
+            self.assertRaises(ValueError, model.x.set_values, [1, 2])
+            model.x.set_bounds(lb=[-1, None, -3])
+            self.assertEqual([model.x[i].bounds for i in model.s],
+                             [(-1, 10), (None, 10), (-3, 10)])
+            model.x.set_bounds(ub=[nan, 5, 6])
+            self.assertEqual([model.x[i].bounds for i in model.s],
+                             [(-1, None), (None, 5), (-3, 6)])
+            model.x.fix_all([True, False, True])
+            self.assertEqual([model.x[i].fixed for i in model.s],
+                             [True, False, True])
+            model.x.unfix_all([False, False, True])
+            self.assertEqual([model.x[i].fixed for i in model.s],
+                             [True, False, False])
+            model.x.fix_all()
+            self.assertEqual([model.x[i].fixed for i in model.s],
+                             [True]*3)
+            model.x.unfix_all()
+            self.assertEqual([model.x[i].fixed for i in model.s],
+                             [False]*3)
+            self.assertRaises(ValueError, model.x.fix_all, [True])
+
+    def test_numpy(self):
+        if not numpy_available:
+            self.skipTest("This test requires NumPy")
+        model = self._model()
+        vals = model.x.get_values(as_array=True)
+        self.assertTrue(isinstance(vals, numpy.ndarray))
+        vals[1] = 5
+        # a copy is returned
+        self.assertEqual(model.x[1].value, 1)
+        model.x.set_values(numpy.array([1.5, 2.5, numpy.nan]))
+        self.assertEqual([model.x[i].value for i in model.s],
+                         [1.5, 2.5, None])
+        self.assertTrue(type(model.x[1].value) is float)
+        model.x.fix_all(numpy.array([1, 0, 0], dtype=bool))
+        self.assertEqual([model.x[i].fixed for i in model.s],
+                         [True, False, False])
+
+    def test_pickle(self):
+        import pickle
+        model = self._model()
+        model.x[3].setub(model.p)
+        model.x[1].fix()
+        for tmp in (pickle.loads(pickle.dumps(model)), model.clone()):
+            self.assertEqual([tmp.x[i].value for i in tmp.s], [None, 1, 2])
+            self.assertEqual(tmp.x[3].bounds, (0, 4))
+            self.assertTrue(tmp.x[1].fixed)
+            tmp.x[2].value = 3
+            self.assertEqual(model.x[2].value, 2)
+            self.assertTrue(tmp.x[2].parent_component() is tmp.x)
+
+    def test_write(self):
+        from pyomo.opt import ProblemFormat
+        # the NL writer prints repr() of the values and bounds, which
+        # are stored as floats by columnar variables
+        ans = []
+        for columnar in (True, False):
+            model = self._model(columnar)
+            model.x.set_bounds([0.0]*3, [10.0]*3)
+            model.x[3].fix(1.0)
+            model.y[2].setub(model.p)
+            model.o = Objective(expr=summation(model.x) + model.y[2])
+            model.c = Constraint(expr=model.p*model.x[1] - model.x[2] >= 1)
+            model.n = Constraint(expr=model.x[1]*model.y[2] <= 1)
+            ans.append([])
+            for format in (ProblemFormat.cpxlp, ProblemFormat.nl):
+                filename = currdir+"columnar_var_test."+str(format)
+                model.write(filename=filename, format=format)
+                with open(filename) as f:
+                    ans[-1].append(f.read())
+                os.remove(filename)
+        self.assertEqual(ans[0], ans[1])
+
+
 if __name__ == "__main__":
     unittest.main()
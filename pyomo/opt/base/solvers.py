@@ -36,6 +36,9 @@ from six.moves import xrange
 
 logger = logging.getLogger('pyomo.opt')
 
+# the solver manager used by OptSolver.solve_async()
+_async_solver_manager = None
+
 
 # The version string is first searched for trunk/Trunk, and if
 # found a tuple of infinities is returned. Otherwise, the first
@@ -550,6 +553,15 @@ class OptSolver(Plugin):
 
             self._presolve(*args, **kwds)
 
+            #
+            # If the solution is loaded into the model, results readers
+            # that support it can store the solution values as arrays
+            # (see ModelSolutions.add_solution)
+            #
+            if hasattr(self._results_reader, 'solution_arrays'):
+                self._results_reader.solution_arrays = \
+                    (_model is not None) and self._load_solutions
+
             presolve_completion_time = time.time()
 
             if not _model is None:
@@ -613,6 +625,29 @@ class OptSolver(Plugin):
 
         return result
 
+    def solve_async(self, *args, **kwds):
+        """
+        Start a solve of the problem, and return an ActionFuture
+        whose result() is the results object that is returned by
+        solve().  The future can also be awaited by an asyncio
+        coroutine (on Python 3.5+).
+
+        The solve is queued with the solver manager that is specified
+        by the 'solver_manager' keyword.  By default, a 'threadpool'
+        solver manager is used, which executes the solver executables
+        of system call solvers concurrently.
+        """
+        from pyomo.opt.parallel import SolverManagerFactory
+        from pyomo.opt.parallel.manager import ActionFuture
+        global _async_solver_manager
+        manager = kwds.pop('solver_manager', None)
+        if manager is None:
+            if _async_solver_manager is None:
+                _async_solver_manager = SolverManagerFactory('threadpool')
+            manager = _async_solver_manager
+        kwds['opt'] = self
+        return ActionFuture(manager, manager.queue(*args, **kwds))
+
     def _presolve(self, *args, **kwds):
 
         self._log_file                = kwds.pop("logfile", None)
@@ -10,15 +10,33 @@
 
 __all__ = ()
 
+import sys
 import time
+import logging
+import shutil
+import tempfile
+import threading
+import traceback
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+from collections import deque
+try:
+    import cPickle as pickle
+except ImportError:                         #pragma:nocover
+    import pickle
 
 try:
     from collections import OrderedDict
 except ImportError:                         #pragma:nocover
     from ordereddict import OrderedDict
 
+from pyutilib.common import ApplicationError
+from pyutilib.services import TempfileManager
+
 from pyomo.util.plugin import alias
+from pyomo.util import fork_available, fork_context
 import pyomo.opt
+from pyomo.opt.solver.shellcmd import SystemCallSolver
 from pyomo.opt.parallel.manager import (ActionManagerError,
                                         ActionStatus,
                                         ActionHandle)
@@ -26,6 +44,9 @@ from pyomo.opt.parallel.async_solver import AsynchronousSolverManager
 
 import six
 from six import string_types
+from six.moves import queue as Queue
+
+logger = logging.getLogger('pyomo.opt')
 
 class SolverManager_Serial(AsynchronousSolverManager):
 
@@ -80,3 +101,460 @@ class SolverManager_Serial(AsynchronousSolverManager):
                             explanation=("No queued evaluations available in "
                                          "the 'serial' solver manager, which "
                                          "executes solvers synchronously"))
+
+
+def _find_model(args):
+    from pyomo.core.base import Block
+    for arg in args:
+        if isinstance(arg, Block):
+            return arg
+    return None
+
+
+class _SolverManager_Pool(AsynchronousSolverManager):
+    """
+    Base class for the solver managers that execute queued solves
+    concurrently on the local machine, using at most 'workers'
+    concurrent solves (the default is the number of CPUs).
+
+    Solves that can not be started yet are kept in a queue, and
+    wait_any() returns the action handles in the order in which the
+    solves complete.
+    """
+
+    def __init__(self, **kwds):
+        workers = kwds.pop('workers', None)
+        if workers is None:
+            workers = multiprocessing.cpu_count()
+        if workers < 1:
+            raise ValueError("The number of workers must be positive")
+        self._workers = workers
+        super(_SolverManager_Pool, self).__init__(**kwds)
+
+    def clear(self):
+        """
+        Clear manager state
+        """
+        super(_SolverManager_Pool, self).clear()
+        # tasks that have not been started, (task, data) for the tasks
+        # that are running (by action handle id), and the ids of the
+        # completed tasks that have not been returned by wait_any()
+        self._pending = deque()
+        self._running = {}
+        self._completed = deque()
+
+    def get_results(self, ah):
+        return self.results.pop(ah.id, None)
+
+    def wait_all(self, *args):
+        """
+        Wait for all actions to complete.  The arguments to this method
+        are expected to be ActionHandle objects or iterators that return
+        ActionHandle objects.  If no arguments are provided, then this
+        method will terminate after all queued actions are complete.
+        """
+        ahs = self._flatten(*args)
+        if len(ahs):
+            for ah in ahs:
+                while self.event_handle[ah.id].status == ActionStatus.queued:
+                    self._complete_task()
+        else:
+            while len(self._running):
+                self._complete_task()
+
+    def wait_any(self, *args):
+        """
+        Wait for any action (or any of the specified actions) to
+        complete, and return the corresponding ActionHandle.
+        """
+        ahs = self._flatten(*args)
+        if len(ahs):
+            while (1):
+                for ah in ahs:
+                    ah = self.event_handle[ah.id]
+                    if ah.status != ActionStatus.queued:
+                        if ah.id in self._completed:
+                            self._completed.remove(ah.id)
+                        return ah
+                self._complete_task()
+        else:
+            while len(self._completed) == 0:
+                self._complete_task()
+            return self.event_handle[self._completed.popleft()]
+
+    def wait_for(self, ah):
+        """
+        Wait for the specified action to complete.
+        """
+        self.wait_any(ah)
+        return self.get_results(ah)
+
+    def _perform_queue(self, ah, *args, **kwds):
+        """
+        Perform the queue operation.  This method returns the ActionHandle,
+        and the ActionHandle status indicates whether the queue was successful.
+        """
+        opt = kwds.pop('solver', kwds.pop('opt', None))
+        if opt is None:
+            raise ActionManagerError(
+                "No solver passed to %s, use keyword option 'solver'"
+                % (type(self).__name__) )
+        self._pending.append((ah, opt, args, kwds))
+        self._start_tasks()
+        return ah
+
+    def _start_tasks(self):
+        while self._pending and (len(self._running) < self._workers):
+            task = self._pending.popleft()
+            ah = task[0]
+            try:
+                self._running[ah.id] = (task, self._start_task(task))
+            except:
+                ah.status = ActionStatus.error
+                self.queued_action_counter -= 1
+                raise
+
+    def _complete_task(self):
+        """
+        Wait for a solve to complete, and store its results.
+        """
+        if len(self._running) == 0:
+            raise ActionManagerError(
+                "No queued evaluations available in the '%s' solver "
+                "manager" % (self.name))
+        ah_id, data = self._wait_task()
+        task, task_data = self._running.pop(ah_id)
+        ah = task[0]
+        self.queued_action_counter -= 1
+        self._completed.append(ah_id)
+        try:
+            self.results[ah_id] = self._finish_task(task, task_data, data)
+            ah.status = ActionStatus.done
+        except:
+            ah.status = ActionStatus.error
+            raise
+        finally:
+            self.event_handle[ah_id].update(ah)
+            self._start_tasks()
+
+    def _start_task(self, task):
+        """
+        Start the solve of a task, and return the data needed to
+        finish it.
+        """
+        raise NotImplementedError     #pragma:nocover
+
+    def _wait_task(self):
+        """
+        Wait for a running task to complete, and return the tuple
+        (action handle id, data).
+        """
+        raise NotImplementedError     #pragma:nocover
+
+    def _finish_task(self, task, task_data, data):
+        """
+        Return the results of a completed task.
+        """
+        raise NotImplementedError     #pragma:nocover
+
+
+#
+# The solve performed by the worker processes of the 'processpool'
+# solver manager. When a model is solved, the solution is loaded into
+# the (forked) model and stored in the results with ComponentUID
+# keys, so it can be loaded into the model of the parent process.
+#
+def _process_solve(opt, args, kwds):
+    model = _find_model(args)
+    if model is not None:
+        kwds['load_solutions'] = True
+    time_start = time.time()
+    if isinstance(opt, string_types):
+        with pyomo.opt.SolverFactory(opt) as _opt:
+            results = _opt.solve(*args, **kwds)
+    else:
+        results = opt.solve(*args, **kwds)
+    results.pyomo_solve_time = time.time()-time_start
+    if model is not None:
+        model.solutions.store_to(results, cuid=True)
+    results.compact()
+    return results
+
+def _process_worker(result_queue, ah_id, opt, args, kwds):
+    # the temporary files are created in a new directory, so they are
+    # removed even if the solve fails
+    task_dir = tempfile.mkdtemp(prefix='pyomo_', dir=TempfileManager.tempdir)
+    TempfileManager.tempdir = task_dir
+    try:
+        data = (_process_solve(opt, args, kwds), None)
+        data = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+    except:
+        data = pickle.dumps((None, traceback.format_exc()),
+                            protocol=pickle.HIGHEST_PROTOCOL)
+    finally:
+        if not kwds.get('keepfiles', False):
+            shutil.rmtree(task_dir, ignore_errors=True)
+    result_queue.put((ah_id, data))
+
+
+class SolverManager_ProcessPool(_SolverManager_Pool):
+    """
+    Execute solvers concurrently in forked worker processes.
+
+    The problem instances are shared with the workers by forking a
+    worker process when a solve is started, so the models are never
+    pickled, and the results (with solutions stored by ComponentUID)
+    are returned to this process as each solve completes. Unless
+    load_solutions=False is specified, the solution is loaded into
+    the model, as with the 'serial' solver manager.
+
+    If worker processes can not be forked, solves are executed
+    synchronously when they are queued.
+    """
+
+    alias("processpool",
+          doc="Execute solvers concurrently in forked local processes")
+
+    def clear(self):
+        """
+        Clear manager state
+        """
+        super(SolverManager_ProcessPool, self).clear()
+        self._result_queue = None
+
+    def _start_task(self, task):
+        ah, opt, args, kwds = task
+        load = (kwds.pop('load_solutions', True), kwds.get('select', 0))
+        if not fork_available():
+            if self._result_queue is None:
+                self._result_queue = Queue.Queue()
+            data = (_process_solve(opt, args, kwds), None)
+            self._result_queue.put((ah.id, pickle.dumps(data)))
+            return (None, load)
+        context = fork_context()
+        if self._result_queue is None:
+            self._result_queue = context.Queue()
+        process = context.Process(target=_process_worker,
+                                  args=(self._result_queue,
+                                        ah.id, opt, args, kwds))
+        process.daemon = True
+        process.start()
+        return (process, load)
+
+    def _wait_task(self):
+        return self._result_queue.get()
+
+    def _finish_task(self, task, task_data, data):
+        ah, opt, args, kwds = task
+        process, (load_solutions, select) = task_data
+        if process is not None:
+            process.join()
+        results, error = pickle.loads(data)
+        if error is not None:
+            raise ActionManagerError(
+                "Solve of action %s failed in a worker process:\n%s"
+                % (ah.id, error))
+        model = _find_model(args)
+        if (model is not None) and load_solutions:
+            # default variable values were assigned by the worker
+            model.solutions.load_from(results, select=select)
+            results.solution.clear()
+        return results
+
+
+class SolverManager_ThreadPool(_SolverManager_Pool):
+    """
+    Execute solvers concurrently in a pool of threads.
+
+    Only the execution of the solver executable of a system call
+    solver is performed by the threads: the problem files are written
+    and the results are read and loaded into the model by the thread
+    that calls queue() and wait_any(), as neither the models nor the
+    temporary file manager are thread-safe. Each solve uses a new
+    solver plugin (with the options and executable of the solver that
+    is passed to queue()), and a separate directory for its
+    temporary files.
+
+    Solves with other solvers are executed synchronously when they
+    are queued.
+    """
+
+    alias("threadpool",
+          doc="Execute solver executables concurrently in local threads")
+
+    def clear(self):
+        """
+        Clear manager state
+        """
+        super(SolverManager_ThreadPool, self).clear()
+        self._pool = None
+        self._result_queue = Queue.Queue()
+        # the ids of the tasks that have been executed, and the
+        # functions registered with add_done_callback() for the other
+        # tasks, which are accessed by the pool threads
+        self._lock = threading.Lock()
+        self._executed = set()
+        self._done_callbacks = {}
+
+    def add_done_callback(self, ah, callback):
+        """
+        Register a function that is called with the ActionHandle when
+        the action completes.  The function is called by the pool
+        thread that executed the solver, before the results are
+        processed by wait_any().  Returns True.
+        """
+        with self._lock:
+            if (ah.id not in self._executed) and \
+               (self.event_handle[ah.id].status == ActionStatus.queued):
+                self._done_callbacks.setdefault(ah.id, []).append(callback)
+                return True
+        callback(ah)
+        return True
+
+    def _task_executed(self, ah_id, data):
+        self._result_queue.put((ah_id, data))
+        with self._lock:
+            self._executed.add(ah_id)
+            callbacks = self._done_callbacks.pop(ah_id, ())
+        for callback in callbacks:
+            callback(self.event_handle[ah_id])
+
+    def deactivate(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        super(SolverManager_ThreadPool, self).deactivate()
+
+    def _start_task(self, task):
+        ah, opt, args, kwds = task
+        time_start = time.time()
+        if isinstance(opt, string_types):
+            _opt = pyomo.opt.SolverFactory(opt)
+        else:
+            _opt = pyomo.opt.SolverFactory(opt.type)
+            if _opt is not None:
+                for key in opt.options:
+                    _opt.options[key] = opt.options[key]
+                if isinstance(opt, SystemCallSolver):
+                    _opt._user_executable = opt._user_executable
+        if not isinstance(_opt, SystemCallSolver):
+            if _opt is not None:
+                _opt.deactivate()
+            if isinstance(opt, string_types):
+                with pyomo.opt.SolverFactory(opt) as _opt:
+                    results = _opt.solve(*args, **kwds)
+            else:
+                results = opt.solve(*args, **kwds)
+            results.pyomo_solve_time = time.time()-time_start
+            self._task_executed(ah.id, (results, None))
+            return None
+        try:
+            task_dir = self._presolve(_opt, args, kwds)
+        except:
+            _opt.deactivate()
+            raise
+        if self._pool is None:
+            self._pool = ThreadPool(self._workers)
+        def callback(status, ah_id=ah.id):
+            self._task_executed(ah_id, (status, None))
+        def apply_solver(opt=_opt, ah_id=ah.id):
+            try:
+                return opt._apply_solver()
+            except:
+                self._task_executed(ah_id, (None, sys.exc_info()))
+                raise
+        self._pool.apply_async(apply_solver, callback=callback)
+        return (_opt, task_dir, time_start)
+
+    def _presolve(self, opt, args, kwds):
+        """
+        Perform the steps of OptSolver.solve() that precede the
+        execution of the solver, with the temporary files created
+        in a new directory. Returns the directory.
+        """
+        opt.available(exception_flag=True)
+        model = _find_model(args)
+        if model is not None:
+            from pyomo.core.base.suffix import active_import_suffix_generator
+            if not model.is_constructed():
+                raise RuntimeError(
+                    "Attempting to solve model=%s with unconstructed "
+                    "component(s)" % (model.name,) )
+            model_suffixes = list(name for (name,comp) \
+                                  in active_import_suffix_generator(model))
+            if len(model_suffixes) > 0:
+                kwds_suffixes = kwds.setdefault('suffixes',[])
+                for name in model_suffixes:
+                    if name not in kwds_suffixes:
+                        kwds_suffixes.append(name)
+        #
+        # The solver plugin is not shared, so ephemeral solver options
+        # do not need to be reset
+        #
+        tmp_solver_options = kwds.pop('options', {})
+        tmp_solver_options.update(
+            opt._options_string_to_dict(kwds.pop('options_string', '')))
+        for key in tmp_solver_options:
+            opt.options[key] = tmp_solver_options[key]
+
+        task_dir = tempfile.mkdtemp(prefix='pyomo_', dir=TempfileManager.tempdir)
+        tempdir = TempfileManager.tempdir
+        TempfileManager.tempdir = task_dir
+        try:
+            opt._presolve(*args, **kwds)
+        except:
+            shutil.rmtree(task_dir, ignore_errors=True)
+            raise
+        finally:
+            TempfileManager.tempdir = tempdir
+        # the files are removed when the task is finished
+        TempfileManager.pop(remove=False)
+        if hasattr(opt._results_reader, 'solution_arrays'):
+            opt._results_reader.solution_arrays = \
+                (model is not None) and opt._load_solutions
+        return task_dir
+
+    def _wait_task(self):
+        return self._result_queue.get()
+
+    def _finish_task(self, task, task_data, data):
+        ah, opt, args, kwds = task
+        with self._lock:
+            self._executed.discard(ah.id)
+        status, exc_info = data
+        if task_data is None:
+            return status
+        opt, task_dir, time_start = task_data
+        TempfileManager.push()
+        TempfileManager.add_tempfile(task_dir)
+        try:
+            if exc_info is not None:
+                six.reraise(*exc_info)
+            if status.rc:
+                if hasattr(status, 'log') and status.log:
+                    logger.error("Solver log:\n" + str(status.log))
+                raise ApplicationError(
+                    "Solver (%s) did not exit normally" % opt.name)
+            results = opt._postsolve()
+        except:
+            TempfileManager.pop(remove=not opt._keepfiles)
+            opt.deactivate()
+            raise
+        results._smap_id = opt._smap_id
+        results._smap = None
+        model = _find_model(args)
+        if model is not None:
+            if opt._load_solutions:
+                model.solutions.load_from(
+                    results,
+                    select=opt._select_index,
+                    default_variable_value=opt._default_variable_value)
+                results._smap_id = None
+                results.solution.clear()
+            else:
+                results._smap = model.solutions.symbol_map[opt._smap_id]
+                model.solutions.delete_symbol_map(opt._smap_id)
+        results.pyomo_solve_time = time.time()-time_start
+        opt.deactivate()
+        return results
@@ -8,7 +8,9 @@
 #  _________________________________________________________________________
 
 
-__all__ = ['ActionManagerError', 'ActionHandle', 'AsynchronousActionManager', 'ActionStatus', 'FailedActionHandle', 'solve_all_instances']
+__all__ = ['ActionManagerError', 'ActionHandle', 'AsynchronousActionManager', 'ActionStatus', 'FailedActionHandle', 'ActionFuture', 'solve_all_instances']
+
+import threading
 
 from pyutilib.enum import Enum
 
@@ -175,6 +177,23 @@ class AsynchronousActionManager(object):
                     "Action %s failed: %s" % (ah, tmp.explanation))
         return self.get_results(ah)
 
+    def add_done_callback(self, ah, callback):
+        """
+        Register a function that is called with the ActionHandle when
+        the action completes, i.e., when the results can be collected
+        with wait_for() without waiting for the action to execute.
+        The function may be called by another thread.
+
+        Returns False if the manager cannot notify the completion of
+        the action, in which case the function is not called.  By
+        default, the function is called immediately if the action is
+        no longer queued, and False is returned otherwise.
+        """
+        if self.event_handle[ah.id].status == ActionStatus.queued:
+            return False
+        callback(ah)
+        return True
+
     def num_queued(self):
         """
         Return the number of queued actions.
@@ -218,3 +237,75 @@ class AsynchronousActionManager(object):
         value, to indicate an error.
         """
         raise ActionManagerError("The _perform_wait_any method is not defined")      #pragma:nocover
+
+
+class ActionFuture(object):
+    """
+    The eventual result of an action that was queued in an action
+    manager.  The result is collected from the manager by result(),
+    which waits for the action to complete.
+
+    On Python 3.5+, an ActionFuture can be awaited by a coroutine
+    running in an asyncio event loop of the thread that queued the
+    action.  If the manager notifies the event loop when the action
+    completes (see AsynchronousActionManager.add_done_callback), the
+    result is then collected in the event loop.  Otherwise, the
+    result is collected in a thread of the default executor of the
+    loop.  In both cases, the loop is not blocked while the action
+    executes.
+    """
+
+    # managers are not thread-safe, so the results of the actions
+    # awaited in executor threads are collected one at a time
+    _lock = threading.Lock()
+
+    def __init__(self, manager, ah):
+        self.manager = manager
+        self.action_handle = ah
+        self._results = None
+        self._collected = False
+        self._asyncio_future = None
+
+    def done(self):
+        """
+        Return True if the result has been collected from the manager.
+        """
+        return self._collected
+
+    def result(self):
+        """
+        Wait for the action to complete, and return its result.
+        """
+        if not self._collected:
+            with ActionFuture._lock:
+                if not self._collected:
+                    self._results = self.manager.wait_for(self.action_handle)
+                    self._collected = True
+        return self._results
+
+    def __await__(self):
+        if self._asyncio_future is None:
+            import asyncio
+            get_running_loop = getattr(asyncio, 'get_running_loop', None)
+            if get_running_loop is None:
+                # Python < 3.7: this is the running loop when the
+                # future is awaited by a coroutine
+                loop = asyncio.get_event_loop()
+            else:
+                loop = get_running_loop()
+            future = loop.create_future()
+            def collect():
+                if future.cancelled():
+                    return
+                try:
+                    future.set_result(self.result())
+                except Exception as e:
+                    future.set_exception(e)
+            if self.manager.add_done_callback(
+                    self.action_handle,
+                    lambda ah: loop.call_soon_threadsafe(collect)):
+                self._asyncio_future = future
+            else:
+                self._asyncio_future = loop.run_in_executor(None,
+                                                            self.result)
+        return self._asyncio_future.__await__()
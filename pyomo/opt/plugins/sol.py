@@ -12,6 +12,8 @@
 #
 
 import re
+import mmap
+from array import array
 
 import pyutilib.misc
 
@@ -23,12 +25,159 @@ from pyomo.opt import (SolverResults,
                        SolverStatus,
                        TerminationCondition)
 
+import six
 from six.moves import xrange
 
+try:
+    import numpy
+    numpy_available = True
+except ImportError:
+    numpy_available = False
+
+if six.PY3:
+    def _decode(data):
+        return data.decode('utf-8', 'replace')
+else:
+    def _decode(data):
+        return data
+
+# the number of bytes scanned at a time for the end of the primal and
+# dual blocks
+_chunk_size = 1 << 22
+
+def _find_lines_end(data, pos, nlines):
+    """
+    Return the offset just past the nlines-th newline in data after
+    pos, or len(data) if the last line is not terminated.
+    """
+    if nlines == 0:
+        return pos
+    size = len(data)
+    if numpy_available:
+        # the start of the line after the last newline found
+        line_start = pos
+        while pos < size:
+            chunk = numpy.frombuffer(data,
+                                     dtype=numpy.uint8,
+                                     count=min(_chunk_size, size - pos),
+                                     offset=pos)
+            newlines = numpy.flatnonzero(chunk == 10)
+            if len(newlines) >= nlines:
+                return pos + int(newlines[nlines - 1]) + 1
+            if len(newlines):
+                line_start = pos + int(newlines[-1]) + 1
+            nlines -= len(newlines)
+            pos += len(chunk)
+        pos = line_start
+    else:
+        while nlines:
+            i = data.find(b'\n', pos)
+            if i < 0:
+                break
+            pos = i + 1
+            nlines -= 1
+        if not nlines:
+            return pos
+    if (nlines == 1) and data[pos:size].strip():
+        return size
+    return None
+
+def _parse_values(data, start, stop):
+    """
+    Return the whitespace separated numbers in data[start:stop] as a
+    NumPy array of doubles (or an array.array if NumPy is not
+    available).
+    """
+    if numpy_available:
+        return numpy.array(data[start:stop].split(), dtype=numpy.float64)
+    return array('d', map(float, data[start:stop].split()))
+
+def _read_sol_file(filename):
+    """
+    Read the header and the dual and primal values of a *.sol file.
+
+    The file is memory-mapped and the blocks of dual and primal values
+    are parsed in bulk. Returns a tuple (msg, nopts, z, y, x, lines)
+    where y and x are arrays of the dual and primal values, and lines
+    is a list of the remaining lines of the file (the objno line and
+    the suffixes).
+    """
+    with open(filename, 'rb') as INPUT:
+        try:
+            data = mmap.mmap(INPUT.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty file
+            data = None
+        if data is None:
+            raise ValueError("Error reading \"" + filename +
+                             "\": no Options line found.\n"
+                             "SOL File Output:\n")
+        try:
+            def readline():
+                return _decode(data.readline())
+            msg = ""
+            line = readline()
+            if line.strip() == "":
+                line = readline()
+            while line:
+                if line[0] == '\n' or (line[0] == '\r' and line[1] == '\n'):
+                    break
+                msg += line
+                line = readline()
+            z = []
+            line = readline()
+            if line[:7] == "Options":
+                line = readline()
+                nopts = int(line)
+                need_vbtol = False
+                if nopts > 4:           # WEH - when is this true?
+                    nopts -= 2
+                    need_vbtol = True
+                for i in xrange(nopts + 4):
+                    line = readline()
+                    z += [int(line)]
+                if need_vbtol:          # WEH - when is this true?
+                    line = readline()
+                    z += [float(line)]
+            else:
+                msg = ("Error reading \"" + filename +
+                       "\": no Options line found.\nSOL File Output:\n")
+                msg += _decode(data[:])
+                raise ValueError(msg)
+            n = z[nopts + 3] # variables
+            m = z[nopts + 1] # constraints
+            start = data.tell()
+            middle = _find_lines_end(data, start, m)
+            stop = None
+            if middle is not None:
+                stop = _find_lines_end(data, middle, n)
+            if stop is None:
+                raise ValueError("Error reading \"" + filename +
+                                 "\": expected %d dual and %d primal values"
+                                 % (m, n))
+            y = _parse_values(data, start, middle)
+            x = _parse_values(data, middle, stop)
+            if (len(y) != m) or (len(x) != n):
+                raise ValueError("Error reading \"" + filename +
+                                 "\": expected %d dual and %d primal values"
+                                 % (m, n))
+            lines = _decode(data[stop:]).splitlines(True)
+        finally:
+            data.close()
+    return msg, nopts, z, y, x, lines
+
 class ResultsReader_sol(results.AbstractResultsReader):
     """
     Class that reads in a *.sol results file and generates a
     SolverResults object.
+
+    If solution_arrays is True, the primal values (and the dual
+    values, if the dual suffix is requested) are not stored as
+    entries of the solution. They are stored as arrays, in the order
+    of the variables (constraints) in the NL file, in the
+    _variable_values (_constraint_duals) attribute of the solution,
+    which ModelSolutions.add_solution loads with the indexed symbols
+    of the symbol map.
     """
 
     alias(str(ResultsFormat.sol))
@@ -37,6 +186,7 @@ class ResultsReader_sol(results.AbstractResultsReader):
         results.AbstractResultsReader.__init__(self,ResultsFormat.sol)
         if not name is None:
             self.name = name
+        self.solution_arrays = False
 
     def __call__(self, filename, res=None, soln=None, suffixes=[]):
         """
@@ -46,56 +196,16 @@ class ResultsReader_sol(results.AbstractResultsReader):
         if res is None:
             res = SolverResults()
         #
-        IN = open(filename,"r")
-        msg = ""
-        line = IN.readline()
-        if line.strip() == "":
-            line = IN.readline()
-        while line:
-            if line[0] == '\n' or (line[0] == '\r' and line[1] == '\n'):
-                break
-            msg += line
-            line = IN.readline()
-        z = []
-        line = IN.readline()
-        if line[:7] == "Options":
-            line = IN.readline()
-            nopts = int(line)
-            need_vbtol = False
-            if nopts > 4:           # WEH - when is this true?
-                nopts -= 2
-                need_vbtol = True
-            for i in xrange(nopts + 4):
-                line = IN.readline()
-                z += [int(line)]
-            if need_vbtol:          # WEH - when is this true?
-                line = IN.readline()
-                z += [float(line)]
-        else:
-            IN.close()
-            msg = ("Error reading \"" + filename +
-                   "\": no Options line found.\nSOL File Output:\n")
-            IN = open(filename, 'r')
-            for line in IN:
-                msg += line
-            IN.close()
-            raise ValueError(msg)
+        msg, nopts, z, y, x, lines = _read_sol_file(filename)
         n = z[nopts + 3] # variables
         m = z[nopts + 1] # constraints
-        x = []
-        y = []
-        i = 0
-        while i < m:
-            line = IN.readline()
-            y.append(float(line))
-            i += 1
-        i = 0
-        while i < n:
-            line = IN.readline()
-            x.append(float(line))
-            i += 1
+        lines.reverse()
+        def readline():
+            if lines:
+                return lines.pop()
+            return ""
         objno = [0,0]
-        line = IN.readline()
+        line = readline()
         if line:                    # WEH - when is this true?
             if line[:5] != "objno":         #pragma:nocover
                 raise ValueError("Error reading \"" + filename +
@@ -164,17 +274,23 @@ class ResultsReader_sol(results.AbstractResultsReader):
             soln.message = msg.strip()
             soln.message = res.solver.message.replace("\n","; ")
             soln_variable = soln.variable
-            i = 0
-            for var_value in x:
-                soln_variable["v"+str(i)] = {"Value" : var_value}
-                i = i + 1
             soln_constraint = soln.constraint
-            if any(re.match(suf,"dual") for suf in suffixes):
-                for i in xrange(0,len(y)):
-                    soln_constraint["c"+str(i)] = {"Dual" : y[i]}
+            load_duals = any(re.match(suf,"dual") for suf in suffixes)
+            if self.solution_arrays:
+                soln._variable_values = x
+                if load_duals:
+                    soln._constraint_duals = y
+            else:
+                soln_variable.update(
+                    ("v"+str(i), {"Value" : var_value})
+                    for i, var_value in enumerate(x.tolist()))
+                if load_duals:
+                    soln_constraint.update(
+                        ("c"+str(i), {"Dual" : dual})
+                        for i, dual in enumerate(y.tolist()))
 
             ### Read suffixes ###
-            line = IN.readline()
+            line = readline()
             while line:
                 line = line.strip().split()
                 if line[0] != 'suffix':
@@ -182,10 +298,10 @@ class ResultsReader_sol(results.AbstractResultsReader):
                     # section like kestrel_option, which
                     # comes after all suffixes.
                     remaining = ""
-                    line = IN.readline()
+                    line = readline()
                     while line:
                         remaining += line.strip()+"; "
-                        line = IN.readline()
+                        line = readline()
                     res.solver.message += remaining
                     break
                 unmasked_kind = int(line[1])
@@ -197,20 +313,20 @@ class ResultsReader_sol(results.AbstractResultsReader):
                 namelen = int(line[3])
                 tablen = int(line[4])
                 tabline = int(line[5])
-                suffix_name = IN.readline().strip()
+                suffix_name = readline().strip()
                 if any(re.match(suf,suffix_name) for suf in suffixes):
                     # ignore translation of the table number to string value for now,
                     # this information can be obtained from the solver documentation
                     for n in xrange(tabline):
-                        IN.readline()
+                        readline()
                     if kind == 0: # Var
                         for cnt in xrange(nvalues):
-                            suf_line = IN.readline().split()
-                            soln_variable["v"+suf_line[0]][suffix_name] = \
+                            suf_line = readline().split()
+                            soln_variable.setdefault("v"+suf_line[0],{})[suffix_name] = \
                                 convert_function(suf_line[1])
                     elif kind == 1: # Con
                         for cnt in xrange(nvalues):
-                            suf_line = IN.readline().split()
+                            suf_line = readline().split()
                             key = "c"+suf_line[0]
                             if key not in soln_constraint:
                                 soln_constraint[key] = {}
@@ -222,22 +338,21 @@ class ResultsReader_sol(results.AbstractResultsReader):
                                 convert_function(suf_line[1])
                     elif kind == 2: # Obj
                         for cnt in xrange(nvalues):
-                            suf_line = IN.readline().split()
+                            suf_line = readline().split()
                             soln.objective.setdefault("o"+suf_line[0],{})[suffix_name] = \
                                 convert_function(suf_line[1])
                     elif kind == 3: # Prob
                         # Skip problem kind suffixes for now. Not sure the
                         # best place to put them in the results object
                         for cnt in xrange(nvalues):
-                            suf_line = IN.readline().split()
+                            suf_line = readline().split()
                             soln.problem[suffix_name] = convert_function(suf_line[1])
                 else:
                     # do not store the suffix in the solution object
                     for cnt in xrange(nvalues):
-                        IN.readline()
-                line = IN.readline()
+                        readline()
+                line = readline()
         ###
-        IN.close()
         #
         # This is a bit of a hack to accommodate PICO.  If
         # the PICO parser has parsed the # of constraints, then
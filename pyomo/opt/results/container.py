@@ -7,10 +7,15 @@
 #  This software is distributed under the BSD License.
 #  _________________________________________________________________________
 
-__all__ = ['UndefinedData', 'undefined', 'ignore', 'ScalarData', 'ListContainer', 'MapContainer', 'default_print_options', 'ScalarType']
+__all__ = ['UndefinedData', 'undefined', 'ignore', 'ScalarData', 'ListContainer', 'MapContainer', 'CompactMap', 'default_print_options', 'ScalarType']
 
 import copy
 import math
+from array import array
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
 
 import pyutilib.math
 from pyutilib.misc import Bunch
@@ -53,6 +58,8 @@ class ScalarData(object):
             value = str(self.value)
         elif type(self.value) is UndefinedData:
             value = '<undefined>'
+        elif type(self.value) is CompactMap:
+            value = self.value.to_dict()
         else:
             value = self.value
         return value
@@ -126,6 +133,207 @@ class ScalarData(object):
             self.value = repn
 
 
+#
+# This class stores a map from names to dictionaries of attribute
+# values (e.g., the variables of a solution: name -> {'Value': val})
+# as a list of names and one array of values per attribute. The
+# dictionaries of the entries are not created until an entry is
+# accessed (or the map is modified), so a solution with compact
+# variable and constraint data is cheap to store and to pickle.
+#
+class CompactMap(MutableMapping):
+
+    def __init__(self, names=(), columns=None):
+        #
+        # names:    the keys of the entries
+        # columns:  attribute -> (positions, values), where values[i]
+        #           is the value of the attribute for the entry with
+        #           key names[positions[i]] (positions is None if all
+        #           entries have the attribute)
+        #
+        self._names = names
+        if columns is None:
+            columns = {}
+        self._columns = columns
+        # the names of the entries, for membership tests before the
+        # entries are created
+        self._index = None
+        # the entries, once they are created
+        self._dict = None
+
+    @classmethod
+    def from_dict(cls, entries):
+        """
+        Create a CompactMap with the entries of a dictionary.
+        """
+        names = list(entries)
+        positions = {}
+        values = {}
+        for i, name in enumerate(names):
+            for attr, val in iteritems(entries[name]):
+                if attr not in values:
+                    positions[attr] = []
+                    values[attr] = []
+                positions[attr].append(i)
+                values[attr].append(val)
+        columns = {}
+        for attr in values:
+            vals = values[attr]
+            if all(type(val) is float for val in vals):
+                vals = array('d', vals)
+            if len(vals) == len(names):
+                columns[attr] = (None, vals)
+            else:
+                columns[attr] = (array('l', positions[attr]), vals)
+        return cls(names, columns)
+
+    def is_compact(self):
+        """
+        Returns True if the entries have not been created.
+        """
+        return self._dict is None
+
+    def attributes(self):
+        """
+        Return the names of the attributes of the entries.
+        """
+        if self._dict is not None:
+            attrs = set()
+            for entry in itervalues(self._dict):
+                attrs.update(entry)
+            return sorted(attrs)
+        return sorted(self._columns)
+
+    def column(self, attr):
+        """
+        Return a tuple (names, values) for an attribute, where values[i]
+        is the value of the attribute for the entry names[i] (the names
+        are the names of the entries with the attribute).
+        """
+        if self._dict is not None:
+            items = [(name, entry[attr])
+                     for name, entry in iteritems(self._dict)
+                     if attr in entry]
+            return [name for name, val in items], [val for name, val in items]
+        if attr not in self._columns:
+            return [], []
+        positions, values = self._columns[attr]
+        if positions is None:
+            return self._names, values
+        names = self._names
+        return [names[i] for i in positions], values
+
+    def to_dict(self):
+        """
+        Return a dictionary with the entries (the map is not changed).
+        """
+        if self._dict is not None:
+            return dict((name, dict(entry))
+                        for name, entry in iteritems(self._dict))
+        entries = dict((name, {}) for name in self._names)
+        names = self._names
+        for attr, (positions, values) in iteritems(self._columns):
+            if isinstance(values, array):
+                values = values.tolist()
+            if positions is None:
+                for name, val in zip(names, values):
+                    entries[name][attr] = val
+            else:
+                for i, val in zip(positions, values):
+                    entries[names[i]][attr] = val
+        return entries
+
+    def _entries(self):
+        if self._dict is None:
+            self._dict = self.to_dict()
+            self._names = None
+            self._columns = None
+            self._index = None
+        return self._dict
+
+    def __len__(self):
+        if self._dict is None:
+            return len(self._names)
+        return len(self._dict)
+
+    def __iter__(self):
+        if self._dict is None:
+            return iter(self._names)
+        return iter(self._dict)
+
+    def __contains__(self, name):
+        if self._dict is None:
+            if self._index is None:
+                self._index = frozenset(self._names)
+            return name in self._index
+        return name in self._dict
+
+    def __getitem__(self, name):
+        return self._entries()[name]
+
+    def __setitem__(self, name, val):
+        self._entries()[name] = val
+
+    def __delitem__(self, name):
+        del self._entries()[name]
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+    #
+    # The names and the arrays are pickled as strings (when possible),
+    # which is much smaller and faster to load than a list of
+    # objects.
+    #
+
+    def __getstate__(self):
+        state = copy.copy(self.__dict__)
+        # the index is rebuilt when it is needed
+        state['_index'] = None
+        if self._dict is not None:
+            return state
+        names = self._names
+        if all(type(name) is str for name in names):
+            joined = '\0'.join(names)
+            if joined.count('\0') == max(len(names) - 1, 0):
+                state['_names'] = (len(names), joined)
+        state['_columns'] = dict(
+            (attr, (_pack_array(positions), _pack_array(values)))
+            for attr, (positions, values) in iteritems(self._columns))
+        return state
+
+    def __setstate__(self, state):
+        self._index = None
+        self.__dict__.update(state)
+        if self._dict is not None:
+            return
+        if type(self._names) is tuple:
+            n, joined = self._names
+            self._names = joined.split('\0') if n else []
+        self._columns = dict(
+            (attr, (_unpack_array(positions), _unpack_array(values)))
+            for attr, (positions, values) in iteritems(self._columns))
+
+def _pack_array(values):
+    if not isinstance(values, array):
+        return values
+    tobytes = getattr(values, 'tobytes', None)
+    if tobytes is None:
+        tobytes = values.tostring
+    return (values.typecode, tobytes())
+
+def _unpack_array(values):
+    if type(values) is not tuple:
+        return values
+    typecode, data = values
+    ans = array(typecode)
+    frombytes = getattr(ans, 'frombytes', None)
+    if frombytes is None:
+        frombytes = ans.fromstring
+    frombytes(data)
+    return ans
+
+
 #
 # This class manages a list of MapContainer objects.
 #
@@ -62,6 +62,16 @@ class SolverResults(MapContainer):
         self._sections.append(tmp)
         self._descriptions[tmp]=description
 
+    def compact(self):
+        """
+        Store the variable and constraint data of the solutions as
+        parallel arrays of names and values, which reduces the memory
+        used by the results and the size of the pickled results. The
+        data of a solution is created again when it is accessed, and
+        it is not changed when the results are printed or written.
+        """
+        dict.__getitem__(self, 'Solution').compact()
+
     def json_repn(self, options=None):
         if options is None:
             return self._repn_(SolverResults.default_print_options)
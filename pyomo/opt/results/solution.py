@@ -93,6 +93,17 @@ class Solution(MapContainer):
             self.objective = tmp_
         MapContainer.load(self, repn)
 
+    def compact(self):
+        """
+        Store the variable and constraint data of this solution as
+        parallel arrays (see CompactMap). The entries are created
+        again when they are accessed.
+        """
+        for key in ('Variable', 'Constraint'):
+            item = dict.__getitem__(self, key)
+            if type(item.value) is dict:
+                item.value = CompactMap.from_dict(item.value)
+
     def pprint(self, ostream, option, from_list=False, prefix="", repn=None):
         #
         # the following is specialized logic for handling variable and
@@ -104,7 +115,10 @@ class Solution(MapContainer):
             if not key in repn or key == 'Problem':
                 continue
             item = dict.__getitem__(self,key)
-            if not type(item.value) is dict:
+            value = item.value
+            if type(value) is CompactMap:
+                value = value.to_dict()
+            if not type(value) is dict:
                 #
                 # Do a normal print
                 #
@@ -114,7 +128,7 @@ class Solution(MapContainer):
                 else:
                     ostream.write(prefix+key+": ")
                 item.pprint(ostream, option, prefix=prefix+"  ", repn=repn[key])
-            elif len(item.value) == 0:
+            elif len(value) == 0:
                 #
                 # The dictionary is empty
                 #
@@ -128,7 +142,6 @@ class Solution(MapContainer):
                 #
                 # Print values in the dictionary
                 #
-                value = item.value
                 id_ctr = 0
                 id_dict_map = {}
                 id_name_map = {} # the name could be an integer or float - so convert prior to       printing (see code below)
@@ -211,6 +224,14 @@ class SolutionSet(ListContainer):
             ostream.write(prefix+'- ')
             item.pprint(ostream, option, from_list=True, prefix=prefix+"  ", repn=repn[i+1])
 
+    def compact(self):
+        """
+        Store the variable and constraint data of the solutions as
+        parallel arrays (see Solution.compact).
+        """
+        for item in self._list:
+            item.compact()
+
     def load(self, repn):
         #
         # Note: we ignore the first element of the repn list, since
@@ -13,6 +13,7 @@ import os
 import sys
 import time
 import logging
+import threading
 
 import pyutilib.misc
 from pyutilib.common import ApplicationError, WindowsError
@@ -26,6 +27,19 @@ from pyomo.opt.results import SolverStatus, SolverResults
 
 logger = logging.getLogger('pyomo.opt')
 
+
+def tmpfs_directory():
+    """
+    Return the directory of a memory-backed file system where solver
+    problem and solution files can be written (the PYOMO_TMPFS
+    environment variable, or /dev/shm), or None if there is none.
+    """
+    path = os.environ.get('PYOMO_TMPFS', '/dev/shm')
+    if os.path.isdir(path) and os.access(path, os.W_OK):
+        return path
+    return None
+
+
 class SystemCallSolver(OptSolver):
     """ A generic command line solver """
 
@@ -191,21 +205,38 @@ class SystemCallSolver(OptSolver):
         TempfileManager.push()
 
         self._keepfiles = kwds.pop("keepfiles", False)
-
-        OptSolver._presolve(self, *args, **kwds)
-
-        #
-        # Verify that the input problems exists
         #
-        for filename in self._problem_files:
-            if not os.path.exists(filename):
-                msg = 'Solver failed to locate input problem file: %s'
-                raise ValueError(msg % filename)
+        # Write the problem, solution and log files to a memory-backed
+        # file system
         #
-        # Create command line
-        #
-        self._command = self.create_command_line(
-            self.executable(), self._problem_files)
+        tempdir = TempfileManager.tempdir
+        if kwds.pop("tmpfs", False):
+            tmpfs = tmpfs_directory()
+            if tmpfs is None:
+                logger.warning("No memory-backed file system is available "
+                               "for the files of solver %s (set the "
+                               "PYOMO_TMPFS environment variable)"
+                               % (self.name))
+            else:
+                TempfileManager.tempdir = tmpfs
+
+        try:
+            OptSolver._presolve(self, *args, **kwds)
+
+            #
+            # Verify that the input problems exists
+            #
+            for filename in self._problem_files:
+                if not os.path.exists(filename):
+                    msg = 'Solver failed to locate input problem file: %s'
+                    raise ValueError(msg % filename)
+            #
+            # Create command line
+            #
+            self._command = self.create_command_line(
+                self.executable(), self._problem_files)
+        finally:
+            TempfileManager.tempdir = tempdir
 
         self._log_file=self._command.log_file
         #
@@ -296,12 +327,17 @@ class SystemCallSolver(OptSolver):
                 _input = command.script
             else:
                 _input = None
+            # signal handlers can only be set in the main thread (the
+            # 'threadpool' solver manager executes commands in other
+            # threads)
             [rc, log] = run(
                 command.cmd,
                 stdin = _input,
                 timelimit = self._timelimit,
                 env   = command.env,
-                tee   = self._tee
+                tee   = self._tee,
+                define_signal_handlers = (
+                    threading.current_thread().name == 'MainThread')
              )
         except WindowsError:
             err = sys.exc_info()[1]
@@ -20,6 +20,7 @@ import pyutilib.services
 
 import pyomo.opt
 from pyomo.opt import TerminationCondition, SolutionStatus
+import pyomo.opt.plugins.sol as sol
 
 old_tempdir = pyutilib.services.TempfileManager.tempdir
 
@@ -65,5 +66,164 @@ class Test(unittest.TestCase):
                              TerminationCondition.infeasible)
             self.assertEqual(soln.solution.status,
                              SolutionStatus.infeasible)
+
+    def test_solution_arrays(self):
+        with pyomo.opt.ReaderFactory("sol") as reader:
+            if reader is None:
+                raise IOError("Reader 'sol' is not registered")
+            baseline = reader(currdir+"test4_sol.sol", suffixes=["dual"])
+            reader.solution_arrays = True
+            soln = reader(currdir+"test4_sol.sol", suffixes=["dual"])
+            self.assertEqual(len(soln.solution(0).variable), 0)
+            self.assertEqual(len(soln.solution(0).constraint), 0)
+            x = soln.solution(0)._variable_values
+            y = soln.solution(0)._constraint_duals
+            self.assertEqual(len(x), 32)
+            self.assertEqual(len(y), 24)
+            for i, val in enumerate(x):
+                self.assertEqual(baseline.solution(0).variable["v%d" % i],
+                                 {"Value": val})
+            self.assertEqual(y[2], 0.12599999999999997)
+            self.assertEqual(soln.solver.termination_condition,
+                             baseline.solver.termination_condition)
+
+    def test_truncated(self):
+        with open(currdir+"test4_sol.sol") as INPUT:
+            lines = INPUT.readlines()
+        with open(currdir+"test_sol.txt", "w") as OUTPUT:
+            OUTPUT.write("".join(lines[:-5]))
+        with pyomo.opt.ReaderFactory("sol") as reader:
+            if reader is None:
+                raise IOError("Reader 'sol' is not registered")
+            self.assertRaises(ValueError, reader, currdir+"test_sol.txt")
+
+
+class TestFindLinesEnd(unittest.TestCase):
+
+    def setUp(self):
+        self.sol = sol
+        self.numpy_available = sol.numpy_available
+        self.chunk_size = sol._chunk_size
+
+    def tearDown(self):
+        self.sol.numpy_available = self.numpy_available
+        self.sol._chunk_size = self.chunk_size
+
+    def _check(self, numpy_available, chunk_size):
+        self.sol.numpy_available = numpy_available
+        self.sol._chunk_size = chunk_size
+        find = self.sol._find_lines_end
+        data = b"1\n2.5\n-3\n"
+        self.assertEqual(find(data, 0, 0), 0)
+        self.assertEqual(find(data, 0, 2), 6)
+        self.assertEqual(find(data, 2, 2), 9)
+        self.assertEqual(find(data, 0, 4), None)
+        # an unterminated last line
+        data = b"1\n2.5\n-3"
+        self.assertEqual(find(data, 0, 3), len(data))
+        self.assertEqual(find(data, 6, 1), len(data))
+        self.assertEqual(find(data, 0, 4), None)
+        self.assertEqual(find(b"1\n2\n  ", 0, 3), None)
+        self.assertEqual(
+            list(self.sol._parse_values(data, 0, find(data, 0, 3))),
+            [1.0, 2.5, -3.0])
+
+    def test_python(self):
+        self._check(False, self.chunk_size)
+
+    @unittest.skipIf(not sol.numpy_available,
+                     "NumPy is not available")
+    def test_numpy(self):
+        self._check(True, self.chunk_size)
+        # the newlines are found across several chunks
+        self._check(True, 2)
+
+
+class TestLoadSolutionArrays(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        import pyomo.environ
+
+    def tearDown(self):
+        for name in ("test_sol.nl", "test_sol.sol"):
+            if os.path.exists(currdir+name):
+                os.remove(currdir+name)
+
+    def _solve(self, solution_arrays, suffixes=["dual", "rc"], compact=False):
+        from pyomo.environ import (ConcreteModel, Var, Constraint,
+                                   Objective, Suffix)
+        model = ConcreteModel()
+        model.x = Var([1,2,3], bounds=(0,None))
+        model.y = Var()
+        model.z = Var()
+        model.z.fix(4)
+        model.obj = Objective(expr=model.x[1] + model.y + model.z)
+        model.c = Constraint([1,2], rule=lambda m, i: m.x[i] + m.y >= i)
+        model.d = Constraint(expr=model.x[3] <= 2)
+        model.dual = Suffix(direction=Suffix.IMPORT)
+        model.rc = Suffix(direction=Suffix.IMPORT)
+        _, smap_id = model.write(filename=currdir+"test_sol.nl",
+                                 format=pyomo.opt.ProblemFormat.nl)
+        smap = model.solutions.symbol_map[smap_id]
+        # write a solution in which the value of a variable (or the
+        # dual of a constraint) is 1.5 plus its position in the NL file
+        cons = smap.getIndexedObjects('c')
+        variables = smap.getIndexedObjects('v')
+        with open(currdir+"test_sol.sol", "w") as OUTPUT:
+            OUTPUT.write("\nTest Solver: optimal\n\nOptions\n3\n1\n1\n0\n")
+            OUTPUT.write("%d\n%d\n%d\n%d\n" % (len(cons), len(cons),
+                                                len(variables), len(variables)))
+            for i in range(len(cons)):
+                OUTPUT.write("%r\n" % (1.5+i))
+            for i in range(len(variables)):
+                OUTPUT.write("%r\n" % (1.5+i))
+            OUTPUT.write("objno 0 0\n")
+            OUTPUT.write("suffix 4 1 3 0 0\nrc\n0 -1.5\n")
+        with pyomo.opt.ReaderFactory("sol") as reader:
+            reader.solution_arrays = solution_arrays
+            results = reader(currdir+"test_sol.sol", suffixes=suffixes)
+        if compact:
+            results.compact()
+        results._smap_id = smap_id
+        model.solutions.load_from(results)
+        return model, variables, cons
+
+    def test_load(self):
+        for solution_arrays, compact in ((False, False),
+                                         (True, False),
+                                         (False, True),
+                                         (True, True)):
+            model, variables, cons = self._solve(solution_arrays,
+                                                 compact=compact)
+            self.assertEqual(len(model.solutions), 1)
+            for i, vardata in enumerate(variables):
+                self.assertEqual(vardata.value, 1.5+i)
+                self.assertFalse(vardata.stale)
+            self.assertEqual(model.z.value, 4)
+            for i, condata in enumerate(cons):
+                self.assertEqual(model.dual[condata], 1.5+i)
+            self.assertEqual(len(model.rc), 1)
+            self.assertEqual(model.rc[variables[0]], -1.5)
+
+    def test_no_duals(self):
+        model, variables, cons = self._solve(True, suffixes=[])
+        self.assertEqual(len(model.dual), 0)
+        self.assertEqual(model.x[3].value, 1.5+variables.index(model.x[3]))
+
+    def test_store_to(self):
+        model, variables, cons = self._solve(True)
+        results = pyomo.opt.SolverResults()
+        model.solutions.store_to(results)
+        self.assertEqual(results.solution(0).variable["x[1]"]["Value"],
+                         model.x[1].value)
+        self.assertEqual(results.solution(0).constraint["d"]["Dual"],
+                         model.dual[model.d])
+        # reselect the stored solution
+        model.x[1].value = None
+        model.solutions.select(0)
+        self.assertEqual(model.x[1].value,
+                         1.5+variables.index(model.x[1]))
+
 if __name__ == "__main__":
     unittest.main()
@@ -175,6 +175,72 @@ class Test(unittest.TestCase):
         self.assertEqual(self.soln.variable[4]["Value"],0.3)
         self.assertEqual(self.soln.variable[4]["Slack"],0.4)
 
+    def test_compact_write(self):
+        """ Write a compact SolverResults Object """
+        self.results = pyomo.opt.SolverResults()
+        self.results.read(filename=currdir+"test4_sol.jsn", format='json')
+        self.results.compact()
+        variable = self.results.solution(0).variable
+        self.assertTrue(isinstance(variable, pyomo.opt.CompactMap))
+        self.results.write(filename=currdir+"read_solution2.out", format='json')
+        self.assertMatchesJsonBaseline(currdir+"read_solution2.out", currdir+"test4_sol.jsn")
+        # writing the results does not create the entries
+        self.assertTrue(variable.is_compact())
+
+    def test_compact_pprint(self):
+        """ Print a compact solution """
+        self.soln.variable[1]["Value"]=0.0
+        self.soln.variable[2]["Value"]=0.0
+        self.soln.variable[4]["Value"]=0.0
+        self.results.compact()
+        pyutilib.misc.setup_redirect(currdir+"soln_pprint2.out")
+        print(self.soln)
+        pyutilib.misc.reset_redirect()
+        self.assertFileEqualsBaseline(currdir+"soln_pprint2.out", currdir+"soln_pprint2.txt")
+
+    def test_compact_pickle(self):
+        """ Pickle a compact SolverResults Object """
+        self.results = pyomo.opt.SolverResults()
+        soln = self.results.solution.add()
+        for i in range(1000):
+            soln.variable["x[%d]" % i] = {"Value": i+0.5}
+            soln.constraint["c[%d]" % i] = {"Dual": -i-0.5}
+        soln.variable["x[3]"]["Rc"] = 1.5
+        baseline = (soln.variable.copy(), soln.constraint.copy())
+        full_size = len(pickle.dumps(self.results, protocol=2))
+        self.results.compact()
+        compact_size = len(pickle.dumps(self.results, protocol=2))
+        self.assertTrue(compact_size < 0.7*full_size)
+        res = pickle.loads(pickle.dumps(self.results, protocol=2))
+        variable = res.solution(0).variable
+        self.assertTrue(variable.is_compact())
+        self.assertEqual(len(variable), 1000)
+        self.assertTrue("x[999]" in variable)
+        self.assertFalse("x[1000]" in variable)
+        names, values = variable.column("Rc")
+        self.assertEqual((list(names), list(values)), (["x[3]"], [1.5]))
+        self.assertEqual(variable.to_dict(), baseline[0])
+        self.assertEqual(res.solution(0).constraint.to_dict(), baseline[1])
+
+    def test_compact_access(self):
+        """ Access the entries of a compact solution """
+        self.soln.variable[2]["Slack"] = 0.4
+        self.results.compact()
+        variable = self.soln.variable
+        self.assertEqual(sorted(variable), [1,2,4])
+        self.assertTrue(variable.is_compact())
+        # membership tests do not create the entries
+        self.assertTrue(2 in variable)
+        self.assertFalse(3 in variable)
+        self.assertTrue(variable.is_compact())
+        self.assertEqual(variable[2], {"Value": 0, "Slack": 0.4})
+        self.assertFalse(variable.is_compact())
+        variable[2]["Value"] = 0.3
+        variable[5] = {"Value": 1.0}
+        self.assertEqual(self.soln.variable[2]["Value"], 0.3)
+        self.assertEqual(sorted(self.soln.variable), [1,2,4,5])
+        self.assertEqual(variable.column("Slack"), ([2], [0.4]))
+
 if __name__ == "__main__":
     import pyutilib.misc
     #sys.settrace(pyutilib.misc.traceit)
@@ -60,7 +60,8 @@ from pyomo.pysp.scenariotree.manager import InvocationType
 from pyomo.pysp.scenariotree.manager_solver import \
     (ScenarioTreeManagerSolver,
      ScenarioTreeManagerSolverClientSerial,
-     ScenarioTreeManagerSolverClientPyro)
+     ScenarioTreeManagerSolverClientPyro,
+     ScenarioTreeManagerSolverClientMultiprocess)
 from pyomo.pysp.phutils import find_active_objective
 from pyomo.pysp.ef import create_ef_instance
 
@@ -1268,6 +1269,7 @@ def runbenders_register_options(options=None):
                                "output_scenario_tree_solution")
     ScenarioTreeManagerSolverClientSerial.register_options(options)
     ScenarioTreeManagerSolverClientPyro.register_options(options)
+    ScenarioTreeManagerSolverClientMultiprocess.register_options(options)
     BendersAlgorithm.register_options(options)
 
     return options
@@ -1287,6 +1289,8 @@ def runbenders(options):
         manager_class = ScenarioTreeManagerSolverClientSerial
     elif options.scenario_tree_manager == 'pyro':
         manager_class = ScenarioTreeManagerSolverClientPyro
+    elif options.scenario_tree_manager == 'multiprocess':
+        manager_class = ScenarioTreeManagerSolverClientMultiprocess
 
     with manager_class(options) \
          as manager:
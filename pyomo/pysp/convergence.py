@@ -11,6 +11,9 @@ from math import fabs
 
 from pyomo.pysp.generators import \
     scenario_tree_node_variables_generator_noinstances
+from pyomo.pysp.phvectorutils import numpy_available
+if numpy_available:
+    import numpy
 
 from six import iteritems, iterkeys
 
@@ -142,6 +145,13 @@ class TermDiffConvergence(ConvergenceBase):
 
         term_diff = 0.0
 
+        if getattr(ph, "_vectorized_updates", False):
+            for probabilities, average_values, diffs in \
+                _term_diff_arrays(ph, scenario_tree):
+                term_diff += \
+                    (probabilities[:, None] * numpy.abs(diffs)).sum()
+            return float(term_diff)
+
         for stage, tree_node, variable_id, variable_values, is_fixed, is_stale \
             in scenario_tree_node_variables_generator_noinstances(
                 scenario_tree,
@@ -159,6 +169,46 @@ class TermDiffConvergence(ConvergenceBase):
         return term_diff
 
 
+#
+# Yields the (scenario x variable) arrays of the differences between
+# the scenario solutions and the node averages for the non-leaf tree
+# nodes, along with the scenario probabilities and the node averages,
+# when the PH object performs vectorized updates (see
+# phvectorutils.py). Only the columns of the variables that are not
+# stale, or that are fixed, are included.
+#
+
+def _term_diff_arrays(ph, scenario_tree):
+
+    for stage in scenario_tree._stages[:-1]:
+        for tree_node in stage._tree_nodes:
+
+            arrays = ph._get_tree_node_arrays(tree_node)
+
+            is_stale = numpy.zeros(len(arrays.variable_ids), dtype=bool)
+            instance_fixed_count = numpy.zeros(len(arrays.variable_ids),
+                                               dtype=int)
+            for scenario in arrays.scenarios:
+                is_stale |= arrays.mask(scenario._stale[tree_node._name])
+                instance_fixed_count += \
+                    arrays.mask(scenario._fixed[tree_node._name])
+            inconsistent = (instance_fixed_count > 0) & \
+                (instance_fixed_count < len(arrays.scenarios))
+            if inconsistent.any():
+                i = numpy.flatnonzero(inconsistent)[0]
+                variable_name, index = \
+                    tree_node._variable_ids[arrays.variable_ids[i]]
+                raise RuntimeError("Variable="+variable_name+str(index)+" is "
+                                   "fixed in "+str(instance_fixed_count[i])+" "
+                                   "scenarios, which is less than the number "
+                                   "of scenarios at tree node="+tree_node._name)
+            included = (~is_stale) | arrays.mask(tree_node._fixed)
+
+            average_values = \
+                arrays.gather_node('_averages')[included]
+            diffs = arrays.gather('_x')[:, included] - average_values
+            yield arrays.probabilities, average_values, diffs
+
 #
 # Implements the normalized "term-diff" metric from our submitted CMS
 # paper.  For each variable, take the fabs of the difference from the
@@ -183,6 +233,18 @@ class NormalizedTermDiffConvergence(ConvergenceBase):
 
         normalized_term_diff = 0.0
 
+        if getattr(ph, "_vectorized_updates", False):
+            for probabilities, average_values, diffs in \
+                _term_diff_arrays(ph, scenario_tree):
+                # should think about nixing the magic constant below
+                nonzero = numpy.abs(average_values) > 0.0001
+                normalized_term_diff += \
+                    (probabilities[:, None] *
+                     numpy.abs(diffs[:, nonzero] /
+                               average_values[nonzero])).sum()
+            return float(normalized_term_diff) / \
+                (ph._total_discrete_vars + ph._total_continuous_vars)
+
         for stage, tree_node, variable_id, variable_values, is_fixed, is_stale \
             in scenario_tree_node_variables_generator_noinstances(
                 scenario_tree,
@@ -24,7 +24,8 @@ from pyomo.pysp.util.misc import (parse_command_line,
                                   sort_extensions_by_precedence)
 from pyomo.pysp.scenariotree.manager_solver import \
     (ScenarioTreeManagerSolverClientSerial,
-     ScenarioTreeManagerSolverClientPyro)
+     ScenarioTreeManagerSolverClientPyro,
+     ScenarioTreeManagerSolverClientMultiprocess)
 from pyomo.pysp.solutionioextensions import \
     (IPySPSolutionSaverExtension,
      IPySPSolutionLoaderExtension)
@@ -136,6 +137,7 @@ def run_evaluate_xhat_register_options(options=None):
             visibility=0))
     ScenarioTreeManagerSolverClientSerial.register_options(options)
     ScenarioTreeManagerSolverClientPyro.register_options(options)
+    ScenarioTreeManagerSolverClientMultiprocess.register_options(options)
 
     return options
 
@@ -159,6 +161,8 @@ def run_evaluate_xhat(options,
         manager_class = ScenarioTreeManagerSolverClientSerial
     elif options.scenario_tree_manager == 'pyro':
         manager_class = ScenarioTreeManagerSolverClientPyro
+    elif options.scenario_tree_manager == 'multiprocess':
+        manager_class = ScenarioTreeManagerSolverClientMultiprocess
 
     with manager_class(options) \
          as manager:
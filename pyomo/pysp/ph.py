@@ -15,7 +15,7 @@ import time
 import inspect
 import uuid
 from operator import itemgetter
-from math import fabs, sqrt
+from math import fabs, sqrt, ceil
 
 try:
     from guppy import hpy
@@ -30,6 +30,7 @@ from pyomo.opt import (UndefinedData,
                        ProblemFormat,
                        undefined,
                        SolverFactory,
+                       PersistentSolver,
                        SolverStatus,
                        TerminationCondition,
                        SolutionStatus)
@@ -60,6 +61,9 @@ from pyomo.pysp.phutils import (create_block_symbol_maps,
                                 _OLD_OUTPUT)
 from pyomo.pysp.util.misc import load_external_module
 from pyomo.pysp import phsolverserverutils
+from pyomo.pysp.phvectorutils import numpy_available, TreeNodeArrays
+if numpy_available:
+    import numpy
 
 from six import iterkeys, itervalues, iteritems
 from six.moves import xrange
@@ -261,6 +265,12 @@ class _PHBase(object):
         self._solver_io = None
         self._comparison_tolerance_for_fixed_vars = 1e-5
 
+        # maps scenario name (or bundle name, in the case of bundling)
+        # to the solver plugin that keeps the compiled sub-problem,
+        # when the sub-problem solver is persistent (see
+        # _get_subproblem_solver)
+        self._subproblem_solvers = {}
+
         self._problem_states = None
         self._modules_imported = {}
 
@@ -946,7 +956,7 @@ class _PHBase(object):
                     self._problem_states.ph_constraints[scenario_name],
                     self._problem_states.objective_updated[scenario_name],
                     not self._write_fixed_variables,
-                    self._solver)
+                    self._subproblem_solvers.get(scenario_name, self._solver))
 
                 # We've preprocessed the instance, reset the relevant flags
                 self._problem_states.clear_update_flags(scenario_name)
@@ -964,6 +974,9 @@ class _PHBase(object):
                 # Until proven otherwise
                 preprocess_bundle_objective = False
                 preprocess_bundle_constraints = False
+                # the variables fixed or freed in the scenario
+                # instances of the bundle
+                bundle_variables = []
 
                 for scenario_name in \
                       self._bundle_scenario_instance_map[scenario_bundle_name]:
@@ -986,6 +999,10 @@ class _PHBase(object):
                         preprocess_bundle_objective = True
                         preprocess_bundle_constraints = True
 
+                    for var_name, var_index in fixed_vars + freed_vars:
+                        bundle_variables.append(
+                            scenario_instance.find_component(var_name)[var_index])
+
                     preprocess_scenario_instance(
                         scenario_instance,
                         fixed_vars,
@@ -1019,12 +1036,70 @@ class _PHBase(object):
                     if preprocess_bundle_constraints:
                         canonical_preprocess_block_constraints(bundle_ef_instance,
                                                                var_id_map)
+
+                # the persistent solver of the bundle compiled the
+                # bundle instance, so the scenario instances (which are
+                # sub-blocks of it) were not updated in it above
+                bundle_solver = \
+                    self._subproblem_solvers.get(scenario_bundle_name)
+                if (bundle_solver is not None) and \
+                   bundle_solver.instance_compiled():
+                    if preprocess_bundle_objective:
+                        bundle_solver.compile_objective(bundle_ef_instance)
+                    if len(bundle_variables) > 0:
+                        bundle_solver.compile_variable_bounds(
+                            bundle_ef_instance,
+                            vars_to_update=[(var.parent_component().cname(True),
+                                             var.index())
+                                            for var in bundle_variables])
+
         end_time = time.time()
 
         if self._output_times:
             print("Scenario instance preprocessing time=%.2f seconds"
                   % (end_time - start_time))
 
+    #
+    # Returns the solver plugin used to solve a scenario or bundle
+    # sub-problem. A persistent solver plugin keeps the compiled model
+    # of a single instance, so when the sub-problem solver is
+    # persistent, each sub-problem gets its own solver object, and the
+    # instance is compiled into it once. Later solves only update the
+    # compiled model (the objective when the PH weights, xbars or rhos
+    # change, and the variable bounds when variables are fixed or
+    # freed), rather than writing the instance out again. Solver
+    # plugins without persistent support are shared by all
+    # sub-problems.
+    #
+
+    def _get_subproblem_solver(self, subproblem_name, instance):
+
+        if not isinstance(self._solver, PersistentSolver):
+            return self._solver
+
+        solver = self._subproblem_solvers.get(subproblem_name)
+        if solver is None:
+            solver = self._subproblem_solvers[subproblem_name] = \
+                SolverFactory(self._solver_type, solver_io=self._solver_io)
+            # all sub-problem solvers use the same options
+            solver.options = self._solver.options
+            solver._report_timing = self._solver._report_timing
+        if not solver.instance_compiled():
+            if self._verbose:
+                print("Compiling instance for sub-problem=%s into "
+                      "persistent solver" % (subproblem_name))
+            solver.compile_instance(
+                instance,
+                symbolic_solver_labels=self._symbolic_solver_labels,
+                output_fixed_variable_bounds=self._write_fixed_variables)
+        return solver
+
+    def _release_subproblem_solvers(self):
+
+        for solver in itervalues(self._subproblem_solvers):
+            solver.deactivate()
+        self._subproblem_solvers = {}
+
     #
     # create PH weight and xbar vectors, on a per-scenario basis, for
     # each variable that is not in the final stage, i.e., for all
@@ -1193,6 +1268,7 @@ class ProgressiveHedging(_PHBase):
 
             phsolverserverutils.release_phsolverservers(self)
 
+        self._release_subproblem_solvers()
         if self._solver is not None:
             self._solver.deactivate()
             self._solver = None
@@ -1469,6 +1545,7 @@ class ProgressiveHedging(_PHBase):
             phsolverserverutils.restore_cached_scenario_solutions(self, cache_id, release_cache)
 
         _PHBase.restoreCachedSolutions(self, cache_id, release_cache)
+        self._invalidate_tree_node_arrays()
 
     def cacheSolutions(self, cache_id=None):
 
@@ -1742,6 +1819,14 @@ class ProgressiveHedging(_PHBase):
 
         self._phpyro_worker_jobs_map = {}
         self._phpyro_job_worker_map = {}
+        # maps scenario (or bundle) names to the SharedArray (and its
+        # layout) used to transmit weights and xbars to the PH solver
+        # server of the scenario (or bundle), if it runs on this host
+        self._phpyro_shared_arrays = {}
+        # maps tree node names to the TreeNodeArrays object used to
+        # perform the vectorized PH updates for the node
+        self._tree_node_arrays = {}
+        self._vectorized_updates = False
         # Helps to gracefully exit PH when a system exit is caught.
         # Holds the set of queued solve action handles that have not
         # been collected yet.
@@ -1812,6 +1897,8 @@ class ProgressiveHedging(_PHBase):
         self._max_iterations = 0
         self._async = False
         self._async_buffer_length = 1
+        self._async_fraction = 0.0
+        self._async_staleness_bound = 0
 
         # it may be the case that some plugins think they can do a
         # better job of weight updates than PH - and it might even be
@@ -1909,6 +1996,8 @@ class ProgressiveHedging(_PHBase):
         self._nu                                  = options.nu
         self._async                               = options.async
         self._async_buffer_length                 = options.async_buffer_length
+        self._async_fraction                      = options.async_fraction
+        self._async_staleness_bound               = options.async_staleness_bound
         self._rho                                 = options.default_rho
         self._rho_setter_file                     = options.rho_cfgfile
         self._xhat_method                         = options.xhat_method
@@ -1941,6 +2030,9 @@ class ProgressiveHedging(_PHBase):
         self._breakpoint_strategy                 = options.breakpoint_strategy
         self._output_scenario_tree_solution       = options.output_scenario_tree_solution
         self._phpyro_transmit_leaf_stage_solution = options.phpyro_transmit_leaf_stage_solution
+        self._phpyro_shared_memory                = options.phpyro_shared_memory
+        self._vectorized_updates                  = \
+            numpy_available and (not options.disable_vectorized_updates)
 
         self._termdiff_threshold                     = options.termdiff_threshold
         self._enable_free_discrete_count_convergence = options.enable_free_discrete_count_convergence
@@ -2113,6 +2205,8 @@ class ProgressiveHedging(_PHBase):
             print("   Max iterations="+str(self._max_iterations))
             print("   Async mode=" + str(self._async))
             print("   Async buffer length=" + str(self._async_buffer_length))
+            print("   Async fraction=" + str(self._async_fraction))
+            print("   Async staleness bound=" + str(self._async_staleness_bound))
             print("   Default global rho=" + str(self._rho))
             print("   Over-relaxation enabled="+str(self._overrelax))
             if self._overrelax:
@@ -2520,6 +2614,9 @@ class ProgressiveHedging(_PHBase):
             if self._verbose:
                 print("Scenario tree ids successfully sent")
 
+            if self._phpyro_shared_memory:
+                phsolverserverutils.initialize_shared_arrays(self)
+
         self._objective_sense = \
             self._scenario_tree._scenarios[0]._objective_sense
 
@@ -2730,20 +2827,23 @@ class ProgressiveHedging(_PHBase):
                         print("Solver manager queuing instance=%s"
                               % (scenario_bundle._name))
 
-                    if warmstart and self._solver.warm_start_capable():
+                    bundle_instance = \
+                        self._bundle_binding_instance_map[scenario_bundle._name]
+                    solver = self._get_subproblem_solver(scenario_bundle._name,
+                                                         bundle_instance)
+
+                    if warmstart and solver.warm_start_capable():
                         new_action_handle = \
                             self._solver_manager.queue(
-                                self._bundle_binding_instance_map[\
-                                    scenario_bundle._name],
-                                opt=self._solver,
+                                bundle_instance,
+                                opt=solver,
                                 warmstart=True,
                                 **common_kwds)
                     else:
                         new_action_handle = \
                             self._solver_manager.queue(
-                                self._bundle_binding_instance_map[\
-                                    scenario_bundle._name],
-                                opt=self._solver,
+                                bundle_instance,
+                                opt=solver,
                                 **common_kwds)
 
                 bundle_action_handle_map[scenario_bundle._name] = new_action_handle
@@ -2778,25 +2878,27 @@ class ProgressiveHedging(_PHBase):
                 else:
 
                     instance = scenario._instance
+                    solver = self._get_subproblem_solver(scenario._name,
+                                                         instance)
 
                     if (self._output_times is True) and (self._verbose is False):
                         print("Solver manager queuing instance=%s"
                               % (scenario._name))
 
-                    if warmstart and self._solver.warm_start_capable():
+                    if warmstart and solver.warm_start_capable():
 
                         if self._extensions_suffix_list is not None:
                             new_action_handle = \
                                 self._solver_manager.queue(
                                     instance,
-                                    opt=self._solver,
+                                    opt=solver,
                                     warmstart=True,
                                     suffixes=self._extensions_suffix_list,
                                     **common_kwds)
                         else:
                             new_action_handle = \
                                 self._solver_manager.queue(instance,
-                                                           opt=self._solver,
+                                                           opt=solver,
                                                            warmstart=True,
                                                            **common_kwds)
                     else:
@@ -2805,13 +2907,13 @@ class ProgressiveHedging(_PHBase):
                             new_action_handle = \
                                 self._solver_manager.queue(
                                     instance,
-                                    opt=self._solver,
+                                    opt=solver,
                                     suffixes=self._extensions_suffix_list,
                                     **common_kwds)
                         else:
                             new_action_handle = \
                                 self._solver_manager.queue(instance,
-                                                           opt=self._solver,
+                                                           opt=solver,
                                                            **common_kwds)
 
                 scenario_action_handle_map[scenario._name] = new_action_handle
@@ -3343,6 +3445,10 @@ class ProgressiveHedging(_PHBase):
 
             for tree_node in stage._tree_nodes:
 
+                if self._vectorized_updates:
+                    self._update_tree_node_statistics_vectorized(tree_node)
+                    continue
+
                 xbars = tree_node._xbars
 
                 scenario_solutions = \
@@ -3412,6 +3518,10 @@ class ProgressiveHedging(_PHBase):
 
             for tree_node in stage._tree_nodes:
 
+                if self._vectorized_updates:
+                    self._update_tree_node_weights_vectorized(tree_node)
+                    continue
+
                 tree_node_xbars = None
                 if self._dual_mode is True:
                     tree_node_xbars = tree_node._xbars
@@ -3490,6 +3600,115 @@ class ProgressiveHedging(_PHBase):
         if self._output_times:
             print("Weight update time=%.2f seconds" % (end_time - start_time))
 
+    #
+    # Vectorized versions of the per-node updates performed by
+    # update_variable_statistics and update_weights. The results are
+    # identical to the loop-based versions: the sums over scenarios
+    # are accumulated in the same order, and the variables without a
+    # solution value in some scenario are skipped in the same way.
+    #
+    # The arrays of each tree node are kept between the updates (see
+    # phvectorutils.py). The solution values are gathered again by
+    # each statistics update, and all of the arrays are gathered
+    # again after the plugin callbacks and the other code that
+    # modifies the PH dictionaries directly.
+    #
+
+    def _get_tree_node_arrays(self, tree_node):
+
+        arrays = self._tree_node_arrays.get(tree_node._name)
+        if arrays is None:
+            arrays = self._tree_node_arrays[tree_node._name] = \
+                TreeNodeArrays(tree_node)
+        return arrays
+
+    def _invalidate_tree_node_arrays(self):
+
+        for arrays in itervalues(self._tree_node_arrays):
+            arrays.invalidate()
+
+    def _invalidate_tree_node_arrays_after_plugins(self):
+
+        # the plugins can modify any of the PH dictionaries
+        if len(self._ph_plugins) > 0:
+            self._invalidate_tree_node_arrays()
+
+    def _update_tree_node_statistics_vectorized(self, tree_node):
+
+        arrays = self._get_tree_node_arrays(tree_node)
+        # there are new solutions
+        arrays.invalidate('_x')
+        x = arrays.gather('_x')
+        # a variable is stale if it has no value in some scenario
+        current = ~numpy.isnan(x).any(axis=0)
+        if not current.any():
+            return
+        x = numpy.where(current, x, 0.0)
+
+        avg_values = (arrays.probabilities[:, None] * x).sum(axis=0)
+        avg_values /= arrays.node_probability
+        arrays.scatter_node('_minimums', x.min(axis=0), current)
+        arrays.scatter_node('_maximums', x.max(axis=0), current)
+
+        if self._ph_xbar_updates_enabled:
+            if (self._overrelax) and (self._current_iteration >= 1):
+                xbar_values = \
+                    self._nu*avg_values + \
+                    (1-self._nu)*arrays.gather_node('_averages')
+            else:
+                xbar_values = avg_values
+            arrays.scatter_node('_xbars', xbar_values, current)
+
+        arrays.scatter_node('_averages', avg_values, current)
+
+    def _update_tree_node_weights_vectorized(self, tree_node):
+
+        arrays = self._get_tree_node_arrays(tree_node)
+
+        if self._dual_mode is True:
+            xbar_values = arrays.gather_node('_xbars')
+        else:
+            xbar_values = arrays.gather_node('_averages')
+        blend_values = arrays.gather_node('_blend')
+        x = arrays.gather('_x')
+        current = ~numpy.isnan(x)
+
+        tree_node._wbars = \
+            dict((var_id,0) for var_id in tree_node._variable_ids)
+        arrays.invalidate('_wbars')
+        if not current.any():
+            return
+
+        nu_value = 1.0
+        if self._overrelax:
+            nu_value = self._nu
+
+        # see update_weights for the reason the weights are not
+        # updated when blending is disabled (blend_values is 0)
+        with numpy.errstate(invalid='ignore'):
+            delta = blend_values * arrays.gather('_rho') * nu_value * \
+                    (x - xbar_values)
+        if not self._dual_mode:
+            if self._objective_sense == minimize:
+                weight_values = arrays.gather('_w') + delta
+            else:
+                weight_values = arrays.gather('_w') - delta
+        else:
+            assert (blend_values[current.any(axis=0)] == 1.0).all()
+            assert nu_value == 1.0
+            assert self._objective_sense == minimize
+            weight_values = delta
+        arrays.scatter('_w', weight_values, current)
+
+        wbar_values = numpy.where(
+            current,
+            arrays.probabilities[:, None] * weight_values /
+            arrays.node_probability,
+            0.0).sum(axis=0)
+        arrays.scatter_node('_wbars',
+                            wbar_values,
+                            current.any(axis=0))
+
     def update_weights_for_scenario(self, scenario):
 
         start_time = time.time()
@@ -3559,6 +3778,10 @@ class ProgressiveHedging(_PHBase):
                             (varval - \
                              tree_node_xbars[variable_id])
 
+            arrays = self._tree_node_arrays.get(tree_node._name)
+            if arrays is not None:
+                arrays.invalidate('_w')
+
         end_time = time.time()
         self._cumulative_weight_time += (end_time - start_time)
 
@@ -3646,9 +3869,26 @@ class ProgressiveHedging(_PHBase):
            (self._async_buffer_length > len(self._scenario_tree._scenarios)):
             raise RuntimeError("Async buffer length parameter is bad: %s"
                                % (self._async_buffer_length))
+        if (self._async_fraction < 0) or (self._async_fraction > 1):
+            raise RuntimeError("Async fraction parameter is bad: %s"
+                               % (self._async_fraction))
+        if self._async_staleness_bound < 0:
+            raise RuntimeError("Async staleness bound parameter is bad: %s"
+                               % (self._async_staleness_bound))
+
+        # the number of scenario solves that must be collected before
+        # the statistics and weights are updated, when the scenarios
+        # to queue are not chosen by a plugin.
+        if self._async_fraction > 0:
+            async_update_count = \
+                int(ceil(self._async_fraction *
+                         len(self._scenario_tree._scenarios)))
+        else:
+            async_update_count = self._async_buffer_length
+
         if self._verbose:
             print("Starting PH iteration k+ solves - running async "
-                  "with buffer length=%s" % (self._async_buffer_length))
+                  "with buffer length=%s" % (async_update_count))
 
         # we are going to buffer the scenario names
         ScenarioBuffer = []
@@ -3690,12 +3930,25 @@ class ProgressiveHedging(_PHBase):
                         self._report_only_nonconverged_variables,
                         report_stage_costs=False)
 
-        # determine what needs to be queued
+        # determine what needs to be queued. if no plugin chooses the
+        # sub-problems, all scenarios are queued, and each scenario is
+        # requeued as soon as its solution has been folded into the
+        # statistics and weights (see _async_subproblems_to_queue).
+        queue_plugins = [plugin for plugin in self._ph_plugins
+                         if hasattr(plugin, "asynchronous_subproblems_to_queue")]
         subproblems_to_queue = []
-        for plugin in self._ph_plugins: # WARNING - BEING SLOPPY - WE SHOULD MAKE SURE WE HAVE ONE LIST RETURNED (MORE THAN ONE PLUGIN CAUSES ISSUES)
+        for plugin in queue_plugins: # WARNING - BEING SLOPPY - WE SHOULD MAKE SURE WE HAVE ONE LIST RETURNED (MORE THAN ONE PLUGIN CAUSES ISSUES)
             subproblems_to_queue = plugin.asynchronous_subproblems_to_queue(self)
+        if len(queue_plugins) == 0:
+            subproblems_to_queue = [scenario._name for scenario
+                                    in self._scenario_tree._scenarios]
         assert(len(subproblems_to_queue)!=0)
 
+        # the scenarios with a queued solve, and the scenarios whose
+        # solve is held back by the staleness bound.
+        subproblems_in_flight = set(subproblems_to_queue)
+        deferred_subproblems = []
+
         # in general, we need to track the number of subproblems queued - it may not be,
         # depending on the plugin, equal to the async buffer length.
         number_subproblems_queued = len(subproblems_to_queue)
@@ -3703,7 +3956,8 @@ class ProgressiveHedging(_PHBase):
         # NOTE - THE FOLLOWING IS NOT BUNDLE AWARE!
         for plugin in self._ph_plugins:
             for subproblem in subproblems_to_queue:
-                plugin.asynchronous_pre_scenario_queue(self, scenario._name)
+                plugin.asynchronous_pre_scenario_queue(self, subproblem)
+        self._invalidate_tree_node_arrays_after_plugins()
 
         # queue up the solves for all scenario sub-problems - iteration 0 is special.
         warmstart = (not self._disable_warmstarts) and self._solver.warm_start_capable()
@@ -3725,6 +3979,7 @@ class ProgressiveHedging(_PHBase):
 
             solved_scenario = self._scenario_tree.get_scenario(solved_subproblems[0])
             solved_scenario_name = solved_scenario._name
+            subproblems_in_flight.discard(solved_scenario_name)
 
             scenario_solve_counts[solved_scenario_name] += 1
             total_scenario_solve_count += 1
@@ -3750,8 +4005,15 @@ class ProgressiveHedging(_PHBase):
 
             # changed 19 Nov 2011 to support scenario buffers for async
             ScenarioBuffer.append(solved_scenario_name)
-#            if len(ScenarioBuffer) == self._async_buffer_length:
-            if len(ScenarioBuffer) == number_subproblems_queued:
+            if len(queue_plugins):
+                process_buffer = \
+                    (len(ScenarioBuffer) == number_subproblems_queued)
+            else:
+                # never wait for more solves than are in flight
+                process_buffer = \
+                    (len(ScenarioBuffer) >= async_update_count) or \
+                    (len(subproblems_in_flight) == 0)
+            if process_buffer:
                 if self._verbose:
                     print("Processing async buffer")
 
@@ -3766,6 +4028,7 @@ class ProgressiveHedging(_PHBase):
                 # give a user a chance to react if they want to change something.
                 for plugin in self._ph_plugins:
                     plugin.post_asynchronous_var_w_update(self, ScenarioBuffer, scenario_solve_counts)
+                self._invalidate_tree_node_arrays_after_plugins()
 
                 # we don't want to report stuff and invoke callbacks
                 # after each scenario solve - wait for when each
@@ -3775,6 +4038,7 @@ class ProgressiveHedging(_PHBase):
                     # let plugins know if they care.
                     for plugin in self._ph_plugins:
                         plugin.post_iteration_k_solves(self)
+                    self._invalidate_tree_node_arrays_after_plugins()
 
                     # update the fixed variable statistics.
                     self._total_fixed_discrete_vars,\
@@ -3855,8 +4119,13 @@ class ProgressiveHedging(_PHBase):
                 # the plugins define the order.
                 subproblems_to_queue = []
                 # WARNING - BEING SLOPPY - WE SHOULD MAKE SURE WE HAVE ONE LIST RETURNED (MORE THAN ONE PLUGIN CAUSES ISSUES)
-                for plugin in self._ph_plugins:
+                for plugin in queue_plugins:
                     subproblems_to_queue = plugin.asynchronous_subproblems_to_queue(self)
+                if len(queue_plugins) == 0:
+                    subproblems_to_queue = \
+                        self._async_subproblems_to_queue(ScenarioBuffer,
+                                                         deferred_subproblems,
+                                                         scenario_solve_counts)
 
                 for scenario_name in subproblems_to_queue:
 
@@ -3881,11 +4150,13 @@ class ProgressiveHedging(_PHBase):
                     # let plugins know if they care.
                     for plugin in self._ph_plugins:
                         plugin.asynchronous_pre_scenario_queue(self, scenario_name)
+                    self._invalidate_tree_node_arrays_after_plugins()
 
                     # queue stuff!
                     warmstart = (not self._disable_warmstarts) and self._solver.warm_start_capable()
                     action_handle_scenario_map_updates, a, b, c = self.queue_subproblems(subproblems=[scenario_name], warmstart=warmstart)
                     action_handle_scenario_map.update(action_handle_scenario_map_updates)
+                    subproblems_in_flight.add(scenario_name)
 
                     number_subproblems_queued = len(subproblems_to_queue)
 
@@ -3917,6 +4188,39 @@ class ProgressiveHedging(_PHBase):
                 # this is not a speed issue, is there a memory issue?
                 ScenarioBuffer = []
 
+    #
+    # Returns the scenarios to queue after the asynchronous buffer
+    # has been processed, when no plugin chooses them. The scenarios
+    # in the buffer are requeued, unless a scenario has been solved
+    # at least async_staleness_bound more times than the slowest
+    # scenario, in which case it is held back (in the deferred list)
+    # until the slowest scenarios catch up. This bounds the staleness
+    # of the solutions that contribute to the node averages.
+    #
+
+    def _async_subproblems_to_queue(self,
+                                    processed_subproblems,
+                                    deferred_subproblems,
+                                    scenario_solve_counts):
+
+        deferred_subproblems.extend(processed_subproblems)
+        if self._async_staleness_bound > 0:
+            min_solve_count = min(itervalues(scenario_solve_counts))
+            ready = [scenario_name for scenario_name in deferred_subproblems
+                     if (scenario_solve_counts[scenario_name] - \
+                         min_solve_count) < self._async_staleness_bound]
+        else:
+            ready = list(deferred_subproblems)
+        deferred_subproblems[:] = [scenario_name for scenario_name
+                                   in deferred_subproblems
+                                   if scenario_name not in ready]
+
+        if self._verbose and len(deferred_subproblems):
+            print("Holding back solves for scenarios %s (staleness bound=%s)"
+                  % (deferred_subproblems, self._async_staleness_bound))
+
+        return ready
+
     def solve(self):
         # return None unless a solve failure was detected in iter0,
         # then immediately return the iter0 solve return value (which
@@ -3928,6 +4232,10 @@ class ProgressiveHedging(_PHBase):
         self._cumulative_weight_time = 0.0
         self._current_iteration = 0;
 
+        # the PH dictionaries may have been modified since the last
+        # updates (e.g., by the initialization or a warmstart)
+        self._invalidate_tree_node_arrays()
+
         # garbage collection noticeably slows down PH when dealing with
         # large numbers of scenarios. fortunately, there are well-defined
         # points at which garbage collection makes sense (and there isn't a
@@ -3997,6 +4305,7 @@ class ProgressiveHedging(_PHBase):
             # let plugins know if they care.
             for plugin in self._ph_plugins:
                 plugin.post_iteration_0_solves(self)
+            self._invalidate_tree_node_arrays_after_plugins()
 
             # update the fixed variable statistics.
             self._total_fixed_discrete_vars, \
@@ -4039,6 +4348,7 @@ class ProgressiveHedging(_PHBase):
             # let plugins know if they care.
             for plugin in self._ph_plugins:
                 plugin.post_iteration_0(self)
+            self._invalidate_tree_node_arrays_after_plugins()
 
             # IMPT: update the weights after the PH iteration 0 callbacks;
             #       they might compute rhos based on iteration 0
@@ -4125,6 +4435,7 @@ class ProgressiveHedging(_PHBase):
                 # let plugins know if they care.
                 for plugin in self._ph_plugins:
                     plugin.pre_iteration_k_solves(self)
+                self._invalidate_tree_node_arrays_after_plugins()
 
                 if not _OLD_OUTPUT:
                     if self._report_rhos_each_iteration or \
@@ -4174,6 +4485,8 @@ class ProgressiveHedging(_PHBase):
                 else:
                     dual_rc = dual_model.add_cut()
                     dual_model.solve()
+                    # the dual model updates the xbars
+                    self._invalidate_tree_node_arrays()
                     self.update_variable_statistics(compute_xbars=False)
 
                 # update weights
@@ -4183,6 +4496,7 @@ class ProgressiveHedging(_PHBase):
                 # let plugins know if they care.
                 for plugin in self._ph_plugins:
                     plugin.post_iteration_k_solves(self)
+                self._invalidate_tree_node_arrays_after_plugins()
 
                 if (self._verbose) or (self._report_solutions):
                     print("Variable values following scenario solves:")
@@ -4243,6 +4557,7 @@ class ProgressiveHedging(_PHBase):
                 # let plugins know if they care.
                 for plugin in self._ph_plugins:
                     plugin.post_iteration_k(self)
+                self._invalidate_tree_node_arrays_after_plugins()
 
                 # at this point, all the real work of an iteration is
                 # complete.
@@ -4331,11 +4646,13 @@ class ProgressiveHedging(_PHBase):
 
             for plugin in self._ph_plugins:
                 plugin.pre_asynchronous_solves(self)
+            self._invalidate_tree_node_arrays_after_plugins()
 
             self.async_iteration_k_plus_solves()
 
             for plugin in self._ph_plugins:
                 plugin.post_asynchronous_solves(self)
+            self._invalidate_tree_node_arrays_after_plugins()
 
         # re-enable the normal garbage collection mode.
         if re_enable_gc:
@@ -184,6 +184,18 @@ def construct_ph_options_parser(usage_string):
       dest="async_buffer_length",
       type=int,
       default=1)
+    phOpts.add_argument("--async-fraction",
+      help="Fraction of the scenarios that must report a new solution, if in async mode, before doing statistics and weight updates. Overrides --async-buffer-length when positive. Default is 0.0.",
+      action="store",
+      dest="async_fraction",
+      type=float,
+      default=0.0)
+    phOpts.add_argument("--async-staleness-bound",
+      help="If in async mode, the maximum number of solves a scenario can be ahead of the slowest scenario. Scenarios that reach the bound are not requeued until the slowest scenarios catch up. A value of 0 disables the bound. Default is 0.",
+      action="store",
+      dest="async_staleness_bound",
+      type=int,
+      default=0)
     phOpts.add_argument('--rho-cfgfile',
       help="The name of python script containing a ph_rhosetter_callback function to compute and update PH rho values. Default is None.",
       action="store",
@@ -262,6 +274,11 @@ def construct_ph_options_parser(usage_string):
       action="store_true",
       dest="drop_proximal_terms",
       default=False)
+    phOpts.add_argument('--disable-vectorized-updates',
+      help="Compute the PH variable statistics, weight updates, and term-diff convergence metrics variable-by-variable, rather than with NumPy array operations over all scenarios of a tree node. Vectorized updates are only used when NumPy is available. Default is False.",
+      action="store_true",
+      dest="disable_vectorized_updates",
+      default=False)
     phOpts.add_argument('--enable-ww-extensions',
       help="Enable the Watson-Woodruff PH extensions plugin. Default is False.",
       action="store_true",
@@ -358,6 +375,11 @@ def construct_ph_options_parser(usage_string):
       action="store_true",
       dest="phpyro_transmit_leaf_stage_solution",
       default=False)
+    solverOpts.add_argument('--phpyro-shared-memory',
+      help="When running PH using the PHPyro solver manager, transmit weights and xbars to the PH solver servers that run on the same host as PH through arrays in shared memory, rather than with each request. Default is False.",
+      action="store_true",
+      dest="phpyro_shared_memory",
+      default=False)
     solverOpts.add_argument('--disable-warmstarts',
       help="Disable warm-start of scenario sub-problem solves in PH iterations >= 1. Default is False.",
       action="store_true",
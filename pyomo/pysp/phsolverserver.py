@@ -27,7 +27,6 @@ from pyomo.opt import UndefinedData
 from pyomo.util import pyomo_command
 from pyomo.util.plugin import ExtensionPoint
 from pyomo.opt import (SolverFactory,
-                       PersistentSolver,
                        TerminationCondition,
                        SolutionStatus)
 from pyomo.pysp.phextension import IPHSolverServerExtension
@@ -39,6 +38,7 @@ from pyomo.pysp.ph import _PHBase
 from pyomo.pysp.phutils import (reset_nonconverged_variables,
                                 reset_stage_cost_variables)
 from pyomo.pysp.util.misc import launch_command
+from pyomo.pysp.util.shared_array import SharedArray
 
 from six import iterkeys, iteritems
 
@@ -63,8 +63,11 @@ class PHPyroWorker(TaskWorker):
     def del_server(self, name):
         phsolver = self._phsolverserver_map[name]
         # Avoid memory leaks
+        phsolver._release_subproblem_solvers()
         if phsolver._solver is not None:
             phsolver._solver.deactivate()
+        if phsolver._shared_array is not None:
+            phsolver._shared_array.close()
         del self._phsolverserver_map[name]
 
     def process(self, data):
@@ -113,6 +116,12 @@ class _PHSolverServer(_PHBase):
         self._master_scenario_tree_id_map = {}
         self._reverse_master_scenario_tree_id_map = {}
 
+        # The array in shared memory (and its layout) through which
+        # weights and xbars are received, if the PH client runs on
+        # this host (see phsolverserverutils.initialize_shared_arrays)
+        self._shared_array = None
+        self._shared_array_layout = None
+
         # global handle to ph extension plugins
         self._ph_plugins = ExtensionPoint(IPHSolverServerExtension)
         self._modules_imported = modules_imported
@@ -520,24 +529,10 @@ class _PHSolverServer(_PHBase):
 
         self._preprocess_scenario_instances()
 
-        if self._first_solve:
-
-            # if we are dealing with a persisent solver plugin, go ahead
-            # and compile the instance into the solver.
-            if isinstance(self._solver, PersistentSolver):
-                if self._scenario_tree.contains_bundles():
-                    # probably for no good reason, as we should be able to
-                    # hand the binding instance to the compile procedure -
-                    # just not tested.
-                    raise RuntimeError("***We presently can't handle bundles in "
-                                       "persistent solver plugins")
-                else:
-                    self._solver.compile_instance(
-                        self._scenario_tree.get_arbitrary_scenario()._instance,
-                        symbolic_solver_labels=self._symbolic_solver_labels,
-                        output_fixed_variable_bounds=self._write_fixed_variables)
-
-        else:
+        # Note: if the solver plugin is persistent, the scenario (or
+        #       bundle) instance is compiled into the solver the first
+        #       time it is solved (see _get_subproblem_solver)
+        if not self._first_solve:
 
             # GAH: We may need to redefine our concept of
             #      warmstart. These values could be helpful in the
@@ -582,16 +577,18 @@ class _PHSolverServer(_PHBase):
                 return None
 
             bundle_ef_instance = self._bundle_binding_instance_map[object_name]
+            solver = self._get_subproblem_solver(object_name,
+                                                 bundle_ef_instance)
 
             solve_start_time = time.time()
 
-            if  self._warmstart and self._solver.warm_start_capable():
-                results = self._solver.solve(bundle_ef_instance,
-                                             warmstart=True,
-                                             **common_solve_kwds)
+            if  self._warmstart and solver.warm_start_capable():
+                results = solver.solve(bundle_ef_instance,
+                                       warmstart=True,
+                                       **common_solve_kwds)
             else:
-                results = self._solver.solve(bundle_ef_instance,
-                                             **common_solve_kwds)
+                results = solver.solve(bundle_ef_instance,
+                                       **common_solve_kwds)
 
             pyomo_solve_time = time.time() - solve_start_time
 
@@ -672,16 +669,18 @@ class _PHSolverServer(_PHBase):
 
             scenario = self._scenario_tree._scenario_map[object_name]
             scenario_instance = self._instances[object_name]
+            solver = self._get_subproblem_solver(object_name,
+                                                 scenario_instance)
 
             solve_start_time = time.time()
 
-            if self._warmstart and self._solver.warm_start_capable():
-                results = self._solver.solve(scenario_instance,
-                                             warmstart=True,
-                                             **common_solve_kwds)
+            if self._warmstart and solver.warm_start_capable():
+                results = solver.solve(scenario_instance,
+                                       warmstart=True,
+                                       **common_solve_kwds)
             else:
-                results = self._solver.solve(scenario_instance,
-                                             **common_solve_kwds)
+                results = solver.solve(scenario_instance,
+                                       **common_solve_kwds)
 
             pyomo_solve_time = time.time() - solve_start_time
 
@@ -853,6 +852,51 @@ class _PHSolverServer(_PHBase):
             tree_node._xbars.update((master_id_map[master_id_index],val) \
                                     for master_id_index, val in iteritems(node_xbars))
 
+    #
+    # attach to the shared memory array created by the PH client for
+    # this scenario or bundle. returns False if the array is not found
+    # (e.g., if the PH client runs on another host).
+    #
+    def attach_shared_array(self, object_name, filename, size, layout):
+
+        if self._verbose:
+            print("Received request to attach shared memory array=%s for "
+                  "object=%s" % (filename, object_name))
+
+        if self._initialized is False:
+            raise RuntimeError("PH solver server has not been initialized!")
+
+        if self._shared_array is not None:
+            self._shared_array.close()
+        self._shared_array = SharedArray.attach(filename, size)
+        self._shared_array_layout = layout
+        return self._shared_array is not None
+
+    #
+    # read the xbars (by node name) or the weights (by scenario and
+    # node name) stored in the shared memory array, indexed by the
+    # scenario tree ids of the master node
+    #
+    def _read_shared_array(self, kind):
+
+        if self._shared_array is None:
+            raise RuntimeError("PH solver server has no shared memory "
+                               "array attached")
+
+        data = {}
+        for entry_kind, scenario_name, node_name, offset, variable_ids in \
+              self._shared_array_layout:
+            if entry_kind != kind:
+                continue
+            values = dict(zip(variable_ids,
+                              self._shared_array.read(offset,
+                                                      len(variable_ids))))
+            if kind == "xbars":
+                data[node_name] = values
+            else:
+                data.setdefault(scenario_name, {})[node_name] = values
+        return data
+
     #
     # updating weights only applies to scenarios - not bundles.
     #
@@ -1258,20 +1302,36 @@ class _PHSolverServer(_PHBase):
             result = True
             self._push_fix_queue_to_instances()
 
+        elif data.action == "attach_shared_array":
+            result = self.attach_shared_array(data.name,
+                                              data.filename,
+                                              data.size,
+                                              data.layout)
+
         elif data.action == "load_weights":
+            new_weights = data.new_weights
+            if new_weights is None:
+                # the weights are stored in shared memory
+                new_weights = self._read_shared_array("weights")
+                if self._scenario_tree.contains_bundles() is False:
+                    new_weights = new_weights[data.name]
             if self._scenario_tree.contains_bundles() is True:
                 for scenario_name, scenario_instance in iteritems(self._instances):
                     self.update_weights(scenario_name,
-                                        data.new_weights[scenario_name])
+                                        new_weights[scenario_name])
             else:
                 self.update_weights(data.name,
-                                    data.new_weights)
+                                    new_weights)
             result = True
             self._push_w_to_instances()
 
         elif data.action == "load_xbars":
+            new_xbars = data.new_xbars
+            if new_xbars is None:
+                # the xbars are stored in shared memory
+                new_xbars = self._read_shared_array("xbars")
             self.update_xbars(data.name,
-                              data.new_xbars)
+                              new_xbars)
             result = True
             self._push_xbar_to_instances()
 
@@ -16,6 +16,7 @@ import itertools
 from pyutilib.enum import Enum
 
 from pyomo.core import *
+from pyomo.pysp.util.shared_array import SharedArray
 
 from six import iteritems, itervalues
 
@@ -353,13 +354,20 @@ def transmit_weights(ph):
             # map from scenario name to the corresponding weight map
             weights_to_transmit = {}
 
-            for scenario in bundle._scenario_tree._scenarios:
-                scenario_name = scenario._name
+            if bundle._name in ph._phpyro_shared_arrays:
+                # the weights are read from shared memory
+                _write_shared_array(ph, bundle._name, "weights")
+                weights_to_transmit = None
 
-                # Skip the leaf nodes (scenario._w usually doesn't
-                # store a value for variables on the leaf node)
-                weights_to_transmit[scenario._name] = \
-                    ph._scenario_tree._scenario_map[scenario_name]._w
+            else:
+
+                for scenario in bundle._scenario_tree._scenarios:
+                    scenario_name = scenario._name
+
+                    # Skip the leaf nodes (scenario._w usually doesn't
+                    # store a value for variables on the leaf node)
+                    weights_to_transmit[scenario._name] = \
+                        ph._scenario_tree._scenario_map[scenario_name]._w
 
             action_handles.append( ph._solver_manager.queue(
                 action="load_weights",
@@ -374,12 +382,18 @@ def transmit_weights(ph):
 
             # Skip the leaf nodes (scenario._w usually doesn't store a value
             # for variables on the leaf node)
+            weights_to_transmit = scenario._w
+            if scenario._name in ph._phpyro_shared_arrays:
+                # the weights are read from shared memory
+                _write_shared_array(ph, scenario._name, "weights")
+                weights_to_transmit = None
+
             action_handles.append( ph._solver_manager.queue(
                 action="load_weights",
                 queue_name=ph._phpyro_job_worker_map[scenario._name],
                 generateResponse=generate_responses,
                 name=scenario._name,
-                new_weights=scenario._w) )
+                new_weights=weights_to_transmit) )
     ph._solver_manager.end_bulk()
 
     if generate_responses:
@@ -412,16 +426,22 @@ def transmit_xbars(ph):
         for bundle in ph._scenario_tree._scenario_bundles:
 
             xbars_to_transmit = {}
-            # Skip the leaf nodes
-            for stage in bundle._scenario_tree._stages[:-1]:
-                for bundle_tree_node in stage._tree_nodes:
-                    # The bundle scenariotree usually isn't populated
-                    # with variable value data so we need to reference
-                    # the original scenariotree node
-                    primary_tree_node = \
-                        ph._scenario_tree._tree_node_map[bundle_tree_node._name]
-                    xbars_to_transmit[primary_tree_node._name] = \
-                        primary_tree_node._xbars
+            if bundle._name in ph._phpyro_shared_arrays:
+                # the xbars are read from shared memory
+                _write_shared_array(ph, bundle._name, "xbars")
+                xbars_to_transmit = None
+
+            else:
+                # Skip the leaf nodes
+                for stage in bundle._scenario_tree._stages[:-1]:
+                    for bundle_tree_node in stage._tree_nodes:
+                        # The bundle scenariotree usually isn't populated
+                        # with variable value data so we need to reference
+                        # the original scenariotree node
+                        primary_tree_node = \
+                            ph._scenario_tree._tree_node_map[bundle_tree_node._name]
+                        xbars_to_transmit[primary_tree_node._name] = \
+                            primary_tree_node._xbars
 
             action_handles.append( ph._solver_manager.queue(
                 action="load_xbars",
@@ -436,8 +456,13 @@ def transmit_xbars(ph):
 
             # Skip the leaf nodes
             xbars_to_transmit = {}
-            xbars_to_transmit = dict((tree_node._name, tree_node._xbars) \
-                                     for tree_node in scenario._node_list[:-1])
+            if scenario._name in ph._phpyro_shared_arrays:
+                # the xbars are read from shared memory
+                _write_shared_array(ph, scenario._name, "xbars")
+                xbars_to_transmit = None
+            else:
+                xbars_to_transmit = dict((tree_node._name, tree_node._xbars) \
+                                         for tree_node in scenario._node_list[:-1])
 
             action_handles.append( ph._solver_manager.queue(
                 action="load_xbars",
@@ -456,6 +481,115 @@ def transmit_xbars(ph):
         print("Xbar transmission time=%.2f seconds" % (end_time - start_time))
 
 
+#
+# utilities to transmit weights and xbars to PH solver servers that
+# run on the same host through arrays in shared memory. The layout of
+# the array of each scenario (or bundle) - the position of the xbar
+# of each non-leaf tree node variable and of the weight of each
+# scenario variable - is built and transmitted once. Afterwards, the
+# load_weights and load_xbars requests only contain the object name.
+#
+
+def _shared_array_layout(ph, object_name):
+    """
+    Return the layout of the shared array of a scenario or bundle, a
+    list of (kind, scenario_name, node_name, offset, variable_ids)
+    tuples, where kind is "xbars" (with scenario_name None) or
+    "weights", and the size of the array.
+    """
+    scenario_tree = ph._scenario_tree
+    if scenario_tree.contains_bundles():
+        bundle = scenario_tree.get_bundle(object_name)
+        xbar_node_names = [tree_node._name
+                           for stage in bundle._scenario_tree._stages[:-1]
+                           for tree_node in stage._tree_nodes]
+        scenario_names = bundle._scenario_names
+    else:
+        scenario = scenario_tree.get_scenario(object_name)
+        xbar_node_names = [tree_node._name
+                           for tree_node in scenario._node_list[:-1]]
+        scenario_names = [object_name]
+
+    layout = []
+    offset = 0
+    for node_name in xbar_node_names:
+        tree_node = scenario_tree.get_node(node_name)
+        variable_ids = sorted(tree_node._standard_variable_ids)
+        layout.append(("xbars", None, node_name, offset, variable_ids))
+        offset += len(variable_ids)
+    for scenario_name in scenario_names:
+        scenario = scenario_tree.get_scenario(scenario_name)
+        for tree_node in scenario._node_list[:-1]:
+            variable_ids = sorted(tree_node._standard_variable_ids)
+            layout.append(("weights", scenario_name, tree_node._name,
+                           offset, variable_ids))
+            offset += len(variable_ids)
+    return layout, offset
+
+def _write_shared_array(ph, object_name, kind):
+
+    shared_array, layout = ph._phpyro_shared_arrays[object_name]
+    scenario_tree = ph._scenario_tree
+    for entry_kind, scenario_name, node_name, offset, variable_ids in layout:
+        if entry_kind != kind:
+            continue
+        if kind == "xbars":
+            values = scenario_tree._tree_node_map[node_name]._xbars
+        else:
+            values = scenario_tree._scenario_map[scenario_name]._w[node_name]
+        shared_array.write(offset, [values[variable_id]
+                                    for variable_id in variable_ids])
+
+def initialize_shared_arrays(ph):
+
+    start_time = time.time()
+
+    if ph._verbose:
+        print("Creating shared memory arrays for PH solver servers")
+
+    action_handle_map = {}
+    ph._solver_manager.begin_bulk()
+    for object_name, worker_name in iteritems(ph._phpyro_job_worker_map):
+        layout, size = _shared_array_layout(ph, object_name)
+        shared_array = SharedArray.create(size)
+        action_handle = ph._solver_manager.queue(
+            action="attach_shared_array",
+            queue_name=worker_name,
+            generateResponse=True,
+            name=object_name,
+            filename=shared_array.filename,
+            size=size,
+            layout=layout)
+        action_handle_map[action_handle] = \
+            (object_name, shared_array, layout)
+    ph._solver_manager.end_bulk()
+    ph._solver_manager.wait_all(list(action_handle_map))
+
+    # PH solver servers that run on another host do not find the array,
+    # and continue to receive the weights and xbars with the requests
+    for action_handle, (object_name, shared_array, layout) in \
+          iteritems(action_handle_map):
+        if ph._solver_manager.get_results(action_handle):
+            ph._phpyro_shared_arrays[object_name] = (shared_array, layout)
+        else:
+            shared_array.close()
+
+    end_time = time.time()
+
+    if ph._verbose:
+        print("PH solver servers using shared memory: %d of %d"
+              % (len(ph._phpyro_shared_arrays), len(action_handle_map)))
+
+    if ph._output_times:
+        print("Shared memory initialization time=%.2f seconds"
+              % (end_time - start_time))
+
+def release_shared_arrays(ph):
+
+    for shared_array, layout in itervalues(ph._phpyro_shared_arrays):
+        shared_array.close()
+    ph._phpyro_shared_arrays = {}
+
 def _transmit_init(ph, worker_name, object_name):
 
     # both the dispatcher queue for initialization and the action name
@@ -503,6 +637,7 @@ def release_phsolverservers(ph):
 
     ph._phpyro_worker_jobs_map = {}
     ph._phpyro_job_worker_map = {}
+    release_shared_arrays(ph)
 
 def initialize_ph_solver_servers(ph):
 
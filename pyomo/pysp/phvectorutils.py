@@ -0,0 +1,184 @@
+#  _________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright (c) 2014 Sandia Corporation.
+#  Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+#  the U.S. Government retains certain rights in this software.
+#  This software is distributed under the BSD License.
+#  _________________________________________________________________________
+
+#
+# Utilities to perform the per-iteration PH updates (variable
+# statistics, weights, and convergence metrics) as batched NumPy array
+# operations rather than variable-by-variable in Python.
+#
+# The scenario tree keeps storing the PH data in dictionaries keyed by
+# variable id (the solves, plugins, solver servers and reports read
+# and modify them), so each tree node keeps persistent dense arrays of
+# its data that are synchronized with the dictionaries:
+#
+#  - An array is gathered from the dictionaries the first time it is
+#    used, and it is kept up to date by the updates that scatter
+#    values back, so the weights, rhos and node statistics are not
+#    gathered again in each iteration.
+#  - The solution values (_x) are gathered again once per round of
+#    solves, and they are shared by the statistics, weight and
+#    convergence updates of that round.
+#  - The values computed by the updates are scattered to the
+#    dictionaries as they are computed, since the weights are pushed
+#    to the scenario instances (or solver servers) from there. Both
+#    directions use C-level iteration (operator.itemgetter and
+#    dict.update).
+#
+# Code that modifies the dictionaries directly (e.g., the plugin
+# callbacks) is a synchronization boundary: the PH object invalidates
+# the arrays after it, and they are gathered again when next used.
+#
+
+__all__ = ("numpy_available", "TreeNodeArrays")
+
+from operator import itemgetter
+
+try:
+    import numpy
+    numpy_available = True
+except ImportError:
+    numpy_available = False
+
+class TreeNodeArrays(object):
+    """
+    Dense (scenario x variable) arrays of the PH data of the standard
+    variables of a scenario tree node. The rows follow the order of
+    tree_node._scenarios, and the columns follow the order of the
+    variable_ids list. Values of None are represented by NaN.
+
+    The arrays returned by gather() and gather_node() are kept until
+    they are invalidated, and must not be modified by the caller.
+    """
+
+    __slots__ = ("tree_node",
+                 "node_name",
+                 "variable_ids",
+                 "scenarios",
+                 "probabilities",
+                 "node_probability",
+                 "_index",
+                 "_getter",
+                 "_arrays",
+                 "_node_arrays")
+
+    def __init__(self, tree_node):
+        self.tree_node = tree_node
+        self.node_name = tree_node._name
+        self.variable_ids = sorted(tree_node._standard_variable_ids)
+        self.scenarios = list(tree_node._scenarios)
+        self.probabilities = numpy.array(
+            [scenario._probability for scenario in self.scenarios],
+            dtype=float)
+        self.node_probability = tree_node._probability
+        self._index = dict((variable_id, i) for i, variable_id
+                           in enumerate(self.variable_ids))
+        if len(self.variable_ids) == 1:
+            variable_id = self.variable_ids[0]
+            self._getter = lambda values: (values[variable_id],)
+        elif len(self.variable_ids) > 1:
+            self._getter = itemgetter(*self.variable_ids)
+        else:
+            self._getter = lambda values: ()
+        # the gathered arrays, by attribute name
+        self._arrays = {}
+        self._node_arrays = {}
+
+    def invalidate(self, name=None):
+        """
+        Discard the array gathered from the scenario or tree node
+        dictionaries with the given attribute name (or all of the
+        arrays if name is None).
+        """
+        if name is None:
+            self._arrays.clear()
+            self._node_arrays.clear()
+        else:
+            self._arrays.pop(name, None)
+            self._node_arrays.pop(name, None)
+
+    def gather(self, name):
+        """
+        Return the (scenario x variable) array of the values in the
+        scenario dictionaries with the given attribute name (e.g.,
+        '_x', '_w', or '_rho').
+        """
+        array = self._arrays.get(name)
+        if array is None:
+            getter = self._getter
+            node_name = self.node_name
+            array = self._arrays[name] = numpy.array(
+                [getter(getattr(scenario, name)[node_name])
+                 for scenario in self.scenarios],
+                dtype=float).reshape(len(self.scenarios),
+                                     len(self.variable_ids))
+        return array
+
+    def gather_node(self, name):
+        """
+        Return the array of the values of the tree node dictionary
+        with the given attribute name (e.g., '_averages').
+        """
+        array = self._node_arrays.get(name)
+        if array is None:
+            array = self._node_arrays[name] = numpy.array(
+                self._getter(getattr(self.tree_node, name)),
+                dtype=float).reshape(len(self.variable_ids))
+        return array
+
+    def scatter(self, name, array, mask):
+        """
+        Store the entries of a (scenario x variable) array for which
+        the mask is True in the scenario dictionaries with the given
+        attribute name (and in the gathered array).
+        """
+        gathered = self._arrays.get(name)
+        if gathered is not None:
+            numpy.copyto(gathered, array, where=mask)
+        variable_ids = self.variable_ids
+        node_name = self.node_name
+        for scenario, row, row_mask in zip(self.scenarios,
+                                           array.tolist(),
+                                           mask.tolist()):
+            values = getattr(scenario, name)[node_name]
+            if all(row_mask):
+                values.update(zip(variable_ids, row))
+            else:
+                values.update((variable_id, value)
+                              for variable_id, value, update
+                              in zip(variable_ids, row, row_mask)
+                              if update)
+
+    def scatter_node(self, name, array, mask):
+        """
+        Store the entries of an array for which the mask is True in
+        the tree node dictionary with the given attribute name (and in
+        the gathered array).
+        """
+        gathered = self._node_arrays.get(name)
+        if gathered is not None:
+            numpy.copyto(gathered, array, where=mask)
+        values = getattr(self.tree_node, name)
+        values.update((variable_id, value)
+                      for variable_id, value, update
+                      in zip(self.variable_ids,
+                             array.tolist(),
+                             mask.tolist())
+                      if update)
+
+    def mask(self, variable_ids):
+        """
+        Return a boolean array that is True for the columns of the
+        given variable ids. Variable ids that are not standard
+        variables of the tree node are ignored.
+        """
+        mask = numpy.zeros(len(self.variable_ids), dtype=bool)
+        index = self._index
+        mask[[index[variable_id] for variable_id in variable_ids
+              if variable_id in index]] = True
+        return mask
@@ -0,0 +1,356 @@
+#  _________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright (c) 2014 Sandia Corporation.
+#  Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+#  the U.S. Government retains certain rights in this software.
+#  This software is distributed under the BSD License.
+#  _________________________________________________________________________
+
+__all__ = ("ScenarioTreeActionManagerMultiprocess",)
+
+import sys
+import select
+import logging
+import threading
+import traceback
+import multiprocessing
+from collections import defaultdict
+try:
+    from collections import OrderedDict
+except ImportError:                         #pragma:nocover
+    from ordereddict import OrderedDict
+try:
+    from multiprocessing.connection import wait as _wait_connections
+except ImportError:
+    def _wait_connections(connections):
+        return select.select(connections, [], [])[0]
+
+from pyomo.opt.parallel.manager import (AsynchronousActionManager,
+                                        ActionManagerError,
+                                        ActionStatus)
+from pyomo.pysp.util.configured_object import PySPConfiguredObject
+from pyomo.pysp.scenariotree.server_pyro import ScenarioTreeServerPyro
+
+from six.moves import xrange, queue
+
+logger = logging.getLogger('pyomo.pysp')
+
+#
+# A scenario tree server that runs in a local process and receives
+# its tasks through a pipe rather than from a Pyro dispatcher. The
+# tasks are processed exactly as they are by the ScenarioTreeServerPyro
+# class, so the same registered worker types can be used.
+#
+
+class _ScenarioTreeServerMultiprocess(ScenarioTreeServerPyro):
+
+    def __init__(self, name, verbose=False):
+        # Note: The TaskWorker base class is not initialized, as
+        #       it would attempt to connect to a Pyro dispatcher
+        self.WORKERNAME = name
+        self._verbose = verbose
+        self._modules_imported = {}
+        self._worker_shutdown = False
+        options = self.register_options()
+        PySPConfiguredObject.__init__(self, options)
+        self._worker_map = {}
+        self._scenario_instance_factory = None
+        self._full_scenario_tree = None
+
+def _scenario_tree_server_main(connection, name, verbose):
+    """The main loop of a scenario tree server process. Tasks are
+    received as (id, generate_response, data) tuples, and results are
+    sent back as (id, result, error) tuples. The loop ends when None
+    is received or when a shutdown task has been processed."""
+    server = _ScenarioTreeServerMultiprocess(name, verbose=verbose)
+    try:
+        while not server._worker_shutdown:
+            try:
+                task = connection.recv()
+            except EOFError:
+                break
+            if task is None:
+                break
+            task_id, generate_response, data = task
+            result = None
+            error = None
+            try:
+                result = server._process(data)
+            except:
+                logger.error(
+                    "Scenario tree server %s caught an exception of type "
+                    "%s while processing a task."
+                    % (name, sys.exc_info()[0].__name__))
+                error = traceback.format_exc()
+            if generate_response:
+                try:
+                    connection.send((task_id, result, error))
+                except (IOError, OSError):
+                    break
+                except:
+                    # the result could not be pickled
+                    connection.send((task_id, None, traceback.format_exc()))
+            elif error is not None:
+                sys.stderr.write(error)
+    finally:
+        server.reset()
+        connection.close()
+
+#
+# The tasks are sent to a scenario tree server by a thread that
+# writes them to its pipe. A server blocks when it sends a result that
+# does not fit in the pipe, until the result is read. If the tasks
+# were sent by the thread that reads the results, it could block on
+# a full pipe while queueing tasks to that server, and neither side
+# would read.
+#
+
+def _send_tasks(connection, tasks, errors):
+    """The main loop of a task sender thread. The tasks are taken from
+    a queue and written to the connection of a scenario tree server.
+    The loop ends after None (which shuts down the server) is sent or
+    when the connection fails."""
+    while True:
+        task = tasks.get()
+        try:
+            connection.send(task)
+        except (IOError, OSError):
+            errors.append(traceback.format_exc())
+            break
+        except:
+            # the task could not be pickled
+            errors.append(traceback.format_exc())
+            continue
+        if task is None:
+            break
+
+#
+# An asynchronous action manager that starts a pool of scenario tree
+# servers in local processes and communicates with them through
+# pipes. It implements the interface of the
+# ScenarioTreeActionManagerPyro class used by the scenario tree
+# manager clients, but it does not require a Pyro name server or
+# dispatcher.
+#
+
+class ScenarioTreeActionManagerMultiprocess(AsynchronousActionManager):
+
+    def __init__(self, verbose=0):
+        self._verbose = verbose
+        self._paused = False
+        self._paused_tasks = []
+        # maps server name to the (process, connection, tasks,
+        # sender) running it, where tasks is the queue of the tasks
+        # written to the connection by the sender thread
+        self._servers = {}
+        # the errors reported by the sender threads
+        self._send_errors = []
+        # the number of responses expected from each server
+        self._outstanding = defaultdict(int)
+        # the scenario tree servers associated with this manager
+        self.server_pool = []
+        super(ScenarioTreeActionManagerMultiprocess, self).__init__()
+        self.results = OrderedDict()
+
+    def clear(self):
+        """
+        Clear manager state
+        """
+        super(ScenarioTreeActionManagerMultiprocess, self).clear()
+        self.results = OrderedDict()
+
+    def close(self):
+        """Close the manager."""
+        if len(self.results):
+            print("WARNING: %s is closing with %s local "
+                  "results waiting to be processed."
+                  % (type(self).__name__, len(self.results)))
+        if len(self._paused_tasks):
+            print("WARNING: %s is closing with %s paused "
+                  "tasks waiting to be queued."
+                  % (type(self).__name__, len(self._paused_tasks)))
+        self.results = OrderedDict()
+        self._paused = False
+        self._paused_tasks = []
+        if len(self.server_pool):
+            self.release_servers()
+
+    def acquire_servers(self, servers_requested, timeout=None):
+        """Start the requested number of scenario tree server
+        processes. The timeout argument is ignored, as the servers
+        are always available."""
+
+        if self._verbose:
+            print("Starting %s scenario tree server processes"
+                  % (servers_requested))
+
+        assert len(self.server_pool) == 0
+        for i in xrange(servers_requested):
+            server_name = "ScenarioTreeServerMultiprocess_%d" % (i)
+            connection, server_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_scenario_tree_server_main,
+                name=server_name,
+                args=(server_connection, server_name, bool(self._verbose)))
+            process.daemon = True
+            process.start()
+            server_connection.close()
+            tasks = queue.Queue()
+            sender = threading.Thread(
+                target=_send_tasks,
+                name=server_name+"_sender",
+                args=(connection, tasks, self._send_errors))
+            sender.daemon = True
+            sender.start()
+            self._servers[server_name] = (process, connection, tasks, sender)
+            self.server_pool.append(server_name)
+
+    def release_servers(self):
+        """Stop the scenario tree server processes."""
+
+        if self._verbose:
+            print("Releasing scenario tree servers")
+
+        for server_name in self.server_pool:
+            process, connection, tasks, sender = self._servers[server_name]
+            tasks.put(None)
+            sender.join()
+            process.join()
+            connection.close()
+
+        self.server_pool = []
+        self._servers = {}
+        self._outstanding = defaultdict(int)
+        self._send_errors[:] = []
+
+    def pause(self):
+        self._paused = True
+
+    def unpause(self):
+        self._paused = False
+        paused_tasks = self._paused_tasks
+        self._paused_tasks = []
+        for server_name, task in paused_tasks:
+            self._send_task(server_name, task)
+
+    def get_results(self, ah):
+        return self.results.pop(ah.id, None)
+
+    def wait_all(self, *args):
+        """
+        Wait for all actions to complete.  The arguments to this method
+        are expected to be ActionHandle objects or iterators that return
+        ActionHandle objects.  If no arguments are provided, then this
+        method will terminate after all queued actions are complete.
+        """
+        # Collect event handlers from the arguments
+        ahs = self._flatten(*args)
+        if len(ahs):
+            while len(ahs) > 0:
+                ahs.difference_update([ah for ah in ahs if ah.id in self.results])
+                if len(ahs):
+                    self._download_results()
+        else:
+            while self.queued_action_counter > 0:
+                self._download_results()
+
+    def wait_any(self, *args):
+        # Collect event handlers from the arguments
+        ahs = self._flatten(*args)
+        if len(ahs):
+            while (1):
+                for ah in ahs:
+                    if ah.id in self.results:
+                        return ah
+                self._download_results()
+        else:
+            while len(self.results) == 0:
+                self._download_results()
+            return self.event_handle[next(iter(self.results))]
+
+    def wait_for(self, ah):
+        """
+        Wait for the specified action to complete.
+        """
+        while ah.id not in self.results:
+            self._download_results()
+        return self.get_results(ah)
+
+    def _send_task(self, server_name, task):
+        tasks = self._servers[server_name][2]
+        tasks.put(task)
+        if task[1]:
+            self._outstanding[server_name] += 1
+
+    #
+    # Perform the queue operation. This method returns the
+    # ActionHandle, and the ActionHandle status indicates whether
+    # the queue was successful.
+    #
+    def _perform_queue(self, ah, *args, **kwds):
+
+        queue_name = kwds.pop('queue_name', None)
+        generate_response = kwds.pop('generate_response', True)
+        if queue_name not in self._servers:
+            raise ActionManagerError(
+                "No scenario tree server with name '%s' has been "
+                "started by this %s" % (queue_name, type(self).__name__))
+
+        task = (ah.id, generate_response, kwds)
+        if self._paused:
+            self._paused_tasks.append((queue_name, task))
+        else:
+            self._send_task(queue_name, task)
+
+        if not generate_response:
+            ah.status = ActionStatus.done
+            self.event_handle[ah.id].update(ah)
+            self.queued_action_counter -= 1
+
+        return ah
+
+    def _download_results(self):
+
+        if len(self._send_errors):
+            raise RuntimeError(
+                "A task could not be sent to a scenario tree server. "
+                "Reason: \n%s" % (self._send_errors[0]))
+
+        connection_to_server_name = \
+            dict((self._servers[server_name][1], server_name)
+                 for server_name in self.server_pool
+                 if self._outstanding[server_name] > 0)
+        if len(connection_to_server_name) == 0:
+            raise ActionManagerError(
+                "%s is waiting for results, but no actions are being "
+                "executed by the scenario tree servers"
+                % (type(self).__name__))
+
+        for connection in _wait_connections(list(connection_to_server_name)):
+            server_name = connection_to_server_name[connection]
+            try:
+                task_id, result, error = connection.recv()
+            except EOFError:
+                raise RuntimeError(
+                    "Scenario tree server %s terminated unexpectedly"
+                    % (server_name))
+            self._outstanding[server_name] -= 1
+            self.queued_action_counter -= 1
+            ah = self.event_handle.get(task_id, None)
+            if ah is None:
+                # if we are here, this is really bad news!
+                raise RuntimeError(
+                    "The %s found results for task with id=%s"
+                    " - but no corresponding action handle "
+                    "could be located!" % (type(self).__name__, task_id))
+            if error is not None:
+                ah.status = ActionStatus.error
+                self.event_handle[ah.id].update(ah)
+                raise RuntimeError(
+                    "Scenario tree server %s reported a processing error "
+                    "for task with id=%s. Reason: \n%s"
+                    % (server_name, task_id, error))
+            ah.status = ActionStatus.done
+            self.event_handle[ah.id].update(ah)
+            self.results[ah.id] = result
@@ -9,7 +9,8 @@
 
 __all__ = ("InvocationType",
            "ScenarioTreeManagerClientSerial",
-           "ScenarioTreeManagerClientPyro")
+           "ScenarioTreeManagerClientPyro",
+           "ScenarioTreeManagerClientMultiprocess")
 
 import sys
 import time
@@ -17,6 +18,7 @@ import itertools
 import inspect
 import logging
 import traceback
+import multiprocessing
 from collections import defaultdict
 
 import pyutilib.misc
@@ -37,6 +39,8 @@ from pyomo.pysp.scenariotree.action_manager_pyro \
     import ScenarioTreeActionManagerPyro
 from pyomo.pysp.scenariotree.server_pyro \
     import ScenarioTreeServerPyro
+from pyomo.pysp.scenariotree.action_manager_multiprocess \
+    import ScenarioTreeActionManagerMultiprocess
 from pyomo.pysp.scenariotree.server_pyro_utils \
     import (ScenarioWorkerInit,
             BundleWorkerInit,
@@ -1821,10 +1825,7 @@ class _ScenarioTreeManagerClientPyroAdvanced(ScenarioTreeManagerClient,
         action manager."""
 
         assert self._action_manager is None
-        self._action_manager = ScenarioTreeActionManagerPyro(
-            verbose=self._options.verbose,
-            host=self._options.pyro_host,
-            port=self._options.pyro_port)
+        self._action_manager = self._create_action_manager()
         self._action_manager.acquire_servers(num_servers, timeout=timeout)
         # extract server options
         server_options = ScenarioTreeServerPyro.\
@@ -1854,6 +1855,12 @@ class _ScenarioTreeManagerClientPyroAdvanced(ScenarioTreeManagerClient,
 
         return len(self._action_manager.server_pool)
 
+    def _create_action_manager(self):
+        return ScenarioTreeActionManagerPyro(
+            verbose=self._options.verbose,
+            host=self._options.pyro_host,
+            port=self._options.pyro_port)
+
     def release_scenariotreeservers(self):
         """Release the pool of scenario tree servers and destroy the
         action manager."""
@@ -2682,3 +2689,49 @@ class ScenarioTreeManagerClientPyro(_ScenarioTreeManagerClientPyroAdvanced,
     def get_server_for_bundle(self, bundle_name):
         return self.get_server_for_worker(
             self.get_worker_for_bundle(bundle_name))
+
+#
+# This class replaces the Pyro-based action manager used by
+# ScenarioTreeManagerClientPyro with one that starts the scenario tree
+# servers as processes on the local machine and communicates with them
+# through pipes, so that scenario tree work can be distributed over
+# the local processors without a Pyro name server or dispatcher.
+#
+
+class ScenarioTreeManagerClientMultiprocess(ScenarioTreeManagerClientPyro,
+                                            PySPConfiguredObject):
+
+    _declared_options = \
+        PySPConfigBlock("Options declared for the "
+                        "ScenarioTreeManagerClientMultiprocess class")
+    safe_declare_common_option(_declared_options,
+                               "multiprocess_workers")
+
+    def _create_action_manager(self):
+        return ScenarioTreeActionManagerMultiprocess(
+            verbose=self._options.verbose)
+
+    #
+    # Abstract methods for ScenarioTreeManager:
+    #
+
+    # Override the implementation on _ScenarioTreeManagerClientPyroAdvanced
+    def _close_impl(self):
+        if self._action_manager is not None:
+            self.release_scenariotreeservers()
+
+    #
+    # Override the extended interface for Pyro
+    #
+
+    def acquire_scenariotreeservers(self, num_servers, timeout=None):
+        """Start a pool of scenario tree server processes and
+        initialize the action manager. No more processes are started
+        than the value of the multiprocess_workers option (or the
+        number of processors when it is 0). The timeout argument is
+        ignored."""
+        max_servers = self._options.multiprocess_workers
+        if max_servers == 0:
+            max_servers = multiprocessing.cpu_count()
+        return super(ScenarioTreeManagerClientMultiprocess, self).\
+            acquire_scenariotreeservers(min(num_servers, max_servers))
@@ -8,7 +8,8 @@
 #  _________________________________________________________________________
 
 __all__ = ("ScenarioTreeManagerSolverClientSerial",
-           "ScenarioTreeManagerSolverClientPyro")
+           "ScenarioTreeManagerSolverClientPyro",
+           "ScenarioTreeManagerSolverClientMultiprocess")
 
 # TODO: handle pyro as the solver manager when even when the
 #       pyro scenario tree manager is used
@@ -20,6 +21,7 @@ from pyutilib.pyro import shutdown_pyro_components
 from pyomo.opt import (UndefinedData,
                        undefined,
                        SolverFactory,
+                       PersistentSolver,
                        SolutionStatus,
                        TerminationCondition)
 from pyomo.opt.base.solvers import OptSolver
@@ -33,7 +35,8 @@ from pyomo.pysp.scenariotree.manager import \
     (ScenarioTreeManager,
      _ScenarioTreeManagerWorker,
      ScenarioTreeManagerClientSerial,
-     ScenarioTreeManagerClientPyro)
+     ScenarioTreeManagerClientPyro,
+     ScenarioTreeManagerClientMultiprocess)
 
 from six import itervalues, iteritems
 
@@ -828,6 +831,15 @@ class _ScenarioTreeManagerSolverWorker(_ScenarioTreeManagerWorker,
 
             opt = solver_dict[object_name]
             instance = instance_dict[object_name]
+            # a persistent solver keeps the compiled instance across
+            # solves, and the preprocessor updates it afterwards
+            if isinstance(opt, PersistentSolver) and \
+               (not opt.instance_compiled()):
+                opt.compile_instance(
+                    instance,
+                    symbolic_solver_labels=common_kwds['symbolic_solver_labels'],
+                    output_fixed_variable_bounds=\
+                        common_kwds.get('output_fixed_variable_bounds', False))
             if (not self._options.disable_warmstart) and \
                (not disable_warmstart) and \
                opt.warm_start_capable():
@@ -951,7 +963,7 @@ class _ScenarioTreeManagerSolverWorker(_ScenarioTreeManagerWorker,
             self._solve_times[scenario_name] = \
                 float(results.solver.time)
         else:
-            self._solver_times[scenario_name] = undefined
+            self._solve_times[scenario_name] = undefined
 
         if hasattr(results,"pyomo_solve_time"):
             self._pyomo_solve_times[scenario_name] = \
@@ -1525,3 +1537,17 @@ class ScenarioTreeManagerSolverClientPyro(ScenarioTreeManagerClientPyro,
                 self.unpause_transmit()
 
         return node_count
+
+#
+# The ScenarioTreeManagerSolverClientPyro implementation, using
+# scenario tree servers started as processes on the local machine
+# (see ScenarioTreeManagerClientMultiprocess).
+#
+
+class ScenarioTreeManagerSolverClientMultiprocess(
+        ScenarioTreeManagerClientMultiprocess,
+        ScenarioTreeManagerSolverClientPyro):
+
+    def __init__(self, *args, **kwds):
+        super(ScenarioTreeManagerSolverClientMultiprocess, self).\
+            __init__(*args, **kwds)
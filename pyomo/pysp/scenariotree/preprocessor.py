@@ -13,10 +13,14 @@ __all__ = ("ScenarioTreePreprocessor",)
 #       when advanced preprocessing is disabled and finish
 #       implementing for that option.
 import time
+import itertools
 
 # these are the only two preprocessors currently invoked by the
 # simple_preprocessor, which in turn is invoked by the preprocess()
 # method of PyomoModel.
+from pyomo.core.base import Constraint, ComponentMap, value
+from pyomo.core.base.expr import (identify_variables,
+                                  identify_mutable_parameters)
 from pyomo.opt import ProblemFormat, PersistentSolver
 from pyomo.repn.canonical_repn import LinearCanonicalRepn
 from pyomo.repn.compute_canonical_repn import preprocess_block_objectives \
@@ -25,12 +29,16 @@ from pyomo.repn.compute_canonical_repn import preprocess_block_constraints \
     as canonical_preprocess_block_constraints
 from pyomo.repn.compute_canonical_repn import preprocess_constraint \
     as canonical_preprocess_constraint
+from pyomo.repn.compute_canonical_repn import preprocess_model_constraints \
+    as canonical_preprocess_model_constraints
 from pyomo.repn.compute_ampl_repn import preprocess_block_objectives \
     as ampl_preprocess_block_objectives
 from pyomo.repn.compute_ampl_repn import preprocess_block_constraints \
     as ampl_preprocess_block_constraints
 from pyomo.repn.compute_ampl_repn import preprocess_constraint \
     as ampl_preprocess_constraint
+from pyomo.repn.compute_ampl_repn import preprocess_model_constraints \
+    as ampl_preprocess_model_constraints
 from pyomo.repn.ampl_repn import generate_ampl_repn
 from pyomo.repn.canonical_repn import generate_canonical_repn
 import pyomo.util
@@ -47,6 +55,178 @@ ampl_expression_preprocessor = \
     pyomo.util.PyomoAPIFactory("pyomo.repn.compute_ampl_repn")
 
 
+#
+# Records the constraints and objective that reference each variable
+# and mutable parameter of a preprocessed instance, so that only the
+# repns affected by a change are regenerated. The changes are either
+# recorded by the algorithm (the fixed_variables, freed_variables and
+# constraints_updated_list of the preprocessor), which are expanded by
+# collect_flagged(), or found by collect(), which compares the
+# instance with a snapshot of the components that determine the repns
+# (the set of active constraints, the fixed status of variables, and
+# the values of mutable parameters). The fixed status and values are
+# plain attributes of the component data, so there are no hooks to
+# record the changes as they are made, and collect() visits every
+# active constraint, variable and parameter; it is only used with the
+# preprocess_detect_changes option.
+#
+class _InstanceChangeTracker(object):
+
+    __slots__ = ("_instance",
+                 "_objective",
+                 "_track_fixed",
+                 "_active",
+                 "_references",
+                 "_dependents",
+                 "_var_state",
+                 "_param_value")
+
+    def __init__(self, instance, objective, track_fixed):
+        self._instance = instance
+        self._objective = objective
+        # fixed variables are only compiled out of the repns if the
+        # preprocess_fixed_variables option is set
+        self._track_fixed = track_fixed
+        self.reset()
+
+    @staticmethod
+    def _get_var_state(var):
+        if var.fixed:
+            return (True, var.value, value(var.lb), value(var.ub))
+        return (False, None, value(var.lb), value(var.ub))
+
+    def reset(self):
+        """Take a snapshot of the instance after it has been fully
+        preprocessed."""
+        # the active constraints (a set)
+        self._active = ComponentMap()
+        # maps the id of a constraint or objective to the ids of the
+        # variables and parameters in its expression
+        self._references = {}
+        # maps the id of a variable or parameter to the constraints
+        # (and objective) that reference it
+        self._dependents = {}
+        # maps the id of a variable to (variable, state)
+        self._var_state = {}
+        # maps the id of a parameter to (parameter, value)
+        self._param_value = {}
+        for constraint_data in self._instance.component_data_objects(
+                Constraint, active=True, descend_into=True):
+            self._active[constraint_data] = None
+            self._add(constraint_data, constraint_data.body)
+        self._add(self._objective, self._objective.expr)
+
+    def _add(self, component, expr):
+        references = set()
+        for var in identify_variables(expr, include_fixed=True):
+            if id(var) not in self._var_state:
+                self._var_state[id(var)] = (var, self._get_var_state(var))
+            references.add(id(var))
+        for param in identify_mutable_parameters(expr):
+            if id(param) not in self._param_value:
+                self._param_value[id(param)] = (param, param.value)
+            references.add(id(param))
+        for ref in references:
+            self._dependents.setdefault(ref, ComponentMap())[component] = \
+                None
+        self._references[id(component)] = references
+
+    def _remove(self, component):
+        for ref in self._references.pop(id(component)):
+            dependents = self._dependents[ref]
+            del dependents[component]
+            if len(dependents) == 0:
+                del self._dependents[ref]
+                self._var_state.pop(ref, None)
+                self._param_value.pop(ref, None)
+
+    def collect(self):
+        """Return the active constraints whose repns are out of date,
+        whether the repn of the objective is out of date, and the
+        variables whose bounds or fixed status changed since the last
+        call (or the last reset). The snapshot is updated, so each
+        change is only reported once."""
+        dirty = ComponentMap()
+
+        # constraints that were added or activated, and constraints
+        # that were removed or deactivated
+        active = ComponentMap()
+        for constraint_data in self._instance.component_data_objects(
+                Constraint, active=True, descend_into=True):
+            active[constraint_data] = None
+            if constraint_data not in self._active:
+                dirty[constraint_data] = None
+        for constraint_data in self._active:
+            if constraint_data not in active:
+                self._remove(constraint_data)
+        self._active = active
+
+        # mutable parameters whose value changed
+        for param_id, (param, old_value) in list(self._param_value.items()):
+            if param.value != old_value:
+                self._param_value[param_id] = (param, param.value)
+                for component in self._dependents[param_id]:
+                    dirty[component] = None
+
+        # variables whose fixed status, fixed value or bounds changed
+        changed_vars = []
+        for var_id, (var, old_state) in list(self._var_state.items()):
+            state = self._get_var_state(var)
+            if state != old_state:
+                self._var_state[var_id] = (var, state)
+                changed_vars.append(var)
+                if self._track_fixed and (state[:2] != old_state[:2]):
+                    for component in self._dependents[var_id]:
+                        dirty[component] = None
+
+        dirty_constraints, objective_dirty = self._refresh(dirty)
+        return dirty_constraints, objective_dirty, changed_vars
+
+    def collect_flagged(self, variables, constraints, objective_updated):
+        """Return the active constraints (that were not flagged) whose
+        repns are out of date, and whether the repn of the objective
+        is out of date, given the variables whose fixed status changed
+        and the constraints (and objective) whose repns are
+        regenerated in this round. Only the flagged components and the
+        components that reference the flagged variables are
+        visited."""
+        flagged = ComponentMap()
+        for constraint_data in constraints:
+            if not isinstance(constraint_data, LinearCanonicalRepn):
+                flagged[constraint_data] = None
+        if objective_updated:
+            flagged[self._objective] = None
+        dirty = ComponentMap()
+        for var in variables:
+            var_id = id(var)
+            if var_id in self._var_state:
+                self._var_state[var_id] = (var, self._get_var_state(var))
+            if self._track_fixed:
+                for component in self._dependents.get(var_id, ()):
+                    if component not in flagged:
+                        dirty[component] = None
+        # the references of the flagged components may have changed
+        self._refresh(flagged)
+        return self._refresh(dirty)
+
+    def _refresh(self, dirty):
+        """Update the references of the components in dirty (which is
+        modified), and return the active constraints in dirty and
+        whether it contains the objective."""
+        objective_dirty = self._objective in dirty
+        if objective_dirty:
+            del dirty[self._objective]
+            self._remove(self._objective)
+            self._add(self._objective, self._objective.expr)
+        dirty_constraints = []
+        for constraint_data in dirty:
+            if id(constraint_data) in self._references:
+                self._remove(constraint_data)
+            if constraint_data.active:
+                self._add(constraint_data, constraint_data.body)
+                dirty_constraints.append(constraint_data)
+        return dirty_constraints, objective_dirty
+
 #
 # We only want to do the minimal amount of work to get the instance
 # back to a consistent "preprocessed" state. The following attributes
@@ -65,6 +245,10 @@ class ScenarioTreePreprocessor(PySPConfiguredObject):
                                "disable_advanced_preprocessing")
     safe_declare_common_option(_declared_options,
                                "preprocess_fixed_variables")
+    safe_declare_common_option(_declared_options,
+                               "preprocess_detect_changes")
+    safe_declare_common_option(_declared_options,
+                               "preprocess_processes")
     
     #
     # various
@@ -80,6 +264,10 @@ class ScenarioTreePreprocessor(PySPConfiguredObject):
         self._scenario_solver = {}
         self._scenario_instance = {}
         self._scenario_objective = {}
+        # maps scenario name to the _InstanceChangeTracker of the
+        # scenario instance (created after the first preprocessing
+        # round when advanced preprocessing is enabled)
+        self._scenario_change_tracker = {}
 
         #
         # Bundle related objects
@@ -141,6 +329,7 @@ class ScenarioTreePreprocessor(PySPConfiguredObject):
 
         del self._scenario_instance[scenario._name]
         del self._scenario_solver[scenario._name]
+        self._scenario_change_tracker.pop(scenario._name, None)
 
         del self.fixed_variables[scenario._name]
         del self.freed_variables[scenario._name]
@@ -293,6 +482,9 @@ class ScenarioTreePreprocessor(PySPConfiguredObject):
 
             preprocess_bundle = 0
             solver = self._bundle_solvers[bundle_name]
+            # the variables whose bounds or fixed status changed in
+            # the scenario instances of the bundle
+            bundle_variables = []
             for scenario_name in self._bundle_scenarios[bundle_name]:
 
                 if self.objective_updated[scenario_name]:
@@ -309,7 +501,12 @@ class ScenarioTreePreprocessor(PySPConfiguredObject):
                         preprocess_bundle_constraints
                     self._bundle_first_preprocess[bundle_name] = False
 
-                self._preprocess_scenario(scenario_name, solver)
+                # Note: the scenario instance is not the instance
+                #       compiled by a persistent bundle solver
+                bundle_variables.extend(
+                    self._preprocess_scenario(scenario_name,
+                                              solver,
+                                              update_persistent_solver=False))
 
                 # We've preprocessed the instance, reset the relevant flags
                 self.clear_update_flags(scenario_name)
@@ -345,22 +542,51 @@ class ScenarioTreePreprocessor(PySPConfiguredObject):
                             bundle_ef_instance,
                             idMap=idMap)
 
+                if isinstance(solver, PersistentSolver) and \
+                   solver.instance_compiled() and \
+                   (preprocess_bundle & preprocess_bundle_objective):
+                    solver.compile_objective(bundle_ef_instance)
+
+            # the bounds of the variables whose bounds or fixed status
+            # changed are updated in a persistent bundle solver (the
+            # scenario instances are sub-blocks of the bundle instance,
+            # so the variable names are qualified by the scenario name)
+            if isinstance(solver, PersistentSolver) and \
+               solver.instance_compiled() and \
+               (len(bundle_variables) > 0):
+
+                if self._options.verbose:
+                    print("Compiling fixed status updates in persistent "
+                          "solver for bundle %s" % (bundle_name))
+
+                solver.compile_variable_bounds(
+                    self._bundle_instances[bundle_name],
+                    vars_to_update=[(var.parent_component().cname(True),
+                                     var.index())
+                                    for var in bundle_variables])
+
         end_time = time.time()
 
         if self._options.output_times:
             print("Bundle preprocessing time=%.2f seconds"
                   % (end_time - start_time))
 
-    def _preprocess_scenario(self, scenario_name, solver):
+    #
+    # Preprocess a scenario instance, and return the variables whose
+    # bounds or fixed status changed when the persistent solver is not
+    # updated (i.e., when the scenario is part of a bundle).
+    #
+
+    def _preprocess_scenario(self,
+                             scenario_name,
+                             solver,
+                             update_persistent_solver=True):
 
         assert scenario_name in self._scenario_instance
         scenario_objective_active = self._scenario_objective[scenario_name].active
         # because the preprocessor will skip the scenario objective if it is
         # part of a bundle and not active
         self._scenario_objective[scenario_name].activate()
-        def _cleanup():
-            if not scenario_objective_active:
-                self._scenario_objective[scenario_name].deactivate()
         scenario_instance = self._scenario_instance[scenario_name]
         instance_fixed_variables = self.fixed_variables[scenario_name]
         instance_freed_variables = self.freed_variables[scenario_name]
@@ -369,11 +595,69 @@ class ScenarioTreePreprocessor(PySPConfiguredObject):
         instance_constraints_updated_list = \
             self.constraints_updated_list[scenario_name]
         instance_objective_updated = self.objective_updated[scenario_name]
+        tracker = self._scenario_change_tracker.get(scenario_name, None)
+        def _cleanup():
+            # the tracker takes a new snapshot of the instance
+            # whenever all of it has been preprocessed
+            if not self._options.disable_advanced_preprocessing:
+                if tracker is None:
+                    self._scenario_change_tracker[scenario_name] = \
+                        _InstanceChangeTracker(
+                            scenario_instance,
+                            self._scenario_objective[scenario_name],
+                            self._options.preprocess_fixed_variables)
+                elif instance_all_constraints_updated:
+                    tracker.reset()
+            if not scenario_objective_active:
+                self._scenario_objective[scenario_name].deactivate()
 
-        persistent_solver_in_use = isinstance(solver, PersistentSolver)
+        # add the changes to the instance found by the change tracker
+        # to those that were flagged (by default, the tracker only adds
+        # the constraints and objective that reference the flagged
+        # variables)
+        tracked_variables = []
+        if (tracker is not None) and \
+           (not instance_all_constraints_updated):
+            if self._options.preprocess_detect_changes:
+                tracked_constraints, tracked_objective, tracked_variables = \
+                    tracker.collect()
+            else:
+                tracked_constraints, tracked_objective = \
+                    tracker.collect_flagged(
+                        [scenario_instance.find_component(var_name)[var_index]
+                         for var_name, var_index in
+                         itertools.chain(instance_fixed_variables,
+                                         instance_freed_variables)],
+                        instance_constraints_updated_list,
+                        instance_objective_updated)
+            if tracked_objective:
+                instance_objective_updated = True
+            if len(tracked_constraints) > 0:
+                instance_constraints_updated_list = \
+                    list(instance_constraints_updated_list) + \
+                    tracked_constraints
+
+        changed_variables = []
+        if not update_persistent_solver:
+            changed_ids = set()
+            for vardata in itertools.chain(
+                    (scenario_instance.find_component(var_name)[var_index]
+                     for var_name, var_index in
+                     itertools.chain(instance_fixed_variables,
+                                     instance_freed_variables)),
+                    tracked_variables):
+                if id(vardata) not in changed_ids:
+                    changed_ids.add(id(vardata))
+                    changed_variables.append(vardata)
+
+        persistent_solver_in_use = update_persistent_solver and \
+                                   isinstance(solver, PersistentSolver)
+        # (the variables found by the change tracker are only reported
+        # once, so their bounds must be sent to a persistent solver now)
         if (not instance_objective_updated) and \
            (not instance_fixed_variables) and \
            (not instance_freed_variables) and \
+           (not tracked_variables) and \
            (not instance_all_constraints_updated) and \
            (len(instance_constraints_updated_list) == 0):
 
@@ -383,24 +667,34 @@ class ScenarioTreePreprocessor(PySPConfiguredObject):
                 print("No preprocessing necessary for scenario %s"
                       % (scenario_name))
             _cleanup()
-            return
+            return changed_variables
 
+        # the change tracker has already flagged the constraints
+        # and objective that reference variables whose fixed status
+        # changed
         if (instance_fixed_variables or instance_freed_variables) and \
-           (self._options.preprocess_fixed_variables):
+           (self._options.preprocess_fixed_variables) and \
+           (tracker is None):
 
             if self._options.verbose:
                 print("Running full preprocessing for scenario %s"
                       % (scenario_name))
 
             if solver.problem_format() == ProblemFormat.nl:
-                ampl_expression_preprocessor({}, model=scenario_instance)
+                ampl_expression_preprocessor(
+                    {},
+                    model=scenario_instance,
+                    processes=self._options.preprocess_processes)
             else:
-                canonical_expression_preprocessor({}, model=scenario_instance)
+                canonical_expression_preprocessor(
+                    {},
+                    model=scenario_instance,
+                    processes=self._options.preprocess_processes)
 
             # We've preprocessed the entire instance, no point in checking
             # anything else
             _cleanup()
-            return
+            return changed_variables
 
         if instance_objective_updated:
 
@@ -418,7 +712,8 @@ class ScenarioTreePreprocessor(PySPConfiguredObject):
                solver.instance_compiled():
                 solver.compile_objective(scenario_instance)
 
-        if (instance_fixed_variables or instance_freed_variables) and \
+        if (instance_fixed_variables or instance_freed_variables or \
+            tracked_variables) and \
            (persistent_solver_in_use):
 
             if self._options.verbose:
@@ -431,7 +726,9 @@ class ScenarioTreePreprocessor(PySPConfiguredObject):
             # don't compile the variable bounds.
             if solver.instance_compiled():
                 variables_to_change = \
-                    instance_fixed_variables + instance_freed_variables
+                    instance_fixed_variables + instance_freed_variables + \
+                    [(var.parent_component().cname(True), var.index())
+                     for var in tracked_variables]
                 solver.compile_variable_bounds(
                     scenario_instance,
                     vars_to_update=variables_to_change)
@@ -443,17 +740,15 @@ class ScenarioTreePreprocessor(PySPConfiguredObject):
                       % (scenario_name))
 
             if solver.problem_format() == ProblemFormat.nl:
-                idMap = {}
-                for block in scenario_instance.block_data_objects(
-                        active=True,
-                        descend_into=True):
-                    ampl_preprocess_block_constraints(block, idMap=idMap)
+                ampl_preprocess_model_constraints(
+                    scenario_instance,
+                    idMap={},
+                    processes=self._options.preprocess_processes)
             else:
-                idMap = {}
-                for block in scenario_instance.block_data_objects(
-                        active=True,
-                        descend_into=True):
-                    canonical_preprocess_block_constraints(block, idMap=idMap)
+                canonical_preprocess_model_constraints(
+                    scenario_instance,
+                    idMap={},
+                    processes=self._options.preprocess_processes)
 
         elif len(instance_constraints_updated_list) > 0:
 
@@ -483,6 +778,7 @@ class ScenarioTreePreprocessor(PySPConfiguredObject):
                     repn_func(constraint_data.body, idMap=idMap)
 
         _cleanup()
+        return changed_variables
 
     def get_solver_keywords(self):
 
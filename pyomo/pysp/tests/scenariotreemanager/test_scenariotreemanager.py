@@ -26,6 +26,7 @@ import pyutilib.th as unittest
 from pyomo.pysp.util.config import PySPConfigBlock
 from pyomo.pysp.scenariotree.manager import (ScenarioTreeManagerClientSerial,
                                              ScenarioTreeManagerClientPyro,
+                                             ScenarioTreeManagerClientMultiprocess,
                                              InvocationType)
 from pyomo.pysp.scenariotree.manager_worker_pyro import ScenarioTreeManagerWorkerPyro
 from pyomo.pysp.scenariotree.server_pyro import (RegisterWorker,
@@ -44,6 +45,9 @@ class _ScenarioTreeManagerWorkerTest(ScenarioTreeManagerWorkerPyro):
     def junk(self, *args, **kwds):
         return (args, kwds)
 
+    def fail(self):
+        raise ValueError("fail")
+
 class _ScenarioTreeManagerClientTestSerial(ScenarioTreeManagerClientSerial):
 
     def __init__(self, *args, **kwds):
@@ -65,6 +69,9 @@ def _Single(worker):
 def _PerScenario(worker, scenario):
     return scenario.name
 
+def _Pid(worker, scenario):
+    return os.getpid()
+
 def _PerBundle(worker, bundle):
     return bundle.name
 
@@ -1127,5 +1134,111 @@ class TestScenarioTreeManagerClientPyro_HandshakeAtStartup_MultipleWorkers(
         options.pyro_handshake_at_startup = True
         options.pyro_multiple_scenariotreeserver_workers = True
 
+class _ScenarioTreeManagerClientMultiprocessTesterBase(
+        _ScenarioTreeManagerTesterBase):
+
+    cls = ScenarioTreeManagerClientMultiprocess
+
+    def setUp(self):
+        self.options = PySPConfigBlock()
+        ScenarioTreeManagerClientMultiprocess.register_options(
+            self.options,
+            registered_worker_name='ScenarioTreeManagerWorkerTest')
+
+    @unittest.nottest
+    def _setup(self, options):
+        _ScenarioTreeManagerTesterBase._setup(self, options)
+        options.multiprocess_workers = 2
+
+    def test_workers(self):
+        self._setup(self.options)
+        with self.cls(self.options, **_init_kwds) as manager:
+            manager.initialize()
+            # no more processes than the multiprocess_workers option
+            self.assertEqual(len(manager._action_manager.server_pool), 2)
+            pids = manager.invoke_function(
+                "_Pid",
+                thisfile,
+                invocation_type=InvocationType.PerScenario)
+            self.assertEqual(sorted(pids),
+                             sorted(s.name for s in
+                                    manager.scenario_tree.scenarios))
+            self.assertEqual(len(set(pids.values())), 2)
+            self.assertEqual(os.getpid() in pids.values(), False)
+            action_manager = manager._action_manager
+            processes = [action_manager._servers[name][0]
+                         for name in action_manager.server_pool]
+        self.assertEqual(manager._action_manager, None)
+        for process in processes:
+            self.assertEqual(process.is_alive(), False)
+
+    def test_error(self):
+        self._setup(self.options)
+        with self.cls(self.options, **_init_kwds) as manager:
+            manager.initialize()
+            worker_name = manager.worker_names[0]
+            self.assertRaises(RuntimeError,
+                              manager.invoke_method_on_worker,
+                              worker_name,
+                              "fail")
+            # the worker can still be used
+            self.assertEqual(
+                manager.invoke_method_on_worker(worker_name,
+                                                "junk",
+                                                method_args=(1,)),
+                ((1,), {}))
+
+    def test_large_tasks(self):
+        # many tasks and results larger than the pipe buffers are
+        # queued before any result is read
+        self._setup(self.options)
+        with self.cls(self.options, **_init_kwds) as manager:
+            manager.initialize()
+            worker_name = manager.worker_names[0]
+            data = "x" * (1 << 20)
+            results = [manager.invoke_method_on_worker(worker_name,
+                                                       "junk",
+                                                       method_args=(i, data),
+                                                       async=True)
+                       for i in range(16)]
+            for i, result in enumerate(results):
+                self.assertEqual(result.complete(), ((i, data), {}))
+
+@unittest.category('smoke','nightly','expensive')
+class TestScenarioTreeManagerClientMultiprocess(
+        unittest.TestCase,
+        _ScenarioTreeManagerClientMultiprocessTesterBase):
+
+    def setUp(self):
+        _ScenarioTreeManagerClientMultiprocessTesterBase.setUp(self)
+    def _setup(self, options):
+        _ScenarioTreeManagerClientMultiprocessTesterBase._setup(self, options)
+        options.pyro_handshake_at_startup = False
+        options.pyro_multiple_scenariotreeserver_workers = False
+
+@unittest.category('nightly','expensive')
+class TestScenarioTreeManagerClientMultiprocess_MultipleWorkers(
+        unittest.TestCase,
+        _ScenarioTreeManagerClientMultiprocessTesterBase):
+
+    def setUp(self):
+        _ScenarioTreeManagerClientMultiprocessTesterBase.setUp(self)
+    def _setup(self, options):
+        _ScenarioTreeManagerClientMultiprocessTesterBase._setup(self, options)
+        options.pyro_handshake_at_startup = False
+        options.pyro_multiple_scenariotreeserver_workers = True
+
+@unittest.category('nightly','expensive')
+class TestScenarioTreeManagerClientMultiprocess_HandshakeAtStartup(
+        unittest.TestCase,
+        _ScenarioTreeManagerClientMultiprocessTesterBase):
+
+    def setUp(self):
+        _ScenarioTreeManagerClientMultiprocessTesterBase.setUp(self)
+    def _setup(self, options):
+        _ScenarioTreeManagerClientMultiprocessTesterBase._setup(self, options)
+        options.pyro_handshake_at_startup = True
+        options.pyro_multiple_scenariotreeserver_workers = False
+
 if __name__ == "__main__":
     unittest.main()
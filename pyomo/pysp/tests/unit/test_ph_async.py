@@ -0,0 +1,68 @@
+#  _________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright (c) 2014 Sandia Corporation.
+#  Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+#  the U.S. Government retains certain rights in this software.
+#  This software is distributed under the BSD License.
+#  _________________________________________________________________________
+#
+# Test the scenario queueing of asynchronous PH
+#
+
+import pyutilib.th as unittest
+
+import pyomo.environ
+from pyomo.pysp.ph import ProgressiveHedging
+from pyomo.pysp.phinit import construct_ph_options_parser
+
+class TestPHAsync(unittest.TestCase):
+
+    def _ph(self, staleness_bound):
+        ph = ProgressiveHedging.__new__(ProgressiveHedging)
+        ph._verbose = False
+        ph._async_staleness_bound = staleness_bound
+        return ph
+
+    def test_options(self):
+        options = construct_ph_options_parser("").parse_args(
+            ["--async", "--async-fraction=0.5",
+             "--async-staleness-bound=2"])
+        self.assertEqual(options.async_fraction, 0.5)
+        self.assertEqual(options.async_staleness_bound, 2)
+        options = construct_ph_options_parser("").parse_args([])
+        self.assertEqual(options.async_fraction, 0.0)
+        self.assertEqual(options.async_staleness_bound, 0)
+
+    def test_no_bound(self):
+        ph = self._ph(0)
+        deferred = []
+        counts = {'s1': 5, 's2': 1, 's3': 1}
+        self.assertEqual(
+            ph._async_subproblems_to_queue(['s1'], deferred, counts),
+            ['s1'])
+        self.assertEqual(deferred, [])
+
+    def test_bound(self):
+        ph = self._ph(2)
+        deferred = []
+        counts = {'s1': 2, 's2': 1, 's3': 0}
+        # s1 is two solves ahead of s3
+        self.assertEqual(
+            ph._async_subproblems_to_queue(['s1', 's2'], deferred, counts),
+            ['s2'])
+        self.assertEqual(deferred, ['s1'])
+        counts['s2'] = 2
+        self.assertEqual(
+            ph._async_subproblems_to_queue(['s2'], deferred, counts),
+            [])
+        self.assertEqual(deferred, ['s1', 's2'])
+        # the slowest scenario catches up
+        counts['s3'] = 1
+        self.assertEqual(
+            ph._async_subproblems_to_queue(['s3'], deferred, counts),
+            ['s1', 's2', 's3'])
+        self.assertEqual(deferred, [])
+
+if __name__ == "__main__":
+    unittest.main()
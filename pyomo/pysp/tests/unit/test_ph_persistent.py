@@ -0,0 +1,205 @@
+#  _________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright (c) 2014 Sandia Corporation.
+#  Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+#  the U.S. Government retains certain rights in this software.
+#  This software is distributed under the BSD License.
+#  _________________________________________________________________________
+#
+# Test the reuse of persistent sub-problem solvers across PH
+# iterations, using a mock persistent solver plugin that records the
+# calls made to its native model
+#
+
+import os
+from os.path import abspath, dirname, join
+
+import pyutilib.th as unittest
+import pyutilib.misc
+from pyutilib.misc import Bunch
+
+import pyomo.util.plugin
+import pyomo.environ
+from pyomo.opt import SolverFactory, TerminationCondition, SolutionStatus
+from pyomo.solvers.plugins.solvers.persistent_solver import \
+    DirectPersistentSolver
+import pyomo.pysp.phinit
+from pyomo.pysp.scenariotree.manager_solver import \
+    ScenarioTreeManagerSolverClientSerial
+
+thisdir = dirname(abspath(__file__))
+farmer_examples_dir = join(thisdir, '..', '..', '..', '..',
+                           'examples', 'pysp', 'farmer')
+
+class PHMockPersistent(DirectPersistentSolver):
+    """
+    A persistent solver plugin whose solutions assign each variable
+    its lower bound (or 0).
+    """
+
+    pyomo.util.plugin.alias('_ph_mock_persistent')
+
+    # the solver objects created by PH
+    created = []
+
+    def __init__(self, **kwds):
+        kwds['type'] = '_ph_mock_persistent'
+        DirectPersistentSolver.__init__(self, **kwds)
+        self._capabilities.quadratic_objective = True
+        self.calls = []
+        PHMockPersistent.created.append(self)
+
+    def available(self, exception_flag=True):
+        return True
+
+    def _native_create_model(self, name):
+        self.calls.append('create_model')
+        self.lower_bounds = []
+
+    def _native_add_var(self, label, lb, ub, domain):
+        self.lower_bounds.append(lb)
+        return len(self.lower_bounds) - 1
+
+    def _native_set_var_bounds(self, handle, lb, ub):
+        self.lower_bounds[handle] = lb
+
+    def _native_add_constraint(self, label, coefs, handles, lb, ub):
+        return label
+
+    def _native_remove_constraint(self, handle):
+        pass
+
+    def _native_set_constraint_bounds(self, handle, lb, ub):
+        pass
+
+    def _native_set_objective(self, minimize, constant, linear, quadratic):
+        self.calls.append('set_objective')
+
+    def _native_solve(self):
+        self.calls.append('solve')
+        return Bunch(termination_condition=TerminationCondition.optimal,
+                     solution_status=SolutionStatus.optimal,
+                     message=None,
+                     objective_value=0.0,
+                     solver_name="mock")
+
+    def _native_get_values(self, handles):
+        return [self.lower_bounds[h] or 0.0 for h in handles]
+
+    def _native_get_reduced_costs(self, handles):
+        return [0.0 for h in handles]
+
+    def _native_get_duals(self, handles):
+        return [0.0 for h in handles]
+
+class TestPHPersistent(unittest.TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        SolverFactory.deactivate('_ph_mock_persistent')
+
+    def setUp(self):
+        del PHMockPersistent.created[:]
+
+    def _run(self, data_dir):
+        args = ["--solver=_ph_mock_persistent",
+                "--default-rho=1",
+                "--solver-manager=serial",
+                "--max-iterations=3",
+                "--model-directory="+join(farmer_examples_dir, 'models'),
+                "--instance-directory="+join(farmer_examples_dir, data_dir)]
+        pyutilib.misc.setup_redirect(join(thisdir, "ph_persistent.out"))
+        try:
+            pyomo.pysp.phinit.main(args=args)
+        finally:
+            pyutilib.misc.reset_redirect()
+            os.remove(join(thisdir, "ph_persistent.out"))
+        # the first solver is the one constructed by PH
+        solvers = PHMockPersistent.created[1:]
+        self.assertEqual(PHMockPersistent.created[0].calls, [])
+        return solvers
+
+    def _check(self, solvers, count):
+        self.assertEqual(len(solvers), count)
+        for solver in solvers:
+            calls = solver.calls
+            # the instance is compiled once, and the objective is
+            # updated before the solves of the later iterations (the
+            # mock solutions converge after a few iterations)
+            self.assertEqual(calls[0], 'create_model')
+            self.assertEqual(calls.count('create_model'), 1)
+            self.assertTrue(calls.count('solve') > 1)
+            for i, call in enumerate(calls):
+                if (call == 'solve') and (i > 2):
+                    self.assertEqual(calls[i-1], 'set_objective')
+
+    def test_scenarios(self):
+        self._check(self._run('scenariodata'), 3)
+
+    def test_bundles(self):
+        self._check(self._run('scenariodataWithTwoBundles'), 2)
+
+    def test_bundle_fixed_variables(self):
+        # variables fixed in the scenario instances of a bundle are
+        # fixed in the compiled model of the bundle solver
+        parser = pyomo.pysp.phinit.construct_ph_options_parser("")
+        options = parser.parse_args(
+            ["--solver=_ph_mock_persistent",
+             "--default-rho=1",
+             "--solver-manager=serial",
+             "--max-iterations=1",
+             "--model-directory="+join(farmer_examples_dir, 'models'),
+             "--instance-directory="+join(farmer_examples_dir,
+                                          'scenariodataWithTwoBundles')])
+        pyutilib.misc.setup_redirect(join(thisdir, "ph_persistent.out"))
+        ph = None
+        try:
+            ph = pyomo.pysp.phinit.PHFromScratch(options)
+            ph.solve()
+            for bundle_name, scenario_names in \
+                  ph._bundle_scenario_instance_map.items():
+                solver = ph._subproblem_solvers[bundle_name]
+                scenario_name = sorted(scenario_names)[0]
+                vardata = ph._instances[scenario_name].DevotedAcreage['CORN']
+                handle = solver._var_handles[vardata]
+                self.assertEqual(solver.lower_bounds[handle], 0)
+                vardata.fix(7)
+                ph._problem_states.fixed_variables[scenario_name].append(
+                    ('DevotedAcreage', 'CORN'))
+                ph._preprocess_scenario_instances()
+                self.assertEqual(solver.lower_bounds[handle], 7)
+        finally:
+            pyutilib.misc.reset_redirect()
+            os.remove(join(thisdir, "ph_persistent.out"))
+            pyomo.pysp.phinit.PHCleanup(ph)
+
+    def test_scenario_tree_manager(self):
+        options = ScenarioTreeManagerSolverClientSerial.register_options()
+        options.model_location = join(farmer_examples_dir, 'models')
+        options.scenario_tree_location = \
+            join(farmer_examples_dir, 'scenariodataWithTwoBundles')
+        options.solver = '_ph_mock_persistent'
+        pyutilib.misc.setup_redirect(join(thisdir, "ph_persistent.out"))
+        try:
+            with ScenarioTreeManagerSolverClientSerial(options) as manager:
+                manager.initialize()
+                manager.solve_subproblems()
+                for scenario in manager.scenario_tree.scenarios:
+                    manager.preprocessor.objective_updated[scenario.name] = \
+                        True
+                manager.solve_subproblems()
+        finally:
+            pyutilib.misc.reset_redirect()
+            os.remove(join(thisdir, "ph_persistent.out"))
+        # only the bundle solvers are used
+        solvers = [solver for solver in PHMockPersistent.created
+                   if len(solver.calls)]
+        self.assertEqual(len(solvers), 2)
+        for solver in solvers:
+            self.assertEqual(solver.calls,
+                             ['create_model', 'set_objective', 'solve',
+                              'set_objective', 'solve'])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+#  _________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright (c) 2014 Sandia Corporation.
+#  Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+#  the U.S. Government retains certain rights in this software.
+#  This software is distributed under the BSD License.
+#  _________________________________________________________________________
+#
+# Test the vectorized PH updates against the loop-based versions
+#
+
+import random
+from os.path import abspath, dirname, join
+
+import pyutilib.th as unittest
+
+import pyomo.environ
+from pyomo.core import minimize, maximize
+from pyomo.pysp.phvectorutils import numpy_available, TreeNodeArrays
+from pyomo.pysp.ph import ProgressiveHedging
+from pyomo.pysp.convergence import (TermDiffConvergence,
+                                    NormalizedTermDiffConvergence)
+from pyomo.pysp.scenariotree.instance_factory import \
+    ScenarioTreeInstanceFactory
+
+thisdir = dirname(abspath(__file__))
+farmer_examples_dir = join(thisdir, '..', '..', '..', '..',
+                           'examples', 'pysp', 'farmer')
+
+def _generate_ph(vectorized, **kwds):
+    factory = ScenarioTreeInstanceFactory(
+        join(farmer_examples_dir, 'models'),
+        join(farmer_examples_dir, 'scenariodata'))
+    scenario_tree = factory.generate_scenario_tree()
+    instances = factory.construct_instances_for_scenario_tree(scenario_tree)
+    scenario_tree.linkInInstances(instances)
+
+    # only the attributes used by the update methods are set
+    ph = ProgressiveHedging.__new__(ProgressiveHedging)
+    ph._scenario_tree = scenario_tree
+    ph._vectorized_updates = vectorized
+    ph._tree_node_arrays = {}
+    ph._overrelax = False
+    ph._nu = 1.5
+    ph._current_iteration = 0
+    ph._ph_xbar_updates_enabled = True
+    ph._dual_mode = False
+    ph._objective_sense = minimize
+    ph._output_times = False
+    ph._cumulative_xbar_time = 0.0
+    ph._cumulative_weight_time = 0.0
+    ph._total_discrete_vars = 0
+    ph._total_continuous_vars = 3
+    for key, value in kwds.items():
+        setattr(ph, key, value)
+
+    # assign the same (pseudo-random) solutions to both trees
+    rand = random.Random(123)
+    for tree_node in scenario_tree._tree_nodes:
+        for variable_id in tree_node._variable_ids:
+            tree_node._blend[variable_id] = 1
+            tree_node._xbars[variable_id] = 0.0
+    for scenario in scenario_tree._scenarios:
+        for node_name in scenario._x:
+            for variable_id in sorted(scenario._x[node_name]):
+                scenario._x[node_name][variable_id] = rand.uniform(-10, 10)
+                scenario._rho[node_name][variable_id] = rand.uniform(0, 2)
+                scenario._w[node_name][variable_id] = 0.0
+    return ph
+
+@unittest.skipIf(not numpy_available, "Numpy is not available")
+class TestPHVectorUtils(unittest.TestCase):
+
+    def test_arrays(self):
+        ph = _generate_ph(True)
+        root = ph._scenario_tree.findRootNode()
+        arrays = TreeNodeArrays(root)
+        self.assertEqual(arrays.variable_ids,
+                         sorted(root._standard_variable_ids))
+        x = arrays.gather('_x')
+        self.assertEqual(x.shape, (3, len(arrays.variable_ids)))
+        for i, scenario in enumerate(root._scenarios):
+            self.assertEqual(x[i].tolist(),
+                             [scenario._x[root._name][variable_id]
+                              for variable_id in arrays.variable_ids])
+        mask = arrays.mask(arrays.variable_ids[:1])
+        self.assertEqual(mask.tolist(),
+                         [True] + [False]*(len(arrays.variable_ids)-1))
+        x[:] = 1.0
+        arrays.scatter('_x', x, x > 0)
+        for scenario in root._scenarios:
+            self.assertEqual(set(scenario._x[root._name].values()), set([1.0]))
+        root._wbars = {}
+        arrays.scatter_node('_wbars', x[0], mask)
+        self.assertEqual(root._wbars, {arrays.variable_ids[0]: 1.0})
+
+    def test_persistent_arrays(self):
+        ph = _generate_ph(True)
+        root = ph._scenario_tree.findRootNode()
+        ph.update_variable_statistics()
+        ph.update_weights()
+        arrays = ph._get_tree_node_arrays(root)
+        w = arrays.gather('_w')
+        rho = arrays.gather('_rho')
+        averages = arrays.gather_node('_averages')
+        ph._current_iteration = 1
+        ph.update_variable_statistics()
+        ph.update_weights()
+        # the arrays are updated in place, not gathered again
+        self.assertIs(arrays.gather('_w'), w)
+        self.assertIs(arrays.gather('_rho'), rho)
+        self.assertIs(arrays.gather_node('_averages'), averages)
+        for i, scenario in enumerate(root._scenarios):
+            self.assertEqual(w[i].tolist(),
+                             [scenario._w[root._name][variable_id]
+                              for variable_id in arrays.variable_ids])
+        self.assertEqual(averages.tolist(),
+                         [root._averages[variable_id]
+                          for variable_id in arrays.variable_ids])
+        # direct modifications are seen after the arrays are invalidated
+        scenario = root._scenarios[0]
+        scenario._rho[root._name][arrays.variable_ids[0]] = 100.0
+        self.assertNotEqual(arrays.gather('_rho')[0, 0], 100.0)
+        ph._invalidate_tree_node_arrays()
+        self.assertEqual(arrays.gather('_rho')[0, 0], 100.0)
+
+    def _compare(self, **kwds):
+        loop_ph = _generate_ph(False, **kwds)
+        vector_ph = _generate_ph(True, **kwds)
+        # one variable without a solution in some scenario
+        for ph in (loop_ph, vector_ph):
+            scenario = ph._scenario_tree._scenarios[1]
+            scenario._x['RootNode'][sorted(scenario._x['RootNode'])[0]] = None
+        for iteration in range(3):
+            for ph in (loop_ph, vector_ph):
+                ph._current_iteration = iteration
+                ph.update_variable_statistics()
+                ph.update_weights()
+                for scenario in ph._scenario_tree._scenarios:
+                    for node_name in scenario._x:
+                        for variable_id in scenario._x[node_name]:
+                            if scenario._x[node_name][variable_id] is not None:
+                                scenario._x[node_name][variable_id] *= 0.5
+            for loop_node, vector_node in \
+                zip(loop_ph._scenario_tree._tree_nodes,
+                    vector_ph._scenario_tree._tree_nodes):
+                self.assertEqual(loop_node._xbars, vector_node._xbars)
+                self.assertEqual(loop_node._averages, vector_node._averages)
+                self.assertEqual(loop_node._minimums, vector_node._minimums)
+                self.assertEqual(loop_node._maximums, vector_node._maximums)
+                self.assertEqual(loop_node._wbars, vector_node._wbars)
+            for loop_scenario, vector_scenario in \
+                zip(loop_ph._scenario_tree._scenarios,
+                    vector_ph._scenario_tree._scenarios):
+                self.assertEqual(loop_scenario._w, vector_scenario._w)
+        # the stale variable is not included in the convergence metrics
+        for ph in (loop_ph, vector_ph):
+            for scenario in ph._scenario_tree._scenarios:
+                scenario._x['RootNode'][
+                    sorted(scenario._x['RootNode'])[0]] = 1.0
+                scenario._stale['RootNode'].add(
+                    sorted(scenario._x['RootNode'])[0])
+        vector_ph._invalidate_tree_node_arrays()
+        for convergence_type in (TermDiffConvergence,
+                                 NormalizedTermDiffConvergence):
+            self.assertAlmostEqual(
+                convergence_type().computeMetric(
+                    loop_ph, loop_ph._scenario_tree, None),
+                convergence_type().computeMetric(
+                    vector_ph, vector_ph._scenario_tree, None))
+
+    def test_minimize(self):
+        self._compare()
+
+    def test_maximize(self):
+        self._compare(_objective_sense=maximize)
+
+    def test_overrelax(self):
+        self._compare(_overrelax=True)
+
+    def test_dual_mode(self):
+        self._compare(_dual_mode=True)
+
+if __name__ == "__main__":
+    unittest.main()
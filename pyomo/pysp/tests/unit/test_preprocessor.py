@@ -0,0 +1,222 @@
+#  _________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright (c) 2014 Sandia Corporation.
+#  Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+#  the U.S. Government retains certain rights in this software.
+#  This software is distributed under the BSD License.
+#  _________________________________________________________________________
+#
+# Test that the scenario tree preprocessor only regenerates the repns
+# of the constraints affected by changes to a scenario instance
+#
+
+import pyutilib.th as unittest
+from pyutilib.misc import Bunch
+
+from pyomo.environ import (ConcreteModel, Var, Param, Constraint,
+                           Objective)
+from pyomo.opt import ProblemFormat, PersistentSolver
+from pyomo.pysp.scenariotree.preprocessor import ScenarioTreePreprocessor
+from pyomo.util import fork_available
+
+class _MockSolver(object):
+    def problem_format(self):
+        return ProblemFormat.cpxlp
+
+class _MockPersistentSolver(PersistentSolver):
+    """
+    A persistent solver that records the variables whose bounds are
+    compiled.
+    """
+
+    def __init__(self):
+        PersistentSolver.__init__(self, type='_mock_persistent')
+        self.compiled_variables = []
+
+    def problem_format(self):
+        return ProblemFormat.cpxlp
+
+    def instance_compiled(self):
+        return True
+
+    def compile_objective(self, instance):
+        pass
+
+    def compile_variable_bounds(self, instance, vars_to_update):
+        self.compiled_variables.extend(vars_to_update)
+
+def _create_instance():
+    model = ConcreteModel()
+    model.p = Param(initialize=1.0, mutable=True)
+    model.q = Param(initialize=1.0, mutable=True)
+    model.x = Var()
+    model.y = Var()
+    model.z = Var()
+    model.c1 = Constraint(expr=model.p*model.x + model.y >= 1)
+    model.c2 = Constraint(expr=model.x + model.z >= 1)
+    model.c3 = Constraint(expr=model.y + model.z >= 1)
+    model.o = Objective(expr=model.q*model.x + model.y + model.z)
+    return model
+
+class TestScenarioTreePreprocessor(unittest.TestCase):
+
+    def _setup(self, solver=None, **kwds):
+        options = ScenarioTreePreprocessor.register_options()
+        for key, value in kwds.items():
+            setattr(options, key, value)
+        preprocessor = ScenarioTreePreprocessor(options)
+        instance = _create_instance()
+        scenario = Bunch(_name='s', _instance_objective=instance.o)
+        if solver is None:
+            solver = _MockSolver()
+        preprocessor.add_scenario(scenario, instance, solver)
+        preprocessor.preprocess_scenarios()
+        return preprocessor, instance
+
+    def _repns(self, instance):
+        return dict((component.cname(), id(repn)) for component, repn
+                    in instance._canonical_repn.items())
+
+    def _regenerated(self, preprocessor, instance):
+        repns = self._repns(instance)
+        preprocessor.preprocess_scenarios()
+        return sorted(name for name, repn in self._repns(instance).items()
+                      if repns.get(name) != repn)
+
+    def test_no_changes(self):
+        preprocessor, instance = self._setup()
+        self.assertEqual(self._regenerated(preprocessor, instance), [])
+
+    def test_param(self):
+        preprocessor, instance = self._setup(preprocess_detect_changes=True)
+        instance.p = 2.0
+        self.assertEqual(self._regenerated(preprocessor, instance), ['c1'])
+        self.assertEqual(
+            instance._canonical_repn[instance.c1].linear[0], 2.0)
+        instance.q = 2.0
+        self.assertEqual(self._regenerated(preprocessor, instance), ['o'])
+        self.assertEqual(self._regenerated(preprocessor, instance), [])
+
+    def test_constraint_activation(self):
+        preprocessor, instance = self._setup(preprocess_detect_changes=True)
+        instance.c2.deactivate()
+        self.assertEqual(self._regenerated(preprocessor, instance), [])
+        instance.p = 2.0
+        instance.c2.activate()
+        self.assertEqual(self._regenerated(preprocessor, instance),
+                         ['c1', 'c2'])
+        instance.c4 = Constraint(expr=instance.x >= 0)
+        self.assertEqual(self._regenerated(preprocessor, instance), ['c4'])
+
+    def test_fixed_variables(self):
+        preprocessor, instance = self._setup(preprocess_fixed_variables=True,
+                                             preprocess_detect_changes=True)
+        instance.z.fix(1.0)
+        self.assertEqual(self._regenerated(preprocessor, instance),
+                         ['c2', 'c3', 'o'])
+        instance.z.value = 2.0
+        self.assertEqual(self._regenerated(preprocessor, instance),
+                         ['c2', 'c3', 'o'])
+        # bounds do not appear in the repns
+        instance.x.setlb(0)
+        self.assertEqual(self._regenerated(preprocessor, instance), [])
+        instance.z.unfix()
+        preprocessor.freed_variables['s'].append(('z', None))
+        self.assertEqual(self._regenerated(preprocessor, instance),
+                         ['c2', 'c3', 'o'])
+
+    def test_flagged_changes(self):
+        # by default, only the changes that are flagged are found
+        preprocessor, instance = self._setup()
+        instance.p = 2.0
+        self.assertEqual(self._regenerated(preprocessor, instance), [])
+        preprocessor.constraints_updated_list['s'].append(instance.c1)
+        self.assertEqual(self._regenerated(preprocessor, instance), ['c1'])
+        self.assertEqual(
+            instance._canonical_repn[instance.c1].linear[0], 2.0)
+        instance.q = 2.0
+        preprocessor.objective_updated['s'] = True
+        self.assertEqual(self._regenerated(preprocessor, instance), ['o'])
+        self.assertEqual(self._regenerated(preprocessor, instance), [])
+
+    def test_flagged_fixed_variables(self):
+        # the constraints and objective that reference the flagged
+        # variables are regenerated
+        preprocessor, instance = self._setup(preprocess_fixed_variables=True)
+        instance.z.fix(1.0)
+        preprocessor.fixed_variables['s'].append(('z', None))
+        self.assertEqual(self._regenerated(preprocessor, instance),
+                         ['c2', 'c3', 'o'])
+        self.assertEqual(self._regenerated(preprocessor, instance), [])
+        instance.c3.deactivate()
+        instance.z.unfix()
+        preprocessor.freed_variables['s'].append(('z', None))
+        self.assertEqual(self._regenerated(preprocessor, instance),
+                         ['c2', 'o'])
+
+    def test_fixed_variables_not_preprocessed(self):
+        preprocessor, instance = self._setup()
+        instance.z.fix(1.0)
+        preprocessor.fixed_variables['s'].append(('z', None))
+        self.assertEqual(self._regenerated(preprocessor, instance), [])
+
+    def test_persistent_solver_bounds(self):
+        # changes found by the tracker that do not require any repns
+        # to be regenerated are still sent to a persistent solver
+        solver = _MockPersistentSolver()
+        preprocessor, instance = self._setup(solver=solver,
+                                             preprocess_detect_changes=True)
+        preprocessor.preprocess_scenarios()
+        self.assertEqual(solver.compiled_variables, [])
+        instance.x.setub(5)
+        preprocessor.preprocess_scenarios()
+        self.assertEqual(solver.compiled_variables, [('x', None)])
+        instance.y.fix(2)
+        preprocessor.preprocess_scenarios()
+        self.assertEqual(solver.compiled_variables,
+                         [('x', None), ('y', None)])
+        preprocessor.preprocess_scenarios()
+        self.assertEqual(len(solver.compiled_variables), 2)
+
+    def test_persistent_bundle_solver_bounds(self):
+        # the variables fixed or freed in the scenario instances of a
+        # bundle are sent to the persistent solver of the bundle
+        preprocessor, instance = self._setup(preprocess_detect_changes=True)
+        binding_instance = ConcreteModel()
+        binding_instance.add_component('s', instance)
+        solver = _MockPersistentSolver()
+        preprocessor.add_bundle(Bunch(_name='b', _scenario_names=['s']),
+                                binding_instance,
+                                solver)
+        preprocessor.preprocess_bundles()
+        self.assertEqual(solver.compiled_variables, [])
+        instance.y.fix(2)
+        preprocessor.preprocess_bundles()
+        self.assertEqual(solver.compiled_variables, [('s.y', None)])
+        instance.z.fix(1)
+        preprocessor.fixed_variables['s'].append(('z', None))
+        preprocessor.preprocess_bundles()
+        self.assertEqual(solver.compiled_variables,
+                         [('s.y', None), ('s.z', None)])
+        preprocessor.preprocess_bundles()
+        self.assertEqual(len(solver.compiled_variables), 2)
+
+    @unittest.skipIf(not fork_available(), "This test requires os.fork")
+    def test_processes(self):
+        preprocessor, instance = self._setup(preprocess_processes=2)
+        self.assertEqual(sorted(self._repns(instance)),
+                         ['c1', 'c2', 'c3', 'o'])
+        repn = instance._canonical_repn[instance.c1]
+        self.assertEqual(sorted(zip((v.cname() for v in repn.variables),
+                                    repn.linear)),
+                         [('x', 1.0), ('y', 1.0)])
+
+    def test_disable_advanced_preprocessing(self):
+        preprocessor, instance = self._setup(
+            disable_advanced_preprocessing=True)
+        instance.p = 2.0
+        self.assertEqual(self._regenerated(preprocessor, instance), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+#  _________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright (c) 2014 Sandia Corporation.
+#  Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+#  the U.S. Government retains certain rights in this software.
+#  This software is distributed under the BSD License.
+#  _________________________________________________________________________
+#
+# Test the transmission of PH weights and xbars through shared memory
+#
+
+import os
+from os.path import abspath, dirname, join
+
+import pyutilib.th as unittest
+from pyutilib.misc import Bunch
+
+import pyomo.environ
+from pyomo.pysp.util.shared_array import SharedArray
+from pyomo.pysp.scenariotree.instance_factory import \
+    ScenarioTreeInstanceFactory
+from pyomo.pysp import phsolverserverutils
+from pyomo.pysp.phsolverserver import _PHSolverServer
+
+thisdir = dirname(abspath(__file__))
+farmer_examples_dir = join(thisdir, '..', '..', '..', '..',
+                           'examples', 'pysp', 'farmer')
+
+class TestSharedArray(unittest.TestCase):
+
+    def test_create(self):
+        array = SharedArray.create(4)
+        try:
+            self.assertTrue(os.path.exists(array.filename))
+            self.assertEqual(array.read(0, 4), [None]*4)
+            array.write(1, [1.5, None, 3])
+            self.assertEqual(array.read(0, 4), [None, 1.5, None, 3.0])
+            other = SharedArray.attach(array.filename, 4)
+            try:
+                self.assertEqual(other.read(1, 3), [1.5, None, 3.0])
+                other.write(0, [-1])
+                self.assertEqual(array.read(0, 1), [-1.0])
+            finally:
+                other.close()
+            # only the owner removes the file
+            self.assertTrue(os.path.exists(array.filename))
+        finally:
+            array.close()
+        self.assertFalse(os.path.exists(array.filename))
+        # closing twice is harmless
+        array.close()
+
+    def test_empty(self):
+        array = SharedArray.create(0)
+        self.assertEqual(array.read(0, 0), [])
+        array.write(0, [])
+        array.close()
+
+    def test_attach_missing(self):
+        array = SharedArray.create(2)
+        filename = array.filename
+        # too small
+        self.assertEqual(SharedArray.attach(filename, 3), None)
+        array.close()
+        self.assertEqual(SharedArray.attach(filename, 2), None)
+
+class TestSharedArrayTransmission(unittest.TestCase):
+
+    def _scenario_tree(self, data_dir):
+        factory = ScenarioTreeInstanceFactory(
+            join(farmer_examples_dir, 'models'),
+            join(farmer_examples_dir, data_dir))
+        scenario_tree = factory.generate_scenario_tree()
+        instances = factory.construct_instances_for_scenario_tree(
+            scenario_tree)
+        scenario_tree.linkInInstances(instances)
+        return scenario_tree
+
+    def _transmit(self, scenario_tree, object_name):
+        ph = Bunch(_scenario_tree=scenario_tree,
+                   _phpyro_shared_arrays={})
+        for i, tree_node in enumerate(scenario_tree._tree_nodes):
+            for variable_id in tree_node._xbars:
+                tree_node._xbars[variable_id] = i + 0.5
+        for i, scenario in enumerate(scenario_tree._scenarios):
+            for node_name, weights in scenario._w.items():
+                for variable_id in weights:
+                    weights[variable_id] = -i
+        layout, size = phsolverserverutils._shared_array_layout(
+            ph, object_name)
+        shared_array = SharedArray.create(size)
+        ph._phpyro_shared_arrays[object_name] = (shared_array, layout)
+        try:
+            phsolverserverutils._write_shared_array(ph, object_name, "xbars")
+            phsolverserverutils._write_shared_array(ph, object_name,
+                                                    "weights")
+            server = _PHSolverServer({})
+            server._initialized = True
+            self.assertTrue(server.attach_shared_array(
+                object_name, shared_array.filename, size, layout))
+            try:
+                return (server._read_shared_array("xbars"),
+                        server._read_shared_array("weights"))
+            finally:
+                server._shared_array.close()
+        finally:
+            phsolverserverutils.release_shared_arrays(ph)
+
+    def test_scenario(self):
+        scenario_tree = self._scenario_tree('scenariodata')
+        scenario = scenario_tree.get_scenario('AboveAverageScenario')
+        xbars, weights = self._transmit(scenario_tree, scenario._name)
+        root = scenario_tree.get_node('RootNode')
+        self.assertEqual(xbars, {'RootNode': root._xbars})
+        self.assertEqual(weights,
+                         {scenario._name: {'RootNode':
+                                           scenario._w['RootNode']}})
+
+    def test_bundle(self):
+        scenario_tree = self._scenario_tree('scenariodataWithTwoBundles')
+        bundle = scenario_tree.get_bundle('OtherBundle')
+        xbars, weights = self._transmit(scenario_tree, bundle._name)
+        root = scenario_tree.get_node('RootNode')
+        self.assertEqual(xbars, {'RootNode': root._xbars})
+        self.assertEqual(sorted(weights), sorted(bundle._scenario_names))
+        for scenario_name in bundle._scenario_names:
+            scenario = scenario_tree.get_scenario(scenario_name)
+            self.assertEqual(weights[scenario_name],
+                             {'RootNode': scenario._w['RootNode']})
+
+if __name__ == "__main__":
+    unittest.main()
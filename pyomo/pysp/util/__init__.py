@@ -10,3 +10,4 @@
 import pyomo.pysp.util.config
 import pyomo.pysp.util.configured_object
 import pyomo.pysp.util.misc
+import pyomo.pysp.util.shared_array
@@ -581,7 +581,29 @@ safe_declare_unique_option(
             "process and performs all scenario tree operations "
             "sequentially. If 'pyro' is specified, the scenario tree "
             "is fully distributed and scenario tree operations are "
-            "performed asynchronously."
+            "performed asynchronously. If 'multiprocess' is "
+            "specified, the scenario tree is distributed over "
+            "processes started on the local machine (see the "
+            "multiprocess_workers option), which does not require "
+            "a Pyro name server or dispatcher."
+        ),
+        doc=None,
+        visibility=0),
+    ap_group=_scenario_tree_options_group_title)
+
+safe_declare_unique_option(
+    common_block,
+    "multiprocess_workers",
+    PySPConfigValue(
+        0,
+        domain=_domain_nonnegative_integer,
+        description=(
+            "The maximum number of local scenario tree server "
+            "processes to start when the 'multiprocess' scenario "
+            "tree manager is selected. The default value of 0 "
+            "indicates that one process will be started for each "
+            "processor on the local machine. No more processes are "
+            "started than there are scenarios (or bundles)."
         ),
         doc=None,
         visibility=0),
@@ -1013,6 +1035,38 @@ safe_declare_unique_option(
         visibility=0),
     ap_group=_ph_options_group_title)
 
+safe_declare_unique_option(
+    common_block,
+    "async_fraction",
+    PySPConfigValue(
+        0.0,
+        domain=_domain_unit_interval,
+        description=(
+            "Fraction of the scenarios that must report a new solution, "
+            "if in async mode, before doing statistics and weight "
+            "updates. Overrides async_buffer_length when positive. "
+            "Default is 0.0."
+        ),
+        doc=None,
+        visibility=0),
+    ap_group=_ph_options_group_title)
+
+safe_declare_unique_option(
+    common_block,
+    "async_staleness_bound",
+    PySPConfigValue(
+        0,
+        domain=_domain_nonnegative_integer,
+        description=(
+            "If in async mode, the maximum number of solves a scenario "
+            "can be ahead of the slowest scenario. Scenarios that reach "
+            "the bound are not requeued until the slowest scenarios "
+            "catch up. A value of 0 disables the bound. Default is 0."
+        ),
+        doc=None,
+        visibility=0),
+    ap_group=_ph_options_group_title)
+
 #safe_declare_unique_option(
 #    common_block,
 #    "phrhosetter_callback_location",
@@ -1579,6 +1633,47 @@ safe_declare_unique_option(
         visibility=0),
     ap_group=_advanced_options_group_title)
 
+safe_declare_unique_option(
+    common_block,
+    "preprocess_processes",
+    PySPConfigValue(
+        None,
+        domain=_domain_positive_integer,
+        description=(
+            "The number of worker processes that compute the "
+            "representations of the constraints when all of the "
+            "constraints of a scenario instance are preprocessed. The "
+            "workers are forked, so this is only used on platforms "
+            "that support fork. By default, the representations are "
+            "computed serially."
+        ),
+        doc=None,
+        visibility=0),
+    ap_group=_advanced_options_group_title)
+
+safe_declare_unique_option(
+    common_block,
+    "preprocess_detect_changes",
+    PySPConfigValue(
+        False,
+        domain=bool,
+        description=(
+            "Compare each scenario instance with a snapshot of its "
+            "state before every preprocessing round to find the "
+            "changes that were not recorded by the algorithm (e.g., "
+            "parameter values, variable bounds and fixed status, and "
+            "added or deactivated constraints). The comparison visits "
+            "every active constraint, and every variable and mutable "
+            "parameter that they reference, in each round. By default, "
+            "only the changes recorded by the algorithm (fixed and "
+            "freed variables, and updated constraints and objectives) "
+            "are preprocessed. Ignored when advanced preprocessing is "
+            "disabled."
+        ),
+        doc=None,
+        visibility=0),
+    ap_group=_advanced_options_group_title)
+
 safe_declare_unique_option(
     common_block,
     "comparison_tolerance_for_fixed_variables",
@@ -0,0 +1,99 @@
+#  _________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright (c) 2014 Sandia Corporation.
+#  Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+#  the U.S. Government retains certain rights in this software.
+#  This software is distributed under the BSD License.
+#  _________________________________________________________________________
+
+__all__ = ("SharedArray",)
+
+import os
+import mmap
+import struct
+import tempfile
+
+from pyomo.opt.solver.shellcmd import tmpfs_directory
+
+_nan = float('nan')
+
+class SharedArray(object):
+    """
+    A fixed-size array of doubles stored in a memory-mapped file, which
+    is used to share data between processes on the same host. The file
+    is created in a memory-backed file system when one is available
+    (see tmpfs_directory). Values of None are stored as NaN.
+
+    The process that creates the array (SharedArray.create) owns the
+    file and removes it when the array is closed. Other processes
+    attach to the file by name (SharedArray.attach).
+    """
+
+    __slots__ = ("filename", "size", "_file", "_mmap", "_owner")
+
+    def __init__(self, filename, size, owner=False):
+        self.filename = filename
+        self.size = size
+        self._owner = owner
+        self._file = open(filename, "r+b")
+        # mmap does not support empty files
+        self._mmap = mmap.mmap(self._file.fileno(), max(8*size, 8))
+
+    @classmethod
+    def create(cls, size, dir=None):
+        """
+        Create a new array of the given size, initialized to None.
+        """
+        if dir is None:
+            dir = tmpfs_directory()
+        fd, filename = tempfile.mkstemp(prefix="pysp_shared_",
+                                        suffix=".dat",
+                                        dir=dir)
+        try:
+            os.write(fd, struct.pack("%dd" % max(size, 1),
+                                     *([_nan]*max(size, 1))))
+        finally:
+            os.close(fd)
+        return cls(filename, size, owner=True)
+
+    @classmethod
+    def attach(cls, filename, size):
+        """
+        Attach to the array with the given file name, or return None
+        if it can not be found (e.g., it was created on another host).
+        """
+        if (not os.path.exists(filename)) or \
+           (os.path.getsize(filename) < 8*size):
+            return None
+        return cls(filename, size)
+
+    def write(self, offset, values):
+        """
+        Store the values in the array, starting at the given offset.
+        """
+        values = [_nan if val is None else val for val in values]
+        struct.pack_into("%dd" % len(values), self._mmap, 8*offset, *values)
+
+    def read(self, offset, count):
+        """
+        Return a list of count values of the array, starting at the
+        given offset.
+        """
+        return [None if val != val else val
+                for val in struct.unpack_from("%dd" % count,
+                                              self._mmap,
+                                              8*offset)]
+
+    def close(self):
+        """
+        Release the array, and remove its file if it was created by
+        this process.
+        """
+        if self._mmap is not None:
+            self._mmap.close()
+            self._file.close()
+            self._mmap = None
+            self._file = None
+            if self._owner and os.path.exists(self.filename):
+                os.remove(self.filename)
@@ -8,7 +8,9 @@
 #  _________________________________________________________________________
 
 __all__ = ("_LinearConstraintData", "MatrixConstraint",
-           "compile_block_linear_constraints",)
+           "compile_block_linear_constraints",
+           "LinearConstraintMatrix",
+           "compile_linear_constraint_matrix",)
 
 import time
 import logging
@@ -16,8 +18,15 @@ import array
 import collections
 from weakref import ref as weakref_ref
 
+try:
+    import numpy
+    numpy_available = True
+except ImportError:
+    numpy_available = False
+
 from pyomo.core.base.set_types import Any
 from pyomo.core.base import (SortComponents,
+                             ComponentMap,
                              Var,
                              Constraint)
 from pyomo.core.base.numvalue import (is_fixed,
@@ -318,6 +327,194 @@ def compile_block_linear_constraints(parent_block,
                                                 RangeTypes,
                                                 ColumnIndexToVarObject))
 
+class LinearConstraintMatrix(object):
+    """
+    The linear constraints of a block stored as a sparse matrix in
+    compressed sparse row (CSR) format:
+
+        lb <= A x <= ub
+
+    Public attributes:
+        indptr          Row pointers into indices and data
+                            (length nrows+1)
+        indices         The column index of each nonzero
+        data            The value of each nonzero
+        lb              The lower bound of each row (-inf if none)
+        ub              The upper bound of each row (inf if none)
+        variables       A list mapping column indices to variables
+        variable_index  A ComponentMap mapping variables to
+                            column indices
+        constraints     A list mapping row indices to constraint
+                            data objects
+
+    When NumPy is available, the array attributes are NumPy arrays
+    (intp for indptr and indices, float64 for data and bounds).
+    Otherwise they are array.array objects with the same contents.
+    Any constant (including fixed variables) found in the body of a
+    constraint has been moved into its bounds.
+    """
+
+    __slots__ = ('indptr', 'indices', 'data', 'lb', 'ub',
+                 'variables', 'variable_index', 'constraints')
+
+    def __init__(self,
+                 indptr,
+                 indices,
+                 data,
+                 lb,
+                 ub,
+                 variables,
+                 variable_index,
+                 constraints):
+        assert len(indptr) == len(constraints) + 1
+        assert len(indices) == len(data)
+        assert len(lb) == len(constraints)
+        assert len(ub) == len(constraints)
+        assert len(variables) == len(variable_index)
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.lb = lb
+        self.ub = ub
+        self.variables = variables
+        self.variable_index = variable_index
+        self.constraints = constraints
+
+    @property
+    def shape(self):
+        """The (row, column) dimension of the matrix."""
+        return (len(self.constraints), len(self.variables))
+
+    @property
+    def nnz(self):
+        """The number of stored nonzeros."""
+        return len(self.data)
+
+    def row(self, i):
+        """
+        Return the (column indices, values) of the nonzeros in
+        row i.
+        """
+        start = self.indptr[i]
+        stop = self.indptr[i+1]
+        return self.indices[start:stop], self.data[start:stop]
+
+#
+# Collect the linear constraints of a block into a
+# LinearConstraintMatrix. Unlike compile_block_linear_constraints,
+# the block is not modified.
+#
+def compile_linear_constraint_matrix(block,
+                                     descend_into=True,
+                                     skip_trivial_constraints=False,
+                                     skip_nonlinear_constraints=False):
+    """
+    Return a LinearConstraintMatrix for the active constraints on a
+    block (and its active sub-blocks if descend_into is True).
+
+    Rows are ordered by block, constraint name, and index. Columns
+    are assigned to variables in the order they are first referenced
+    by a row. Constraints that are already in linear canonical form
+    (e.g., the rows of a MatrixConstraint) are used directly, as are
+    the canonical representations stored on a block by the
+    preprocessor when the _gen_con_canonical_repn flag on the block
+    is False. All other constraint bodies are expanded using
+    generate_canonical_repn, but the result is not stored on the
+    block.
+
+    A ValueError is raised if a nonlinear constraint is encountered,
+    unless skip_nonlinear_constraints is True, in which case the
+    constraint is left out of the matrix. Constraints without lower
+    or upper bounds are always left out of the matrix.
+    """
+
+    if not block.is_constructed():
+        raise RuntimeError(
+            "Attempting to compile block '%s' with unconstructed "
+            "component(s)" % (block.name))
+
+    inf = float('inf')
+    indptr = array.array('l', [0])
+    indices = array.array('l')
+    data = array.array('d')
+    lb = array.array('d')
+    ub = array.array('d')
+    variables = []
+    variable_index = ComponentMap()
+    constraints = []
+
+    sortOrder = SortComponents.indices | SortComponents.alphabetical
+    for block_data in block.block_data_objects(active=True,
+                                               sort=sortOrder,
+                                               descend_into=descend_into):
+
+        if getattr(block_data, "_gen_con_canonical_repn", True):
+            block_canonical_repn = None
+        else:
+            block_canonical_repn = getattr(block_data, "_canonical_repn", None)
+
+        for constraint_data in block_data.component_data_objects(
+                Constraint,
+                active=True,
+                sort=sortOrder,
+                descend_into=False):
+
+            lower = constraint_data.lower
+            upper = constraint_data.upper
+            if (lower is None) and (upper is None):
+                continue
+
+            if isinstance(constraint_data, LinearCanonicalRepn):
+                canonical_repn = constraint_data
+            elif block_canonical_repn is not None:
+                canonical_repn = block_canonical_repn[constraint_data]
+            else:
+                canonical_repn = generate_canonical_repn(constraint_data.body)
+
+            if not isinstance(canonical_repn, LinearCanonicalRepn):
+                if skip_nonlinear_constraints:
+                    continue
+                raise ValueError(
+                    "Unable to compile nonlinear constraint '%s' into a "
+                    "linear constraint matrix" % (constraint_data.cname(True)))
+
+            row_variables = canonical_repn.variables
+            if row_variables is None:
+                if skip_trivial_constraints:
+                    continue
+            else:
+                for vardata in row_variables:
+                    column = variable_index.get(vardata)
+                    if column is None:
+                        column = variable_index[vardata] = len(variables)
+                        variables.append(vardata)
+                    indices.append(column)
+                data.extend(canonical_repn.linear)
+            indptr.append(len(indices))
+
+            constant = value(canonical_repn.constant)
+            if constant is None:
+                constant = 0
+            lb.append(value(lower) - constant if (lower is not None) else -inf)
+            ub.append(value(upper) - constant if (upper is not None) else inf)
+            constraints.append(constraint_data)
+
+    if numpy_available:
+        indptr = numpy.array(indptr, dtype=numpy.intp)
+        indices = numpy.array(indices, dtype=numpy.intp)
+        data = numpy.array(data, dtype=numpy.float64)
+        lb = numpy.array(lb, dtype=numpy.float64)
+        ub = numpy.array(ub, dtype=numpy.float64)
+
+    return LinearConstraintMatrix(indptr,
+                                  indices,
+                                  data,
+                                  lb,
+                                  ub,
+                                  variables,
+                                  variable_index,
+                                  constraints)
+
 class _LinearConstraintData(_ConstraintData, LinearCanonicalRepn):
     """
     This class defines the data for a single linear constraint
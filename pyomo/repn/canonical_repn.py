@@ -11,13 +11,15 @@ from __future__ import division
 
 __all__ = ['generate_canonical_repn', 'as_expr', 'canonical_is_constant', 
            'canonical_is_linear', 'canonical_is_quadratic', 'canonical_is_nonlinear', 
-           'canonical_degree', 'LinearCanonicalRepn', 'GeneralCanonicalRepn']
+           'canonical_degree', 'LinearCanonicalRepn', 'GeneralCanonicalRepn',
+           'set_linear_template_cache']
 
 import logging
 import copy
 
 from pyomo.core.base import Model, value
 from pyomo.core.base import param
+from pyomo.core.base.param import _ParamData
 from pyomo.core.base import expr
 from pyomo.core.base.numvalue import native_numeric_types
 from pyomo.core.base.expression import (_ExpressionData,
@@ -25,7 +27,8 @@ from pyomo.core.base.expression import (_ExpressionData,
                                         SimpleExpression,
                                         Expression)
 from pyomo.core.base.connector import _ConnectorValue, SimpleConnector, Connector
-from pyomo.core.base.var import SimpleVar, Var, _GeneralVarData, _VarData
+from pyomo.core.base.var import (SimpleVar, Var, _GeneralVarData,
+                                 _ColumnarVarData, _VarData)
 
 from pyomo.core.base.expr_pyomo4 import TreeWalkerHelper
 
@@ -421,6 +424,10 @@ def collect_general_canonical_repn(exp, idMap, compute_values):
 #
 class LinearCanonicalRepn(object):
 
+    # Derived classes declare their own slots (there is one instance
+    # of these per constraint, so they should not carry a __dict__)
+    __slots__ = ()
+
     #
     # Abstract Interface
     #
@@ -773,9 +780,11 @@ _linear_collectors = {
     SimpleConnector         : _collect_linear_connector,
     expr.Expr_if            : _collect_branching_expr,
     param._ParamData        : _collect_linear_const,
+    param._ParamProxyData   : _collect_linear_const,
     param.SimpleParam       : _collect_linear_const,
     param.Param             : _collect_linear_const,
     _GeneralVarData         : _collect_linear_var,
+    _ColumnarVarData        : _collect_linear_var,
     SimpleVar               : _collect_linear_var,
     Var                     : _collect_linear_var,
     _GeneralExpressionData  : _collect_identity,
@@ -800,6 +809,466 @@ def collect_linear_canonical_repn(exp, idMap, compute_values=True):
                               (type(exp).__name__, str(exp)) )
     return coef, varmap
 
+#
+# Linear expression templates
+#
+# Indexed constraints generated by a single rule tend to produce many
+# expression trees with the same structure, differing only in the
+# numeric values at their leaves and in the variables they
+# reference. When a linear tree structure is encountered for the
+# second time, the work collect_linear_canonical_repn does on that
+# structure is compiled into a straight-line Python function. Later
+# trees with the same structure then only need a single pass to
+# extract their signature and leaves (in place of the separate
+# polynomial_degree and collection passes), after which the compiled
+# function computes the coefficients. The compiled function performs
+# the same arithmetic, in the same order, as the collector routines
+# above and inserts the variables in the same order, so the resulting
+# representation is identical.
+#
+# A signature is a flat tuple of tokens:
+#   'S', n          : a _SumExpression with n arguments
+#   'P', n, d       : a _ProductExpression with n numerator and d
+#                     denominator terms
+#   j (an int)      : the j-th distinct (unfixed) variable in the tree
+#   'c'             : a constant leaf (param, fixed variable, or a
+#                     fixed named expression)
+#   'x'             : a constant numerator term that follows the
+#                     variable term in a product
+#
+
+class _NoLinearTemplate(Exception):
+    pass
+
+_SUM, _PROD, _VAR, _CONST, _IDENTITY = range(5)
+
+_linear_template_kinds = {}
+for _cls, _collector in iteritems(_linear_collectors):
+    if _collector is _collect_linear_sum:
+        _linear_template_kinds[_cls] = _SUM
+    elif _collector is _collect_linear_prod:
+        _linear_template_kinds[_cls] = _PROD
+    elif _collector is _collect_linear_var:
+        _linear_template_kinds[_cls] = _VAR
+    elif _collector is _collect_linear_const:
+        _linear_template_kinds[_cls] = _CONST
+    elif _collector is _collect_identity:
+        _linear_template_kinds[_cls] = _IDENTITY
+del _cls, _collector
+_linear_template_leaf_classes = frozenset(
+    _cls for _cls, _kind in iteritems(_linear_template_kinds)
+    if _kind in (_VAR, _CONST))
+
+# signature -> compiled function (or None if the signature has only
+# been seen once)
+_linear_templates = {}
+_linear_template_limit = 1024
+_linear_templates_enabled = True
+
+def set_linear_template_cache(enabled, limit=None):
+    """
+    Enable or disable the linear expression template cache used by
+    generate_canonical_repn for coopr3 expression trees, and
+    optionally set the maximum number of tree structures it
+    holds. The cache is cleared.
+    """
+    global _linear_templates_enabled, _linear_template_limit
+    _linear_templates_enabled = bool(enabled)
+    if limit is not None:
+        _linear_template_limit = limit
+    _linear_templates.clear()
+
+def _is_fixed_value(exp):
+    return (exp.__class__ in native_numeric_types) or exp.is_fixed()
+
+def _linear_template_walk(exp, sig, leaves, var_ids, variables,
+                          _kinds=_linear_template_kinds):
+    """
+    Append the signature tokens and leaf values of exp to sig and
+    leaves. Returns True if exp contains an unfixed variable.
+    """
+    kind = _kinds.get(exp.__class__)
+    if kind is None:
+        if isinstance(exp, _VarData):
+            kind = _VAR
+        elif isinstance(exp, _ExpressionData):
+            kind = _IDENTITY
+        else:
+            raise _NoLinearTemplate
+
+    if kind == _SUM:
+        args = exp._args
+        sig.append('S')
+        sig.append(len(args))
+        leaves.append(exp._const)
+        leaves.extend(exp._coef)
+        has_var = False
+        for arg in args:
+            # variables and constants are handled in-line
+            if arg.__class__ is _GeneralVarData:
+                kind = _VAR
+            elif arg.__class__ is _ParamData:
+                kind = _CONST
+            else:
+                kind = _kinds.get(arg.__class__)
+            if kind == _VAR:
+                if arg.fixed:
+                    sig.append('c')
+                    leaves.append(value(arg))
+                else:
+                    j = var_ids.get(id(arg))
+                    if j is None:
+                        j = var_ids[id(arg)] = len(variables)
+                        variables.append(arg)
+                    sig.append(j)
+                    has_var = True
+            elif kind == _CONST:
+                sig.append('c')
+                if arg.__class__ is _ParamData:
+                    x = arg.value
+                    leaves.append(value(arg) if x is None else x)
+                else:
+                    leaves.append(value(arg))
+            elif _linear_template_walk(arg, sig, leaves, var_ids, variables):
+                has_var = True
+        return has_var
+
+    elif kind == _PROD:
+        numerator = exp._numerator
+        denominator = exp._denominator
+        sig.append('P')
+        sig.append(len(numerator))
+        sig.append(len(denominator))
+        leaves.append(exp._coef)
+        for subexp in denominator:
+            if not _is_fixed_value(subexp):
+                raise _NoLinearTemplate
+            x = value(subexp)
+            if x == 0:
+                # leave the error handling to the collector
+                raise _NoLinearTemplate
+            leaves.append(x)
+        has_var = False
+        for subexp in numerator:
+            if has_var:
+                if not _is_fixed_value(subexp):
+                    raise _NoLinearTemplate
+                sig.append('x')
+                leaves.append(value(subexp))
+                continue
+            # variables and constants are handled in-line
+            if subexp.__class__ is _GeneralVarData:
+                kind = _VAR
+            elif subexp.__class__ is _ParamData:
+                kind = _CONST
+            else:
+                kind = _kinds.get(subexp.__class__)
+            if kind == _VAR and not subexp.fixed:
+                j = var_ids.get(id(subexp))
+                if j is None:
+                    j = var_ids[id(subexp)] = len(variables)
+                    variables.append(subexp)
+                sig.append(j)
+                has_var = True
+            elif kind == _CONST:
+                sig.append('c')
+                if subexp.__class__ is _ParamData:
+                    x = subexp.value
+                    leaves.append(value(subexp) if x is None else x)
+                else:
+                    leaves.append(value(subexp))
+            elif _linear_template_walk(subexp, sig, leaves, var_ids, variables):
+                has_var = True
+        return has_var
+
+    elif kind == _VAR:
+        if exp.fixed:
+            sig.append('c')
+            leaves.append(value(exp))
+            return False
+        j = var_ids.get(id(exp))
+        if j is None:
+            j = var_ids[id(exp)] = len(variables)
+            variables.append(exp)
+        sig.append(j)
+        return True
+
+    elif kind == _CONST:
+        sig.append('c')
+        leaves.append(value(exp))
+        return False
+
+    else: # _IDENTITY
+        exp = exp.expr
+        if exp.is_fixed():
+            sig.append('c')
+            leaves.append(value(exp))
+            return False
+        return _linear_template_walk(exp, sig, leaves, var_ids, variables)
+
+class _LinearTemplateCoef(object):
+    """
+    A coefficient map of the collector in a generated function. Maps
+    holding at most one variable are kept in local variables. Maps
+    holding more than one variable are kept in dictionaries, as the
+    order in which their keys are merged into the parent map depends
+    on the keys.
+    """
+
+    def __init__(self, compiler, use_dict):
+        self.compiler = compiler
+        self.use_dict = use_dict
+        self.keys = set()
+        if use_dict:
+            self.name = compiler.temp()
+            compiler.emit("%s = {None: 0}" % (self.name))
+            self.const = "%s[None]" % (self.name)
+        else:
+            self.const = compiler.temp()
+            compiler.emit("%s = 0" % (self.const))
+            self.var = None
+
+    def add_constant(self, expr):
+        self.compiler.emit("%s += %s" % (self.const, expr))
+
+    def reset_constant(self):
+        self.compiler.emit("%s = 0" % (self.const))
+
+    def add_variable(self, j, expr):
+        if self.use_dict:
+            name = "%s[K[%d]]" % (self.name, j)
+        else:
+            if self.var is None:
+                self.var = self.compiler.temp()
+            name = self.var
+        if j in self.keys:
+            self.compiler.emit("%s += %s" % (name, expr))
+        else:
+            self.compiler.emit("%s = %s" % (name, expr))
+            self.keys.add(j)
+
+    def merge(self, sub_coef, multiplier):
+        if sub_coef.use_dict:
+            # see _collect_linear_prod
+            assert self.use_dict
+            emit = self.compiler.emit
+            emit("for key, val in %s.%s():"
+                 % (sub_coef.name, 'items' if using_py3 else 'iteritems'))
+            emit("    if key in %s:" % (self.name))
+            emit("        %s[key] += %s * val" % (self.name, multiplier))
+            emit("    else:")
+            emit("        %s[key] = %s * val" % (self.name, multiplier))
+            self.keys.update(sub_coef.keys)
+        else:
+            self.add_constant("%s * %s" % (multiplier, sub_coef.const))
+            for j in sub_coef.keys:
+                self.add_variable(j, "%s * %s" % (multiplier, sub_coef.var))
+
+class _LinearTemplateCompiler(object):
+    """
+    Generates and compiles a function that computes the coefficient
+    map that collect_linear_canonical_repn returns for any tree with a
+    given signature. The function is called with the list of leaf
+    values (L) and the idMap keys of the distinct variables (K).
+    """
+
+    def __init__(self, sig):
+        self.sig = sig
+        self.ntemp = 0
+        self.lines = []
+
+    def temp(self):
+        self.ntemp += 1
+        return "t%d" % (self.ntemp)
+
+    def emit(self, line):
+        self.lines.append("    " + line)
+
+    #
+    # Parse the signature into nested tuples:
+    #   ('S', const_leaf, ((coef_leaf, node), ...))
+    #   ('P', coef_leaf, (den_leaf, ...), (node or ('x', leaf), ...))
+    #   ('v', j)
+    #   ('c', leaf)
+    # along with the set of variables in each node
+    #
+    def _parse(self):
+        sig = self.sig
+        token = sig[self.pos]
+        self.pos += 1
+        if token == 'S':
+            nargs = sig[self.pos]
+            self.pos += 1
+            const = self._next_leaf()
+            coefs = [self._next_leaf() for i in xrange(nargs)]
+            args = []
+            variables = set()
+            for coef in coefs:
+                node, node_vars = self._parse()
+                args.append((coef, node))
+                variables.update(node_vars)
+            return ('S', const, args), variables
+        elif token == 'P':
+            nnumerator = sig[self.pos]
+            ndenominator = sig[self.pos+1]
+            self.pos += 2
+            coef = self._next_leaf()
+            denominator = [self._next_leaf() for i in xrange(ndenominator)]
+            numerator = []
+            variables = set()
+            for i in xrange(nnumerator):
+                if sig[self.pos] == 'x':
+                    self.pos += 1
+                    numerator.append(('x', self._next_leaf()))
+                else:
+                    node, node_vars = self._parse()
+                    numerator.append((node, node_vars))
+                    variables.update(node_vars)
+            return ('P', coef, denominator, numerator), variables
+        elif token == 'c':
+            return ('c', self._next_leaf()), ()
+        else:
+            return ('v', token), (token,)
+
+    def _next_leaf(self):
+        self.nleaves += 1
+        return self.nleaves - 1
+
+    def _generate(self, node, multiplier, coef):
+        """Returns True if node contains a variable."""
+        token = node[0]
+        if token == 'S':
+            coef.add_constant("%s * L[%d]" % (multiplier, node[1]))
+            has_var = False
+            for arg_coef, arg in node[2]:
+                if arg[0] == 'v':
+                    # see the special case in _collect_linear_sum
+                    coef.add_variable(arg[1], "%s * L[%d]"
+                                      % (multiplier, arg_coef))
+                    has_var = True
+                else:
+                    arg_multiplier = self.temp()
+                    self.emit("%s = %s * L[%d]"
+                              % (arg_multiplier, multiplier, arg_coef))
+                    if self._generate(arg, arg_multiplier, coef):
+                        has_var = True
+            return has_var
+
+        elif token == 'P':
+            prod_multiplier = self.temp()
+            self.emit("%s = %s * L[%d]"
+                      % (prod_multiplier, multiplier, node[1]))
+            for leaf in node[2]:
+                self.emit("%s = %s / L[%d]"
+                          % (prod_multiplier, prod_multiplier, leaf))
+            nvars = sum(len(node_vars) for subexp, node_vars in node[3]
+                        if subexp != 'x')
+            sub_coef = _LinearTemplateCoef(self, nvars > 1)
+            has_var = False
+            for subexp, arg in node[3]:
+                if subexp == 'x':
+                    self.emit("%s = %s * L[%d]"
+                              % (prod_multiplier, prod_multiplier, arg))
+                elif self._generate(subexp, "1", sub_coef):
+                    has_var = True
+                else:
+                    self.emit("%s = %s * %s"
+                              % (prod_multiplier, prod_multiplier,
+                                 sub_coef.const))
+                    sub_coef.reset_constant()
+            if has_var:
+                coef.merge(sub_coef, prod_multiplier)
+            else:
+                coef.add_constant(prod_multiplier)
+            return has_var
+
+        elif token == 'v':
+            coef.add_variable(node[1], multiplier)
+            return True
+
+        else: # 'c'
+            coef.add_constant("%s * L[%d]" % (multiplier, node[1]))
+            return False
+
+    def compile(self):
+        self.pos = 0
+        self.nleaves = 0
+        node, variables = self._parse()
+        assert self.pos == len(self.sig)
+
+        coef = _LinearTemplateCoef(self, True)
+        self._generate(node, "1", coef)
+        self.emit("return %s" % (coef.name))
+        source = "def _linear_template(L, K):\n" + "\n".join(self.lines)
+        namespace = {}
+        code = compile(source, "<linear template>", "exec",
+                       division.compiler_flag, True)
+        exec(code, namespace)
+        return namespace['_linear_template']
+
+def _generate_linear_template_repn(exp, idMap):
+    """
+    Returns the linear canonical representation of exp computed with
+    a compiled template, or None if a template can not (or should
+    not yet) be used for this expression.
+    """
+    if (exp.__class__ is expr._SumExpression) and \
+       (exp._args[0].__class__ in _linear_template_leaf_classes) and \
+       (exp._args[-1].__class__ in _linear_template_leaf_classes):
+        # The collector handles sums of variables and constants in a
+        # single pass, so a template would not save any work. Only
+        # the first and last terms are checked to keep this test
+        # cheap.
+        return None
+
+    sig = []
+    leaves = []
+    variables = []
+    try:
+        if not _linear_template_walk(exp, sig, leaves, {}, variables):
+            # leave constant expressions to the caller
+            return None
+    except _NoLinearTemplate:
+        return None
+
+    sig = tuple(sig)
+    template = _linear_templates.get(sig, False)
+    if template is False:
+        # only compile structures that have been seen before
+        if len(_linear_templates) >= _linear_template_limit:
+            _linear_templates.clear()
+        _linear_templates[sig] = None
+        return None
+    if template is None:
+        template = _linear_templates[sig] = \
+            _LinearTemplateCompiler(sig).compile()
+
+    # assign idMap keys in the order the collector would
+    _test = idMap[None]
+    keys = []
+    for var in variables:
+        key = _test.get(id(var))
+        if key is None:
+            key = _test[id(var)] = len(idMap) - 1
+            idMap[key] = var
+        keys.append(key)
+
+    coef = template(leaves, keys)
+    varmap = dict(zip(keys, variables))
+
+    ans = CompiledLinearCanonicalRepn()
+    if None in coef:
+        val = coef.pop(None)
+        if type(val) not in [int,float] or val != 0.0:
+            ans.constant = val
+    if using_py3:
+        ans.linear = tuple( itervalues(coef) )
+        ans.variables = tuple(varmap[var_hash] for var_hash in iterkeys(coef) )
+    else:
+        ans.linear = tuple( coef.itervalues() )
+        ans.variables = tuple(varmap[var_hash] for var_hash in coef.iterkeys() )
+    return ans
+
 #########################################################################
 #########################################################################
 #### ROUTINES OPERATING ON BOTH LINEAR AND GENERAL CANONICAL REPNS  #####
@@ -807,12 +1276,17 @@ def collect_linear_canonical_repn(exp, idMap, compute_values=True):
 #########################################################################
 
 def coopr3_generate_canonical_repn(exp, idMap=None, compute_values=True):
-    degree = exp.polynomial_degree()
-
     if idMap is None:
         idMap = {}
     idMap.setdefault(None, {})
 
+    if compute_values and _linear_templates_enabled:
+        ans = _generate_linear_template_repn(exp, idMap)
+        if ans is not None:
+            return ans
+
+    degree = exp.polynomial_degree()
+
     if degree == 0:
         ans = CompiledLinearCanonicalRepn()
         ans.constant = value(exp)
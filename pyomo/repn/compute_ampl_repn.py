@@ -16,6 +16,10 @@ from pyomo.core.base import (Constraint,
                              ComponentMap)
 from pyomo.repn.canonical_repn import LinearCanonicalRepn
 from pyomo.repn import generate_ampl_repn
+from pyomo.repn.ampl_repn import AmplRepn
+from pyomo.repn.parallel_repn import (generate_packed_repns,
+                                      add_to_idMap)
+from pyomo.util import fork_available
 
 from six import iteritems
 
@@ -46,13 +50,27 @@ def preprocess_block_objectives(block, idMap=None):
 
         block_ampl_repn[objective_data] = ampl_repn
 
-def preprocess_block_constraints(block, idMap=None):
+def preprocess_block_constraints(block, idMap=None, processes=None):
+    """
+    Compute the ampl representation of the active constraints on a
+    block (but not its sub-blocks).
+
+    If processes is greater than one, the linear representations are
+    computed in that many worker processes (see
+    pyomo.repn.parallel_repn). The result is the same as in serial
+    mode. This requires a platform where processes can be forked;
+    otherwise the representations are computed serially.
+    """
 
     # Get/Create the ComponentMap for the repn
     if not hasattr(block,'_ampl_repn'):
         block._ampl_repn = ComponentMap()
     block_ampl_repn = block._ampl_repn
 
+    if _use_processes(block, processes):
+        _parallel_preprocess_blocks([block], idMap, processes)
+        return
+
     for constraint in block.component_objects(Constraint,
                                               active=True,
                                               descend_into=False):
@@ -102,6 +120,105 @@ def preprocess_constraint(block,
 
         block_ampl_repn[constraint_data] = ampl_repn
 
+def _pack_ampl_repn(repn, var_position):
+    if repn._nonlinear_expr is not None:
+        # nonlinear repns are generated in the parent process
+        return None
+    positions = tuple(var_position[id(vardata)]
+                      for vardata in repn._linear_vars)
+    return (repn._constant, repn._linear_terms_coef, positions)
+
+def _unpack_ampl_repn(packed, variables):
+    repn = AmplRepn()
+    repn._constant, repn._linear_terms_coef, positions = packed
+    repn._linear_vars = tuple(variables[i] for i in positions)
+    repn._nonlinear_vars = tuple()
+    return repn
+
+def preprocess_model_constraints(model, idMap=None, processes=None):
+    """
+    Compute the ampl representation of the active constraints on
+    all active blocks of a model. If processes is greater than one,
+    the representations are computed by one pool of worker processes
+    for all of the blocks (see preprocess_block_constraints).
+    """
+    blocks = list(model.block_data_objects(active=True))
+    if _use_processes(model, processes):
+        _parallel_preprocess_blocks(blocks, idMap, processes)
+        return
+    for block in blocks:
+        preprocess_block_constraints(block, idMap=idMap)
+
+def _use_processes(block, processes):
+    """
+    Returns True if the repns of the constraints on a block (or
+    model) should be generated by worker processes.
+    """
+    if (processes is None) or (processes <= 1):
+        return False
+    if fork_available():
+        return True
+    logging.getLogger('pyomo.core').warning(
+        "Unable to fork worker processes on this platform: the "
+        "ampl representations of the constraints on block %s "
+        "will be computed serially" % (block.cname(True)))
+    return False
+
+def _parallel_constraint_data(block):
+
+    # Collect the constraints in the order used by
+    # preprocess_constraint
+    from pyomo.repn.beta.matrix import MatrixConstraint
+    constraint_data = []
+    for constraint in block.component_objects(Constraint,
+                                              active=True,
+                                              descend_into=False):
+        if isinstance(constraint, MatrixConstraint):
+            continue
+        for index, cdata in iteritems(constraint):
+            if (not cdata.active) or \
+               isinstance(cdata, LinearCanonicalRepn):
+                continue
+            if cdata.body is None:
+                raise ValueError(
+                    "No expression has been defined for the body "
+                    "of constraint %s" % (cdata.cname(True)))
+            constraint_data.append(cdata)
+    return constraint_data
+
+def _parallel_preprocess_blocks(blocks,
+                                idMap,
+                                processes,
+                                objectives=False):
+    """
+    Compute the ampl representation of the active constraints (and
+    objectives, if objectives is True) on a list of blocks, with one
+    pool of worker processes for all of the blocks. The blocks are
+    processed in order, as in serial mode.
+    """
+    constraint_data = [_parallel_constraint_data(block) for block in blocks]
+    variables, packed = generate_packed_repns(
+        [cdata for block_data in constraint_data for cdata in block_data],
+        generate_ampl_repn,
+        _pack_ampl_repn,
+        processes)
+
+    packed = iter(packed)
+    for block, block_data in zip(blocks, constraint_data):
+        if not hasattr(block, '_ampl_repn'):
+            block._ampl_repn = ComponentMap()
+        block_ampl_repn = block._ampl_repn
+        for cdata in block_data:
+            packed_repn = next(packed)
+            if packed_repn is None:
+                preprocess_constraint_data(block, cdata, idMap=idMap)
+            else:
+                repn = _unpack_ampl_repn(packed_repn, variables)
+                add_to_idMap(idMap, repn._linear_vars)
+                block_ampl_repn[cdata] = repn
+        if objectives:
+            preprocess_block_objectives(block, idMap=idMap)
+
 def preprocess_constraint_data(block,
                                constraint_data,
                                idMap=None,
@@ -134,7 +251,7 @@ def preprocess_constraint_data(block,
     block_ampl_repn[constraint_data] = ampl_repn
 
 @pyomo.util.pyomo_api(namespace='pyomo.repn')
-def compute_ampl_repn(data, model=None):
+def compute_ampl_repn(data, model=None, processes=None):
     """
     This plugin computes the ampl representation for all objectives
     and constraints. All results are stored in a ComponentMap named
@@ -148,8 +265,17 @@ def compute_ampl_repn(data, model=None):
 
     Required:
         model:      A concrete model instance.
+
+    Optional:
+        processes:  The number of worker processes that compute the
+                    representations of the constraints of all blocks
+                    (by default, they are computed serially).
     """
     idMap = {}
-    for block in model.block_data_objects(active=True):
+    blocks = list(model.block_data_objects(active=True))
+    if _use_processes(model, processes):
+        _parallel_preprocess_blocks(blocks, idMap, processes, objectives=True)
+        return
+    for block in blocks:
         preprocess_block_constraints(block, idMap=idMap)
         preprocess_block_objectives(block, idMap=idMap)
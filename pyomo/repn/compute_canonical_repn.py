@@ -14,7 +14,10 @@ from pyomo.core.base import Constraint, Objective, ComponentMap, Block
 import pyomo.repn
 from pyomo.repn.canonical_repn import LinearCanonicalRepn
 from pyomo.repn import generate_canonical_repn
+from pyomo.repn.parallel_repn import (generate_packed_repns,
+                                      add_to_idMap)
 import pyomo.core.base.connector
+from pyomo.util import fork_available
 
 from six import iteritems
 
@@ -44,13 +47,27 @@ def preprocess_block_objectives(block, idMap=None):
 
         block_canonical_repn[objective_data] = objective_data_repn
 
-def preprocess_block_constraints(block, idMap=None):
+def preprocess_block_constraints(block, idMap=None, processes=None):
+    """
+    Compute the canonical representation of the active constraints
+    on a block (but not its sub-blocks).
+
+    If processes is greater than one, the linear representations are
+    computed in that many worker processes (see
+    pyomo.repn.parallel_repn). The result is the same as in serial
+    mode. This requires a platform where processes can be forked;
+    otherwise the representations are computed serially.
+    """
 
     # Get/Create the ComponentMap for the canonical_repn
     if not hasattr(block, '_canonical_repn'):
         block._canonical_repn = ComponentMap()
     block_canonical_repn = block._canonical_repn
 
+    if _use_processes(block, processes):
+        _parallel_preprocess_blocks([block], idMap, processes)
+        return
+
     for constraint in block.component_objects(Constraint,
                                               active=True,
                                               descend_into=False):
@@ -113,6 +130,119 @@ def preprocess_constraint(block,
 
         block_canonical_repn[constraint_data] = canonical_repn
 
+def _pack_canonical_repn(repn, var_position):
+    if not isinstance(repn, LinearCanonicalRepn):
+        # general repns are generated in the parent process
+        return None
+    positions = None
+    if repn.variables is not None:
+        positions = tuple(var_position[id(vardata)]
+                          for vardata in repn.variables)
+    return (repn.constant, repn.linear, positions)
+
+def _unpack_canonical_repn(packed, variables):
+    constant, linear, positions = packed
+    repn = pyomo.repn.canonical_repn.CompiledLinearCanonicalRepn()
+    repn.constant = constant
+    repn.linear = linear
+    if positions is None:
+        repn.variables = None
+    else:
+        repn.variables = tuple(variables[i] for i in positions)
+        if linear.__class__ is list:
+            repn.variables = list(repn.variables)
+    return repn
+
+def preprocess_model_constraints(model, idMap=None, processes=None):
+    """
+    Compute the canonical representation of the active constraints on
+    all active blocks of a model. If processes is greater than one,
+    the representations are computed by one pool of worker processes
+    for all of the blocks (see preprocess_block_constraints).
+    """
+    blocks = list(model.block_data_objects(active=True))
+    if _use_processes(model, processes):
+        _parallel_preprocess_blocks(blocks, idMap, processes)
+        return
+    for block in blocks:
+        preprocess_block_constraints(block, idMap=idMap)
+
+def _use_processes(block, processes):
+    """
+    Returns True if the repns of the constraints on a block (or
+    model) should be generated by worker processes.
+    """
+    if (processes is None) or (processes <= 1):
+        return False
+    if fork_available():
+        return True
+    logging.getLogger('pyomo.core').warning(
+        "Unable to fork worker processes on this platform: the "
+        "canonical representations of the constraints on block %s "
+        "will be computed serially" % (block.cname(True)))
+    return False
+
+def _parallel_constraint_data(block):
+
+    # Collect the constraints in the order used by
+    # preprocess_constraint
+    from pyomo.repn.beta.matrix import MatrixConstraint
+    constraint_data = []
+    for constraint in block.component_objects(Constraint,
+                                              active=True,
+                                              descend_into=False):
+        if isinstance(constraint, MatrixConstraint):
+            continue
+        for index, cdata in iteritems(constraint):
+            if (not cdata.active) or \
+               isinstance(cdata, LinearCanonicalRepn):
+                continue
+            if cdata.body is None:
+                raise ValueError("No expression has been defined for "
+                                 "the body of constraint %s, index=%s"
+                                 % (str(constraint.name), str(index)))
+            # See the FIXME in preprocess_constraint
+            if hasattr(cdata.body,"_args") and cdata.body._args is not None:
+                if any(arg.__class__ is pyomo.core.base.connector.SimpleConnector
+                       for arg in cdata.body._args):
+                    continue
+            constraint_data.append(cdata)
+    return constraint_data
+
+def _parallel_preprocess_blocks(blocks,
+                                idMap,
+                                processes,
+                                objectives=False):
+    """
+    Compute the canonical representation of the active constraints
+    (and objectives, if objectives is True) on a list of blocks, with
+    one pool of worker processes for all of the blocks. The blocks
+    are processed in order, as in serial mode.
+    """
+    constraint_data = [_parallel_constraint_data(block) for block in blocks]
+    variables, packed = generate_packed_repns(
+        [cdata for block_data in constraint_data for cdata in block_data],
+        generate_canonical_repn,
+        _pack_canonical_repn,
+        processes)
+
+    packed = iter(packed)
+    for block, block_data in zip(blocks, constraint_data):
+        if not hasattr(block, '_canonical_repn'):
+            block._canonical_repn = ComponentMap()
+        block_canonical_repn = block._canonical_repn
+        for cdata in block_data:
+            packed_repn = next(packed)
+            if packed_repn is None:
+                preprocess_constraint_data(block, cdata, idMap=idMap)
+            else:
+                repn = _unpack_canonical_repn(packed_repn, variables)
+                if repn.variables is not None:
+                    add_to_idMap(idMap, repn.variables)
+                block_canonical_repn[cdata] = repn
+        if objectives:
+            preprocess_block_objectives(block, idMap=idMap)
+
 def preprocess_constraint_data(block,
                                constraint_data,
                                idMap=None,
@@ -155,7 +285,7 @@ def preprocess_constraint_data(block,
     block_canonical_repn[constraint_data] = canonical_repn
 
 @pyomo.util.pyomo_api(namespace='pyomo.repn')
-def compute_canonical_repn(data, model=None):
+def compute_canonical_repn(data, model=None, processes=None):
     """
     This plugin computes the canonical representation for all
     objectives and constraints linear terms.  All results are stored
@@ -169,18 +299,29 @@ def compute_canonical_repn(data, model=None):
 
     Required:
         model:      A concrete model instance.
+
+    Optional:
+        processes:  The number of worker processes that compute the
+                    representations of the constraints of all blocks
+                    (by default, they are computed serially).
     """
     idMap = {}
 
+    blocks = []
     # FIXME: We should revisit the bilevel transformations to see why
     # the test requires "SubModels" to be preprocessed. [JDS 12/31/14]
     if model._type is not Block and model.active:
-        preprocess_block_constraints(model, idMap=idMap)
-        preprocess_block_objectives(model, idMap=idMap)
+        blocks.append(model)
 
     # block_data_objects() returns the current block... no need to do special
     # handling of the top (model) block.
     #
-    for block in model.block_data_objects(active=True):
+    blocks.extend(model.block_data_objects(active=True))
+
+    if _use_processes(model, processes):
+        _parallel_preprocess_blocks(blocks, idMap, processes, objectives=True)
+        return
+
+    for block in blocks:
         preprocess_block_constraints(block, idMap=idMap)
         preprocess_block_objectives(block, idMap=idMap)
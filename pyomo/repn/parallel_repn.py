@@ -0,0 +1,117 @@
+#  _________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright (c) 2014 Sandia Corporation.
+#  Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+#  the U.S. Government retains certain rights in this software.
+#  This software is distributed under the BSD License.
+#  _________________________________________________________________________
+
+#
+# Generate the representations of a list of constraints in worker
+# processes. This is used by the parallel mode of
+# preprocess_block_constraints, compute_canonical_repn and
+# compute_ampl_repn (which generate the repns of all of the blocks of
+# a model with one pool of workers).
+#
+# The workers are forked after the constraint list and a variable
+# index are stored in a module-level variable, so the model itself is
+# never pickled. Each worker generates the repns for a contiguous chunk
+# of the list and returns them as picklable tuples in which variables
+# are replaced by their position in the variable index. The parent
+# then rebuilds the repns in the original constraint order, so the
+# result (and anything written from it) does not depend on the number
+# of processes or on the order in which the chunks complete. Repns
+# that can not be packed (e.g., nonlinear expressions, or variables
+# that are not part of the model) are generated in the parent.
+#
+
+import logging
+
+from pyomo.core.base import Var
+from pyomo.util import fork_available, fork_context
+
+from six.moves import xrange
+
+logger = logging.getLogger('pyomo.core')
+
+# (generate, pack, constraint_data, var_position), set in the parent
+# before the worker processes are forked
+_worker_state = None
+
+def _create_pool(processes):
+    return fork_context().Pool(processes)
+
+def _pack_chunk(chunk):
+    start, stop = chunk
+    generate, pack, constraint_data, var_position = _worker_state
+    results = []
+    for i in xrange(start, stop):
+        try:
+            results.append(pack(generate(constraint_data[i].body),
+                                var_position))
+        except Exception:
+            # the parent regenerates (and reports) this one
+            results.append(None)
+    return results
+
+def generate_packed_repns(constraint_data,
+                          generate,
+                          pack,
+                          processes,
+                          chunk_size=None):
+    """
+    Generate the repn of the body of each constraint in
+    constraint_data using a pool of worker processes.
+
+    Returns a tuple (variables, packed) where packed holds the value
+    returned by pack(repn, var_position) for each constraint (in the
+    same order as constraint_data), or None if the repn could not be
+    generated or packed by a worker. The integer positions used by
+    pack refer to the variables list.
+    """
+    global _worker_state
+    assert processes > 1
+    if not constraint_data:
+        return [], []
+
+    model = constraint_data[0].model()
+    variables = list(model.component_data_objects(Var, descend_into=True))
+    var_position = dict((id(vardata), i)
+                        for i, vardata in enumerate(variables))
+
+    n = len(constraint_data)
+    if chunk_size is None:
+        # a few chunks per process to balance the load
+        chunk_size = max(1, -(-n // (4 * processes)))
+    chunks = [(i, min(i + chunk_size, n)) for i in xrange(0, n, chunk_size)]
+
+    _worker_state = (generate, pack, constraint_data, var_position)
+    try:
+        pool = _create_pool(min(processes, len(chunks)))
+        try:
+            results = pool.map(_pack_chunk, chunks)
+        finally:
+            pool.close()
+            pool.join()
+    finally:
+        _worker_state = None
+
+    packed = []
+    for chunk_results in results:
+        packed.extend(chunk_results)
+    assert len(packed) == n
+    return variables, packed
+
+def add_to_idMap(idMap, variables):
+    """
+    Add variables that are not yet in an idMap, in order.
+    """
+    if idMap is None:
+        return
+    _test = idMap.setdefault(None, {})
+    for vardata in variables:
+        if id(vardata) not in _test:
+            key = len(idMap) - 1
+            _test[id(vardata)] = key
+            idMap[key] = vardata
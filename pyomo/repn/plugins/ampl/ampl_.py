@@ -13,6 +13,7 @@
 
 __all__ = ['ProblemWriter_nl']
 
+import array
 import itertools
 import logging
 import operator
@@ -228,6 +229,18 @@ class ProblemWriter_nl(AbstractProblemWriter):
         include_all_variable_bounds = \
             io_options.pop("include_all_variable_bounds", False)
 
+        # If False, the ampl representations generated for the active
+        # objectives and constraints are discarded once their
+        # coefficients have been collected, rather than being stored
+        # in the _ampl_repn ComponentMap on each block. This reduces
+        # the peak memory required to write large models, but the
+        # cached representations will not be available for reuse by a
+        # subsequent write (e.g., when _gen_con_ampl_repn is False).
+        # Any representations stored by a previous write for the
+        # regenerated objectives and constraints are removed, as they
+        # may no longer be valid.
+        store_ampl_repn = io_options.pop("store_ampl_repn", True)
+
         if len(io_options):
             raise ValueError(
                 "ProblemWriter_nl passed unrecognized io_options:\n\t" +
@@ -247,7 +260,8 @@ class ProblemWriter_nl(AbstractProblemWriter):
                                                   skip_trivial_constraints=skip_trivial_constraints,
                                                   file_determinism=file_determinism,
                                                   output_fixed_variable_bounds=output_fixed_variable_bounds,
-                                                  include_all_variable_bounds=include_all_variable_bounds)
+                                                  include_all_variable_bounds=include_all_variable_bounds,
+                                                  store_ampl_repn=store_ampl_repn)
 
         self._OUTPUT = None
         self._varID_map = None
@@ -430,7 +444,8 @@ class ProblemWriter_nl(AbstractProblemWriter):
                         skip_trivial_constraints=False,
                         file_determinism=1,
                         output_fixed_variable_bounds=False,
-                        include_all_variable_bounds=False):
+                        include_all_variable_bounds=False,
+                        store_ampl_repn=True):
 
         sorter = SortComponents.unsorted
         if file_determinism >= 1:
@@ -549,7 +564,10 @@ class ProblemWriter_nl(AbstractProblemWriter):
 
                 if gen_obj_ampl_repn:
                     ampl_repn = generate_ampl_repn(active_objective.expr)
-                    block_ampl_repn[active_objective] = ampl_repn
+                    if store_ampl_repn:
+                        block_ampl_repn[active_objective] = ampl_repn
+                    else:
+                        block_ampl_repn.pop(active_objective, None)
                 else:
                     ampl_repn = block_ampl_repn[active_objective]
 
@@ -580,7 +598,7 @@ class ProblemWriter_nl(AbstractProblemWriter):
             raise ValueError("The NL writer has detected multiple active objective functions on model %s, "
                              "but currently only handles a single objective." % (model.cname(True)))
         elif n_objs == 1:
-            symbol_map.alias(symbol_map.bySymbol["o0"](),"__default_objective__")
+            symbol_map.alias(symbol_map.getObject("o0"),"__default_objective__")
 
         if show_section_timing:
             subsection_timer.report("Generate objective representation")
@@ -596,7 +614,6 @@ class ProblemWriter_nl(AbstractProblemWriter):
         n_nonlinear_constraints = 0
         ConNonlinearVars = set()
         ConNonlinearVarsInt = set()
-        nnz_grad_constraints = 0
         constraint_bounds_dict = {}
         nonlin_con_order_list = []
         lin_con_order_list = []
@@ -605,8 +622,26 @@ class ProblemWriter_nl(AbstractProblemWriter):
         ccons_nd = 0
         ccons_nzlb = 0
 
+        # The Jacobian sparsity pattern and the linear coefficients
+        # are collected into flat (CSR-style) buffers as each
+        # constraint is visited, so that the ampl_repn for a
+        # constraint need not be kept alive until the J lines are
+        # written. For buffered row i (i.e., con_ID - con_ID_offset),
+        # the entries jac_rowptr[i]:jac_nlptr[i] hold the linear
+        # variables and jac_nlptr[i]:jac_rowptr[i+1] hold the
+        # variables that only appear in the nonlinear expression.
+        # Note: the coefficients are kept in a list (rather than an
+        #       array of doubles) so that they are written using the
+        #       same repr as the original numeric values.
+        con_ID_offset = trivial_labeler._id
+        jac_rowptr = array.array('l', [0])
+        jac_nlptr = array.array('l')
+        jac_var = array.array('l')
+        jac_coef = []
+        # only the nonlinear expressions are needed for the C lines
+        con_nonlinear_expr = {}
+
         for block in all_blocks_list:
-            all_repns = list()
 
             gen_con_ampl_repn = \
                 getattr(block, "_gen_con_ampl_repn", True)
@@ -624,7 +659,10 @@ class ProblemWriter_nl(AbstractProblemWriter):
 
                 if gen_con_ampl_repn:
                     ampl_repn = generate_ampl_repn(constraint_data.body)
-                    block_ampl_repn[constraint_data] = ampl_repn
+                    if store_ampl_repn:
+                        block_ampl_repn[constraint_data] = ampl_repn
+                    else:
+                        block_ampl_repn.pop(constraint_data, None)
                 else:
                     ampl_repn = block_ampl_repn[constraint_data]
 
@@ -637,24 +675,28 @@ class ProblemWriter_nl(AbstractProblemWriter):
                     continue
 
                 con_ID = trivial_labeler(constraint_data)
-                wrapped_ampl_repn = \
-                    RepnWrapper(ampl_repn,
-                                list(self_varID_map[id(var)] for var in ampl_repn._linear_vars),
-                                list(self_varID_map[id(var)] for var in ampl_repn._nonlinear_vars))
+                linear_IDs = [self_varID_map[id(var)]
+                              for var in ampl_repn._linear_vars]
+                jac_var.extend(linear_IDs)
+                jac_coef.extend(ampl_repn._linear_terms_coef)
+                jac_nlptr.append(len(jac_var))
+                LinearVars.update(linear_IDs)
 
                 if ampl_repn.is_nonlinear():
                     nonlin_con_order_list.append(con_ID)
                     n_nonlinear_constraints += 1
+                    con_nonlinear_expr[con_ID] = ampl_repn._nonlinear_expr
+                    nonlinear_IDs = set(self_varID_map[id(var)]
+                                        for var in ampl_repn._nonlinear_vars)
+                    ConNonlinearVars.update(nonlinear_IDs)
+                    nonlinear_IDs.difference_update(linear_IDs)
+                    jac_var.extend(nonlinear_IDs)
+                    jac_coef.extend(0 for var_ID in nonlinear_IDs)
                 else:
                     lin_con_order_list.append(con_ID)
+                jac_rowptr.append(len(jac_var))
 
-                Constraints_dict[con_ID] = (constraint_data, wrapped_ampl_repn)
-
-                LinearVars.update(wrapped_ampl_repn._linear_vars)
-                ConNonlinearVars.update(wrapped_ampl_repn._nonlinear_vars)
-
-                nnz_grad_constraints += \
-                    len(set(wrapped_ampl_repn._linear_vars).union(wrapped_ampl_repn._nonlinear_vars))
+                Constraints_dict[con_ID] = constraint_data
 
                 L = None
                 U = None
@@ -704,6 +746,8 @@ class ProblemWriter_nl(AbstractProblemWriter):
                         # both are not none and they are valid
                         n_ranges += 1
 
+        nnz_grad_constraints = len(jac_var)
+
         sos1 = solver_capability("sos1")
         sos2 = solver_capability("sos2")
         for block in all_blocks_list:
@@ -722,9 +766,10 @@ class ProblemWriter_nl(AbstractProblemWriter):
         # create the ampl constraint ids
         self_ampl_con_id.update((con_ID,row_id) for row_id,con_ID in \
                                 enumerate(itertools.chain(nonlin_con_order_list,lin_con_order_list)))
-        # populate the symbol_map
-        symbol_map.addSymbols([(Constraints_dict[con_ID][0],"c%d"%row_id) for row_id,con_ID in \
-                               enumerate(itertools.chain(nonlin_con_order_list,lin_con_order_list))])
+        # populate the symbol_map (the "c%d" labels are generated lazily)
+        symbol_map.addIndexedSymbols(
+            'c', [Constraints_dict[con_ID] for con_ID in \
+                  itertools.chain(nonlin_con_order_list,lin_con_order_list)])
 
         if show_section_timing:
             subsection_timer.report("Generate constraint representations")
@@ -815,9 +860,9 @@ class ProblemWriter_nl(AbstractProblemWriter):
         # create the ampl variable column ids
         self_ampl_var_id.update((var_ID,column_id)
                                 for column_id,var_ID in enumerate(full_var_list))
-        # populate the symbol_map
-        symbol_map.addSymbols([(Vars_dict[var_ID],"v%d"%column_id)
-                               for column_id,var_ID in enumerate(full_var_list)])
+        # populate the symbol_map (the "v%d" labels are generated lazily)
+        symbol_map.addIndexedSymbols(
+            'v', [Vars_dict[var_ID] for var_ID in full_var_list])
 
         if show_section_timing:
             subsection_timer.report("Partition variable types")
@@ -968,8 +1013,6 @@ class ProblemWriter_nl(AbstractProblemWriter):
                         "Solver does not support SOS level %s constraints" % (level))
                 modelSOS.count_constraint(soscondata)
 
-        symbol_map_byObject = symbol_map.byObject
-
         var_sosno_suffix = modelSOS.sosno
         var_ref_suffix = modelSOS.ref
         sosconstraint_sosno_vals = set(var_sosno_suffix.vals)
@@ -986,6 +1029,18 @@ class ProblemWriter_nl(AbstractProblemWriter):
             for name, suf in active_export_suffix_generator(block):
                 if len(suf):
                     suffix_dict.setdefault(name,[]).append(suf)
+        # id -> (type tag, ampl id) for the components that may appear
+        # in the suffixes. This is built from the maps above (and not
+        # from symbol_map.byObject) so that the symbol_map labels do
+        # not need to be generated.
+        ampl_ids = {}
+        if suffix_dict:
+            ampl_ids.update((id(Vars_dict[var_ID]), ('v', column_id))
+                            for var_ID, column_id in iteritems(self_ampl_var_id))
+            ampl_ids.update((id(Constraints_dict[con_ID]), ('c', row_id))
+                            for con_ID, row_id in iteritems(self_ampl_con_id))
+            ampl_ids.update((id(Objectives_dict[obj_ID][0]), ('o', obj_id))
+                            for obj_ID, obj_id in iteritems(self_ampl_obj_id))
         if not ('sosno' in suffix_dict):
             # We still need to write out the SOSConstraint suffixes
             # even though these may have not been "declared" on the model
@@ -1061,9 +1116,7 @@ class ProblemWriter_nl(AbstractProblemWriter):
                 for component_data, suffix_value in iteritems(suffix):
 
                     try:
-                        symbol = symbol_map_byObject[id(component_data)]
-                        type_tag = symbol[0]
-                        ampl_id = int(symbol[1:])
+                        type_tag, ampl_id = ampl_ids[id(component_data)]
                         if type_tag == 'v':
                             var_s_lines.append((ampl_id, suffix_value))
                         elif type_tag == 'c':
@@ -1128,27 +1181,19 @@ class ProblemWriter_nl(AbstractProblemWriter):
         if symbolic_solver_labels is True:
             rowf = open(rowfilename,'w')
 
-        cu = [0 for i in xrange(len(full_var_list))]
         for con_ID in nonlin_con_order_list:
-            con_data, wrapped_ampl_repn = Constraints_dict[con_ID]
             row_id = self_ampl_con_id[con_ID]
             OUTPUT.write( "C%d\n"%(row_id) )
             if symbolic_solver_labels is True:
-                rowf.write( name_labeler(con_data)+"\n" )
-            self._print_nonlinear_terms_NL(wrapped_ampl_repn.repn._nonlinear_expr)
-
-            for var_ID in set(wrapped_ampl_repn._linear_vars).union(wrapped_ampl_repn._nonlinear_vars):
-                cu[self_ampl_var_id[var_ID]] += 1
+                rowf.write( name_labeler(Constraints_dict[con_ID])+"\n" )
+            self._print_nonlinear_terms_NL(con_nonlinear_expr[con_ID])
+        del con_nonlinear_expr
 
         for con_ID in lin_con_order_list:
-            con_data, wrapped_ampl_repn = Constraints_dict[con_ID]
             row_id = self_ampl_con_id[con_ID]
-            con_vars = set(wrapped_ampl_repn._linear_vars)
-            for var_ID in con_vars:
-                cu[self_ampl_var_id[var_ID]] += 1
             OUTPUT.write( "C%d\n"%(row_id) )
             if symbolic_solver_labels is True:
-                rowf.write( name_labeler(con_data)+"\n" )
+                rowf.write( name_labeler(Constraints_dict[con_ID])+"\n" )
             OUTPUT.write( "n0\n" )
 
         if show_section_timing:
@@ -1195,10 +1240,8 @@ class ProblemWriter_nl(AbstractProblemWriter):
                 for constraint_data, suffix_value in iteritems(dual_suffix):
                     try:
                         # a constraint might not be referenced (inactive / on inactive block)
-                        symbol = symbol_map_byObject[id(constraint_data)]
-                        type_tag = symbol[0]
+                        type_tag, ampl_con_id = ampl_ids[id(constraint_data)]
                         assert type_tag == 'c'
-                        ampl_con_id = int(symbol[1:])
                         s_lines.append((ampl_con_id, suffix_value))
                     except KeyError:
                         pass
@@ -1287,6 +1330,9 @@ class ProblemWriter_nl(AbstractProblemWriter):
         #
         # "k" lines
         #
+        cu = [0 for i in xrange(len(full_var_list))]
+        for var_ID in jac_var:
+            cu[self_ampl_var_id[var_ID]] += 1
         ktot = 0
         n1 = len(full_var_list) - 1
         OUTPUT.write( "k%d\n"%(n1) )
@@ -1304,27 +1350,28 @@ class ProblemWriter_nl(AbstractProblemWriter):
         # "J" lines
         #
         for nc, con_ID in enumerate(itertools.chain(nonlin_con_order_list,lin_con_order_list)):
-            con_data, wrapped_ampl_repn = Constraints_dict[con_ID]
-            num_nonlinear_vars = len(wrapped_ampl_repn._nonlinear_vars)
-            num_linear_vars = len(wrapped_ampl_repn._linear_vars)
-            if num_nonlinear_vars == 0:
-                if num_linear_vars > 0:
-                    linear_dict = dict((var_ID, coef) for var_ID, coef in zip(wrapped_ampl_repn._linear_vars, wrapped_ampl_repn.repn._linear_terms_coef))
-                    OUTPUT.write( "J%d %d\n"%(nc, num_linear_vars) )
-                    OUTPUT.writelines( "{0} {1!r}\n".format(self_ampl_var_id[con_var], linear_dict[con_var]) for con_var in sorted(linear_dict.keys()) )
-            elif num_linear_vars == 0:
-                nl_con_vars = sorted(wrapped_ampl_repn._nonlinear_vars)
-                OUTPUT.write( "J%d %d\n"%(nc, num_nonlinear_vars) )
-                OUTPUT.writelines( "%d 0\n"%(self_ampl_var_id[con_var]) for con_var in nl_con_vars )
-            else:
-                con_vars = set(wrapped_ampl_repn._nonlinear_vars)
-                nl_con_vars = sorted(con_vars.difference(wrapped_ampl_repn._linear_vars))
-                con_vars.update(wrapped_ampl_repn._linear_vars)
-                linear_dict = dict((var_ID, coef) for var_ID, coef in zip(wrapped_ampl_repn._linear_vars, wrapped_ampl_repn.repn._linear_terms_coef))
-                OUTPUT.write( "J%d %d\n"%(nc, len(con_vars)) )
-                OUTPUT.writelines( "{0} {1!r}\n".format(self_ampl_var_id[con_var], linear_dict[con_var]) for con_var in sorted(linear_dict.keys()) )
-                OUTPUT.writelines( "%d 0\n"%(self_ampl_var_id[con_var]) for con_var in nl_con_vars )
-
+            row = con_ID - con_ID_offset
+            row_start = jac_rowptr[row]
+            row_nl = jac_nlptr[row]
+            row_end = jac_rowptr[row+1]
+            if row_end == row_start:
+                continue
+            OUTPUT.write( "J%d %d\n"%(nc, row_end - row_start) )
+            if row_nl > row_start:
+                OUTPUT.writelines(
+                    "{0} {1!r}\n".format(self_ampl_var_id[var_ID], coef)
+                    for var_ID, coef in
+                    sorted(zip(jac_var[row_start:row_nl],
+                               jac_coef[row_start:row_nl]),
+                           key=operator.itemgetter(0)) )
+            if row_end > row_nl:
+                OUTPUT.writelines(
+                    "%d 0\n"%(self_ampl_var_id[var_ID]) for var_ID in
+                    sorted(jac_var[row_nl:row_end]) )
+        del jac_rowptr
+        del jac_nlptr
+        del jac_var
+        del jac_coef
 
         if show_section_timing:
             subsection_timer.report("Write J lines")
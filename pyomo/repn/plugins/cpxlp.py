@@ -15,7 +15,7 @@ import logging
 import math
 import operator
 
-from six import iterkeys, iteritems, StringIO
+from six import iterkeys, iteritems, itervalues, StringIO
 from six.moves import xrange
 
 from pyutilib.math import infinity
@@ -32,6 +32,7 @@ from pyomo.core.base import \
 from pyomo.repn import (generate_canonical_repn,
                         canonical_degree,
                         LinearCanonicalRepn)
+from pyomo.repn.plugins.row_cache import get_row_cache
 
 logger = logging.getLogger('pyomo.core')
 
@@ -114,6 +115,12 @@ class ProblemWriter_cpxlp(AbstractProblemWriter):
         force_objective_constant = \
             io_options.pop("force_objective_constant", False)
 
+        # Keep the text generated for each constraint body on the
+        # model between writes, and reuse it on the next write for
+        # any constraint whose canonical representation has not been
+        # regenerated since (see pyomo.repn.plugins.row_cache).
+        cache_rows = io_options.pop("cache_rows", False)
+
         if len(io_options):
             raise ValueError(
                 "ProblemWriter_cpxlp passed unrecognized io_options:\n\t" +
@@ -129,6 +136,11 @@ class ProblemWriter_cpxlp(AbstractProblemWriter):
         elif labeler is None:
             labeler = NumericLabeler('x')
 
+        if cache_rows and (column_order is not None):
+            raise ValueError("ProblemWriter_cpxlp: The 'cache_rows' "
+                             "I/O option can not be used with a "
+                             "user-defined 'column_order'")
+
         # clear the collection of referenced variables.
         self._referenced_variable_ids.clear()
 
@@ -154,7 +166,8 @@ class ProblemWriter_cpxlp(AbstractProblemWriter):
                     column_order=column_order,
                     skip_trivial_constraints=skip_trivial_constraints,
                     force_objective_constant=force_objective_constant,
-                    include_all_variable_bounds=include_all_variable_bounds)
+                    include_all_variable_bounds=include_all_variable_bounds,
+                    cache_rows=cache_rows)
 
         self._referenced_variable_ids.clear()
 
@@ -362,6 +375,46 @@ class ProblemWriter_cpxlp(AbstractProblemWriter):
         #
         return offset
 
+    def _get_cached_row(self,
+                        row_cache,
+                        constraint_data,
+                        canonical_repn,
+                        object_symbol_dictionary,
+                        variable_symbol_dictionary):
+        """
+        Return the LP body text and constant offset for a constraint,
+        reusing the text stored in the row cache when the constraint
+        has the same canonical representation as on the last write.
+        """
+        entry = row_cache.lookup(constraint_data, canonical_repn)
+        if entry is not None:
+            repn, body, offset, variables = entry
+            referenced_variable_ids = self._referenced_variable_ids
+            for vardata in variables:
+                referenced_variable_ids[id(vardata)] = vardata
+            return body, offset
+
+        # collect the variables referenced by this row separately, so
+        # they can be restored when the cached text is reused
+        referenced_variable_ids = self._referenced_variable_ids
+        self._referenced_variable_ids = {}
+        output = StringIO()
+        try:
+            offset = self._print_expr_canonical(canonical_repn,
+                                                output,
+                                                object_symbol_dictionary,
+                                                variable_symbol_dictionary,
+                                                False,
+                                                None)
+            variables = tuple(itervalues(self._referenced_variable_ids))
+        finally:
+            referenced_variable_ids.update(self._referenced_variable_ids)
+            self._referenced_variable_ids = referenced_variable_ids
+        body = output.getvalue()
+        row_cache.store(constraint_data,
+                        (canonical_repn, body, offset, variables))
+        return body, offset
+
     def printSOS(self,
                  symbol_map,
                  labeler,
@@ -402,7 +455,8 @@ class ProblemWriter_cpxlp(AbstractProblemWriter):
                         column_order=None,
                         skip_trivial_constraints=False,
                         force_objective_constant=False,
-                        include_all_variable_bounds=False):
+                        include_all_variable_bounds=False,
+                        cache_rows=False):
 
         symbol_map = SymbolMap()
         variable_symbol_map = SymbolMap()
@@ -459,6 +513,12 @@ class ProblemWriter_cpxlp(AbstractProblemWriter):
         # cache - these are called all the time.
         print_expr_canonical = self._print_expr_canonical
 
+        row_cache = None
+        if cache_rows:
+            row_cache = get_row_cache(model, '_cpxlp_row_cache')
+            row_cache.validate((self._precision_string,
+                                dict(variable_symbol_dictionary)))
+
         # print the model name and the source, so we know roughly where
         # it came from.
         #
@@ -641,16 +701,26 @@ class ProblemWriter_cpxlp(AbstractProblemWriter):
             # Create symbol
             con_symbol = create_symbol_func(symbol_map, constraint_data, labeler)
 
+            if row_cache is not None:
+                body, offset = self._get_cached_row(row_cache,
+                                                    constraint_data,
+                                                    canonical_repn,
+                                                    object_symbol_dictionary,
+                                                    variable_symbol_dictionary)
+
             if constraint_data.equality:
                 label = 'c_e_' + con_symbol + '_'
                 alias_symbol_func(symbol_map, constraint_data, label)
                 output_file.write(label+':\n')
-                offset = print_expr_canonical(canonical_repn,
-                                              output_file,
-                                              object_symbol_dictionary,
-                                              variable_symbol_dictionary,
-                                              False,
-                                              column_order)
+                if row_cache is None:
+                    offset = print_expr_canonical(canonical_repn,
+                                                  output_file,
+                                                  object_symbol_dictionary,
+                                                  variable_symbol_dictionary,
+                                                  False,
+                                                  column_order)
+                else:
+                    output_file.write(body)
                 bound = constraint_data.lower
                 bound = self._get_bound(bound) - offset
                 if bound != 0:
@@ -670,12 +740,15 @@ class ProblemWriter_cpxlp(AbstractProblemWriter):
                         label = 'c_l_' + con_symbol + '_'
                     alias_symbol_func(symbol_map, constraint_data, label)
                     output_file.write(label+':\n')
-                    offset = print_expr_canonical(canonical_repn,
-                                                  output_file,
-                                                  object_symbol_dictionary,
-                                                  variable_symbol_dictionary,
-                                                  False,
-                                                  column_order)
+                    if row_cache is None:
+                        offset = print_expr_canonical(canonical_repn,
+                                                      output_file,
+                                                      object_symbol_dictionary,
+                                                      variable_symbol_dictionary,
+                                                      False,
+                                                      column_order)
+                    else:
+                        output_file.write(body)
                     bound = constraint_data.lower
                     bound = self._get_bound(bound) - offset
                     if bound != 0:
@@ -693,12 +766,15 @@ class ProblemWriter_cpxlp(AbstractProblemWriter):
                         label = 'c_u_' + con_symbol + '_'
                     alias_symbol_func(symbol_map, constraint_data, label)
                     output_file.write(label+':\n')
-                    offset = print_expr_canonical(canonical_repn,
-                                                  output_file,
-                                                  object_symbol_dictionary,
-                                                  variable_symbol_dictionary,
-                                                  False,
-                                                  column_order)
+                    if row_cache is None:
+                        offset = print_expr_canonical(canonical_repn,
+                                                      output_file,
+                                                      object_symbol_dictionary,
+                                                      variable_symbol_dictionary,
+                                                      False,
+                                                      column_order)
+                    else:
+                        output_file.write(body)
                     bound = constraint_data.upper
                     bound = self._get_bound(bound) - offset
                     if bound != 0:
@@ -15,7 +15,7 @@ import logging
 import math
 import operator
 
-from six import iteritems, iterkeys, StringIO
+from six import iteritems, iterkeys, itervalues, StringIO
 from six.moves import xrange
 
 from pyutilib.math import infinity
@@ -32,9 +32,23 @@ from pyomo.core.base import \
 from pyomo.repn import (generate_canonical_repn,
                         canonical_degree,
                         LinearCanonicalRepn)
+from pyomo.repn.plugins.row_cache import get_row_cache
 
 logger = logging.getLogger('pyomo.core')
 
+class _ColumnCollector(object):
+    """
+    A stand-in for the list of sparse columns that records the entries
+    extracted for a single row in a dictionary keyed by column.
+    """
+    __slots__ = ('_columns',)
+
+    def __init__(self, columns):
+        self._columns = columns
+
+    def __getitem__(self, column):
+        return self._columns.setdefault(column, [])
+
 class ProblemWriter_mps(AbstractProblemWriter):
 
     pyomo.util.plugin.alias('mps', 'Generate the corresponding MPS file')
@@ -119,6 +133,12 @@ class ProblemWriter_mps(AbstractProblemWriter):
         skip_objective_sense = \
             io_options.pop("skip_objective_sense", False)
 
+        # Keep the coefficients extracted for each constraint on the
+        # model between writes, and reuse them on the next write for
+        # any constraint whose canonical representation has not been
+        # regenerated since (see pyomo.repn.plugins.row_cache).
+        cache_rows = io_options.pop("cache_rows", False)
+
         if len(io_options):
             raise ValueError(
                 "ProblemWriter_mps passed unrecognized io_options:\n\t" +
@@ -134,6 +154,11 @@ class ProblemWriter_mps(AbstractProblemWriter):
         elif labeler is None:
             labeler = NumericLabeler('x')
 
+        if cache_rows and (column_order is not None):
+            raise ValueError("ProblemWriter_mps: The 'cache_rows' "
+                             "I/O option can not be used with a "
+                             "user-defined 'column_order'")
+
         # clear the collection of referenced variables.
         self._referenced_variable_ids.clear()
 
@@ -160,7 +185,8 @@ class ProblemWriter_mps(AbstractProblemWriter):
                     skip_trivial_constraints=skip_trivial_constraints,
                     force_objective_constant=force_objective_constant,
                     include_all_variable_bounds=include_all_variable_bounds,
-                    skip_objective_sense=skip_objective_sense)
+                    skip_objective_sense=skip_objective_sense,
+                    cache_rows=cache_rows)
 
         self._referenced_variable_ids.clear()
 
@@ -233,6 +259,70 @@ class ProblemWriter_mps(AbstractProblemWriter):
 
         return constant
 
+    def _get_cached_row(self,
+                        row_cache,
+                        constraint_data,
+                        canonical_repn,
+                        variable_to_column):
+        """
+        Return the (label-independent) column entries extracted for a
+        constraint, reusing those stored in the row cache when the
+        constraint has the same canonical representation as on the
+        last write.
+        """
+        entry = row_cache.lookup(constraint_data, canonical_repn)
+        if entry is None:
+            # collect the variables referenced by this row separately,
+            # so they can be restored when the cached entry is reused
+            referenced_variable_ids = self._referenced_variable_ids
+            self._referenced_variable_ids = {}
+            column_data = {}
+            quadratic_data = []
+            try:
+                constant = self._extract_variable_coefficients(
+                    None,
+                    canonical_repn,
+                    _ColumnCollector(column_data),
+                    quadratic_data,
+                    variable_to_column)
+                variables = tuple(itervalues(self._referenced_variable_ids))
+            finally:
+                referenced_variable_ids.update(self._referenced_variable_ids)
+                self._referenced_variable_ids = referenced_variable_ids
+            quad_terms = None
+            if len(quadratic_data):
+                assert len(quadratic_data) == 1
+                quad_terms = quadratic_data[0][1]
+            entry = (canonical_repn,
+                     tuple((column, coef)
+                           for column, ((row_label, coef),)
+                           in iteritems(column_data)),
+                     quad_terms,
+                     constant,
+                     variables)
+            row_cache.store(constraint_data, entry)
+        else:
+            referenced_variable_ids = self._referenced_variable_ids
+            for vardata in entry[4]:
+                referenced_variable_ids[id(vardata)] = vardata
+        return entry
+
+    def _append_cached_row(self,
+                           row_label,
+                           cached_row,
+                           column_data,
+                           quadratic_data):
+        """
+        Add the column entries for a cached constraint row under the
+        given row label and return the constant part of the body.
+        """
+        repn, linear, quad_terms, constant, variables = cached_row
+        for column, coef in linear:
+            column_data[column].append((row_label, coef))
+        if quad_terms is not None:
+            quadratic_data.append((row_label, quad_terms))
+        return constant
+
     def _printSOS(self,
                   symbol_map,
                   labeler,
@@ -276,7 +366,8 @@ class ProblemWriter_mps(AbstractProblemWriter):
                          skip_trivial_constraints=False,
                          force_objective_constant=False,
                          include_all_variable_bounds=False,
-                         skip_objective_sense=False):
+                         skip_objective_sense=False,
+                         cache_rows=False):
 
         symbol_map = SymbolMap()
         variable_symbol_map = SymbolMap()
@@ -339,6 +430,11 @@ class ProblemWriter_mps(AbstractProblemWriter):
         # constraint rhs
         rhs_data = []
 
+        row_cache = None
+        if cache_rows:
+            row_cache = get_row_cache(model, '_mps_row_cache')
+            row_cache.validate((dict(variable_symbol_dictionary),))
+
         # print the model name and the source, so we know
         # roughly where
         output_file.write("* Source:     Pyomo MPS Writer\n")
@@ -486,16 +582,29 @@ class ProblemWriter_mps(AbstractProblemWriter):
                                             constraint_data,
                                             labeler)
 
+            if row_cache is not None:
+                cached_row = self._get_cached_row(row_cache,
+                                                  constraint_data,
+                                                  canonical_repn,
+                                                  variable_to_column)
+
             if constraint_data.equality:
                 label = 'c_e_' + con_symbol + '_'
                 alias_symbol_func(symbol_map, constraint_data, label)
                 output_file.write(" E  %s\n" % (label))
-                offset = extract_variable_coefficients(
-                    label,
-                    canonical_repn,
-                    column_data,
-                    quadmatrix_data,
-                    variable_to_column)
+                if row_cache is None:
+                    offset = extract_variable_coefficients(
+                        label,
+                        canonical_repn,
+                        column_data,
+                        quadmatrix_data,
+                        variable_to_column)
+                else:
+                    offset = self._append_cached_row(
+                        label,
+                        cached_row,
+                        column_data,
+                        quadmatrix_data)
                 bound = constraint_data.lower
                 bound = self._get_bound(bound) - offset
                 rhs_data.append((label, bound))
@@ -507,12 +616,19 @@ class ProblemWriter_mps(AbstractProblemWriter):
                         label = 'c_l_' + con_symbol + '_'
                     alias_symbol_func(symbol_map, constraint_data, label)
                     output_file.write(" G  %s\n" % (label))
-                    offset = extract_variable_coefficients(
-                        label,
-                        canonical_repn,
-                        column_data,
-                        quadmatrix_data,
-                        variable_to_column)
+                    if row_cache is None:
+                        offset = extract_variable_coefficients(
+                            label,
+                            canonical_repn,
+                            column_data,
+                            quadmatrix_data,
+                            variable_to_column)
+                    else:
+                        offset = self._append_cached_row(
+                            label,
+                            cached_row,
+                            column_data,
+                            quadmatrix_data)
                     bound = constraint_data.lower
                     bound = self._get_bound(bound) - offset
                     rhs_data.append((label, bound))
@@ -523,12 +639,19 @@ class ProblemWriter_mps(AbstractProblemWriter):
                         label = 'c_u_' + con_symbol + '_'
                     alias_symbol_func(symbol_map, constraint_data, label)
                     output_file.write(" L  %s\n" % (label))
-                    offset = extract_variable_coefficients(
-                        label,
-                        canonical_repn,
-                        column_data,
-                        quadmatrix_data,
-                        variable_to_column)
+                    if row_cache is None:
+                        offset = extract_variable_coefficients(
+                            label,
+                            canonical_repn,
+                            column_data,
+                            quadmatrix_data,
+                            variable_to_column)
+                    else:
+                        offset = self._append_cached_row(
+                            label,
+                            cached_row,
+                            column_data,
+                            quadmatrix_data)
                     bound = constraint_data.upper
                     bound = self._get_bound(bound) - offset
                     rhs_data.append((label, bound))
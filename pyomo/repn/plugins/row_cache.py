@@ -0,0 +1,125 @@
+#  _________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright (c) 2014 Sandia Corporation.
+#  Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+#  the U.S. Government retains certain rights in this software.
+#  This software is distributed under the BSD License.
+#  _________________________________________________________________________
+
+#
+# Per-constraint output cache shared by the LP and MPS writers
+#
+
+__all__ = ['RowCache', 'get_row_cache', 'invalidate_row_cache']
+
+from pyomo.core.base import ComponentMap
+from pyomo.repn.canonical_repn import LinearCanonicalRepn
+
+#
+# The names of the attributes used to store the row caches on a
+# model. These are removed when a block is pickled (see
+# _BlockData.__getstate__).
+#
+_row_cache_attributes = ('_cpxlp_row_cache', '_mps_row_cache')
+
+class RowCache(object):
+    """
+    A cache of the (label-independent) output generated for each
+    constraint by a problem writer, stored on the model between
+    successive writes.
+
+    Each entry is keyed by the constraint data object and records the
+    canonical representation it was generated from. An entry is only
+    reused when the writer obtains the *same* representation object
+    for the constraint on a later write, i.e., when the block-level
+    _canonical_repn is reused (_gen_con_canonical_repn=False) and the
+    constraint has not been preprocessed again since. Constraint
+    bounds are always re-evaluated by the writer.
+
+    The rows of a MatrixConstraint are their own canonical
+    representation, so the identity test above can not detect changes
+    to them (e.g., fixed variables). These rows are never cached.
+
+    The entire cache is discarded when the writer options or the
+    variable labels change between writes.
+    """
+
+    __slots__ = ('key', 'rows', 'hits', 'misses')
+
+    def __init__(self):
+        self.key = None
+        self.rows = ComponentMap()
+        self.hits = 0
+        self.misses = 0
+
+    def validate(self, key):
+        """
+        Discard all cached rows if they were generated using a
+        different key (writer options and variable labels).
+        """
+        self.hits = 0
+        self.misses = 0
+        if self.key != key:
+            self.key = key
+            self.rows = ComponentMap()
+
+    def lookup(self, constraint_data, canonical_repn):
+        """
+        Return the cached entry for a constraint if it was generated
+        from the given canonical representation, or None.
+        """
+        if isinstance(constraint_data, LinearCanonicalRepn):
+            self.misses += 1
+            return None
+        entry = self.rows.get(constraint_data)
+        if (entry is not None) and (entry[0] is canonical_repn):
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def store(self, constraint_data, entry):
+        if isinstance(constraint_data, LinearCanonicalRepn):
+            return
+        self.rows[constraint_data] = entry
+
+    def invalidate(self, constraint_data=None):
+        """
+        Mark a single constraint (or every constraint, if None) as
+        changed so that its output is regenerated on the next write.
+        """
+        if constraint_data is None:
+            self.key = None
+            self.rows = ComponentMap()
+            return
+        if constraint_data.is_indexed():
+            constraint_data = constraint_data.values()
+        else:
+            constraint_data = (constraint_data,)
+        rows = self.rows
+        for cdata in constraint_data:
+            if cdata in rows:
+                del rows[cdata]
+
+def get_row_cache(model, name):
+    """
+    Return the row cache with the given attribute name stored on a
+    model, creating it if necessary.
+    """
+    assert name in _row_cache_attributes
+    row_cache = getattr(model, name, None)
+    if row_cache is None:
+        row_cache = RowCache()
+        setattr(model, name, row_cache)
+    return row_cache
+
+def invalidate_row_cache(model, constraint=None):
+    """
+    Invalidate the LP and MPS writer row caches stored on a model,
+    either completely or for a single (possibly indexed) constraint.
+    """
+    for name in _row_cache_attributes:
+        row_cache = getattr(model, name, None)
+        if row_cache is not None:
+            row_cache.invalidate(constraint)
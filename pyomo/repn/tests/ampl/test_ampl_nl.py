@@ -0,0 +1,91 @@
+#  _________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright (c) 2014 Sandia Corporation.
+#  Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+#  the U.S. Government retains certain rights in this software.
+#  This software is distributed under the BSD License.
+#  _________________________________________________________________________
+#
+# Test the io_options of the NL writer
+#
+
+import os
+from os.path import abspath, dirname, join
+currdir = dirname(abspath(__file__))
+
+import pyutilib.th as unittest
+
+from pyomo.opt import ProblemFormat
+from pyomo.core import *
+
+def _generate_model():
+    model = ConcreteModel()
+    model.s = RangeSet(5)
+    model.x = Var(model.s, bounds=(0,None), initialize=1.0)
+    model.y = Var(within=Binary)
+    model.obj = Objective(expr=summation(model.x) + model.y**2)
+    model.c = Constraint(model.s,
+                         rule=lambda m,i: 2*m.x[i] + m.y >= i)
+    model.nl = Constraint(expr=model.x[2]*model.x[3] + \
+                               exp(model.x[4]) + model.x[2] <= 10)
+    model.r = Constraint(expr=(-1, model.x[1] - model.x[5], 1))
+    return model
+
+class TestNLWriter(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        import pyomo.environ
+
+    def _write(self, model, name, **io_options):
+        model.write(filename=join(currdir, name),
+                    format=ProblemFormat.nl,
+                    io_options=io_options)
+        return join(currdir, name)
+
+    def test_store_ampl_repn(self):
+        model = _generate_model()
+        baseline = self._write(model, "store_ampl_repn.baseline.nl")
+        self.assertEqual(len(model._ampl_repn), 8)
+        del model._ampl_repn
+
+        model = _generate_model()
+        test = self._write(model, "store_ampl_repn.test.nl",
+                           store_ampl_repn=False)
+        self.assertEqual(len(model._ampl_repn), 0)
+        self.assertFileEqualsBaseline(test, baseline)
+        os.remove(baseline)
+
+    def test_store_ampl_repn_reuse(self):
+        model = _generate_model()
+        baseline = self._write(model, "store_ampl_repn.baseline.nl")
+        # reuse the cached representations (as PySP does)
+        model._gen_obj_ampl_repn = False
+        model._gen_con_ampl_repn = False
+        test = self._write(model, "store_ampl_repn.test.nl",
+                           store_ampl_repn=False)
+        self.assertFileEqualsBaseline(test, baseline)
+        os.remove(baseline)
+
+    def test_store_ampl_repn_stale(self):
+        model = _generate_model()
+        baseline = self._write(model, "store_ampl_repn.baseline.nl")
+        self.assertEqual(len(model._ampl_repn), 8)
+        # the representations stored by the first write are removed
+        test = self._write(model, "store_ampl_repn.test.nl",
+                           store_ampl_repn=False)
+        self.assertEqual(len(model._ampl_repn), 0)
+        self.assertFileEqualsBaseline(test, baseline)
+        os.remove(baseline)
+        model._gen_obj_ampl_repn = False
+        model._gen_con_ampl_repn = False
+        self.assertRaises(KeyError,
+                          self._write,
+                          model,
+                          "store_ampl_repn.test.nl",
+                          store_ampl_repn=False)
+        os.remove(join(currdir, "store_ampl_repn.test.nl"))
+
+if __name__ == "__main__":
+    unittest.main()
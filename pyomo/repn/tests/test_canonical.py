@@ -18,6 +18,7 @@ import pyutilib.th as unittest
 import pyutilib.services
 
 from pyomo.core.base.expr import Expr_if
+import pyomo.core.base.expr_common as common
 from pyomo.repn import *
 from pyomo.environ import *
 
@@ -643,5 +644,96 @@ class Test(unittest.TestCase):
         self.assertTrue(isinstance(rep, GeneralCanonicalRepn) == True)
         self.assertEqual(canonical_degree(rep), None)
 
+    def test_linear_repn_slots(self):
+        m = ConcreteModel()
+        m.x = Var()
+        rep = generate_canonical_repn(2*m.x + 1)
+        self.assertTrue(isinstance(rep, LinearCanonicalRepn))
+        self.assertFalse(hasattr(rep, '__dict__'))
+
+def _template_model():
+    model = ConcreteModel()
+    model.s = RangeSet(4)
+    model.x = Var(model.s, initialize=2)
+    model.y = Var(model.s, initialize=3)
+    model.p = Param(model.s, initialize=lambda m, i: 1.0/i, mutable=True)
+    model.q = Param(model.s, initialize=lambda m, i: i)
+    model.e = Expression(model.s, rule=lambda m, i: m.p[i]*m.y[i] + 1)
+    def c_rule(m, i):
+        return 3*m.p[i]*(m.x[i] - m.y[i]) + m.q[i]*m.x[i] \
+            + m.x[i]/(m.p[i] + 1) + m.e[i] - m.p[i] >= 0
+    model.c = Constraint(model.s, rule=c_rule)
+    return model
+
+class TestLinearTemplates(unittest.TestCase):
+
+    def tearDown(self):
+        set_linear_template_cache(True)
+
+    def _compare(self, model):
+        set_linear_template_cache(False)
+        idMap = {}
+        baseline = [generate_canonical_repn(model.c[i].body, idMap=idMap)
+                    for i in model.s]
+        set_linear_template_cache(True)
+        template_idMap = {}
+        repns = [generate_canonical_repn(model.c[i].body, idMap=template_idMap)
+                 for i in model.s]
+        self.assertEqual(idMap, template_idMap)
+        for rep, ans in zip(repns, baseline):
+            self.assertEqual(rep.variables, ans.variables)
+            self.assertEqual(rep.linear, ans.linear)
+            self.assertEqual(rep.constant, ans.constant)
+
+    def test_matches_collector(self):
+        model = _template_model()
+        self._compare(model)
+        import pyomo.repn.canonical_repn as canonical_repn
+        if common.mode is common.Mode.coopr3_trees:
+            self.assertEqual(len(canonical_repn._linear_templates), 1)
+            self.assertIsNotNone(
+                list(canonical_repn._linear_templates.values())[0])
+
+    def test_changed_values(self):
+        model = _template_model()
+        self._compare(model)
+        model.p[2] = 5
+        model.p[3] = 0.25
+        self._compare(model)
+
+    def test_fixed_variable(self):
+        model = _template_model()
+        self._compare(model)
+        model.x[2].fix(7)
+        model.y[3].fix(1)
+        self._compare(model)
+        model.x.fix(1)
+        self._compare(model)
+
+    def test_repeated_variable(self):
+        model = _template_model()
+        model.c[3].set_value(3*model.p[3]*(model.x[3] - model.x[3]) +
+                             model.q[3]*model.x[3] + model.x[3]/(model.p[3]+1) +
+                             model.e[3] - model.p[3] >= 0)
+        self._compare(model)
+
+    def test_zero_division(self):
+        model = _template_model()
+        self._compare(model)
+        model.p[4] = -1
+        set_linear_template_cache(True)
+        self.assertRaises(Exception,
+                          generate_canonical_repn, model.c[4].body)
+
+    def test_limit(self):
+        import pyomo.repn.canonical_repn as canonical_repn
+        set_linear_template_cache(True, limit=1)
+        model = _template_model()
+        for i in model.s:
+            generate_canonical_repn(model.c[i].body)
+            generate_canonical_repn(model.c[i].body + model.x[i])
+        self.assertEqual(len(canonical_repn._linear_templates), 1)
+        set_linear_template_cache(True, limit=1024)
+
 if __name__ == "__main__":
     unittest.main()
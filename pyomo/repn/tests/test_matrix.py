@@ -0,0 +1,175 @@
+#  _________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright (c) 2014 Sandia Corporation.
+#  Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+#  the U.S. Government retains certain rights in this software.
+#  This software is distributed under the BSD License.
+#  _________________________________________________________________________
+#
+# Test the linear constraint matrix compiler
+#
+
+import pyutilib.th as unittest
+
+from pyomo.core import *
+from pyomo.repn.beta.matrix import (compile_block_linear_constraints,
+                                    compile_linear_constraint_matrix,
+                                    MatrixConstraint)
+from pyomo.repn.compute_canonical_repn import preprocess_block_constraints
+
+try:
+    import numpy
+    numpy_available=True
+except ImportError:
+    numpy_available=False
+
+inf = float('inf')
+
+def _generate_model():
+    model = ConcreteModel()
+    model.x = Var([1,2,3], bounds=(0,None))
+    model.y = Var()
+    model.obj = Objective(expr=model.x[1])
+    model.c1 = Constraint(expr=2*model.x[2] + model.x[1] + 1 >= 3)
+    model.c2 = Constraint(expr=model.x[3] - model.y == 4)
+    model.c3 = Constraint(expr=(-1, model.y + 3*model.x[1], 5))
+    model.b = Block()
+    model.b.c = Constraint(expr=model.x[2] <= 6)
+    return model
+
+class TestLinearConstraintMatrix(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        import pyomo.environ
+
+    def _check(self, matrix):
+        self.assertEqual(matrix.shape, (4, 4))
+        self.assertEqual(matrix.nnz, 7)
+        self.assertEqual(list(matrix.indptr), [0, 2, 4, 6, 7])
+        self.assertEqual(list(matrix.indices), [0, 1, 2, 3, 3, 1, 0])
+        self.assertEqual(list(matrix.data), [2, 1, 1, -1, 1, 3, 1])
+        self.assertEqual(list(matrix.lb), [2, 4, -1, -inf])
+        self.assertEqual(list(matrix.ub), [inf, 4, 5, 6])
+
+    def test_compile(self):
+        model = _generate_model()
+        matrix = compile_linear_constraint_matrix(model)
+        self._check(matrix)
+        self.assertEqual([v.cname(True) for v in matrix.variables],
+                         ["x[2]", "x[1]", "x[3]", "y"])
+        for column, vardata in enumerate(matrix.variables):
+            self.assertEqual(matrix.variable_index[vardata], column)
+        self.assertEqual([c.cname(True) for c in matrix.constraints],
+                         ["c1", "c2", "c3", "b.c"])
+        indices, data = matrix.row(2)
+        self.assertEqual(list(indices), [3, 1])
+        self.assertEqual(list(data), [1, 3])
+        # the block is not modified
+        self.assertFalse(hasattr(model, "_canonical_repn"))
+        self.assertEqual(len(list(model.component_data_objects(Constraint))),
+                         4)
+
+    def test_numpy(self):
+        if not numpy_available:
+            self.skipTest("This test requires NumPy")
+        matrix = compile_linear_constraint_matrix(_generate_model())
+        self.assertTrue(isinstance(matrix.indptr, numpy.ndarray))
+        self.assertTrue(isinstance(matrix.indices, numpy.ndarray))
+        self.assertTrue(isinstance(matrix.data, numpy.ndarray))
+        self.assertEqual(matrix.data.dtype, numpy.float64)
+        self.assertEqual(matrix.lb.dtype, numpy.float64)
+
+    def test_descend_into(self):
+        model = _generate_model()
+        matrix = compile_linear_constraint_matrix(model, descend_into=False)
+        self.assertEqual(matrix.shape, (3, 4))
+        self.assertEqual([c.cname(True) for c in matrix.constraints],
+                         ["c1", "c2", "c3"])
+
+    def test_block_variables(self):
+        # the columns include the variables declared on sub-blocks,
+        # which are not components of the top-level block
+        model = _generate_model()
+        model.b.z = Var()
+        model.b.c2 = Constraint(expr=model.b.z + model.y >= 1)
+        matrix = compile_linear_constraint_matrix(model)
+        self.assertEqual([v.cname(True) for v in matrix.variables],
+                         ["x[2]", "x[1]", "x[3]", "y", "b.z"])
+        variables = ComponentMap(
+            (vardata, None) for vardata in model.component_data_objects(
+                Var, active=True, descend_into=True))
+        for vardata in matrix.variables:
+            self.assertTrue(vardata in variables)
+
+    def test_fixed(self):
+        model = _generate_model()
+        model.y.fix(2)
+        matrix = compile_linear_constraint_matrix(model)
+        self.assertEqual(matrix.shape, (4, 3))
+        self.assertEqual(list(matrix.indices), [0, 1, 2, 1, 0])
+        self.assertEqual(list(matrix.lb), [2, 6, -3, -inf])
+        self.assertEqual(list(matrix.ub), [inf, 6, 3, 6])
+
+    def test_trivial(self):
+        model = _generate_model()
+        model.x[2].fix(0)
+        matrix = compile_linear_constraint_matrix(model)
+        self.assertEqual(matrix.shape, (4, 3))
+        self.assertEqual(list(matrix.indptr), [0, 1, 3, 5, 5])
+        matrix = compile_linear_constraint_matrix(
+            model, skip_trivial_constraints=True)
+        self.assertEqual(matrix.shape, (3, 3))
+
+    def test_nonlinear(self):
+        model = _generate_model()
+        model.nl = Constraint(expr=model.x[1]*model.y <= 1)
+        self.assertRaises(ValueError, compile_linear_constraint_matrix, model)
+        matrix = compile_linear_constraint_matrix(
+            model, skip_nonlinear_constraints=True)
+        self._check(matrix)
+
+    def test_inactive(self):
+        model = _generate_model()
+        model.c3.deactivate()
+        matrix = compile_linear_constraint_matrix(model)
+        self.assertEqual([c.cname(True) for c in matrix.constraints],
+                         ["c1", "c2", "b.c"])
+        model.c3.activate()
+        model.b.deactivate()
+        matrix = compile_linear_constraint_matrix(model)
+        self.assertEqual([c.cname(True) for c in matrix.constraints],
+                         ["c1", "c2", "c3"])
+
+    def test_preprocessed(self):
+        model = _generate_model()
+        preprocess_block_constraints(model)
+        model._gen_con_canonical_repn = False
+        # the stored representation is used in place of the body
+        model._canonical_repn[model.c1] = \
+            model._canonical_repn[model.c2]
+        matrix = compile_linear_constraint_matrix(model)
+        self.assertEqual(list(matrix.indices[:2]), [0, 1])
+        self.assertEqual([v.cname(True) for v in matrix.variables[:2]],
+                         ["x[3]", "y"])
+
+    def test_matrix_constraint(self):
+        model = _generate_model()
+        baseline = compile_linear_constraint_matrix(model)
+        compile_block_linear_constraints(model, "_matrix")
+        self.assertTrue(isinstance(model._matrix, MatrixConstraint))
+        matrix = compile_linear_constraint_matrix(model)
+        self.assertEqual(matrix.shape, baseline.shape)
+        self.assertEqual(list(matrix.lb), list(baseline.lb))
+        self.assertEqual(list(matrix.ub), list(baseline.ub))
+        for i in range(matrix.shape[0]):
+            self.assertEqual(
+                sorted((matrix.variables[j].cname(True), a)
+                       for j, a in zip(*matrix.row(i))),
+                sorted((baseline.variables[j].cname(True), a)
+                       for j, a in zip(*baseline.row(i))))
+        self.assertFalse(hasattr(model._matrix[0], '__dict__'))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,193 @@
+#  _________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright (c) 2014 Sandia Corporation.
+#  Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+#  the U.S. Government retains certain rights in this software.
+#  This software is distributed under the BSD License.
+#  _________________________________________________________________________
+#
+# Test the parallel mode of preprocess_block_constraints
+#
+
+import os
+from os.path import abspath, dirname, join
+currdir = dirname(abspath(__file__))
+
+import pyutilib.th as unittest
+
+from pyomo.opt import ProblemFormat
+from pyomo.core import *
+import pyomo.repn.compute_canonical_repn as compute_canonical_repn
+import pyomo.repn.compute_ampl_repn as compute_ampl_repn
+import pyomo.repn.parallel_repn as parallel_repn
+from pyomo.util import fork_available, PyomoAPIFactory
+
+def c_rule(model, i):
+    return model.p[i]*model.x[i] + 2*model.y - model.b.z >= i
+
+def nl_rule(model, i):
+    return model.x[i]*model.y + model.x[i]**2 <= 10
+
+def _generate_model():
+    model = ConcreteModel()
+    model.s = RangeSet(50)
+    model.p = Param(model.s, initialize=lambda m, i: 1.0/i, mutable=True)
+    model.x = Var(model.s, bounds=(0,10), initialize=1)
+    model.y = Var(initialize=2)
+    model.b = Block()
+    model.b.z = Var()
+    model.b.c = Constraint(expr=model.b.z + model.y >= 0)
+    model.obj = Objective(expr=summation(model.x) + model.y)
+    model.c = Constraint(model.s, rule=c_rule)
+    model.nl = Constraint(RangeSet(5), rule=nl_rule)
+    model.fixed = Constraint(expr=model.x[1] + model.x[2] == 3)
+    model.empty = Constraint(expr=model.x[3] - model.x[3] <= 0)
+    model.x[2].fix(1)
+    return model
+
+class _ParallelRepnTests(object):
+
+    @classmethod
+    def setUpClass(cls):
+        import pyomo.environ
+
+    def setUp(self):
+        if not fork_available():
+            self.skipTest("This test requires os.fork")
+
+    def _preprocess(self, model, processes):
+        idMap = {}
+        self.module.preprocess_block_constraints(model,
+                                                 idMap=idMap,
+                                                 processes=processes)
+        self.module.preprocess_block_objectives(model, idMap=idMap)
+        setattr(model, self.gen_con_flag, False)
+        setattr(model, self.gen_obj_flag, False)
+        return idMap
+
+    def _write(self, model, name):
+        filename = join(currdir, name+"."+self.suffix)
+        model.write(filename=filename, format=self.format)
+        with open(filename) as f:
+            ans = f.read()
+        os.remove(filename)
+        return ans
+
+    def test_same_repns(self):
+        # the order of the terms in a repn may differ, as it depends
+        # on the keys in the idMap
+        serial = _generate_model()
+        parallel = _generate_model()
+        serial_idMap = self._preprocess(serial, None)
+        parallel_idMap = self._preprocess(parallel, 3)
+        serial_repn = getattr(serial, self.repn_name)
+        parallel_repn = getattr(parallel, self.repn_name)
+        self.assertEqual(len(serial_repn), len(parallel_repn))
+        for cdata in serial.component_data_objects(Constraint,
+                                                   active=True,
+                                                   descend_into=False):
+            other = parallel.find_component(cdata.cname(True))
+            self.assertEqual(self._repn_data(serial_repn[cdata]),
+                             self._repn_data(parallel_repn[other]))
+        self.assertEqual(len(serial_idMap), len(parallel_idMap))
+
+    def test_same_file(self):
+        serial = _generate_model()
+        parallel = _generate_model()
+        self._preprocess(serial, None)
+        self._preprocess(parallel, 4)
+        self.assertEqual(self._write(parallel, "parallel_repn_test"),
+                         self._write(serial, "parallel_repn_baseline"))
+
+    def test_process_count(self):
+        baseline = _generate_model()
+        self._preprocess(baseline, 2)
+        baseline = self._write(baseline, "parallel_repn_baseline")
+        for processes in (3, 7, 60):
+            model = _generate_model()
+            self._preprocess(model, processes)
+            self.assertEqual(self._write(model, "parallel_repn_test"),
+                             baseline)
+
+    def test_one_pool_per_model(self):
+        # the constraints of all blocks are generated by one pool
+        serial = _generate_model()
+        parallel = _generate_model()
+        PyomoAPIFactory(self.api)({}, model=serial)
+        pools = []
+        def _create_pool(processes):
+            pools.append(processes)
+            return create_pool(processes)
+        create_pool = parallel_repn._create_pool
+        parallel_repn._create_pool = _create_pool
+        try:
+            PyomoAPIFactory(self.api)({}, model=parallel, processes=3)
+        finally:
+            parallel_repn._create_pool = create_pool
+        self.assertEqual(pools, [3])
+        for model in (serial, parallel):
+            setattr(model, self.gen_con_flag, False)
+            setattr(model, self.gen_obj_flag, False)
+            setattr(model.b, self.gen_con_flag, False)
+            setattr(model.b, self.gen_obj_flag, False)
+        self.assertEqual(self._write(parallel, "parallel_repn_test"),
+                         self._write(serial, "parallel_repn_baseline"))
+
+    def test_model_constraints(self):
+        serial = _generate_model()
+        parallel = _generate_model()
+        self.module.preprocess_model_constraints(serial, idMap={})
+        self.module.preprocess_model_constraints(parallel,
+                                                 idMap={},
+                                                 processes=2)
+        for cdata in serial.component_data_objects(Constraint, active=True):
+            other = parallel.find_component(cdata.cname(True))
+            block = cdata.parent_block()
+            other_block = other.parent_block()
+            self.assertEqual(
+                self._repn_data(getattr(block, self.repn_name)[cdata]),
+                self._repn_data(getattr(other_block, self.repn_name)[other]))
+
+    def test_error(self):
+        model = _generate_model()
+        model.bad = Constraint(expr=model.y/(model.p[1] - 1) >= 0)
+        self.assertRaises(Exception, self._preprocess, model, 2)
+
+class TestParallelCanonicalRepn(_ParallelRepnTests, unittest.TestCase):
+    module = compute_canonical_repn
+    api = 'pyomo.repn.compute_canonical_repn'
+    repn_name = "_canonical_repn"
+    gen_con_flag = "_gen_con_canonical_repn"
+    gen_obj_flag = "_gen_obj_canonical_repn"
+    format = ProblemFormat.cpxlp
+    suffix = "lp"
+
+    def _repn_data(self, repn):
+        if isinstance(repn, dict):
+            return str(repn)
+        terms = None
+        if repn.variables is not None:
+            terms = sorted((v.cname(True), coef) for v, coef
+                           in zip(repn.variables, repn.linear))
+        return (repn.constant, terms)
+
+class TestParallelAmplRepn(_ParallelRepnTests, unittest.TestCase):
+    module = compute_ampl_repn
+    api = 'pyomo.repn.compute_ampl_repn'
+    repn_name = "_ampl_repn"
+    gen_con_flag = "_gen_con_ampl_repn"
+    gen_obj_flag = "_gen_obj_ampl_repn"
+    format = ProblemFormat.nl
+    suffix = "nl"
+
+    def _repn_data(self, repn):
+        return (repn._constant,
+                sorted((v.cname(True), coef) for v, coef
+                       in zip(repn._linear_vars, repn._linear_terms_coef)),
+                str(repn._nonlinear_expr) if repn._nonlinear_expr is None \
+                    else [(c, str(e)) for c, e in repn._nonlinear_expr],
+                [v.cname(True) for v in repn._nonlinear_vars])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+#  _________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright (c) 2014 Sandia Corporation.
+#  Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+#  the U.S. Government retains certain rights in this software.
+#  This software is distributed under the BSD License.
+#  _________________________________________________________________________
+#
+# Test the row cache used by the LP and MPS writers
+#
+
+import os
+from os.path import abspath, dirname, join
+currdir = dirname(abspath(__file__))
+
+import pyutilib.th as unittest
+
+from pyomo.opt import ProblemFormat
+from pyomo.core import *
+from pyomo.repn.compute_canonical_repn import preprocess_constraint_data
+from pyomo.repn.plugins.row_cache import invalidate_row_cache
+from pyomo.repn.beta.matrix import compile_block_linear_constraints
+
+def rhs_rule(model, i):
+    return i
+
+def c_rule(model, i):
+    return model.a*model.x[i] + model.y >= model.rhs[i]
+
+def _generate_model():
+    model = ConcreteModel()
+    model.s = RangeSet(4)
+    model.rhs = Param(model.s, initialize=rhs_rule, mutable=True)
+    model.a = Param(initialize=2.0, mutable=True)
+    model.x = Var(model.s, bounds=(0,10))
+    model.y = Var()
+    model.obj = Objective(expr=summation(model.x) + model.y)
+    model.c = Constraint(model.s, rule=c_rule)
+    model.r = Constraint(expr=(-1, model.x[1] - model.x[4], 1))
+    model.q = Constraint(expr=model.x[2]**2 + model.y <= 4)
+    return model
+
+class _RowCacheTests(object):
+
+    def _write(self, model, name, **io_options):
+        filename = join(currdir, name+"."+self.suffix)
+        model.write(filename=filename,
+                    format=self.format,
+                    io_options=io_options)
+        with open(filename) as f:
+            ans = f.read()
+        os.remove(filename)
+        return ans
+
+    def _row_cache(self, model):
+        return getattr(model, self.cache_name)
+
+    def test_reuse(self):
+        model = _generate_model()
+        baseline = self._write(model, "row_cache_baseline")
+        self.assertEqual(
+            self._write(model, "row_cache_test", cache_rows=True),
+            baseline)
+        self.assertEqual(self._row_cache(model).misses, 6)
+
+        model._gen_con_canonical_repn = False
+        self.assertEqual(
+            self._write(model, "row_cache_test", cache_rows=True),
+            baseline)
+        self.assertEqual(self._row_cache(model).hits, 6)
+        self.assertEqual(self._row_cache(model).misses, 0)
+
+    def test_changed_bounds(self):
+        model = _generate_model()
+        self._write(model, "row_cache_test", cache_rows=True)
+        model._gen_con_canonical_repn = False
+        model.rhs[2] = 5
+        model.r.set_value((-2, model.x[1] - model.x[4], 2))
+        test = self._write(model, "row_cache_test", cache_rows=True)
+        self.assertEqual(self._row_cache(model).misses, 0)
+
+        model._gen_con_canonical_repn = True
+        self.assertEqual(self._write(model, "row_cache_baseline"), test)
+
+    def test_changed_body(self):
+        model = _generate_model()
+        self._write(model, "row_cache_test", cache_rows=True)
+        model._gen_con_canonical_repn = False
+        model.c[3].set_value(3*model.x[3] + model.y >= model.rhs[3])
+        preprocess_constraint_data(model, model.c[3])
+        test = self._write(model, "row_cache_test", cache_rows=True)
+        self.assertEqual(self._row_cache(model).hits, 5)
+        self.assertEqual(self._row_cache(model).misses, 1)
+        model._gen_con_canonical_repn = True
+        self.assertEqual(self._write(model, "row_cache_baseline"), test)
+
+    def test_deactivate(self):
+        model = _generate_model()
+        self._write(model, "row_cache_test", cache_rows=True)
+        model._gen_con_canonical_repn = False
+        model.c[2].deactivate()
+        test = self._write(model, "row_cache_test", cache_rows=True)
+        self.assertEqual(self._row_cache(model).hits, 5)
+        model._gen_con_canonical_repn = True
+        self.assertEqual(self._write(model, "row_cache_baseline"), test)
+
+    def test_new_variable(self):
+        model = _generate_model()
+        self._write(model, "row_cache_test", cache_rows=True)
+        model._gen_con_canonical_repn = False
+        # changes the numeric variable labels
+        model.z = Var()
+        model.obj.set_value(model.obj.expr + model.z)
+        test = self._write(model, "row_cache_test", cache_rows=True)
+        self.assertEqual(self._row_cache(model).hits, 0)
+        model._gen_con_canonical_repn = True
+        self.assertEqual(self._write(model, "row_cache_baseline"), test)
+
+    def test_invalidate(self):
+        model = _generate_model()
+        self._write(model, "row_cache_test", cache_rows=True)
+        model._gen_con_canonical_repn = False
+        invalidate_row_cache(model, model.c)
+        self._write(model, "row_cache_test", cache_rows=True)
+        self.assertEqual(self._row_cache(model).hits, 2)
+        self.assertEqual(self._row_cache(model).misses, 4)
+        invalidate_row_cache(model)
+        self._write(model, "row_cache_test", cache_rows=True)
+        self.assertEqual(self._row_cache(model).hits, 0)
+
+    def test_matrix_fixed_variable(self):
+        # the rows of a MatrixConstraint are their own canonical
+        # representation, so they can not be reused from the cache
+        model = _generate_model()
+        model.del_component(model.q)
+        compile_block_linear_constraints(model, "_matrix")
+        baseline = self._write(model, "row_cache_baseline")
+        self.assertEqual(
+            self._write(model, "row_cache_test", cache_rows=True),
+            baseline)
+        model.x[2].fix(3)
+        test = self._write(model, "row_cache_test", cache_rows=True)
+        self.assertEqual(self._write(model, "row_cache_baseline"), test)
+        self.assertNotEqual(test, baseline)
+
+    def test_column_order(self):
+        model = _generate_model()
+        column_order = ComponentMap(
+            (v, i) for i, v in enumerate(model.component_data_objects(Var)))
+        self.assertRaises(ValueError,
+                          model.write,
+                          filename=join(currdir, "row_cache_test"),
+                          format=self.format,
+                          io_options={'cache_rows': True,
+                                      'column_order': column_order})
+
+    def test_pickle(self):
+        import pickle
+        model = _generate_model()
+        self._write(model, "row_cache_test", cache_rows=True)
+        self.assertTrue(hasattr(model, self.cache_name))
+        model = pickle.loads(pickle.dumps(model))
+        self.assertFalse(hasattr(model, self.cache_name))
+
+class TestLPRowCache(_RowCacheTests, unittest.TestCase):
+    format = ProblemFormat.cpxlp
+    suffix = "lp"
+    cache_name = "_cpxlp_row_cache"
+
+    @classmethod
+    def setUpClass(cls):
+        import pyomo.environ
+
+class TestMPSRowCache(_RowCacheTests, unittest.TestCase):
+    format = ProblemFormat.mps
+    suffix = "mps"
+    cache_name = "_mps_row_cache"
+
+    @classmethod
+    def setUpClass(cls):
+        import pyomo.environ
+
+if __name__ == "__main__":
+    unittest.main()
@@ -118,7 +118,10 @@ class PyomoMIPWorker(pyutilib.pyro.TaskWorker):
         # support user defined types (e.g., the results object).
         # Therefore, we pickle the results object before sending it
         # over the wire so the user does not need to change the Pyro
-        # serializer.
+        # serializer. The solution data is stored as arrays first,
+        # which makes the pickled results much smaller and faster to
+        # load.
+        results.compact()
         results = pickle.dumps(results, protocol=pickle.HIGHEST_PROTOCOL)
 
         if using_pyro4:
@@ -14,12 +14,14 @@ import pyomo.solvers.plugins.solvers.CBCplugin
 import pyomo.solvers.plugins.solvers.GLPK
 import pyomo.solvers.plugins.solvers.GLPK_old
 import pyomo.solvers.plugins.solvers.glpk_direct
+import pyomo.solvers.plugins.solvers.glpk_persistent
 import pyomo.solvers.plugins.solvers.CPLEX
 import pyomo.solvers.plugins.solvers.CPLEXDirect
 import pyomo.solvers.plugins.solvers.CPLEXPersistent
 import pyomo.solvers.plugins.solvers.GUROBI
 import pyomo.solvers.plugins.solvers.BARON
 import pyomo.solvers.plugins.solvers.gurobi_direct
+import pyomo.solvers.plugins.solvers.gurobi_persistent
 import pyomo.solvers.plugins.solvers.ASL
 import pyomo.solvers.plugins.solvers.pywrapper
 import pyomo.solvers.plugins.solvers.SCIPAMPL
@@ -41,6 +41,10 @@ from pyomo.opt.base.solvers import _extract_version
 from pyomo.opt.results import *
 from pyomo.opt.solver import *
 from pyomo.core.base.numvalue import value
+from pyomo.core.base import ComponentMap
+from pyomo.repn.beta.matrix import compile_linear_constraint_matrix
+
+from six.moves import xrange
 
 import logging
 logger = logging.getLogger('pyomo.solvers')
@@ -133,10 +137,16 @@ class GLPKDirect ( OptSolver ):
         sense = GLP_MAX
         if objective.is_minimizing(): sense = GLP_MIN
 
-        constraint_list = model.component_map(Constraint, active=True)
-        variable_list   = model.component_map(Var, active=True)
-        num_constraints = model.statistics.number_of_constraints
-        num_variables   = model.statistics.number_of_variables
+        # The columns are the unfixed variables on the model and all
+        # of its sub-blocks, as the constraint rows (in CSR format)
+        # include the constraints on the sub-blocks. Constraints that
+        # were compiled into a MatrixConstraint are copied directly.
+        variable_list   = [var for var in model.component_data_objects(
+                               Var, active=True, descend_into=True)
+                           if not var.fixed]
+        num_variables   = len(variable_list)
+        constraint_matrix = compile_linear_constraint_matrix(model)
+        num_constraints = constraint_matrix.shape[0]
 
         sosn = self._capabilities.sosn
         sos1 = self._capabilities.sos1
@@ -152,7 +162,7 @@ class GLPKDirect ( OptSolver ):
         glp_add_cols( lp, num_variables )
 
         # 1 extra because GLPK's arrays in this context are 1-based, not 0-based
-        coef_count = num_constraints * num_variables + 1
+        coef_count = constraint_matrix.nnz + 1
         Ai = intArray( coef_count )
         Aj = intArray( coef_count )
         Ar = doubleArray( coef_count )
@@ -160,46 +170,80 @@ class GLPKDirect ( OptSolver ):
         row = col = coef_count = 0
         colvar_map = dict()
         rowvar_map = dict()
+        # the column of each variable data object
+        var_col = ComponentMap()
 
         # In matrix parlance, variables are columns
-        for name in variable_list:
-            var_set = variable_list[ name ]
-            for ii in var_set:
-                var = var_set[ ii ]
-                if var.fixed is True:
-                    continue
-
-                lb = ub = 0.0
-                if var.lb is None and var.ub is None:
-                    var_type = GLP_FR
-                elif var.lb is None:
-                    var_type = GLP_UB
-                    ub = value(var.ub)
-                elif var.ub is None:
-                    var_type = GLP_LO
-                    lb = value(var.lb)
-                else:
-                    var_type = GLP_DB
-                    lb = value(var.lb)
-                    ub = value(var.ub)
-
-                col += 1
-                colvar_map[ var.label ] = col
-
-                # the name is perhaps not necessary, but for completeness ...
-                glp_set_col_name( lp, col, var.label )
-                glp_set_col_bnds( lp, col, var_type, lb, ub )
-
-                # Be sure to impart the integer and binary nature of any variables
-                if var.is_integer():
-                    glp_set_col_kind( lp, col, GLP_IV )
-                elif var.is_binary():
-                    glp_set_col_kind( lp, col, GLP_BV )
-                elif var.is_continuous():
-                    glp_set_col_kind( lp, col, GLP_CV )   # continuous
-                else:
-                    raise TypeError("Invalid domain type for variable with name '%s'. "
-                                    "Variable is not continuous, integer, or binary.")
+        for var in variable_list:
+
+            lb = ub = 0.0
+            if var.lb is None and var.ub is None:
+                var_type = GLP_FR
+            elif var.lb is None:
+                var_type = GLP_UB
+                ub = value(var.ub)
+            elif var.ub is None:
+                var_type = GLP_LO
+                lb = value(var.lb)
+            else:
+                var_type = GLP_DB
+                lb = value(var.lb)
+                ub = value(var.ub)
+
+            col += 1
+            colvar_map[ var.label ] = col
+            var_col[ var ] = col
+
+            # the name is perhaps not necessary, but for completeness ...
+            glp_set_col_name( lp, col, var.label )
+            glp_set_col_bnds( lp, col, var_type, lb, ub )
+
+            # Be sure to impart the integer and binary nature of any variables
+            if var.is_integer():
+                glp_set_col_kind( lp, col, GLP_IV )
+            elif var.is_binary():
+                glp_set_col_kind( lp, col, GLP_BV )
+            elif var.is_continuous():
+                glp_set_col_kind( lp, col, GLP_CV )   # continuous
+            else:
+                raise TypeError("Invalid domain type for variable with name '%s'. "
+                                "Variable is not continuous, integer, or binary.")
+
+        indptr = constraint_matrix.indptr
+        indices = constraint_matrix.indices
+        data = constraint_matrix.data
+        matrix_col = [var_col[var] for var in constraint_matrix.variables]
+        for i, constraint in enumerate(constraint_matrix.constraints):
+
+            # any constant in the body has already been moved to the bounds
+            lbound = float(constraint_matrix.lb[i])
+            ubound = float(constraint_matrix.ub[i])
+            if constraint.equality:
+                var_type = GLP_FX    # Fixed
+            elif constraint.lower is None:
+                var_type = GLP_UP    # Upper bounded only
+                lbound = 0.0
+            elif constraint.upper is None:
+                var_type = GLP_LO    # Lower bounded only
+                ubound = 0.0
+            else:
+                var_type = GLP_DB    # Double bounded
+
+            row = i + 1
+            rowvar_map[ constraint.label ] = row
+
+            # just as with variables, set the name just for completeness ...
+            glp_set_row_name( lp, row, constraint.label )
+            glp_set_row_bnds( lp, row, var_type, lbound, ubound )
+
+            for p in xrange(indptr[i], indptr[i+1]):
+                coef_count += 1
+                Ai[ coef_count ] = row
+                Aj[ coef_count ] = matrix_col[ int(indices[p]) ]
+                Ar[ coef_count ] = float(data[p])
+
+        # with the rows and columns named and bounded, load the coefficients
+        glp_load_matrix( lp, coef_count, Ai, Aj, Ar )
 
         model_canonical_repn = getattr(model, "_canonical_repn", None)
         if model_canonical_repn is None:
@@ -207,65 +251,6 @@ class GLPKDirect ( OptSolver ):
                              "block with name %s. Did you forget to preprocess?"
                              % (model.cname(True)))
 
-        for name in constraint_list:
-            constraint_set = constraint_list[ name ]
-
-            for ii in constraint_set:
-                constraint = constraint_set[ ii ]
-                if not constraint.active: continue
-                elif constraint.lower is None and constraint.upper is None:
-                    continue
-
-                expression = model_canonical_repn.get(constraint)
-                if constraint is None:
-                    raise ValueError("No entry found in _canonical_repn ComponentMap on "
-                                     "block %s for active constraint with name %s. "
-                                     "Did you forget to preprocess?"
-                                     % (model.cname(True), constraint.cname(True)))
-
-                offset = 0.0
-                if 0 in expression:
-                    offset = expression[0][None]
-
-                lbound = ubound = -offset
-
-                if constraint.equality:
-                    var_type = GLP_FX    # Fixed
-                    lbound = ubound = constraint.lower() - offset
-                elif constraint.lower is None:
-                    var_type = GLP_UP    # Upper bounded only
-                    ubound += constraint.upper()
-                elif constraint.upper is None:
-                    var_type = GLP_LO    # Lower bounded only
-                    lbound += constraint.lower()
-                else:
-                    var_type = GLP_DB    # Double bounded
-                    lbound += constraint.lower()
-                    ubound += constraint.upper()
-
-                row += 1
-                rowvar_map[ constraint.label ] = row
-
-                # just as with variables, set the name just for completeness ...
-                glp_set_row_name( lp, row, constraint.label )
-                glp_set_row_bnds( lp, row, var_type, lbound, ubound )
-
-                if 1 in expression: # first-order terms
-                    keys = sorted( expression[1].keys() )
-                    for var_key in keys:
-                        index = var_key.keys()[0]
-                        var = expression[-1][ index ]
-                        coef  = expression[ 1][ var_key ]
-                        col = colvar_map[ var.label ]
-
-                        coef_count += 1
-                        Ai[ coef_count ] = row
-                        Aj[ coef_count ] = col
-                        Ar[ coef_count ] = coef
-
-        # with the rows and columns named and bounded, load the coefficients
-        glp_load_matrix( lp, coef_count, Ai, Aj, Ar )
-
         for key in objective:
 
             expression = model_canonical_repn.get(objective[key])
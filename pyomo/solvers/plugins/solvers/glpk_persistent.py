@@ -0,0 +1,210 @@
+#  _________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright (c) 2014 Sandia Corporation.
+#  Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+#  the U.S. Government retains certain rights in this software.
+#  This software is distributed under the BSD License.
+#  _________________________________________________________________________
+
+import logging
+
+logger = logging.getLogger('pyomo.solvers')
+
+try:
+    # import all the glp_* functions
+    from glpk import *
+    glpk_python_api_exists = True
+except ImportError:
+    glpk_python_api_exists = False
+except Exception as e:
+    # other forms of exceptions can be thrown by the glpk python
+    # import (see glpk_direct.py)
+    print("Import of glpk failed - glpk message="+str(e)+"\n")
+    glpk_python_api_exists = False
+
+import pyutilib.common
+from pyutilib.misc import Bunch
+
+from pyomo.util.plugin import alias
+from pyomo.opt.base import *
+from pyomo.opt.results import *
+from pyomo.solvers.plugins.solvers.persistent_solver import \
+    DirectPersistentSolver
+
+
+def _glpk_bounds(lb, ub):
+    """Return the GLPK bound type and bounds for (lb, ub)."""
+    if lb is None and ub is None:
+        return GLP_FR, 0.0, 0.0
+    elif lb is None:
+        return GLP_UP, 0.0, ub
+    elif ub is None:
+        return GLP_LO, lb, 0.0
+    elif lb == ub:
+        return GLP_FX, lb, ub
+    return GLP_DB, lb, ub
+
+
+class GLPKPersistent(DirectPersistentSolver):
+    """
+    The GLPK LP/MIP solver (persistent direct API plugin).
+
+    The GLPK problem object is kept between solves and updated with the
+    changes made to the Pyomo instance (see DirectPersistentSolver).
+    This requires the Python-GLPK SWIG interface (see glpk_direct.py).
+    Columns are identified by their number, which does not change
+    because columns are never deleted. Rows are renumbered when rows
+    are deleted, so they are identified by their name.
+    """
+
+    alias('_glpk_persistent',
+          doc='Persistent direct python interface to the GLPK LP/MIP solver')
+
+    def __init__(self, **kwds):
+        kwds['type'] = 'glpk_persistent'
+        DirectPersistentSolver.__init__(self, **kwds)
+        self._glpk_instance = None
+
+    def available(self, exception_flag=True):
+        """ True if the solver is available """
+        if exception_flag is False:
+            return glpk_python_api_exists
+        if glpk_python_api_exists is False:
+            raise pyutilib.common.ApplicationError(
+                "No GLPK <-> Python bindings available - GLPK persistent "
+                "solver functionality is not available")
+        return True
+
+    def _native_create_model(self, name):
+        if self._glpk_instance is not None:
+            glp_delete_prob(self._glpk_instance)
+        lp = glp_create_prob()
+        glp_set_prob_name(lp, name)
+        glp_create_index(lp)
+        self._glpk_instance = lp
+
+    def _native_add_var(self, label, lb, ub, domain):
+        lp = self._glpk_instance
+        col = glp_add_cols(lp, 1)
+        glp_set_col_name(lp, col, label)
+        if domain == 'binary':
+            glp_set_col_kind(lp, col, GLP_BV)
+        elif domain == 'integer':
+            glp_set_col_kind(lp, col, GLP_IV)
+        self._native_set_var_bounds(col, lb, ub)
+        return col
+
+    def _native_set_var_bounds(self, handle, lb, ub):
+        bound_type, lb, ub = _glpk_bounds(lb, ub)
+        glp_set_col_bnds(self._glpk_instance, handle, bound_type, lb, ub)
+
+    def _native_add_constraint(self, label, coefs, handles, lb, ub):
+        lp = self._glpk_instance
+        row = glp_add_rows(lp, 1)
+        glp_set_row_name(lp, row, label)
+        # GLPK's arrays are 1-based
+        n = len(coefs)
+        ind = intArray(n + 1)
+        val = doubleArray(n + 1)
+        for i in range(n):
+            ind[i+1] = handles[i]
+            val[i+1] = float(coefs[i])
+        glp_set_mat_row(lp, row, n, ind, val)
+        self._native_set_constraint_bounds(label, lb, ub, row=row)
+        return label
+
+    def _native_remove_constraint(self, handle):
+        lp = self._glpk_instance
+        num = intArray(2)
+        num[1] = glp_find_row(lp, handle)
+        glp_del_rows(lp, 1, num)
+
+    def _native_set_constraint_bounds(self, handle, lb, ub, row=None):
+        lp = self._glpk_instance
+        if row is None:
+            row = glp_find_row(lp, handle)
+        bound_type, lb, ub = _glpk_bounds(lb, ub)
+        glp_set_row_bnds(lp, row, bound_type, lb, ub)
+
+    def _native_set_objective(self, minimize, constant, linear, quadratic):
+        lp = self._glpk_instance
+        glp_set_obj_dir(lp, GLP_MIN if minimize else GLP_MAX)
+        for col in range(1, glp_get_num_cols(lp) + 1):
+            glp_set_obj_coef(lp, col, 0.0)
+        for coef, col in linear:
+            glp_set_obj_coef(lp, col, coef)
+        glp_set_obj_coef(lp, 0, constant)
+
+    def _native_solve(self):
+        lp = self._glpk_instance
+        self._is_integer = glp_get_num_int(lp) > 0
+        if self._is_integer:
+            parm = glp_iocp()
+            glp_init_iocp(parm)
+            parm.presolve = GLP_ON
+            algorithm = glp_intopt
+        else:
+            parm = glp_smcp()
+            glp_init_smcp(parm)
+            algorithm = glp_simplex
+        if not self._tee:
+            parm.msg_lev = GLP_MSG_OFF
+        for key in self.options:
+            setattr(parm, key, self.options[key])
+        rc = algorithm(lp, parm)
+
+        if self._is_integer:
+            status = glp_mip_status(lp)
+        else:
+            status = glp_get_status(lp)
+        if rc != 0:
+            termination_condition = TerminationCondition.error
+        elif status == GLP_OPT:
+            termination_condition = TerminationCondition.optimal
+        elif status == GLP_NOFEAS:
+            termination_condition = TerminationCondition.infeasible
+        elif status == GLP_UNBND:
+            termination_condition = TerminationCondition.unbounded
+        else:
+            termination_condition = TerminationCondition.other
+        if status == GLP_OPT:
+            solution_status = SolutionStatus.optimal
+        elif status == GLP_FEAS:
+            solution_status = SolutionStatus.feasible
+        elif status in (GLP_INFEAS, GLP_NOFEAS):
+            solution_status = SolutionStatus.infeasible
+        else:
+            solution_status = SolutionStatus.other
+
+        objective_value = None
+        if status in (GLP_OPT, GLP_FEAS):
+            if self._is_integer:
+                objective_value = glp_mip_obj_val(lp)
+            else:
+                objective_value = glp_get_obj_val(lp)
+        return Bunch(termination_condition=termination_condition,
+                     solution_status=solution_status,
+                     message=None if rc == 0 else
+                         "GLPK returned error code %s" % (rc),
+                     objective_value=objective_value,
+                     solver_name="GLPK " + glp_version())
+
+    def _native_get_values(self, handles):
+        lp = self._glpk_instance
+        if self._is_integer:
+            return [glp_mip_col_val(lp, col) for col in handles]
+        return [glp_get_col_prim(lp, col) for col in handles]
+
+    def _native_get_reduced_costs(self, handles):
+        lp = self._glpk_instance
+        return [glp_get_col_dual(lp, col) for col in handles]
+
+    def _native_get_duals(self, handles):
+        lp = self._glpk_instance
+        return [glp_get_row_dual(lp, glp_find_row(lp, name))
+                for name in handles]
+
+
+if not glpk_python_api_exists:
+    SolverFactory().deactivate('_glpk_persistent')
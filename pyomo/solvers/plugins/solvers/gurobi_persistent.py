@@ -0,0 +1,218 @@
+#  _________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright (c) 2014 Sandia Corporation.
+#  Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+#  the U.S. Government retains certain rights in this software.
+#  This software is distributed under the BSD License.
+#  _________________________________________________________________________
+
+import logging
+
+logger = logging.getLogger('pyomo.solvers')
+
+_gurobi_version = None
+try:
+    from gurobipy import *
+    # create a version tuple of length 4
+    _gurobi_version = gurobi.version()
+    while(len(_gurobi_version) < 4):
+        _gurobi_version += (0,)
+    _gurobi_version = _gurobi_version[:4]
+    gurobi_python_api_exists = True
+except ImportError:
+    gurobi_python_api_exists = False
+except Exception as e:
+    # other forms of exceptions can be thrown by the gurobi python
+    # import (see gurobi_direct.py)
+    print("Import of gurobipy failed - gurobi message="+str(e)+"\n")
+    gurobi_python_api_exists = False
+
+import pyutilib.common
+from pyutilib.misc import Bunch
+
+from pyomo.util.plugin import alias
+from pyomo.opt.base import *
+from pyomo.opt.base.solvers import _extract_version
+from pyomo.opt.results import *
+from pyomo.solvers.plugins.solvers.persistent_solver import \
+    DirectPersistentSolver
+
+
+class GurobiPersistent(DirectPersistentSolver):
+    """
+    The Gurobi LP/MIP solver (persistent direct API plugin).
+
+    The Gurobi model is kept between solves and updated with the
+    changes made to the Pyomo instance (see DirectPersistentSolver).
+    Ranged constraints are stored as two Gurobi constraints.
+    """
+
+    alias('_gurobi_persistent',
+          doc='Persistent direct python interface to the Gurobi '
+              'LP/QP/MIP solver')
+
+    def __init__(self, **kwds):
+        kwds['type'] = 'gurobi_persistent'
+        DirectPersistentSolver.__init__(self, **kwds)
+        self._gurobi_model = None
+        self._capabilities.quadratic_objective = True
+
+    def available(self, exception_flag=True):
+        """ True if the solver is available """
+        if exception_flag is False:
+            return gurobi_python_api_exists
+        if gurobi_python_api_exists is False:
+            raise pyutilib.common.ApplicationError(
+                "No Gurobi <-> Python bindings available - Gurobi "
+                "persistent solver functionality is not available")
+        return True
+
+    def _get_version(self):
+        if _gurobi_version is None:
+            return _extract_version('')
+        return _gurobi_version
+
+    def warm_start_capable(self):
+        return True
+
+    def _native_create_model(self, name):
+        self._gurobi_model = Model(name)
+
+    def _native_add_var(self, label, lb, ub, domain):
+        if domain == 'binary':
+            vtype = GRB.BINARY
+        elif domain == 'integer':
+            vtype = GRB.INTEGER
+        else:
+            vtype = GRB.CONTINUOUS
+        return self._gurobi_model.addVar(
+            lb=-GRB.INFINITY if lb is None else lb,
+            ub=GRB.INFINITY if ub is None else ub,
+            vtype=vtype,
+            name=label)
+
+    def _native_set_var_bounds(self, handle, lb, ub):
+        handle.setAttr(GRB.Attr.LB, -GRB.INFINITY if lb is None else lb)
+        handle.setAttr(GRB.Attr.UB, GRB.INFINITY if ub is None else ub)
+
+    def _native_add_constraint(self, label, coefs, handles, lb, ub):
+        # the variables added since the last update are not usable in
+        # constraints until the model is updated
+        model = self._gurobi_model
+        model.update()
+        expr = LinExpr(coefs, handles)
+        if (lb is not None) and (lb == ub):
+            return (model.addConstr(lhs=expr, sense=GRB.EQUAL, rhs=lb,
+                                    name=label),)
+        lower = upper = None
+        if lb is not None:
+            lower = model.addConstr(lhs=expr, sense=GRB.GREATER_EQUAL,
+                                    rhs=lb, name=label+'_lb')
+        if ub is not None:
+            upper = model.addConstr(lhs=expr, sense=GRB.LESS_EQUAL,
+                                    rhs=ub, name=label+'_ub')
+        return (lower, upper)
+
+    def _native_remove_constraint(self, handle):
+        for constr in handle:
+            if constr is not None:
+                self._gurobi_model.remove(constr)
+
+    def _native_set_constraint_bounds(self, handle, lb, ub):
+        if len(handle) == 1:
+            handle[0].setAttr(GRB.Attr.RHS, lb)
+        else:
+            if handle[0] is not None:
+                handle[0].setAttr(GRB.Attr.RHS, lb)
+            if handle[1] is not None:
+                handle[1].setAttr(GRB.Attr.RHS, ub)
+
+    def _native_set_objective(self, minimize, constant, linear, quadratic):
+        model = self._gurobi_model
+        model.update()
+        if quadratic:
+            expr = QuadExpr()
+            for coef, handle1, handle2 in quadratic:
+                expr.addTerms(coef, handle1, handle2)
+            expr.add(LinExpr([coef for coef, handle in linear],
+                             [handle for coef, handle in linear]))
+        else:
+            expr = LinExpr([coef for coef, handle in linear],
+                           [handle for coef, handle in linear])
+        expr.addConstant(constant)
+        model.setObjective(expr,
+                           GRB.MINIMIZE if minimize else GRB.MAXIMIZE)
+
+    def _native_set_warm_start(self, handles, values):
+        self._gurobi_model.update()
+        self._gurobi_model.setAttr(GRB.Attr.Start, handles, values)
+
+    def _native_solve(self):
+        model = self._gurobi_model
+        model.update()
+        model.setParam('OutputFlag', 1 if self._tee else 0)
+        for key in self.options:
+            model.setParam(key, self.options[key])
+        model.optimize()
+
+        status = model.Status
+        if status == GRB.OPTIMAL:
+            termination_condition = TerminationCondition.optimal
+            solution_status = SolutionStatus.optimal
+        elif status == GRB.INFEASIBLE:
+            termination_condition = TerminationCondition.infeasible
+            solution_status = SolutionStatus.infeasible
+        elif status == GRB.INF_OR_UNBD:
+            termination_condition = TerminationCondition.infeasible
+            solution_status = SolutionStatus.other
+        elif status == GRB.UNBOUNDED:
+            termination_condition = TerminationCondition.unbounded
+            solution_status = SolutionStatus.unbounded
+        elif status == GRB.ITERATION_LIMIT:
+            termination_condition = TerminationCondition.maxIterations
+            solution_status = SolutionStatus.stoppedByLimit
+        elif status == GRB.NODE_LIMIT:
+            termination_condition = TerminationCondition.maxEvaluations
+            solution_status = SolutionStatus.stoppedByLimit
+        elif status == GRB.TIME_LIMIT:
+            termination_condition = TerminationCondition.maxTimeLimit
+            solution_status = SolutionStatus.stoppedByLimit
+        elif status == GRB.SOLUTION_LIMIT:
+            termination_condition = TerminationCondition.other
+            solution_status = SolutionStatus.stoppedByLimit
+        elif status == GRB.NUMERIC:
+            termination_condition = TerminationCondition.other
+            solution_status = SolutionStatus.error
+        else:
+            termination_condition = TerminationCondition.other
+            solution_status = SolutionStatus.other
+
+        objective_value = None
+        if model.SolCount > 0:
+            objective_value = model.ObjVal
+        return Bunch(termination_condition=termination_condition,
+                     solution_status=solution_status,
+                     message=None,
+                     objective_value=objective_value,
+                     solver_name="Gurobi %s.%s%s" % gurobi.version())
+
+    def _native_get_values(self, handles):
+        return self._gurobi_model.getAttr(GRB.Attr.X, handles)
+
+    def _native_get_reduced_costs(self, handles):
+        return self._gurobi_model.getAttr(GRB.Attr.RC, handles)
+
+    def _native_get_duals(self, handles):
+        duals = []
+        for handle in handles:
+            dual = 0.0
+            for constr in handle:
+                if constr is not None:
+                    dual += constr.getAttr(GRB.Attr.Pi)
+            duals.append(dual)
+        return duals
+
+
+if not gurobi_python_api_exists:
+    SolverFactory().deactivate('_gurobi_persistent')
@@ -0,0 +1,733 @@
+#  _________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright (c) 2014 Sandia Corporation.
+#  Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+#  the U.S. Government retains certain rights in this software.
+#  This software is distributed under the BSD License.
+#  _________________________________________________________________________
+
+#
+# A generic layer for persistent solver plugins that keep a native
+# solver model for a Pyomo instance across solves.
+#
+# The layer compiles the variables, linear constraints and objective
+# of an instance into the native model once, and records the state
+# that was pushed for each component (the variable bounds and fixed
+# values, and the constraint bounds). Subsequent solves only push the
+# differences between the instance and the recorded state, so a model
+# that is re-solved many times with small modifications (e.g., in a
+# decomposition algorithm) is not rebuilt. Solver interfaces implement
+# a small set of _native_* methods that operate on the native model.
+#
+
+import re
+import time
+import logging
+
+from pyutilib.misc import Bunch, Options
+
+from pyomo.opt.base import *
+from pyomo.opt.results import *
+from pyomo.opt.solver import *
+from pyomo.core.base import (SymbolMap,
+                             ComponentMap,
+                             NumericLabeler,
+                             TextLabeler,
+                             value)
+from pyomo.core.base.expr import identify_variables
+from pyomo.core.base.numvalue import is_constant
+from pyomo.repn import generate_canonical_repn, LinearCanonicalRepn
+
+from six import iteritems, itervalues
+
+logger = logging.getLogger('pyomo.solvers')
+
+
+def _repn_terms(repn):
+    """
+    Return the tuple (constant, linear, quadratic) for a canonical
+    representation, where linear is a list of (coef, var) and
+    quadratic is a list of (coef, var, var). Raises ValueError if the
+    representation is not linear or quadratic.
+    """
+    linear = []
+    quadratic = []
+    if isinstance(repn, LinearCanonicalRepn):
+        constant = repn.constant
+        if repn.linear is not None:
+            linear.extend(zip(repn.linear, repn.variables))
+    else:
+        constant = None
+        if None in repn:
+            raise ValueError("Expression is not linear or quadratic")
+        for degree in repn:
+            if degree > 2:
+                raise ValueError("Expression is not linear or quadratic")
+        if 0 in repn:
+            constant = repn[0][None]
+        if 1 in repn:
+            hash_to_variable_map = repn[-1]
+            for var_hash, coef in iteritems(repn[1]):
+                linear.append((coef, hash_to_variable_map[var_hash]))
+        if 2 in repn:
+            hash_to_variable_map = repn[-1]
+            for quad_repn, coef in iteritems(repn[2]):
+                quad_vars = []
+                for var_hash, exponent in iteritems(quad_repn):
+                    quad_vars.extend([hash_to_variable_map[var_hash]]*exponent)
+                quadratic.append((coef, quad_vars[0], quad_vars[1]))
+    if constant is None:
+        constant = 0.0
+    return constant, linear, quadratic
+
+def _get_repn(component, expr, gen_flag):
+    """
+    Return the canonical representation of the body (or expression)
+    of a constraint (or objective), using the representation stored in
+    the _canonical_repn map of its block if the block flag gen_flag
+    (_gen_con_canonical_repn or _gen_obj_canonical_repn) is False.
+    """
+    block = component.parent_block()
+    if not hasattr(block, '_canonical_repn'):
+        block._canonical_repn = ComponentMap()
+    if getattr(block, gen_flag, True):
+        repn = generate_canonical_repn(expr)
+        block._canonical_repn[component] = repn
+    else:
+        repn = block._canonical_repn[component]
+    return repn
+
+
+class DirectPersistentSolver(PersistentSolver):
+    """
+    Base class for persistent solver plugins that keep a native model
+    that is updated incrementally.
+
+    An instance is compiled into the native model by compile_instance().
+    The native model can then be modified with add_constraint(),
+    remove_constraint(), update_var_bounds(), update_rhs() and
+    set_objective(), and update() pushes all of the changes that it
+    detects in the instance (new, removed, activated or deactivated
+    constraints, variable bounds and fixed values, and constraint
+    bounds). update() is called by solve(), so the native model always
+    reflects the instance that is solved. Only changes to the
+    expression of a constraint (or of the objective) are not detected:
+    those constraints are updated by removing and adding them again
+    (or by calling set_objective()).
+
+    Fixed variables are compiled out of the constraint and objective
+    expressions (the native variable is fixed with its bounds), so
+    fixing or freeing a variable updates the constraints that
+    contain it. The variables of each compiled constraint are
+    recorded when it is added, so only those constraints are
+    compiled again.
+
+    The cost of update() is one pass over the active constraints of
+    the instance (to find the constraints that were added), one
+    comparison of the bounds of each compiled variable, and one
+    comparison of the bounds of each constraint whose bounds are not
+    constant (e.g., that depend on mutable parameters). Only the
+    variables and constraints that changed are pushed to the native
+    model.
+    """
+
+    def __init__(self, **kwds):
+        PersistentSolver.__init__(self, **kwds)
+        self._instance = None
+        self._symbol_map = None
+        self._smap_id = None
+        self._labeler = None
+        self._symbolic_solver_labels = False
+        self._output_fixed_variable_bounds = False
+        self._skip_trivial_constraints = False
+        self._warm_start_solve = False
+        self._keepfiles = False
+        self._clear_state()
+
+        # Note: Undefined capabilities default to 'None'
+        self._capabilities = Options()
+        self._capabilities.linear = True
+        self._capabilities.integer = True
+
+    def _clear_state(self):
+        # the native variable for each compiled variable, and the
+        # (lb, ub, fixed, value) of the variable when its bounds were
+        # last pushed
+        self._var_handles = ComponentMap()
+        self._var_state = ComponentMap()
+        # the native constraint for each compiled constraint (None for
+        # trivial and unbounded constraints, which are tracked but not
+        # compiled), the constant of its body and its (lb, ub) in the
+        # native model
+        self._con_handles = ComponentMap()
+        self._con_offsets = ComponentMap()
+        self._con_bounds = ComponentMap()
+        # the variables in the body of each compiled constraint, and
+        # the compiled constraints (as ComponentMap keys) that contain
+        # each variable
+        self._con_vars = ComponentMap()
+        self._var_cons = ComponentMap()
+        # the compiled constraints whose bounds are not constant (as
+        # ComponentMap keys)
+        self._rhs_cons = ComponentMap()
+        self._objective = None
+        self._objective_label = None
+        self._objective_vars = ComponentMap()
+
+    #
+    # The interface to the native model, implemented by solver plugins.
+    # Bounds are None if there is no bound. Variables and constraints
+    # are identified by the handles returned when they are added.
+    #
+
+    def _native_create_model(self, name):
+        """Create a new (empty) native model."""
+        raise NotImplementedError     #pragma:nocover
+
+    def _native_add_var(self, label, lb, ub, domain):
+        """
+        Add a variable ('continuous', 'integer' or 'binary' domain)
+        and return its handle.
+        """
+        raise NotImplementedError     #pragma:nocover
+
+    def _native_set_var_bounds(self, handle, lb, ub):
+        raise NotImplementedError     #pragma:nocover
+
+    def _native_add_constraint(self, label, coefs, handles, lb, ub):
+        """
+        Add the constraint lb <= sum(coefs[i]*handles[i]) <= ub and
+        return its handle.
+        """
+        raise NotImplementedError     #pragma:nocover
+
+    def _native_remove_constraint(self, handle):
+        raise NotImplementedError     #pragma:nocover
+
+    def _native_set_constraint_bounds(self, handle, lb, ub):
+        """
+        Change the bounds of a constraint. The bounds that are None,
+        and whether lb == ub, are the same as when it was added.
+        """
+        raise NotImplementedError     #pragma:nocover
+
+    def _native_set_objective(self, minimize, constant, linear, quadratic):
+        """
+        Replace the objective; linear is a list of (coef, handle) and
+        quadratic is a list of (coef, handle, handle).
+        """
+        raise NotImplementedError     #pragma:nocover
+
+    def _native_solve(self):
+        """
+        Solve the native model, and return a Bunch with the
+        termination_condition, solution_status, message (or None),
+        objective value (or None, if no solution is available) and
+        solver name.
+        """
+        raise NotImplementedError     #pragma:nocover
+
+    def _native_get_values(self, handles):
+        raise NotImplementedError     #pragma:nocover
+
+    def _native_get_reduced_costs(self, handles):
+        raise NotImplementedError     #pragma:nocover
+
+    def _native_get_duals(self, handles):
+        raise NotImplementedError     #pragma:nocover
+
+    def _native_set_warm_start(self, handles, values):
+        raise NotImplementedError     #pragma:nocover
+
+    #
+    # Compiling an instance
+    #
+
+    def compile_instance(self,
+                         pyomo_instance,
+                         symbolic_solver_labels=False,
+                         output_fixed_variable_bounds=False,
+                         skip_trivial_constraints=False):
+        """
+        Create the native model for an instance.
+        """
+        from pyomo.core.base import Var, Constraint, Objective, \
+            SOSConstraint
+
+        for soscondata in pyomo_instance.component_data_objects(
+                SOSConstraint, active=True):
+            raise RuntimeError("Solver %s does not support SOSConstraint "
+                               "declarations" % (self.type))
+
+        self._symbolic_solver_labels = symbolic_solver_labels
+        self._output_fixed_variable_bounds = output_fixed_variable_bounds
+        self._skip_trivial_constraints = skip_trivial_constraints
+        if symbolic_solver_labels:
+            self._labeler = TextLabeler()
+        else:
+            self._labeler = NumericLabeler('x')
+        self._symbol_map = SymbolMap()
+        self._smap_id = id(self._symbol_map)
+        self._instance = pyomo_instance
+        pyomo_instance.solutions.add_symbol_map(self._symbol_map)
+        self._clear_state()
+
+        self._native_create_model(pyomo_instance.name)
+        for var in pyomo_instance.component_data_objects(Var, active=True):
+            self.add_var(var)
+        for con in pyomo_instance.component_data_objects(Constraint,
+                                                         active=True):
+            self._add_constraint(con)
+        self.set_objective()
+
+    def instance_compiled(self):
+        """
+        Return True if an instance has been compiled.
+        """
+        return self._instance is not None
+
+    def _check_compiled(self):
+        if self._instance is None:
+            raise RuntimeError("The %s solver plugin has no instance "
+                               "compiled" % (self.type))
+
+    def add_var(self, var):
+        """
+        Add a variable to the native model.
+        """
+        self._check_compiled()
+        if var in self._var_handles:
+            raise ValueError("Variable %s has already been added to the "
+                             "%s solver plugin" % (var.cname(True), self.type))
+        if var.is_binary():
+            domain = 'binary'
+        elif var.is_integer():
+            domain = 'integer'
+        elif var.is_continuous():
+            domain = 'continuous'
+        else:
+            raise TypeError("Invalid domain type for variable with name '%s'. "
+                            "Variable is not continuous, integer, or binary."
+                            % (var.cname(True)))
+        state = self._get_var_state(var)
+        lb, ub = self._var_bounds(state)
+        label = self._symbol_map.getSymbol(var, self._labeler)
+        self._var_handles[var] = self._native_add_var(label, lb, ub, domain)
+        self._var_state[var] = state
+
+    def _get_var_state(self, var):
+        if var.fixed:
+            return (None, None, True, value(var))
+        return (value(var.lb), value(var.ub), False, None)
+
+    def _var_bounds(self, state):
+        lb, ub, fixed, fixed_value = state
+        if fixed:
+            return fixed_value, fixed_value
+        return lb, ub
+
+    def _get_var_handle(self, var):
+        handle = self._var_handles.get(var)
+        if handle is None:
+            self.add_var(var)
+            handle = self._var_handles[var]
+        return handle
+
+    def add_constraint(self, con):
+        """
+        Add a constraint (or all indices of an indexed constraint) to
+        the native model.
+        """
+        self._check_compiled()
+        if con.is_indexed():
+            for condata in con.values():
+                self._add_constraint(condata)
+        else:
+            self._add_constraint(con)
+
+    def _add_constraint(self, con):
+        if con in self._con_handles:
+            raise ValueError("Constraint %s has already been added to the "
+                             "%s solver plugin" % (con.cname(True), self.type))
+        if (con.lower is None) and (con.upper is None):
+            # not binding at all, don't bother
+            self._con_handles[con] = None
+            return
+        repn = _get_repn(con, con.body, "_gen_con_canonical_repn")
+        try:
+            offset, linear, quadratic = _repn_terms(repn)
+        except ValueError:
+            quadratic = True
+        if quadratic:
+            raise ValueError(
+                "The %s solver plugin does not support nonlinear constraint "
+                "expressions.\nConstraint: %s" % (self.type, con.cname(True)))
+        lb, ub = self._con_native_bounds(con, offset)
+        if (not linear) and self._skip_trivial_constraints:
+            handle = None
+        else:
+            label = self._symbol_map.getSymbol(con, self._labeler)
+            handle = self._native_add_constraint(
+                label,
+                [coef for coef, var in linear],
+                [self._get_var_handle(var) for coef, var in linear],
+                lb, ub)
+        self._con_handles[con] = handle
+        self._con_offsets[con] = offset
+        self._con_bounds[con] = (lb, ub)
+        # the fixed variables are recorded as well, since freeing them
+        # changes the constraint
+        variables = tuple(identify_variables(con.body, include_fixed=True))
+        self._con_vars[con] = variables
+        for var in variables:
+            cons = self._var_cons.get(var)
+            if cons is None:
+                cons = self._var_cons[var] = ComponentMap()
+            cons[con] = None
+        if not ((con.lower is None or is_constant(con.lower)) and
+                (con.upper is None or is_constant(con.upper))):
+            self._rhs_cons[con] = None
+
+    def _con_native_bounds(self, con, offset):
+        if con.equality:
+            lb = ub = value(con.lower) - offset
+        else:
+            lb = None if con.lower is None else value(con.lower) - offset
+            ub = None if con.upper is None else value(con.upper) - offset
+        return lb, ub
+
+    def remove_constraint(self, con):
+        """
+        Remove a constraint (or all indices of an indexed constraint)
+        from the native model.
+        """
+        self._check_compiled()
+        if con.is_indexed():
+            for condata in con.values():
+                self._remove_constraint(condata)
+        else:
+            self._remove_constraint(con)
+
+    def _remove_constraint(self, con):
+        if con not in self._con_handles:
+            raise ValueError("Constraint %s has not been added to the "
+                             "%s solver plugin" % (con.cname(True), self.type))
+        handle = self._con_handles.pop(con)
+        self._con_offsets.pop(con, None)
+        self._con_bounds.pop(con, None)
+        self._rhs_cons.pop(con, None)
+        for var in self._con_vars.pop(con, ()):
+            cons = self._var_cons[var]
+            del cons[con]
+            if len(cons) == 0:
+                del self._var_cons[var]
+        if handle is not None:
+            self._native_remove_constraint(handle)
+        self._symbol_map.removeSymbol(con)
+
+    def update_var_bounds(self, var=None):
+        """
+        Push the bounds of a variable (or of all indices of an indexed
+        variable, or of all variables if var is None) that changed, or
+        whose fixed status or fixed value changed, to the native model.
+        """
+        self._check_compiled()
+        if var is None:
+            variables = self._var_handles
+        elif var.is_indexed():
+            variables = var.values()
+        else:
+            variables = (var,)
+        refixed = []
+        for vardata in variables:
+            old_state = self._var_state[vardata]
+            state = self._get_var_state(vardata)
+            if state == old_state:
+                continue
+            lb, ub = self._var_bounds(state)
+            if (lb, ub) != self._var_bounds(old_state):
+                self._native_set_var_bounds(self._var_handles[vardata],
+                                            lb, ub)
+            self._var_state[vardata] = state
+            if state[2] or old_state[2]:
+                refixed.append(vardata)
+        if refixed:
+            self._update_fixed_variables(refixed)
+
+    def _update_fixed_variables(self, variables):
+        """
+        Compile the constraints and the objective that contain
+        variables that were fixed or freed (or whose fixed value
+        changed) again.
+        """
+        constraints = ComponentMap()
+        for vardata in variables:
+            for con in self._var_cons.get(vardata, ()):
+                constraints[con] = None
+        for con in constraints:
+            self._remove_constraint(con)
+            self._add_constraint(con)
+        if (self._objective is not None) and \
+           any(vardata in self._objective_vars for vardata in variables):
+            self.set_objective(self._objective)
+
+    def update_rhs(self, con=None):
+        """
+        Push the bounds of a constraint (or of all indices of an
+        indexed constraint) that changed to the native model. If con
+        is None, the constraints whose bounds are not constant (e.g.,
+        that depend on mutable parameters) are checked.
+        """
+        self._check_compiled()
+        if con is None:
+            constraints = list(self._rhs_cons)
+        elif con.is_indexed():
+            constraints = list(con.values())
+        else:
+            constraints = (con,)
+        for condata in constraints:
+            if condata not in self._con_bounds:
+                # unbounded constraints
+                if (condata.lower is not None) or \
+                   (condata.upper is not None):
+                    self._remove_constraint(condata)
+                    self._add_constraint(condata)
+                continue
+            lb, ub = self._con_native_bounds(condata,
+                                             self._con_offsets[condata])
+            old_lb, old_ub = self._con_bounds[condata]
+            if (lb, ub) == (old_lb, old_ub):
+                continue
+            handle = self._con_handles[condata]
+            if (handle is None) or \
+               ((lb is None) != (old_lb is None)) or \
+               ((ub is None) != (old_ub is None)) or \
+               ((lb == ub) != (old_lb == old_ub)):
+                self._remove_constraint(condata)
+                self._add_constraint(condata)
+            else:
+                self._native_set_constraint_bounds(handle, lb, ub)
+                self._con_bounds[condata] = (lb, ub)
+
+    def set_objective(self, obj=None):
+        """
+        Compile an objective (by default, the active objective of the
+        instance) into the native model.
+        """
+        from pyomo.core.base import Objective
+        self._check_compiled()
+        if obj is None:
+            objectives = list(self._instance.component_data_objects(
+                Objective, active=True))
+            if len(objectives) != 1:
+                raise ValueError(
+                    "The %s solver plugin requires a single active objective "
+                    "on instance %s (%s were found)"
+                    % (self.type, self._instance.cname(True), len(objectives)))
+            obj = objectives[0]
+        repn = _get_repn(obj, obj.expr, "_gen_obj_canonical_repn")
+        try:
+            constant, linear, quadratic = _repn_terms(repn)
+        except ValueError:
+            raise ValueError(
+                "The %s solver plugin does not support general nonlinear "
+                "objective expressions (only linear or quadratic).\n"
+                "Objective: %s" % (self.type, obj.cname(True)))
+        if quadratic and not self._capabilities.quadratic_objective:
+            raise ValueError(
+                "The %s solver plugin does not support quadratic "
+                "objective expressions.\nObjective: %s"
+                % (self.type, obj.cname(True)))
+        self._native_set_objective(
+            obj.is_minimizing(),
+            constant,
+            [(coef, self._get_var_handle(var)) for coef, var in linear],
+            [(coef, self._get_var_handle(var1), self._get_var_handle(var2))
+             for coef, var1, var2 in quadratic])
+        if (self._objective is not None) and (self._objective is not obj):
+            self._symbol_map.removeSymbol(self._objective)
+        self._objective = obj
+        self._objective_label = self._symbol_map.getSymbol(obj, self._labeler)
+        self._objective_vars = ComponentMap(
+            (var, None)
+            for var in identify_variables(obj.expr, include_fixed=True))
+
+    def update(self):
+        """
+        Push all changes to the instance that can be detected to the
+        native model: constraints that were added, activated, removed
+        or deactivated, variable bounds and fixed values, constraint
+        bounds, and the active objective (if a different objective is
+        active).
+        """
+        from pyomo.core.base import Constraint, Objective
+        self._check_compiled()
+        added = []
+        compiled = 0
+        for con in self._instance.component_data_objects(Constraint,
+                                                         active=True):
+            if con in self._con_handles:
+                compiled += 1
+            else:
+                added.append(con)
+        if compiled < len(self._con_handles):
+            # some compiled constraints were removed or deactivated
+            active = ComponentMap(
+                (con, None) for con in self._instance.component_data_objects(
+                    Constraint, active=True))
+            for con in list(self._con_handles):
+                if con not in active:
+                    self._remove_constraint(con)
+        self.update_var_bounds()
+        self.update_rhs()
+        for con in added:
+            self._add_constraint(con)
+        objectives = list(self._instance.component_data_objects(
+            Objective, active=True))
+        if (len(objectives) != 1) or (objectives[0] is not self._objective):
+            self.set_objective()
+
+    #
+    # The compatibility interface used by PySP
+    #
+
+    def compile_objective(self, pyomo_instance):
+        assert pyomo_instance is self._instance
+        self.set_objective()
+
+    def compile_variable_bounds(self, pyomo_instance, vars_to_update):
+        assert pyomo_instance is self._instance
+        if len(vars_to_update) == 0:
+            self.update_var_bounds()
+        else:
+            for var_name, var_index in vars_to_update:
+                var = pyomo_instance.find_component(var_name)
+                self.update_var_bounds(var[var_index])
+
+    #
+    # Solving
+    #
+
+    def warm_start_capable(self):
+        return False
+
+    def _warm_start(self, instance):
+        handles = []
+        values = []
+        for var, handle in iteritems(self._var_handles):
+            if (not var.fixed) and (var.value is not None):
+                handles.append(handle)
+                values.append(var.value)
+        self._native_set_warm_start(handles, values)
+
+    def _presolve(self, *args, **kwds):
+        from pyomo.core.base import Block
+
+        self._warm_start_solve = kwds.pop('warmstart', False)
+        self._keepfiles = kwds.pop('keepfiles', False)
+        io_options = {}
+        for name in ('symbolic_solver_labels',
+                     'output_fixed_variable_bounds',
+                     'skip_trivial_constraints'):
+            if name in kwds:
+                io_options[name] = kwds.pop(name)
+
+        # this implies we have a custom solution "parser",
+        # preventing the OptSolver _presolve method from
+        # creating one
+        self._results_format = ResultsFormat.soln
+        OptSolver._presolve(self, *args, **kwds)
+
+        if (len(args) != 1) or (not isinstance(args[0], Block)):
+            raise ValueError("The %s solver plugin must be supplied a "
+                             "single problem instance" % (self.type))
+        if args[0] is not self._instance:
+            self.compile_instance(args[0], **io_options)
+        else:
+            self.update()
+            # Re-add the symbol map if it was removed after a previous
+            # solution load
+            if self._smap_id not in self._instance.solutions.symbol_map:
+                self._instance.solutions.add_symbol_map(self._symbol_map)
+
+        if self._warm_start_solve:
+            self._warm_start(args[0])
+
+    def _apply_solver(self):
+        start_time = time.time()
+        self._solve_status = self._native_solve()
+        self._solve_time = time.time() - start_time
+        return Bunch(rc=None, log=None)
+
+    def _postsolve(self):
+        extract_duals = False
+        extract_reduced_costs = False
+        for suffix in self._suffixes:
+            flag = False
+            if re.match(suffix, "dual"):
+                extract_duals = True
+                flag = True
+            if re.match(suffix, "rc"):
+                extract_reduced_costs = True
+                flag = True
+            if not flag:
+                raise RuntimeError(
+                    "***The %s solver plugin cannot extract solution "
+                    "suffix=%s" % (self.type, suffix))
+
+        status = self._solve_status
+        results = SolverResults()
+        soln = Solution()
+        results.solver.name = status.solver_name
+        results.solver.wallclock_time = self._solve_time
+        results.solver.termination_condition = status.termination_condition
+        if status.message is not None:
+            results.solver.termination_message = status.message
+        problem = results.problem
+        problem.name = self._instance.name
+        problem.number_of_constraints = \
+            sum(1 for handle in itervalues(self._con_handles)
+                if handle is not None)
+        problem.number_of_variables = len(self._var_handles)
+        problem.number_of_objectives = 1
+        if self._objective.is_minimizing():
+            problem.sense = ProblemSense.minimize
+        else:
+            problem.sense = ProblemSense.maximize
+        soln.status = status.solution_status
+
+        if status.objective_value is not None:
+            if problem.sense == ProblemSense.minimize:
+                problem.upper_bound = status.objective_value
+            else:
+                problem.lower_bound = status.objective_value
+            soln.objective[self._objective_label] = \
+                {'Value': status.objective_value}
+            byObject = self._symbol_map.byObject
+            variables = list(self._var_handles)
+            handles = [self._var_handles[var] for var in variables]
+            labels = [byObject[id(var)] for var in variables]
+            soln_variables = soln.variable
+            for label, val in zip(labels,
+                                  self._native_get_values(handles)):
+                soln_variables[label] = {"Value": val}
+            if extract_reduced_costs:
+                for label, val in zip(labels,
+                                      self._native_get_reduced_costs(handles)):
+                    soln_variables[label]["Rc"] = val
+            if extract_duals:
+                constraints = [con for con, handle
+                               in iteritems(self._con_handles)
+                               if handle is not None]
+                duals = self._native_get_duals(
+                    [self._con_handles[con] for con in constraints])
+                soln_constraints = soln.constraint
+                for con, val in zip(constraints, duals):
+                    soln_constraints[byObject[id(con)]] = {"Dual": val}
+
+        results.solution.insert(soln)
+        self.results = results
+
+        # let the base class deal with returning results.
+        return OptSolver._postsolve(self)
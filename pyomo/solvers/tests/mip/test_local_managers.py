@@ -0,0 +1,261 @@
+#  _________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright (c) 2014 Sandia Corporation.
+#  Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+#  the U.S. Government retains certain rights in this software.
+#  This software is distributed under the BSD License.
+#  _________________________________________________________________________
+#
+# Test the 'processpool' and 'threadpool' solver managers, using a fake
+# ASL solver executable that assigns the same value to all variables
+#
+
+import os
+import sys
+import shutil
+import tempfile
+import threading
+try:
+    import asyncio
+    asyncio_available = hasattr(asyncio.Future, '__await__')
+except ImportError:
+    asyncio_available = False
+
+import pyutilib.th as unittest
+import pyutilib.services
+import pyutilib.common
+
+from pyomo.core import ConcreteModel, Var, Objective, Constraint, RangeSet
+from pyomo.opt import SolverFactory, SolverManagerFactory, TerminationCondition
+from pyomo.opt.parallel.manager import (ActionManagerError, ActionStatus,
+                                        ActionFuture)
+from pyomo.util import fork_available
+
+# Usage: fake_asl -s <problem>.nl [delay=<seconds>] [value=<x>] [rc=<code>]
+_fake_asl = """#! %s
+import sys, time
+options = dict(arg.split('=', 1) for arg in sys.argv[3:])
+time.sleep(float(options.get('delay', 0)))
+problem = sys.argv[2]
+with open(problem) as f:
+    f.readline()
+    n, m = [int(x) for x in f.readline().split()[:2]]
+with open(problem[:-3] + '.sol', 'w') as f:
+    f.write('fake_asl: solved\\n\\nOptions\\n3\\n0\\n0\\n0\\n')
+    f.write('%%d\\n0\\n%%d\\n%%d\\n' %% (m, n, n))
+    for i in range(n):
+        f.write(options.get('value', '1') + '\\n')
+    f.write('objno 0 0\\n')
+sys.exit(int(options.get('rc', 0)))
+"""
+
+def _generate_model(size=3):
+    model = ConcreteModel()
+    model.s = RangeSet(size)
+    model.x = Var(model.s, bounds=(0, 10))
+    model.obj = Objective(expr=sum(model.x[i] for i in model.s))
+    model.c = Constraint(expr=model.x[1] >= 0)
+    return model
+
+class _LocalManagerTests(object):
+
+    @classmethod
+    def setUpClass(cls):
+        import pyomo.environ
+        cls.tmpdir = tempfile.mkdtemp()
+        cls.executable = os.path.join(cls.tmpdir, 'fake_asl')
+        with open(cls.executable, 'w') as f:
+            f.write(_fake_asl % sys.executable)
+        os.chmod(cls.executable, 0o755)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmpdir)
+
+    def setUp(self):
+        self.old_tempdir = pyutilib.services.TempfileManager.tempdir
+        pyutilib.services.TempfileManager.tempdir = self.tmpdir
+        self.opt = SolverFactory('asl:fake_asl')
+        self.opt.set_executable(self.executable)
+        self.manager = SolverManagerFactory(self.name, workers=2)
+
+    def tearDown(self):
+        self.manager.deactivate()
+        self.opt.deactivate()
+        pyutilib.services.TempfileManager.tempdir = self.old_tempdir
+        # all temporary files are removed
+        self.assertEqual(os.listdir(self.tmpdir), ['fake_asl'])
+
+    def _values(self, model):
+        return [model.x[i].value for i in model.s]
+
+    def test_solve(self):
+        model = _generate_model()
+        results = self.manager.solve(model, opt=self.opt,
+                                     options={'value': 2.5})
+        self.assertEqual(results.solver.termination_condition,
+                         TerminationCondition.optimal)
+        self.assertEqual(len(results.solution), 0)
+        self.assertEqual(self._values(model), [2.5, 2.5, 2.5])
+        self.assertTrue(results.pyomo_solve_time >= 0)
+        # the solver options are not modified
+        self.assertFalse('value' in self.opt.options)
+
+    def test_load_solutions(self):
+        model = _generate_model()
+        results = self.manager.solve(model, opt=self.opt,
+                                     load_solutions=False)
+        self.assertEqual(self._values(model), [None, None, None])
+        self.assertEqual(len(results.solution), 1)
+        model.solutions.load_from(results)
+        self.assertEqual(self._values(model), [1, 1, 1])
+
+    def test_queue(self):
+        models = [_generate_model(size) for size in range(1, 6)]
+        handles = {}
+        for i, model in enumerate(models):
+            ah = self.manager.queue(model, opt=self.opt,
+                                    options={'value': i})
+            handles[ah] = i
+        self.assertEqual(self.manager.num_queued(), 5)
+        self.manager.wait_all()
+        self.assertEqual(self.manager.num_queued(), 0)
+        for ah, i in handles.items():
+            self.assertEqual(ah.status, ActionStatus.done)
+            self.assertTrue(self.manager.get_results(ah) is not None)
+            self.assertEqual(self._values(models[i]),
+                             [i]*(i+1))
+
+    def test_wait_any(self):
+        # the results are returned in the order in which the solves
+        # complete
+        slow = _generate_model()
+        fast = _generate_model()
+        ah_slow = self.manager.queue(slow, opt=self.opt,
+                                     options={'delay': 1, 'value': 1})
+        ah_fast = self.manager.queue(fast, opt=self.opt,
+                                     options={'value': 2})
+        self.assertEqual(self.manager.wait_any(), ah_fast)
+        self.assertEqual(self._values(fast), [2, 2, 2])
+        self.assertEqual(self.manager.wait_any(), ah_slow)
+        self.assertEqual(self._values(slow), [1, 1, 1])
+        self.assertRaises(ActionManagerError, self.manager.wait_any)
+
+    def test_wait_for(self):
+        models = [_generate_model() for i in range(4)]
+        handles = [self.manager.queue(model, opt=self.opt,
+                                      options={'delay': 0.2*(4-i)})
+                   for i, model in enumerate(models)]
+        results = self.manager.wait_for(handles[0])
+        self.assertEqual(results.solver.termination_condition,
+                         TerminationCondition.optimal)
+        self.assertEqual(handles[0].status, ActionStatus.done)
+        self.manager.wait_all(handles[1:])
+        self.assertEqual(self.manager.wait_any(handles[3]), handles[3])
+        for model in models:
+            self.assertEqual(self._values(model), [1, 1, 1])
+
+    def test_solver_name(self):
+        model = _generate_model()
+        self.assertRaises(ActionManagerError,
+                          self.manager.queue, model)
+
+    def test_error(self):
+        model = _generate_model()
+        ah = self.manager.queue(model, opt=self.opt, options={'rc': 1})
+        self.assertRaises(self.error, self.manager.wait_any)
+        self.assertEqual(ah.status, ActionStatus.error)
+        # the manager can still be used
+        self.manager.solve(model, opt=self.opt)
+        self.assertEqual(self._values(model), [1, 1, 1])
+
+    def test_done_callback(self):
+        model = _generate_model()
+        event = threading.Event()
+        done = []
+        def callback(ah):
+            done.append(ah)
+            event.set()
+        ah = self.manager.queue(model, opt=self.opt, options={'delay': 0.2})
+        notified = self.manager.add_done_callback(ah, callback)
+        if self.name == 'processpool':
+            # the manager cannot notify the completion of the action
+            self.assertFalse(notified)
+            self.assertEqual(done, [])
+        else:
+            self.assertTrue(notified)
+            event.wait(10)
+            self.assertEqual(done, [ah])
+        self.assertEqual(self.manager.wait_any(), ah)
+        # the action has completed
+        self.assertTrue(self.manager.add_done_callback(ah, callback))
+        self.assertEqual(done[-1], ah)
+
+    def test_solve_async(self):
+        models = [_generate_model() for i in range(3)]
+        futures = [self.opt.solve_async(model,
+                                        solver_manager=self.manager,
+                                        options={'value': i})
+                   for i, model in enumerate(models)]
+        for i, future in enumerate(futures):
+            self.assertTrue(isinstance(future, ActionFuture))
+            self.assertFalse(future.done())
+            results = future.result()
+            self.assertTrue(future.done())
+            self.assertTrue(future.result() is results)
+            self.assertEqual(results.solver.termination_condition,
+                             TerminationCondition.optimal)
+            self.assertEqual(self._values(models[i]), [i, i, i])
+
+    def test_await(self):
+        if not asyncio_available:
+            self.skipTest("This test requires asyncio (Python 3.5+)")
+        models = [_generate_model() for i in range(3)]
+        loop = asyncio.new_event_loop()
+        try:
+            asyncio.set_event_loop(loop)
+            futures = [self.opt.solve_async(model,
+                                            solver_manager=self.manager,
+                                            options={'delay': 0.2*(3-i),
+                                                     'value': i})
+                       for i, model in enumerate(models)]
+            order = []
+            tasks = [asyncio.ensure_future(future) for future in futures]
+            for i, task in enumerate(tasks):
+                task.add_done_callback(lambda task, i=i: order.append(i))
+            # the event loop is not blocked while the solves run
+            ticks = []
+            def tick():
+                ticks.append(None)
+                if len(order) < len(tasks):
+                    loop.call_later(0.05, tick)
+            loop.call_soon(tick)
+            loop.run_until_complete(asyncio.wait(tasks))
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+        for i, model in enumerate(models):
+            self.assertEqual(tasks[i].result().solver.termination_condition,
+                             TerminationCondition.optimal)
+            self.assertEqual(self._values(model), [i, i, i])
+        self.assertTrue(len(ticks) >= 5)
+        if self.name == 'threadpool':
+            # the results are collected as the solves complete
+            self.assertEqual(order, [2, 1, 0])
+
+class TestProcessPool(_LocalManagerTests, unittest.TestCase):
+    name = 'processpool'
+    error = ActionManagerError
+
+    def setUp(self):
+        if not fork_available():
+            self.skipTest("This test requires os.fork")
+        super(TestProcessPool, self).setUp()
+
+class TestThreadPool(_LocalManagerTests, unittest.TestCase):
+    name = 'threadpool'
+    error = pyutilib.common.ApplicationError
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+#  _________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright (c) 2014 Sandia Corporation.
+#  Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+#  the U.S. Government retains certain rights in this software.
+#  This software is distributed under the BSD License.
+#  _________________________________________________________________________
+#
+# Test the tmpfs option of SystemCallSolver, using a fake ASL solver
+# executable
+#
+
+import os
+import sys
+import shutil
+import tempfile
+
+import pyutilib.th as unittest
+import pyutilib.services
+
+from pyomo.core import ConcreteModel, Var, Objective, RangeSet
+from pyomo.opt import SolverFactory, TerminationCondition
+
+# Usage: fake_asl -s <problem>.nl
+_fake_asl = """#! %s
+import sys
+problem = sys.argv[2]
+with open(problem) as f:
+    f.readline()
+    n, m = [int(x) for x in f.readline().split()[:2]]
+with open(problem[:-3] + '.sol', 'w') as f:
+    f.write('fake_asl: solved\\n\\nOptions\\n3\\n0\\n0\\n0\\n')
+    f.write('%%d\\n0\\n%%d\\n%%d\\n' %% (m, n, n))
+    for i in range(n):
+        f.write('1\\n')
+    f.write('objno 0 0\\n')
+"""
+
+def _generate_model():
+    model = ConcreteModel()
+    model.s = RangeSet(3)
+    model.x = Var(model.s, bounds=(0, 10))
+    model.obj = Objective(expr=sum(model.x[i] for i in model.s))
+    return model
+
+class TestTmpfs(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        import pyomo.environ
+        cls.tmpdir = tempfile.mkdtemp()
+        cls.executable = os.path.join(cls.tmpdir, 'fake_asl')
+        with open(cls.executable, 'w') as f:
+            f.write(_fake_asl % sys.executable)
+        os.chmod(cls.executable, 0o755)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmpdir)
+
+    def setUp(self):
+        self.old_tempdir = pyutilib.services.TempfileManager.tempdir
+        pyutilib.services.TempfileManager.tempdir = self.tmpdir
+
+    def tearDown(self):
+        pyutilib.services.TempfileManager.tempdir = self.old_tempdir
+        # all temporary files are removed
+        self.assertEqual(os.listdir(self.tmpdir), ['fake_asl'])
+
+    def _solve(self, opt, **kwds):
+        model = _generate_model()
+        results = opt.solve(model, **kwds)
+        self.assertEqual(results.solver.termination_condition,
+                         TerminationCondition.optimal)
+        return [model.x[i].value for i in model.s]
+
+    def test_tmpfs(self):
+        tmpfs = tempfile.mkdtemp()
+        old_tmpfs = os.environ.get('PYOMO_TMPFS')
+        os.environ['PYOMO_TMPFS'] = tmpfs
+        try:
+            with SolverFactory('asl:fake_asl') as opt:
+                opt.set_executable(self.executable)
+                self.assertEqual(self._solve(opt, tmpfs=True), [1, 1, 1])
+                self.assertEqual(
+                    os.path.dirname(opt._problem_files[0]), tmpfs)
+                self.assertEqual(
+                    pyutilib.services.TempfileManager.tempdir, self.tmpdir)
+            self.assertEqual(os.listdir(tmpfs), [])
+        finally:
+            if old_tmpfs is None:
+                del os.environ['PYOMO_TMPFS']
+            else:
+                os.environ['PYOMO_TMPFS'] = old_tmpfs
+            shutil.rmtree(tmpfs)
+
+if __name__ == "__main__":
+    unittest.main()
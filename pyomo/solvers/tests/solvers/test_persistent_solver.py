@@ -0,0 +1,317 @@
+#  _________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright (c) 2014 Sandia Corporation.
+#  Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+#  the U.S. Government retains certain rights in this software.
+#  This software is distributed under the BSD License.
+#  _________________________________________________________________________
+#
+# Test the change tracking of DirectPersistentSolver, using a mock
+# native model that records the calls made by the plugin
+#
+
+import pyutilib.th as unittest
+from pyutilib.misc import Bunch
+
+from pyomo.opt import *
+from pyomo.environ import *
+from pyomo.solvers.plugins.solvers.persistent_solver import \
+    DirectPersistentSolver
+
+try:
+    import gurobipy
+    gurobipy_available = True
+except ImportError:
+    gurobipy_available = False
+
+class MockPersistent(DirectPersistentSolver):
+    """
+    A persistent solver plugin that stores the native model in
+    dictionaries. The solution assigns each variable its lower bound
+    (or 0).
+    """
+
+    def __init__(self, **kwds):
+        kwds['type'] = 'mock_persistent'
+        DirectPersistentSolver.__init__(self, **kwds)
+        self.calls = []
+
+    def available(self, exception_flag=True):
+        return True
+
+    def _native_create_model(self, name):
+        self.calls.append(('create_model', name))
+        self.cols = []
+        self.rows = {}
+        self.objective = None
+        self._next_row = 0
+
+    def _native_add_var(self, label, lb, ub, domain):
+        self.calls.append(('add_var', label))
+        self.cols.append([label, lb, ub, domain])
+        return len(self.cols) - 1
+
+    def _native_set_var_bounds(self, handle, lb, ub):
+        self.calls.append(('set_var_bounds', self.cols[handle][0], lb, ub))
+        self.cols[handle][1:3] = [lb, ub]
+
+    def _native_add_constraint(self, label, coefs, handles, lb, ub):
+        self.calls.append(('add_constraint', label))
+        self._next_row += 1
+        self.rows[self._next_row] = [label, dict(zip(handles, coefs)), lb, ub]
+        return self._next_row
+
+    def _native_remove_constraint(self, handle):
+        self.calls.append(('remove_constraint', self.rows[handle][0]))
+        del self.rows[handle]
+
+    def _native_set_constraint_bounds(self, handle, lb, ub):
+        self.calls.append(('set_constraint_bounds', self.rows[handle][0],
+                           lb, ub))
+        self.rows[handle][2:4] = [lb, ub]
+
+    def _native_set_objective(self, minimize, constant, linear, quadratic):
+        self.calls.append(('set_objective',))
+        self.objective = (minimize, constant, dict((h, c) for c, h in linear))
+
+    def _native_solve(self):
+        self.calls.append(('solve',))
+        minimize, constant, linear = self.objective
+        values = self._native_get_values(range(len(self.cols)))
+        return Bunch(termination_condition=TerminationCondition.optimal,
+                     solution_status=SolutionStatus.optimal,
+                     message=None,
+                     objective_value=constant + sum(
+                         coef*values[h] for h, coef in linear.items()),
+                     solver_name="mock")
+
+    def _native_get_values(self, handles):
+        return [self.cols[h][1] or 0.0 for h in handles]
+
+    def _native_get_reduced_costs(self, handles):
+        return [0.0 for h in handles]
+
+    def _native_get_duals(self, handles):
+        return [float(h) for h in handles]
+
+def _generate_model():
+    model = ConcreteModel()
+    model.s = RangeSet(3)
+    model.x = Var(model.s, bounds=(1, 10))
+    model.y = Var(within=Binary)
+    model.p = Param(mutable=True, initialize=5)
+    model.obj = Objective(expr=summation(model.x) + model.y)
+    model.c = Constraint(model.s,
+                         rule=lambda m, i: m.x[i] + 2*m.y <= m.p + i)
+    model.r = Constraint(expr=(0, model.x[1] - model.x[2] + 1, 4))
+    return model
+
+class PersistentSolverTests(unittest.TestCase):
+
+    def setUp(self):
+        self.opt = MockPersistent()
+        self.model = _generate_model()
+        self.opt.compile_instance(self.model)
+        del self.opt.calls[:]
+
+    def tearDown(self):
+        self.opt.deactivate()
+
+    def _row(self, con):
+        return self.opt.rows[self.opt._con_handles[con]]
+
+    def _col(self, var):
+        return self.opt.cols[self.opt._var_handles[var]]
+
+    def test_compile(self):
+        opt = MockPersistent()
+        model = _generate_model()
+        self.assertFalse(opt.instance_compiled())
+        opt.compile_instance(model)
+        self.assertTrue(opt.instance_compiled())
+        self.assertEqual(len(opt.cols), 4)
+        self.assertEqual(len(opt.rows), 4)
+        self.assertEqual(self._col(self.model.y)[1:], [0, 1, 'binary'])
+        self.assertEqual(opt.calls[-1], ('set_objective',))
+        # the constant of the body is moved to the bounds
+        row = opt.rows[opt._con_handles[model.r]]
+        self.assertEqual(row[2:], [-1, 3])
+        self.assertEqual(sorted(row[1].values()), [-1, 1])
+
+    def test_solve(self):
+        self.model.dual = Suffix(direction=Suffix.IMPORT)
+        results = self.opt.solve(self.model, suffixes=['dual'])
+        self.assertEqual(results.solver.termination_condition,
+                         TerminationCondition.optimal)
+        self.assertEqual([self.model.x[i].value for i in self.model.s],
+                         [1, 1, 1])
+        self.assertEqual(self.model.y.value, 0)
+        self.assertEqual(value(self.model.obj), 3)
+        self.assertEqual(self.model.dual[self.model.r],
+                         self.opt._con_handles[self.model.r])
+        # nothing changed, nothing is pushed
+        self.assertEqual(self.opt.calls, [('solve',)])
+        del self.opt.calls[:]
+        self.opt.solve(self.model)
+        self.assertEqual(self.opt.calls, [('solve',)])
+
+    def test_update_var_bounds(self):
+        self.model.x[2].setlb(2)
+        self.model.x[3].setub(None)
+        self.opt.update_var_bounds(self.model.x)
+        self.assertEqual(self._col(self.model.x[2])[1:3], [2, 10])
+        self.assertEqual(self._col(self.model.x[3])[1:3], [1, None])
+        self.assertEqual([call[0] for call in self.opt.calls],
+                         ['set_var_bounds']*2)
+
+    def test_fix_var(self):
+        self.model.x[1].fix(4)
+        self.opt.solve(self.model)
+        self.assertEqual(self._col(self.model.x[1])[1:3], [4, 4])
+        self.assertEqual(self.model.x[1].value, 4)
+        # the fixed variable is compiled out of the constraints that
+        # contain it, and of the objective
+        self.assertEqual(sorted(call[1] for call in self.opt.calls
+                                if call[0] == 'add_constraint'),
+                         sorted(self.opt._symbol_map.byObject[id(con)]
+                                for con in (self.model.c[1], self.model.r)))
+        self.assertTrue(('set_objective',) in self.opt.calls)
+        self.assertEqual(self._row(self.model.r)[2:], [-5, -1])
+        self.assertEqual(self._row(self.model.c[1])[2:], [None, 2])
+        self.assertEqual(self.opt.objective[1], 4)
+        # changing the fixed value
+        del self.opt.calls[:]
+        self.model.x[1].value = 5
+        self.opt.update_var_bounds()
+        self.assertEqual(self._row(self.model.c[1])[2:], [None, 1])
+        self.assertEqual(self.opt.objective[1], 5)
+        # freeing the variable
+        self.model.x[1].unfix()
+        self.opt.update_var_bounds()
+        self.assertEqual(self._col(self.model.x[1])[1:3], [1, 10])
+        self.assertEqual(self._row(self.model.c[1])[2:], [None, 6])
+        self.assertEqual(self.opt.objective[1], 0)
+
+    def test_update_rhs(self):
+        self.model.p = 7
+        self.opt.update_rhs()
+        self.assertEqual([call[:2] for call in self.opt.calls],
+                         [('set_constraint_bounds',
+                           self.opt._symbol_map.byObject[id(self.model.c[i])])
+                          for i in self.model.s])
+        self.assertEqual(self._row(self.model.c[2])[2:], [None, 9])
+        # a change of the type of bound adds the constraint again
+        del self.opt.calls[:]
+        self.model.r._upper = None
+        self.opt.update_rhs(self.model.r)
+        self.assertEqual([call[0] for call in self.opt.calls],
+                         ['remove_constraint', 'add_constraint'])
+        self.assertEqual(self._row(self.model.r)[2:], [-1, None])
+
+    def test_rhs_constraints(self):
+        # only the constraints whose bounds depend on the parameter
+        # are checked by update_rhs()
+        self.assertEqual(sorted(con.cname(True)
+                                for con in self.opt._rhs_cons),
+                         ['c[1]', 'c[2]', 'c[3]'])
+        self.model.r._upper = 5
+        self.opt.update_rhs()
+        self.assertEqual(self.opt.calls, [])
+        self.assertEqual(self._row(self.model.r)[2:], [-1, 3])
+
+    def test_variable_constraints(self):
+        # the compiled constraints that contain each variable
+        self.assertEqual(sorted(con.cname(True) for con in
+                                self.opt._var_cons[self.model.x[1]]),
+                         ['c[1]', 'r'])
+        self.assertEqual(len(self.opt._var_cons[self.model.y]), 3)
+        # fixing a variable only compiles those constraints again
+        self.model.x[3].fix(2)
+        self.opt.update_var_bounds(self.model.x[3])
+        self.assertEqual([call[0] for call in self.opt.calls],
+                         ['set_var_bounds', 'remove_constraint',
+                          'add_constraint', 'set_objective'])
+        self.assertEqual(self.opt.calls[2][1],
+                         self.opt._symbol_map.byObject[id(self.model.c[3])])
+        # the fixed variable is still recorded, so freeing it compiles
+        # the constraint again
+        self.assertEqual(len(self.opt._var_cons[self.model.x[3]]), 1)
+        self.assertEqual(self._row(self.model.c[3])[2:], [None, 6])
+        self.model.x[3].unfix()
+        self.opt.update_var_bounds(self.model.x[3])
+        self.assertEqual(self._row(self.model.c[3])[2:], [None, 8])
+        # removing the constraints removes them from the map
+        self.opt.remove_constraint(self.model.c)
+        self.assertFalse(self.model.x[3] in self.opt._var_cons)
+        self.assertFalse(self.model.y in self.opt._var_cons)
+        self.assertEqual(len(self.opt._var_cons[self.model.x[1]]), 1)
+
+    def test_add_remove_constraint(self):
+        self.model.d = Constraint(self.model.s,
+                                  rule=lambda m, i: m.x[i] >= m.y)
+        self.opt.add_constraint(self.model.d)
+        self.assertEqual([call[0] for call in self.opt.calls],
+                         ['add_constraint']*3)
+        self.assertEqual(len(self.opt.rows), 7)
+        self.assertRaises(ValueError, self.opt.add_constraint,
+                          self.model.d[1])
+        del self.opt.calls[:]
+        self.opt.remove_constraint(self.model.c)
+        self.assertEqual([call[0] for call in self.opt.calls],
+                         ['remove_constraint']*3)
+        self.assertEqual(len(self.opt.rows), 4)
+        self.assertFalse(id(self.model.c[1]) in
+                         self.opt._symbol_map.byObject)
+        self.assertRaises(ValueError, self.opt.remove_constraint,
+                          self.model.c[1])
+
+    def test_update(self):
+        self.model.c[2].deactivate()
+        self.model.d = Constraint(expr=self.model.x[1] >= self.model.y)
+        self.model.z = Var(bounds=(2, 3))
+        self.model.e = Constraint(expr=self.model.z <= 3)
+        self.opt.update()
+        self.assertEqual(sorted(call[0] for call in self.opt.calls),
+                         ['add_constraint', 'add_constraint', 'add_var',
+                          'remove_constraint'])
+        self.assertEqual(len(self.opt.rows), 5)
+        # a new objective
+        del self.opt.calls[:]
+        self.model.obj.deactivate()
+        self.model.obj2 = Objective(expr=self.model.z, sense=maximize)
+        self.opt.solve(self.model)
+        self.assertEqual(self.opt.calls, [('set_objective',), ('solve',)])
+        self.assertEqual(self.opt.objective[0], False)
+        self.assertEqual(self.model.z.value, 2)
+
+    def test_nonlinear(self):
+        self.model.n = Constraint(expr=self.model.x[1]**2 <= 4)
+        self.assertRaises(ValueError, self.opt.add_constraint, self.model.n)
+        self.model.obj.deactivate()
+        self.model.obj2 = Objective(expr=self.model.x[1]**2)
+        self.assertRaises(ValueError, self.opt.set_objective)
+
+    def test_compile_variable_bounds(self):
+        self.model.x[1].setub(5)
+        self.model.x[2].setub(5)
+        self.opt.compile_variable_bounds(self.model, [('x', 1)])
+        self.assertEqual(self._col(self.model.x[1])[1:3], [1, 5])
+        self.assertEqual(self._col(self.model.x[2])[1:3], [1, 10])
+        self.opt.compile_variable_bounds(self.model, [])
+        self.assertEqual(self._col(self.model.x[2])[1:3], [1, 5])
+
+    @unittest.skipIf(not gurobipy_available,
+                     "The 'gurobipy' python bindings are not available")
+    def test_gurobi_resolve(self):
+        model = _generate_model()
+        model.obj.sense = maximize
+        with SolverFactory("_gurobi_persistent") as opt:
+            opt.solve(model)
+            self.assertAlmostEqual(value(model.obj), 19.0)
+            model.p = 3
+            opt.solve(model)
+            self.assertAlmostEqual(value(model.obj), 16.0)
+
+if __name__ == "__main__":
+    unittest.main()
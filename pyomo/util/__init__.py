@@ -10,3 +10,4 @@
 from pyomo.util._task import pyomo_api, PyomoAPIData, PyomoAPIFactory
 from pyomo.util._command import pyomo_command, get_pyomo_commands
 from pyomo.util._config import *
+from pyomo.util._fork import fork_available, fork_context
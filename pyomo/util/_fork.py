@@ -0,0 +1,44 @@
+#  _________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright (c) 2014 Sandia Corporation.
+#  Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+#  the U.S. Government retains certain rights in this software.
+#  This software is distributed under the BSD License.
+#  _________________________________________________________________________
+
+#
+# Helpers for the code that shares a model with worker processes by
+# forking them (so the model is never pickled), e.g., the
+# 'processpool' solver manager and the parallel mode of the repn
+# preprocessors.
+#
+
+import os
+import multiprocessing
+
+__all__ = ['fork_available', 'fork_context']
+
+def fork_available():
+    """
+    Returns True if worker processes can be forked.
+    """
+    if not hasattr(os, 'fork'):
+        return False
+    get_all_start_methods = getattr(multiprocessing,
+                                    'get_all_start_methods',
+                                    None)
+    if get_all_start_methods is None:
+        # Python 2: multiprocessing always forks on POSIX systems
+        return True
+    return 'fork' in get_all_start_methods()
+
+def fork_context():
+    """
+    Returns the multiprocessing context (or module, for Python 2)
+    whose Pool and Process objects fork the worker processes.
+    """
+    get_context = getattr(multiprocessing, 'get_context', None)
+    if get_context is None:
+        return multiprocessing
+    return get_context('fork')
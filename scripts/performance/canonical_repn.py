@@ -0,0 +1,105 @@
+#  _________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright (c) 2014 Sandia Corporation.
+#  Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+#  the U.S. Government retains certain rights in this software.
+#  This software is distributed under the BSD License.
+#  _________________________________________________________________________
+#
+# A script to compare the time spent generating canonical
+# representations for indexed constraints with and without the linear
+# expression template cache (see set_linear_template_cache in
+# pyomo.repn.canonical_repn).
+#
+# The models are the p-median example used by the pyomo.core tests
+# (pyomo/core/tests/examples/pmedian.py) and a few synthetic indexed
+# constraints with common rule shapes.
+#
+#   python canonical_repn.py [--size=N] [--repeat=N]
+#
+
+import argparse
+import os
+import time
+
+import pyomo.core
+from pyomo.environ import (ConcreteModel, RangeSet, Var, Param,
+                           Constraint, Objective, summation)
+from pyomo.repn.canonical_repn import (generate_canonical_repn,
+                                       set_linear_template_cache)
+
+pmedian_dir = os.path.join(os.path.dirname(os.path.abspath(pyomo.core.__file__)),
+                           "tests", "examples")
+
+def pmedian_model(size):
+    import imp
+    pmedian = imp.load_source("pmedian",
+                              os.path.join(pmedian_dir, "pmedian.py"))
+    return pmedian.model.create_instance(
+        os.path.join(pmedian_dir, "pmedian.dat"))
+
+def synthetic_model(size):
+    model = ConcreteModel()
+    model.I = RangeSet(size)
+    model.J = RangeSet(20)
+    model.x = Var(model.I, model.J)
+    model.y = Var(model.I, model.J)
+    model.a = Param(model.I, model.J, mutable=True,
+                    initialize=lambda m, i, j: i*0.5 + j)
+    model.b = Param(model.I, model.J,
+                    initialize=lambda m, i, j: i*0.5 + j)
+    model.obj = Objective(expr=summation(model.x))
+    # a sum of variables with numeric coefficients
+    model.fixed_coef = Constraint(
+        model.I,
+        rule=lambda m, i: sum(m.b[i,j]*m.x[i,j] for j in m.J) <= 1)
+    # a sum of variables with mutable parameter coefficients
+    model.param_coef = Constraint(
+        model.I,
+        rule=lambda m, i: sum(m.a[i,j]*m.x[i,j] for j in m.J) <= 1)
+    # parameters multiplying sums of variables
+    model.param_sum = Constraint(
+        model.I,
+        rule=lambda m, i: sum(m.a[i,j]*(m.x[i,j] - m.y[i,j])
+                              for j in m.J) \
+            + 2*sum(m.y[i,j] for j in m.J) <= m.a[i,1])
+    return model
+
+def time_constraints(model, repeat):
+    results = []
+    for constraint in model.component_objects(Constraint, active=True):
+        bodies = [cdata.body for cdata in constraint.values()]
+        best = None
+        for i in range(repeat):
+            start = time.time()
+            idMap = {}
+            for body in bodies:
+                generate_canonical_repn(body, idMap=idMap)
+            stop = time.time()
+            if (best is None) or (stop - start < best):
+                best = stop - start
+        results.append((constraint.cname(True), len(bodies), best))
+    return results
+
+def main(args=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size', type=int, default=5000,
+                        help="number of indices of the synthetic constraints")
+    parser.add_argument('--repeat', type=int, default=3)
+    options = parser.parse_args(args=args)
+
+    print("%-30s %8s %12s %12s %8s"
+          % ("constraint", "rows", "default (s)", "template (s)", "speedup"))
+    for create in (pmedian_model, synthetic_model):
+        model = create(options.size)
+        set_linear_template_cache(False)
+        baseline = time_constraints(model, options.repeat)
+        set_linear_template_cache(True)
+        templates = time_constraints(model, options.repeat)
+        for (name, rows, base), (_, _, test) in zip(baseline, templates):
+            print("%-30s %8d %12.3f %12.3f %8.2f"
+                  % (name, rows, base, test, base/test))
+
+if __name__ == "__main__":
+    main()
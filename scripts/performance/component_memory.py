@@ -0,0 +1,133 @@
+#  _________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright (c) 2014 Sandia Corporation.
+#  Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+#  the U.S. Government retains certain rights in this software.
+#  This software is distributed under the BSD License.
+#  _________________________________________________________________________
+#
+# A script to report the memory used per index by the component data
+# objects of Var, Constraint and Param, and by the compact
+# alternatives for each of them:
+#
+#   - Var: one _GeneralVarData per index versus columnar storage
+#     (Var(..., columnar=True))
+#   - Param: mutable (one _ParamData per index) versus mutable with
+#     compact storage (Param(..., compact=True), the values are
+#     stored directly and the data objects are created on demand)
+#     and immutable (the values are stored directly)
+#   - Constraint: one _GeneralConstraintData and body expression per
+#     index versus a MatrixConstraint (CSR arrays shared by
+#     lightweight row objects, see compile_block_linear_constraints)
+#   - the canonical representation stored for each constraint by
+#     preprocess_block_constraints
+#
+# The size of a component is the total size (sys.getsizeof) of all
+# objects that are reachable from it and that were not already
+# reachable from the model before it was added, so the variables
+# referenced by a constraint are not counted against the constraint.
+#
+#   python component_memory.py [--size=N]
+#
+
+import argparse
+import gc
+import sys
+import types
+
+from pyomo.environ import (ConcreteModel, RangeSet, Var, Param,
+                           Constraint, Objective, summation)
+from pyomo.repn.beta.matrix import compile_block_linear_constraints
+from pyomo.repn.compute_canonical_repn import preprocess_block_constraints
+
+_shared_types = (type, types.ModuleType, types.FunctionType,
+                 types.BuiltinFunctionType, types.MethodType)
+
+def _reachable(roots, exclude=None):
+    """
+    Return a dict mapping id -> object for all objects reachable from
+    roots (following gc.get_referents), skipping the objects in
+    exclude, classes, modules and functions.
+    """
+    if exclude is None:
+        exclude = {}
+    seen = {}
+    stack = list(roots)
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or id(obj) in exclude:
+            continue
+        if isinstance(obj, _shared_types):
+            continue
+        seen[id(obj)] = obj
+        stack.extend(gc.get_referents(obj))
+    return seen
+
+def component_size(obj, shared):
+    """
+    Return the total size of the objects reachable from obj that are
+    not reachable from the shared objects.
+    """
+    gc.collect()
+    return sum(sys.getsizeof(x)
+               for x in _reachable([obj], _reachable(shared)).values())
+
+def create_model(size):
+    model = ConcreteModel()
+    model.I = RangeSet(size)
+    model.J = RangeSet(5)
+    model.y = Var(model.I, model.J, bounds=(0, 10))
+    model.obj = Objective(expr=summation(model.y))
+    return model
+
+def _p_rule(model, i):
+    return 0.5*i + 0.1
+
+def _c_rule(model, i):
+    return sum((j+0.5)*model.y[i,j] for j in model.J) >= 1
+
+def main(args=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size', type=int, default=50000,
+                        help="number of indices of each component")
+    options = parser.parse_args(args=args)
+    size = options.size
+
+    def report(name, obj, shared):
+        print("%-36s %12.1f"
+              % (name, component_size(obj, shared) / float(size)))
+
+    print("%-36s %12s" % ("component", "bytes/index"))
+
+    model = create_model(size)
+    shared = [model.I, model.J, model.y]
+    # each variable has a distinct value, as it would after loading a
+    # solution
+    model.x = Var(model.I, bounds=(0, 10), initialize=_p_rule)
+    report("Var", model.x, shared)
+    model.z = Var(model.I, bounds=(0, 10), initialize=_p_rule,
+                  columnar=True)
+    report("Var (columnar)", model.z, shared)
+    model.p = Param(model.I, initialize=_p_rule, mutable=True)
+    report("Param (mutable)", model.p, shared)
+    model.r = Param(model.I, initialize=_p_rule, mutable=True,
+                    compact=True)
+    report("Param (mutable, compact)", model.r, shared)
+    model.q = Param(model.I, initialize=_p_rule)
+    report("Param (immutable)", model.q, shared)
+
+    model.c = Constraint(model.I, rule=_c_rule)
+    report("Constraint (5 terms per row)", model.c, shared)
+    preprocess_block_constraints(model)
+    report("  canonical repn of each row",
+           model._canonical_repn, shared + [model.c])
+
+    model = create_model(size)
+    model.c = Constraint(model.I, rule=_c_rule)
+    compile_block_linear_constraints(model, "_matrix")
+    report("MatrixConstraint (5 terms per row)",
+           model._matrix, [model.I, model.J, model.y])
+
+if __name__ == "__main__":
+    main()
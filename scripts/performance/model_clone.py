@@ -0,0 +1,110 @@
+#  _________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright (c) 2014 Sandia Corporation.
+#  Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+#  the U.S. Government retains certain rights in this software.
+#  This software is distributed under the BSD License.
+#  _________________________________________________________________________
+#
+# A script to compare the time and memory of Block.clone() with the
+# generic copy.deepcopy() path it replaces, for a model with indexed
+# variables, mutable parameters, constraints and expressions.
+#
+# The generic path is restored for the comparison by removing the
+# specialized __deepcopy__ methods of Component and of the expression
+# classes, and by copying the state of component data with deepcopy()
+# (as ComponentData.__deepcopy__ used to).
+#
+# The memory of a clone is the total size of the objects reachable
+# from it that are not reachable from the original model (see
+# component_memory.py).
+#
+#   python model_clone.py [--size=N] [--repeat=R]
+#
+
+import argparse
+import copy
+import time
+
+from pyomo.environ import (ConcreteModel, RangeSet, Var, Param,
+                           Constraint, Expression, Objective, Binary,
+                           summation)
+import pyomo.core.base.component
+from pyomo.core.base.component import Component
+from pyomo.core.base import expr as EXPR
+
+from component_memory import component_size
+
+class generic_deepcopy(object):
+    """
+    A context manager that restores the generic deepcopy() path of
+    Block.clone().
+    """
+
+    def __enter__(self):
+        self._expression_base = EXPR._ExpressionBase
+        self._methods = [(cls, cls.__dict__['__deepcopy__'])
+                         for cls in (Component, self._expression_base)]
+        for cls, method in self._methods:
+            delattr(cls, '__deepcopy__')
+        self._deepcopy_state = pyomo.core.base.component._deepcopy_state
+        pyomo.core.base.component._deepcopy_state = copy.deepcopy
+        return self
+
+    def __exit__(self, t, v, traceback):
+        for cls, method in self._methods:
+            setattr(cls, '__deepcopy__', method)
+        pyomo.core.base.component._deepcopy_state = self._deepcopy_state
+
+def create_model(size):
+    model = ConcreteModel()
+    model.I = RangeSet(size)
+    model.J = RangeSet(3)
+    model.p = Param(model.I, initialize=lambda m, i: i, mutable=True)
+    model.x = Var(model.I, model.J, bounds=(0, 10), initialize=1)
+    model.y = Var(model.I, within=Binary)
+    model.c = Constraint(model.I, rule=lambda m, i:
+                         sum(m.p[i]*m.x[i,j] for j in m.J) + 2*m.y[i] <= 5)
+    model.e = Expression(model.I, rule=lambda m, i: m.x[i,1]**2)
+    model.obj = Objective(expr=summation(model.y))
+    return model
+
+def time_clone(model, repeat):
+    best = None
+    for i in range(repeat):
+        start = time.time()
+        clone = model.clone()
+        elapsed = time.time() - start
+        if (best is None) or (elapsed < best):
+            best = elapsed
+    return best, clone
+
+def main(args=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size', type=int, default=20000,
+                        help="number of indices of each component")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="number of clones timed (the best is "
+                        "reported)")
+    options = parser.parse_args(args=args)
+
+    start = time.time()
+    model = create_model(options.size)
+    print("%-24s %10.3f s" % ("model construction", time.time() - start))
+
+    with generic_deepcopy():
+        generic_time, clone = time_clone(model, options.repeat)
+        generic_size = component_size(clone, [model])
+    del clone
+    fast_time, clone = time_clone(model, options.repeat)
+    fast_size = component_size(clone, [model])
+
+    print("%-24s %10.3f s %10.1f bytes/index"
+          % ("clone (deepcopy)", generic_time,
+             generic_size / float(options.size)))
+    print("%-24s %10.3f s %10.1f bytes/index"
+          % ("clone", fast_time, fast_size / float(options.size)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#  _________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright (c) 2014 Sandia Corporation.
+#  Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+#  the U.S. Government retains certain rights in this software.
+#  This software is distributed under the BSD License.
+#  _________________________________________________________________________
+#
+# A script to compare the size of the serialization of a model and
+# the time to write and read it, for the binary format of
+# pyomo.core.base.serialize and for (c)Pickle, for a model with
+# indexed variables, mutable parameters, constraints and expressions.
+#
+#   python model_serialize.py [--size=N] [--repeat=R]
+#
+
+import argparse
+import time
+
+from six.moves import cPickle as pickle
+
+from pyomo.environ import (ConcreteModel, RangeSet, Var, Param,
+                           Constraint, Expression, Objective, Binary,
+                           summation, dumps_model, loads_model)
+
+# The rules are module functions (lambdas can not be pickled)
+def p_init(model, i):
+    return i
+def c_rule(model, i):
+    return sum(model.p[i]*model.x[i,j] for j in model.J) + 2*model.y[i] <= 5
+def e_rule(model, i):
+    return model.x[i,1]**2
+
+def create_model(size):
+    model = ConcreteModel()
+    model.I = RangeSet(size)
+    model.J = RangeSet(3)
+    model.p = Param(model.I, initialize=p_init, mutable=True)
+    model.x = Var(model.I, model.J, bounds=(0, 10), initialize=1)
+    model.y = Var(model.I, within=Binary)
+    model.c = Constraint(model.I, rule=c_rule)
+    model.e = Expression(model.I, rule=e_rule)
+    model.obj = Objective(expr=summation(model.y))
+    return model
+
+def best_time(f, arg, repeat):
+    best = None
+    for i in range(repeat):
+        start = time.time()
+        ans = f(arg)
+        elapsed = time.time() - start
+        if (best is None) or (elapsed < best):
+            best = elapsed
+    return best, ans
+
+def main(args=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size', type=int, default=20000,
+                        help="number of indices of each component")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="number of times each operation is timed "
+                        "(the best time is reported)")
+    options = parser.parse_args(args=args)
+
+    start = time.time()
+    model = create_model(options.size)
+    print("%-24s %10.3f s" % ("model construction", time.time() - start))
+
+    def pickle_dumps(model):
+        return pickle.dumps(model, pickle.HIGHEST_PROTOCOL)
+    for name, dumps, loads in (("pickle", pickle_dumps, pickle.loads),
+                               ("binary", dumps_model, loads_model)):
+        dump_time, data = best_time(dumps, model, options.repeat)
+        load_time, tmp = best_time(loads, data, options.repeat)
+        del tmp
+        print("%-24s %10.3f s %10.3f s %12d bytes"
+              % (name+" (write, read)", dump_time, load_time, len(data)))
+
+if __name__ == "__main__":
+    main()
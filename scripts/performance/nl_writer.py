@@ -0,0 +1,128 @@
+#  _________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright (c) 2014 Sandia Corporation.
+#  Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+#  the U.S. Government retains certain rights in this software.
+#  This software is distributed under the BSD License.
+#  _________________________________________________________________________
+#
+# A script to compare the wall time and peak memory of the NL writer
+# with those of the NL writer of another Pyomo source tree (e.g., the
+# tree before the Jacobian of the writer was buffered in CSR arrays).
+# The NL writer of this tree is run when the ampl representations are
+# stored on the model (the default) and when they are discarded as the
+# file is written (io_options={'store_ampl_repn': False}).
+#
+# The baseline is the directory that contains the pyomo package of
+# the other source tree, e.g., created with
+#
+#   git worktree add /tmp/pyomo-baseline <revision>
+#   python nl_writer.py --baseline=/tmp/pyomo-baseline
+#
+# Each configuration is run in a separate process so that the peak
+# resident set size reported by the OS is not shared between them,
+# and so that the baseline imports its own pyomo package. The script
+# also reports whether the NL files are identical to the first one.
+#
+#   python nl_writer.py [--rows=N] [--cols=N] [--nnz=N] [--baseline=DIR]
+#
+
+import argparse
+import hashlib
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+def create_model(rows, cols, nnz):
+    from pyomo.environ import (ConcreteModel, RangeSet, Var, Objective,
+                               Constraint, NonNegativeReals, summation)
+    random.seed(1000)
+    model = ConcreteModel()
+    model.I = RangeSet(rows)
+    model.J = RangeSet(cols)
+    model.x = Var(model.J, within=NonNegativeReals, initialize=1.0)
+    model.obj = Objective(expr=summation(model.x))
+    def c_rule(model, i):
+        cols = random.sample(range(1, len(model.J)+1), nnz)
+        return sum(random.random()*model.x[j] for j in cols) >= 1
+    model.c = Constraint(model.I, rule=c_rule)
+    # a handful of nonlinear rows
+    def nl_rule(model, i):
+        return model.x[i]*model.x[i+1] <= 10
+    model.nl = Constraint(RangeSet(min(rows, cols-1)//100), rule=nl_rule)
+    return model
+
+def _peak_rss():
+    # ru_maxrss is reported in kilobytes on Linux and bytes on OS X
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        rss /= 1024.0
+    return rss / 1024.0
+
+def run(path, io_options, rows, cols, nnz, queue):
+    if path is not None:
+        # import the pyomo package of the baseline source tree
+        sys.path.insert(0, path)
+    from pyomo.opt import ProblemFormat
+    model = create_model(rows, cols, nnz)
+    baseline_rss = _peak_rss()
+    fd, filename = tempfile.mkstemp(suffix='.nl')
+    os.close(fd)
+    start = time.time()
+    model.write(filename=filename,
+                format=ProblemFormat.nl,
+                io_options=io_options)
+    stop = time.time()
+    with open(filename, 'rb') as f:
+        digest = hashlib.md5(f.read()).hexdigest()
+    os.remove(filename)
+    queue.put((stop-start, baseline_rss, _peak_rss(), digest))
+
+def main(args=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--cols', type=int, default=50000)
+    parser.add_argument('--nnz', type=int, default=5,
+                        help="nonzeros per row")
+    parser.add_argument('--baseline', default=None,
+                        help="directory of the pyomo source tree whose "
+                        "NL writer is the baseline")
+    options = parser.parse_args(args=args)
+
+    configurations = []
+    if options.baseline is not None:
+        if not os.path.isdir(os.path.join(options.baseline, 'pyomo')):
+            parser.error("No pyomo package found in the baseline "
+                         "directory %s" % (options.baseline))
+        # the baseline writer may not support the store_ampl_repn option
+        configurations.append(("baseline",
+                               os.path.abspath(options.baseline), {}))
+    configurations.append(("store_ampl_repn=True",
+                           None, {'store_ampl_repn': True}))
+    configurations.append(("store_ampl_repn=False",
+                           None, {'store_ampl_repn': False}))
+
+    print("%-22s %10s %14s %14s %10s"
+          % ("writer", "write (s)", "model (MB)", "peak (MB)", "same file"))
+    first_digest = None
+    for name, path, io_options in configurations:
+        queue = multiprocessing.Queue()
+        p = multiprocessing.Process(
+            target=run,
+            args=(path, io_options,
+                  options.rows, options.cols, options.nnz, queue))
+        p.start()
+        wall, model_rss, peak_rss, digest = queue.get()
+        p.join()
+        if first_digest is None:
+            first_digest = digest
+        print("%-22s %10.2f %14.1f %14.1f %10s"
+              % (name, wall, model_rss, peak_rss, digest == first_digest))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#  _________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright (c) 2014 Sandia Corporation.
+#  Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+#  the U.S. Government retains certain rights in this software.
+#  This software is distributed under the BSD License.
+#  _________________________________________________________________________
+#
+# A script to compare the time of the common operations on the
+# virtual sets created by set operators, with and without the cache of
+# their elements:
+#
+#   construction  construct a variable and a parameter indexed by the
+#                 union of two sets
+#   len           call len() on the index set once per 1000 elements
+#   membership    test the membership of each element in the index set
+#   product       test the membership of each element of the product
+#                 of the index set and another set
+#
+# The uncached operations are timed by disabling the version tracking
+# of the operand sets (see _SetOperator._set_version).
+#
+#   python set_operators.py [--size=N]
+#
+
+import argparse
+import time
+
+from pyomo.environ import ConcreteModel, Set, Var, Param
+from pyomo.core.base.sets import _SetOperator
+
+class uncached(object):
+    """
+    A context manager that disables the cache of the elements of the
+    sets created by set operators.
+    """
+
+    def __enter__(self):
+        self._set_version = _SetOperator.__dict__['_set_version']
+        _SetOperator._set_version = lambda self: None
+        return self
+
+    def __exit__(self, t, v, traceback):
+        _SetOperator._set_version = self._set_version
+
+def p_init(model, i):
+    return i
+
+def run(size):
+    ans = []
+    model = ConcreteModel()
+    model.A = Set(initialize=range(size), ordered=True)
+    model.B = Set(initialize=range(size//2, size + size//2), ordered=True)
+    model.C = Set(initialize=[1, 2, 3])
+    model.U = model.A | model.B
+
+    start = time.time()
+    model.x = Var(model.U)
+    model.p = Param(model.U, initialize=p_init)
+    ans.append(time.time() - start)
+
+    # len() is called for a fraction of the elements (the uncached
+    # calls are O(n) each)
+    start = time.time()
+    for i in range(0, len(model.U), 1000):
+        len(model.U)
+    ans.append(time.time() - start)
+
+    start = time.time()
+    for i in model.U:
+        i in model.U
+    ans.append(time.time() - start)
+
+    model.P = model.U * model.C
+    start = time.time()
+    for i in model.U:
+        (i, 1) in model.P
+    ans.append(time.time() - start)
+    return ans
+
+def main(args=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size', type=int, default=100000,
+                        help="number of elements of each operand set")
+    options = parser.parse_args(args=args)
+
+    with uncached():
+        uncached_times = run(options.size)
+    cached_times = run(options.size)
+    print("%-16s %12s %12s" % ("", "uncached", "cached"))
+    for name, t0, t1 in zip(("construction", "len", "membership",
+                             "product"), uncached_times, cached_times):
+        print("%-16s %10.3f s %10.3f s" % (name, t0, t1))
+
+if __name__ == "__main__":
+    main()
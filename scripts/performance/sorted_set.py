@@ -0,0 +1,67 @@
+#  _________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright (c) 2014 Sandia Corporation.
+#  Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+#  the U.S. Government retains certain rights in this software.
+#  This software is distributed under the BSD License.
+#  _________________________________________________________________________
+#
+# A script to time the construction of a sorted Set element by
+# element, for elements added in random order:
+#
+#   add           add all of the elements, then iterate over the set
+#   add + next    call ord(), next() and prev() after each element is
+#                 added (as the discretizations of pyomo.dae do)
+#
+# The --resort option sorts the set again before each call, which is
+# the work the previous implementation of sorted sets did after an
+# element was added (use a smaller --size with this option).
+#
+#   python sorted_set.py [--size=N] [--resort]
+#
+
+import argparse
+import random
+import time
+
+from pyomo.environ import ConcreteModel, Set
+
+def add_elements(values, query, resort):
+    model = ConcreteModel()
+    model.T = Set(ordered=Set.SortedOrder)
+    T = model.T
+    for val in values:
+        T.add(val)
+        if query:
+            if resort:
+                T._sort()
+            i = T.ord(val)
+            if i > 1:
+                T.prev(val)
+            if i < len(T):
+                T.next(val)
+    if resort:
+        T._sort()
+    return sum(1 for val in T)
+
+def main(args=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size', type=int, default=1000000,
+                        help="number of elements added to the set")
+    parser.add_argument('--resort', action='store_true', default=False,
+                        help="sort the set before each ord() call")
+    options = parser.parse_args(args=args)
+
+    rnd = random.Random(1)
+    values = [rnd.random() for i in range(options.size)]
+
+    for name, query in (("add", False), ("add + next", True)):
+        start = time.time()
+        count = add_elements(values, query, options.resort)
+        elapsed = time.time() - start
+        print("%-24s %10.3f s %10.2f us/element"
+              % (name, elapsed, 1e6 * elapsed / count))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#  _________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright (c) 2014 Sandia Corporation.
+#  Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+#  the U.S. Government retains certain rights in this software.
+#  This software is distributed under the BSD License.
+#  _________________________________________________________________________
+#
+# A script to compare the construction time, iteration time and memory
+# of dense and sparse (dense=False) indexed variables and parameters,
+# for a network flow model whose flow variables and arc costs are
+# indexed by all pairs of nodes, but where only a few of the arcs are
+# used by the constraints.
+#
+# The memory of a model is the total size of the objects reachable
+# from it (see component_memory.py).
+#
+#   python sparse_components.py [--nodes=N] [--arcs=E]
+#
+
+import argparse
+import random
+import time
+
+from pyomo.environ import (ConcreteModel, RangeSet, Var, Param,
+                           Constraint)
+
+from component_memory import component_size
+
+def arc_cost(model, i, j):
+    return i + j
+
+def create_model(nodes, arcs, dense):
+    model = ConcreteModel()
+    model.N = RangeSet(nodes)
+    model.c = Param(model.N, model.N, initialize=arc_cost, mutable=True,
+                    dense=dense)
+    model.f = Var(model.N, model.N, bounds=(0, 10), dense=dense)
+    out_arcs = dict((n, []) for n in model.N)
+    for i, j in arcs:
+        out_arcs[i].append(j)
+    def supply_rule(model, i):
+        if not out_arcs[i]:
+            return Constraint.Skip
+        return sum(model.c[i,j]*model.f[i,j] for j in out_arcs[i]) >= 1
+    model.supply = Constraint(model.N, rule=supply_rule)
+    return model
+
+def main(args=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--nodes', type=int, default=1000,
+                        help="number of nodes")
+    parser.add_argument('--arcs', type=int, default=10000,
+                        help="number of (random) arcs used by the model")
+    options = parser.parse_args(args=args)
+
+    rnd = random.Random(1)
+    arcs = sorted(set((rnd.randint(1, options.nodes),
+                       rnd.randint(1, options.nodes))
+                      for e in range(options.arcs)))
+
+    for dense in (True, False):
+        start = time.time()
+        model = create_model(options.nodes, arcs, dense)
+        build_time = time.time() - start
+        start = time.time()
+        count = sum(1 for v in model.f.values())
+        iter_time = time.time() - start
+        size = component_size(model, [])
+        print("%-12s construction %8.3f s  iteration %8.3f s  "
+              "%8d vars  %12d bytes"
+              % ("dense" if dense else "sparse", build_time, iter_time,
+                 count, size))
+        del model
+
+if __name__ == "__main__":
+    main()